@@ -5,29 +5,22 @@ import os
 import time
 import logging
 import threading
+import uuid
 from typing import Dict, Any, List
 
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 
 from config import config
-from modules.tts.tts_service import TTSService
-from modules.tts.provider_factory import TTSProviderFactory
-from modules.tts.fallback_manager import TTSFallbackManager
-from modules.tts.voice_pool import VoicePoolManager
-from modules.tts.telnyx_streaming import TelnyxStreamingManager
-from modules.tts.call_metrics import CallQualityMonitor
-from modules.tts.dialog_manager import DialogManager
-from modules.tts.cache_manager import TTSCacheManager
-from modules.tts.predictive import PredictiveGenerator
-from modules.tts.benchmarking import TTSBenchmark
-from modules.redis_store import RedisStore
-from modules.openai_transcription_handler import OpenAITranscriptionHandler
-from modules.assemblyai_handler import AssemblyAIHandler
-from modules.telnyx_handler import TelnyxHandler
-from modules.llm_handler import LLMHandler
+from modules.tts.scheduler import SchedulingClass
+from modules.webhook_queue import WebhookEventQueue
+from modules.transcription_metrics import TranscriptionLatencyTracker
+from modules.streaming_stt import StreamingSTTManager, BatchTranscriptionASR
+from modules.tracing import get_tracer
+from modules.components import ComponentRegistry
+from modules.app_components import register_components
 from api_blueprint import api
-from webhook_blueprint import webhooks
+from webhook_blueprint import webhooks, process_call_event, dispatch_transcript
 from routes.metrics import register_metrics_blueprint
 
 # Configure logging
@@ -69,148 +62,24 @@ def create_app(config_obj=None):
     os.makedirs(os.path.join('logs', 'call_metrics'), exist_ok=True)
     os.makedirs(os.path.join('cache', 'tts'), exist_ok=True)
     
-    # Initialize service clients
-    redis_store = RedisStore(
-        host=app_config.REDIS_HOST,
-        port=app_config.REDIS_PORT,
-        password=app_config.REDIS_PASSWORD,
-        db=app_config.REDIS_DB
-    )
-    
-    # Initialize Telnyx handler
-    telnyx_handler = TelnyxHandler(
-        api_key=app_config.TELNYX_API_KEY,
-        phone_number=app_config.TELNYX_PHONE_NUMBER,
-        messaging_profile_id=app_config.TELNYX_MESSAGING_PROFILE_ID,
-        app_id=app_config.TELNYX_APP_ID
-    )
-    
-    # Initialize the enhanced TTS components
-    
-    # 1. Initialize the multi-layer cache manager
-    cache_manager = TTSCacheManager(
-        redis_client=redis_store.redis,
-        cache_dir=os.path.join('cache', 'tts'),
-        memory_capacity=app_config.TTS_CACHE_MEMORY_CAPACITY,
-        redis_ttl=app_config.TTS_CACHE_TTL,
-        enable_memory_cache=app_config.TTS_CACHE_MEMORY_ENABLED,
-        enable_redis_cache=app_config.TTS_CACHE_REDIS_ENABLED,
-        enable_file_cache=app_config.TTS_CACHE_FILE_ENABLED
-    )
-    
-    # 2. Initialize the voice pool manager for provider resource management
-    voice_pool_manager = VoicePoolManager(
-        initial_pool_size=app_config.TTS_VOICE_POOL_SIZE,
-        min_pool_size=app_config.TTS_VOICE_POOL_MIN_SIZE,
-        max_pool_size=app_config.TTS_VOICE_POOL_MAX_SIZE,
-        provider_ttl=app_config.TTS_VOICE_POOL_TTL,
-        provider_factory=TTSProviderFactory(),
-        provider_configs=app_config.get_tts_provider_config()
-    )
-    
-    # 3. Initialize the TTS fallback manager for provider failover
-    fallback_manager = TTSFallbackManager(
-        primary_provider_name=app_config.TTS_PROVIDER,
-        fallback_providers=app_config.TTS_FALLBACK_PROVIDERS,
-        provider_configs=app_config.get_tts_provider_config(),
-        provider_factory=TTSProviderFactory(),
-        health_check_interval=app_config.TTS_HEALTH_CHECK_INTERVAL
-    )
-    
-    # 4. Initialize the Telnyx streaming manager for real-time audio
-    telnyx_streaming_manager = TelnyxStreamingManager(
-        telnyx_api_key=app_config.TELNYX_API_KEY,
-        chunk_size_ms=app_config.TTS_STREAMING_CHUNK_SIZE_MS,
-        buffer_threshold=app_config.TTS_STREAMING_BUFFER_THRESHOLD,
-        max_silence_ms=app_config.TTS_STREAMING_MAX_SILENCE_MS,
-        max_active_streams=app_config.TTS_STREAMING_MAX_ACTIVE_STREAMS
-    )
-    
-    # 5. Initialize dialog manager for conversation flow
-    dialog_manager = DialogManager(
-        initial_fragment_words=app_config.TTS_INITIAL_FRAGMENT_WORDS,
-        min_first_fragment_words=app_config.TTS_MIN_FIRST_FRAGMENT_WORDS,
-        sentence_pause_ms=app_config.TTS_SENTENCE_PAUSE_MS,
-        min_pause_ms=app_config.TTS_MIN_PAUSE_MS,
-        break_on_punctuation=app_config.TTS_BREAK_ON_PUNCTUATION.split(',')
-    )
-    
-    # 6. Initialize the TTS service with all the new components
-    tts_config = {
-        "default_provider": app_config.TTS_PROVIDER,
-        "cache_enabled": app_config.TTS_CACHE_ENABLED,
-        "cache_ttl": app_config.TTS_CACHE_TTL,
-        "provider_config": app_config.get_tts_provider_config(),
-        "voice_mapping": app_config.TTS_VOICE_MAPPING
-    }
-    
-    tts_service = TTSService(
-        redis_client=redis_store.redis,
-        telnyx_handler=telnyx_handler,
-        config=tts_config,
-        cache_manager=cache_manager,
-        fallback_manager=fallback_manager,
-        voice_pool_manager=voice_pool_manager,
-        dialog_manager=dialog_manager
-    )
-    
-    # 7. Initialize the call quality monitor for metrics collection
-    call_quality_monitor = CallQualityMonitor(
-        tts_service=tts_service,
-        telnyx_streaming_manager=telnyx_streaming_manager
-    )
-    
-    # 8. Initialize predictive generator for prewarming
-    predictive_generator = PredictiveGenerator(
-        tts_service=tts_service,
-        cache_manager=cache_manager,
-        prediction_depth=app_config.TTS_PREDICTION_DEPTH,
-        min_confidence=app_config.TTS_PREDICTION_MIN_CONFIDENCE
-    )
-    
-    # 9. Initialize TTS benchmark for performance measurement
-    tts_benchmark = TTSBenchmark(
-        provider_factory=TTSProviderFactory(),
-        provider_configs=app_config.get_tts_provider_config(),
-        results_dir=os.path.join('logs', 'benchmarks')
-    )
-    
-    # Initialize transcription handlers - use OpenAI if available, fall back to AssemblyAI
-    transcription_handler = None
-    
-    # First try to initialize OpenAI handler if API key is available
-    if app_config.OPENAI_API_KEY:
-        try:
-            transcription_handler = OpenAITranscriptionHandler(
-                api_key=app_config.OPENAI_API_KEY,
-                model=app_config.OPENAI_TRANSCRIBE_MODEL
-            )
-            logger.info(f"Using OpenAI for transcription with model: {app_config.OPENAI_TRANSCRIBE_MODEL}")
-        except Exception as e:
-            logger.error(f"Failed to initialize OpenAI transcription handler: {e}")
-            transcription_handler = None
-    
-    # Fall back to AssemblyAI if OpenAI initialization failed or no OpenAI API key
-    if transcription_handler is None and app_config.ASSEMBLYAI_API_KEY:
-        try:
-            transcription_handler = AssemblyAIHandler(
-                api_key=app_config.ASSEMBLYAI_API_KEY
-            )
-            logger.info("Using AssemblyAI for transcription")
-        except Exception as e:
-            logger.error(f"Failed to initialize AssemblyAI handler: {e}")
-            transcription_handler = None
-    
-    if transcription_handler is None:
-        logger.warning("No transcription handler available - call functionality will be limited")
-    
-    # Initialize LLM handler
-    llm_handler = LLMHandler(
-        llm_type=app_config.LLM_TYPE,
-        api_key=app_config.LLM_API_KEY,
-        model=app_config.LLM_MODEL,
-        endpoint=app_config.LLM_ENDPOINT
-    )
+    # Components are built on first use; warm-up builds them in the background
+    registry = ComponentRegistry()
+    
+    register_components(registry, app_config)
+    
+    redis_store = registry.lazy('redis_store')
+    telnyx_handler = registry.lazy('telnyx_handler')
+    cache_manager = registry.lazy('cache_manager')
+    voice_pool_manager = registry.lazy('voice_pool_manager')
+    fallback_manager = registry.lazy('fallback_manager')
+    telnyx_streaming_manager = registry.lazy('telnyx_streaming_manager')
+    dialog_manager = registry.lazy('dialog_manager')
+    tts_service = registry.lazy('tts_service')
+    call_quality_monitor = registry.lazy('call_quality_monitor')
+    predictive_generator = registry.lazy('predictive_generator')
+    tts_benchmark = registry.lazy('tts_benchmark')
+    transcription_handler = registry.lazy('transcription_handler')
+    llm_handler = registry.lazy('llm_handler')
     
     # Register blueprints
     app.register_blueprint(api, url_prefix='/api')
@@ -218,6 +87,7 @@ def create_app(config_obj=None):
     register_metrics_blueprint(app)
     
     # Store service clients in app config for access in routes
+    app.config['COMPONENTS'] = registry
     app.config['REDIS_STORE'] = redis_store
     app.tts_service = tts_service  # Make directly accessible
     app.telnyx_streaming_manager = telnyx_streaming_manager  # Direct access
@@ -232,12 +102,62 @@ def create_app(config_obj=None):
     app.config['PREDICTIVE_GENERATOR'] = predictive_generator
     app.config['TTS_BENCHMARK'] = tts_benchmark
     app.config['TRANSCRIPTION_HANDLER'] = transcription_handler
+    app.config['TRANSCRIPTION_LATENCY'] = TranscriptionLatencyTracker()
     app.config['TELNYX_HANDLER'] = telnyx_handler
     app.config['LLM_HANDLER'] = llm_handler
     
+    # Trace each turn through webhook, STT, LLM, TTS and upload
+    tracer = get_tracer()
+    tracer.configure(enabled=app_config.TRACING_ENABLED, capacity=app_config.TRACE_BUFFER_SPANS)
+    app.config['TRACER'] = tracer
+    
     # Store config in app
     app.config['APP_CONFIG'] = app_config
     
+    # Queue call webhooks so they are acknowledged at once and processed in order per call
+    if app_config.WEBHOOK_QUEUE_ENABLED:
+        def handle_call_event(data):
+            with app.app_context():
+                process_call_event(data)
+        
+        def build_webhook_queue(components):
+            webhook_queue = WebhookEventQueue(
+                components.get('redis_store').redis,
+                handler=handle_call_event,
+                shard_count=app_config.WEBHOOK_QUEUE_SHARDS,
+                claim_idle_ms=app_config.WEBHOOK_QUEUE_CLAIM_IDLE_MS
+            )
+            webhook_queue.start()
+            return webhook_queue
+        
+        registry.register('webhook_queue', build_webhook_queue)
+        app.config['WEBHOOK_QUEUE'] = registry.lazy('webhook_queue')
+    
+    # Recognize streamed caller audio and answer as soon as the caller stops speaking
+    if app_config.STREAMING_STT_ENABLED and app_config.OPENAI_API_KEY:
+        def handle_final_transcript(call_control_id, client_state, event):
+            # End of speech starts the caller's turn
+            with app.app_context(), tracer.trace():
+                now = time.time()
+                tracer.record("stt.streaming", now - event.asr_ms / 1000, now,
+                              utterance_ms=event.end_ms - event.start_ms)
+                app.config['TRANSCRIPTION_LATENCY'].record('streaming', event.asr_ms / 1000)
+                dispatch_transcript(call_control_id, client_state, f"stream-{uuid.uuid4()}",
+                                    {"status": "completed", "text": event.text})
+        
+        def build_streaming_stt(components):
+            openai_transcription_handler = components.get('openai_transcription_handler')
+            if not openai_transcription_handler:
+                return None
+            return StreamingSTTManager(
+                BatchTranscriptionASR(openai_transcription_handler),
+                on_final=handle_final_transcript,
+                end_silence_ms=app_config.STREAMING_STT_END_SILENCE_MS
+            )
+        
+        registry.register('streaming_stt', build_streaming_stt)
+        app.config['STREAMING_STT'] = registry.lazy('streaming_stt')
+    
     # Prewarm cache for common phrases if enabled
     if app_config.TTS_PREWARM_ENABLED:
         def prewarm_cache():
@@ -251,8 +171,8 @@ def create_app(config_obj=None):
                 # Generate speech for each common phrase
                 for phrase in common_phrases:
                     try:
-                        # Use default voice
-                        tts_service.generate_speech(text=phrase)
+                        # Use default voice; waits behind live calls and predictions
+                        tts_service.generate_speech(text=phrase, priority=SchedulingClass.PREWARM)
                         logger.debug(f"Prewarmed cache for phrase: {phrase[:30]}...")
                     except Exception as e:
                         logger.error(f"Failed to prewarm cache for phrase: {e}")
@@ -266,9 +186,11 @@ def create_app(config_obj=None):
         prewarm_thread.daemon = True
         prewarm_thread.start()
     
-    # Start the fallback manager's health check thread
-    fallback_manager.start_health_check_thread()
+    # Build components in parallel in the background; requests build what they need first
+    if app_config.STARTUP_WARMUP_ENABLED:
+        registry.warm_up()
     
+    registry.mark_serving()
     logger.info("Morning Coffee application initialized with enhanced TTS components")
     
     # Root endpoint
@@ -286,6 +208,22 @@ def create_app(config_obj=None):
             }
         })
     
+    # Readiness endpoint
+    @app.route('/ready')
+    def ready():
+        """
+        Readiness check.
+        
+        "serving" once requests are accepted; components not yet built are
+        built by the first request that needs them. "warm" once every
+        component has been built. With ``?warm=true`` the check fails
+        until the application is warm.
+        """
+        status = registry.get_status()
+        if request.args.get('warm', '').lower() == 'true' and status['status'] != 'warm':
+            return jsonify(status), 503
+        return jsonify(status)
+    
     # Enhanced health check endpoint
     @app.route('/health')
     def health():
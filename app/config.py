@@ -23,6 +23,8 @@ class Config:
         self.REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD')
         self.REDIS_DB = int(os.environ.get('REDIS_DB', 0))
         self.REDIS_URL = self._build_redis_url()
+        # Seconds a completed or failed call session is kept
+        self.FINISHED_CALL_TTL = int(os.environ.get('FINISHED_CALL_TTL', 7 * 86400))
         
         # TTS service configuration
         self.TTS_SERVICE_URL = os.environ.get('TTS_SERVICE_URL', 'http://spark-tts:5001')
@@ -32,6 +34,13 @@ class Config:
         self.TTS_PROVIDER = os.environ.get('TTS_PROVIDER', 'openai')  # Default to OpenAI
         self.TTS_CACHE_ENABLED = os.environ.get('TTS_CACHE_ENABLED', 'true').lower() == 'true'
         self.TTS_CACHE_TTL = int(os.environ.get('TTS_CACHE_TTL', 86400))  # 24 hours default
+        # Providers tried in order when the default provider fails (comma separated)
+        self.TTS_FALLBACK_PROVIDERS = [name.strip() for name in
+                                       os.environ.get('TTS_FALLBACK_PROVIDERS', '').split(',') if name.strip()]
+        # Synthesize common phrases into the cache at startup (phrases separated by '|')
+        self.TTS_PREWARM_ENABLED = os.environ.get('TTS_PREWARM_ENABLED', 'false').lower() == 'true'
+        self.TTS_PREWARM_PHRASES = [phrase.strip() for phrase in
+                                    os.environ.get('TTS_PREWARM_PHRASES', '').split('|') if phrase.strip()]
         
         # Voice mapping configuration
         self.TTS_VOICE_MAPPING = self._load_voice_mapping()
@@ -45,6 +54,12 @@ class Config:
         
         # AssemblyAI settings
         self.ASSEMBLYAI_API_KEY = os.environ.get('ASSEMBLYAI_API_KEY')
+        self.ASSEMBLYAI_WEBHOOK_ENABLED = os.environ.get('ASSEMBLYAI_WEBHOOK_ENABLED', 'true').lower() == 'true'
+        self.ASSEMBLYAI_WEBHOOK_SECRET = os.environ.get('ASSEMBLYAI_WEBHOOK_SECRET')
+        self.ASSEMBLYAI_WEBHOOK_GRACE = float(os.environ.get('ASSEMBLYAI_WEBHOOK_GRACE', 15))  # Seconds before polling
+        
+        # Race OpenAI and AssemblyAI when both are configured
+        self.TRANSCRIPTION_RACE_ENABLED = os.environ.get('TRANSCRIPTION_RACE_ENABLED', 'true').lower() == 'true'
         
         # OpenAI settings for TTS and STT
         self.OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
@@ -61,6 +76,26 @@ class Config:
         
         # Webhook settings
         self.WEBHOOK_BASE_URL = os.environ.get('WEBHOOK_BASE_URL', 'https://example.com')
+        self.WEBHOOK_QUEUE_ENABLED = os.environ.get('WEBHOOK_QUEUE_ENABLED', 'true').lower() == 'true'
+        self.WEBHOOK_QUEUE_SHARDS = int(os.environ.get('WEBHOOK_QUEUE_SHARDS', 8))
+        # Idle time before another process's unacknowledged events are taken over;
+        # keep it above the longest time handling one event can take
+        self.WEBHOOK_QUEUE_CLAIM_IDLE_MS = int(os.environ.get('WEBHOOK_QUEUE_CLAIM_IDLE_MS', 120000))
+        
+        # Streaming speech recognition of inbound call audio; needs a media transport
+        # passing the call's stream to StreamingSTTManager.handle_media_message
+        self.STREAMING_STT_ENABLED = os.environ.get('STREAMING_STT_ENABLED', 'false').lower() == 'true'
+        self.STREAMING_STT_END_SILENCE_MS = int(os.environ.get('STREAMING_STT_END_SILENCE_MS', 600))
+        
+        # Per-turn latency tracing, kept in an in-process ring buffer
+        self.TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+        self.TRACE_BUFFER_SPANS = int(os.environ.get('TRACE_BUFFER_SPANS', 5000))
+        
+        # Build components in the background at startup instead of on first use only
+        self.STARTUP_WARMUP_ENABLED = os.environ.get('STARTUP_WARMUP_ENABLED', 'true').lower() == 'true'
+        
+        # Most recent conversation entries loaded per turn to build the prompt (0 loads all)
+        self.CONVERSATION_HISTORY_LIMIT = int(os.environ.get('CONVERSATION_HISTORY_LIMIT', 20))
     
     def _build_redis_url(self) -> str:
         """
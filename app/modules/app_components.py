@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# Application component factories for Morning Coffee
+
+import logging
+import os
+
+from .components import ComponentRegistry
+from .redis_store import RedisStore
+from .telnyx_handler import TelnyxHandler
+from .llm_handler import LLMHandler
+from .assemblyai_handler import AssemblyAIHandler
+from .transcription_coordinator import TranscriptionCoordinator
+from .call_flow import MORNING_CALL_FLOW
+from .tts.tts_service import TTSService
+from .tts.voice_pool import VoicePoolManager
+from .tts.telnyx_streaming import TelnyxStreamingManager
+from .tts.call_metrics import CallQualityMonitor
+from .tts.cache_manager import TTSCacheManager
+from .tts.predictive import PredictiveGenerator
+from .tts.benchmarking import TTSBenchmark
+
+logger = logging.getLogger('app-components')
+
+def register_components(registry: ComponentRegistry, app_config) -> None:
+    """
+    Register the factories of the application's service components.
+    
+    Components are built on first use or by warm-up. The fallback and dialog
+    managers are the ones the TTS service routes through, not separate
+    instances.
+    
+    Args:
+        registry (ComponentRegistry): Registry to register the factories with
+        app_config: Application configuration
+    """
+    # Initialize service clients
+    def build_redis_store(components):
+        return RedisStore(
+            host=app_config.REDIS_HOST,
+            port=app_config.REDIS_PORT,
+            password=app_config.REDIS_PASSWORD,
+            db=app_config.REDIS_DB,
+            finished_call_ttl=app_config.FINISHED_CALL_TTL
+        )
+    
+    # Initialize Telnyx handler
+    def build_telnyx_handler(components):
+        return TelnyxHandler(
+            api_key=app_config.TELNYX_API_KEY,
+            phone_number=app_config.TELNYX_PHONE_NUMBER,
+            messaging_profile_id=app_config.TELNYX_MESSAGING_PROFILE_ID,
+            app_id=app_config.TELNYX_APP_ID
+        )
+    
+    # Initialize the enhanced TTS components
+    
+    # 1. Initialize the multi-layer cache manager
+    def build_cache_manager(components):
+        return TTSCacheManager({
+            "redis": {
+                "enabled": app_config.TTS_CACHE_ENABLED,
+                "host": app_config.REDIS_HOST,
+                "port": app_config.REDIS_PORT,
+                "db": app_config.REDIS_DB,
+                "password": app_config.REDIS_PASSWORD,
+                "ttl": app_config.TTS_CACHE_TTL
+            },
+            "filesystem": {
+                "cache_dir": os.path.join('cache', 'tts')
+            }
+        })
+    
+    # 2. Initialize the voice pool manager for provider resource management
+    def build_voice_pool_manager(components):
+        return VoicePoolManager()
+    
+    # 3. The TTS service's fallback manager for provider failover
+    #    (None without fallback providers)
+    def build_fallback_manager(components):
+        return components.get('tts_service').fallback_manager
+    
+    # 4. Initialize the Telnyx streaming manager for real-time audio
+    def build_telnyx_streaming_manager(components):
+        return TelnyxStreamingManager(api_key=app_config.TELNYX_API_KEY)
+    
+    # 5. The TTS service's dialog manager for conversation flow
+    def build_dialog_manager(components):
+        return components.get('tts_service').dialog_manager
+    
+    # 6. Initialize the TTS service with all the new components
+    def build_tts_service(components):
+        tts_config = {
+            "default_provider": app_config.TTS_PROVIDER,
+            "fallback_providers": app_config.TTS_FALLBACK_PROVIDERS,
+            "cache_enabled": app_config.TTS_CACHE_ENABLED,
+            "cache_ttl": app_config.TTS_CACHE_TTL,
+            "provider_config": app_config.get_tts_provider_config(),
+            "voice_mapping": app_config.TTS_VOICE_MAPPING
+        }
+        
+        return TTSService(
+            redis_client=components.get('redis_store').redis,
+            telnyx_handler=components.get('telnyx_handler'),
+            config=tts_config,
+            voice_pool_manager=components.get('voice_pool_manager')
+        )
+    
+    # 7. Initialize the call quality monitor for metrics collection
+    def build_call_quality_monitor(components):
+        return CallQualityMonitor(
+            tts_service=components.get('tts_service'),
+            telnyx_streaming_manager=components.get('telnyx_streaming_manager')
+        )
+    
+    # 8. Initialize predictive generator for prewarming, learning from the
+    #    morning call flow's step transitions across processes
+    def build_predictive_generator(components):
+        predictive_generator = PredictiveGenerator(
+            cache_manager=components.get('cache_manager'),
+            tts_generator=components.get('tts_service').generate_speech,
+            redis_client=components.get('redis_store').redis
+        )
+        predictive_generator.register_call_flow(MORNING_CALL_FLOW)
+        return predictive_generator
+    
+    # 9. Initialize TTS benchmark for performance measurement
+    def build_tts_benchmark(components):
+        return TTSBenchmark(components.get('tts_service'))
+    
+    # Initialize transcription handlers
+    def build_openai_transcription_handler(components):
+        if not app_config.OPENAI_API_KEY:
+            return None
+        try:
+            # Imported here so the OpenAI SDK only loads when transcription is used
+            from .openai_transcription_handler import OpenAITranscriptionHandler
+            handler = OpenAITranscriptionHandler(
+                api_key=app_config.OPENAI_API_KEY,
+                model=app_config.OPENAI_TRANSCRIBE_MODEL
+            )
+            logger.info(f"OpenAI transcription available with model: {app_config.OPENAI_TRANSCRIBE_MODEL}")
+            return handler
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI transcription handler: {e}")
+            return None
+    
+    def build_assemblyai_handler(components):
+        if not app_config.ASSEMBLYAI_API_KEY:
+            return None
+        if not app_config.TRANSCRIPTION_RACE_ENABLED and components.get('openai_transcription_handler'):
+            return None
+        try:
+            # Transcripts are delivered to /webhooks/assemblyai; polling is only a fallback
+            handler = AssemblyAIHandler(
+                api_key=app_config.ASSEMBLYAI_API_KEY,
+                webhook_url=(f"{app_config.WEBHOOK_BASE_URL}/webhooks/assemblyai"
+                             if app_config.ASSEMBLYAI_WEBHOOK_ENABLED else None),
+                webhook_secret=app_config.ASSEMBLYAI_WEBHOOK_SECRET,
+                webhook_grace=app_config.ASSEMBLYAI_WEBHOOK_GRACE
+            )
+            logger.info("AssemblyAI transcription available")
+            return handler
+        except Exception as e:
+            logger.error(f"Failed to initialize AssemblyAI handler: {e}")
+            return None
+    
+    # Race both providers if available, otherwise use OpenAI and fall back to AssemblyAI
+    def build_transcription_handler(components):
+        openai_transcription_handler = components.get('openai_transcription_handler')
+        assemblyai_handler = components.get('assemblyai_handler')
+        if openai_transcription_handler and assemblyai_handler:
+            logger.info("Racing OpenAI and AssemblyAI for transcription")
+            return TranscriptionCoordinator({
+                "openai": openai_transcription_handler,
+                "assemblyai": assemblyai_handler
+            })
+        
+        transcription_handler = openai_transcription_handler or assemblyai_handler
+        if transcription_handler is None:
+            logger.warning("No transcription handler available - call functionality will be limited")
+        return transcription_handler
+    
+    # Initialize LLM handler
+    def build_llm_handler(components):
+        return LLMHandler(
+            llm_type=app_config.LLM_TYPE,
+            api_key=app_config.LLM_API_KEY,
+            model=app_config.LLM_MODEL,
+            endpoint=app_config.LLM_ENDPOINT
+        )
+    
+    registry.register('redis_store', build_redis_store)
+    registry.register('telnyx_handler', build_telnyx_handler)
+    registry.register('cache_manager', build_cache_manager)
+    registry.register('voice_pool_manager', build_voice_pool_manager)
+    registry.register('fallback_manager', build_fallback_manager)
+    registry.register('telnyx_streaming_manager', build_telnyx_streaming_manager)
+    registry.register('dialog_manager', build_dialog_manager)
+    registry.register('tts_service', build_tts_service)
+    registry.register('call_quality_monitor', build_call_quality_monitor)
+    registry.register('predictive_generator', build_predictive_generator)
+    registry.register('tts_benchmark', build_tts_benchmark, warm=False)
+    registry.register('openai_transcription_handler', build_openai_transcription_handler)
+    registry.register('assemblyai_handler', build_assemblyai_handler)
+    registry.register('transcription_handler', build_transcription_handler)
+    registry.register('llm_handler', build_llm_handler)
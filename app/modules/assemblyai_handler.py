@@ -2,46 +2,68 @@
 # AssemblyAI Handler Module for Morning Coffee application
 # Direct REST API implementation to avoid SDK validation issues
 
+import hmac
 import logging
 import json
 import time
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .tracing import traced
+
 # Configure logging
 logger = logging.getLogger("assemblyai-handler")
 
 class AssemblyAIHandler:
-    """Handler for AssemblyAI API interactions using direct REST API calls."""
+    """
+    Handler for AssemblyAI API interactions using direct REST API calls.
+    
+    If a ``webhook_url`` is configured, AssemblyAI calls it when a transcript
+    is done, and ``wait_for_transcription`` is only needed as a fallback for
+    callbacks that do not arrive within ``webhook_grace`` seconds.
+    """
     
     # AssemblyAI API endpoints
     BASE_URL = "https://api.assemblyai.com/v2"
     TRANSCRIPT_ENDPOINT = f"{BASE_URL}/transcript"
     
-    def __init__(self, api_key: str):
+    # Header AssemblyAI sends back with webhook callbacks
+    WEBHOOK_AUTH_HEADER = "X-Webhook-Secret"
+    
+    def __init__(self, api_key: str, webhook_url: Optional[str] = None,
+                 webhook_secret: Optional[str] = None, webhook_grace: float = 15.0):
         """
         Initialize the AssemblyAI handler.
         
         Args:
             api_key (str): AssemblyAI API key
+            webhook_url (Optional[str]): URL AssemblyAI calls when a transcript is done
+            webhook_secret (Optional[str]): Value AssemblyAI sends in ``WEBHOOK_AUTH_HEADER``
+            webhook_grace (float): Seconds to wait for a callback before polling
         """
         self.api_key = api_key
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.webhook_grace = webhook_grace
         self.headers = {
             "Authorization": api_key,
             "Content-Type": "application/json"
         }
     
+    @traced("stt.assemblyai.submit")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def submit_transcription(self, audio_url: str) -> Optional[Dict[str, Any]]:
+    def submit_transcription(self, audio_url: str, webhook: bool = True) -> Optional[Dict[str, Any]]:
         """
         Submit an audio file for transcription using direct REST API.
         
         Args:
             audio_url (str): URL of the audio file to transcribe
+            webhook (bool): Request a callback to ``webhook_url`` if one is configured
             
         Returns:
-            Optional[Dict[str, Any]]: Job information or None if failed
+            Optional[Dict[str, Any]]: Job information (job_id, status, submitted_at
+                and whether a webhook callback was requested) or None if failed
         """
         try:
             # Create transcription configuration - using direct API call
@@ -52,7 +74,14 @@ class AssemblyAIHandler:
                 "punctuate": True,
                 "format_text": True
             }
+            webhook = webhook and bool(self.webhook_url)
+            if webhook:
+                data["webhook_url"] = self.webhook_url
+                if self.webhook_secret:
+                    data["webhook_auth_header_name"] = self.WEBHOOK_AUTH_HEADER
+                    data["webhook_auth_header_value"] = self.webhook_secret
             
+            submitted_at = time.time()
             # Submit the audio file for transcription
             response = requests.post(
                 self.TRANSCRIPT_ENDPOINT,
@@ -72,13 +101,14 @@ class AssemblyAIHandler:
             
             return {
                 "job_id": transcript_id,
-                "status": "submitted"
+                "status": "submitted",
+                "submitted_at": submitted_at,
+                "webhook": webhook
             }
         except Exception as e:
             logger.error(f"Error submitting transcription to AssemblyAI: {e}")
             return None
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def check_transcription_status(self, job_id: str) -> Dict[str, Any]:
         """
         Check the status of a transcription job using direct REST API.
@@ -87,7 +117,9 @@ class AssemblyAIHandler:
             job_id (str): The ID of the transcription job
             
         Returns:
-            Dict[str, Any]: Status information with text if completed
+            Dict[str, Any]: Status information with text if completed. Status
+                "error" means AssemblyAI failed the job; "unavailable" means the
+                status could not be read and may be checked again
         """
         try:
             # Check the status of the job
@@ -117,8 +149,89 @@ class AssemblyAIHandler:
                     "error": f"Transcription failed with status: {status}"
                 }
         except Exception as e:
-            logger.error(f"Error checking AssemblyAI transcription status: {e}")
+            logger.warning(f"Error checking AssemblyAI transcription status: {e}")
             return {
-                "status": "error",
+                "status": "unavailable",
                 "error": str(e)
-            } 
\ No newline at end of file
+            }
+    
+    def wait_for_transcription(self, job_id: str, timeout: float = 60.0,
+                               initial_interval: float = 0.25, max_interval: float = 2.0,
+                               backoff: float = 1.5,
+                               should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        Poll a transcription job until it is done.
+        
+        The interval starts short, since short turns are transcribed quickly,
+        and grows by ``backoff`` up to ``max_interval``. Checks that fail to
+        reach AssemblyAI are retried on the same schedule; only a job status
+        ends polling early.
+        
+        Args:
+            job_id (str): The ID of the transcription job
+            timeout (float): Seconds to poll before giving up
+            initial_interval (float): Seconds before the second check
+            max_interval (float): Longest interval between checks
+            backoff (float): Factor the interval grows by after each check
+            should_stop (Optional[Callable[[], bool]]): Checked before each poll;
+                polling stops once it returns True
+            
+        Returns:
+            Dict[str, Any]: Status information as from ``check_transcription_status``,
+                or status "timeout" or "cancelled"
+        """
+        deadline = time.time() + timeout
+        interval = initial_interval
+        while True:
+            if should_stop and should_stop():
+                return {"status": "cancelled"}
+            
+            result = self.check_transcription_status(job_id)
+            if result.get("status") not in ("in_progress", "unavailable"):
+                return result
+            
+            if time.time() + interval > deadline:
+                logger.error(f"Timed out waiting for transcription {job_id}")
+                error = f"No transcript after {timeout}s"
+                if result.get("status") == "unavailable":
+                    error += f" (last check failed: {result.get('error')})"
+                return {"status": "timeout", "error": error}
+            time.sleep(interval)
+            interval = min(interval * backoff, max_interval)
+    
+    @traced("stt.assemblyai")
+    def transcribe_and_wait(self, audio_url: str, timeout: float = 60.0,
+                            should_stop: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        """
+        Transcribe audio from a URL, polling until the transcript is done.
+        
+        No webhook callback is requested, since the caller waits for the text.
+        
+        Args:
+            audio_url (str): URL of the audio file to transcribe
+            timeout (float): Seconds to wait for the transcript
+            should_stop (Optional[Callable[[], bool]]): Polling stops once it returns True
+            
+        Returns:
+            Optional[str]: Transcribed text or None if failed or stopped
+        """
+        job = self.submit_transcription(audio_url, webhook=False)
+        if not job:
+            return None
+        
+        result = self.wait_for_transcription(job["job_id"], timeout=timeout, should_stop=should_stop)
+        return result.get("text") if result.get("status") == "completed" else None
+    
+    def verify_webhook(self, headers: Dict[str, str]) -> bool:
+        """
+        Check that a webhook callback carries the configured secret.
+        
+        Args:
+            headers (Dict[str, str]): Request headers
+            
+        Returns:
+            bool: True if no secret is configured or the secret matches
+        """
+        if not self.webhook_secret:
+            return True
+        return hmac.compare_digest(headers.get(self.WEBHOOK_AUTH_HEADER, ""), self.webhook_secret)
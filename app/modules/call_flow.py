@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# Morning call flow, as followed by the call webhooks
+
+# Fixed phrases the call speaks
+REPEAT_PROMPT = "Now, please repeat the affirmation."
+CHAT_PROMPT = "Would you like to continue our conversation? Just say yes or no."
+GOODBYE_MESSAGE = "Thank you for your time today. Remember your affirmation and have a wonderful day!"
+
+# Voice the call's phrases are spoken in
+CALL_VOICE = "default_female"
+
+# ID the flow is registered under (derived from its name)
+MORNING_CALL_FLOW_ID = "morning_call"
+
+# Steps are the client states of the call's playbacks and recordings, so
+# predictive synthesis can learn which phrases a call needs next
+MORNING_CALL_FLOW = {
+    "name": "Morning Call",
+    "description": "Greeting, affirmation repetition, then an optional chat",
+    "entry_point": "greeting",
+    "steps": {
+        "greeting": {"transitions": {"default": "repeat_prompt"}},
+        "repeat_prompt": {"phrases": [REPEAT_PROMPT], "transitions": {"default": "recording_affirmation"}},
+        "recording_affirmation": {"transitions": {"default": "ai_response"}},
+        "ai_response": {"transitions": {"default": "chat_prompt"}},
+        "chat_prompt": {"phrases": [CHAT_PROMPT], "transitions": {"default": "recording_chat"}},
+        "recording_chat": {"transitions": {"continue": "ai_response", "end": "goodbye"}},
+        "goodbye": {"phrases": [GOODBYE_MESSAGE], "transitions": {}},
+    },
+}
+
+# Step a call moves to when the playback of a step ends
+NEXT_STEP_AFTER_PLAYBACK = {
+    "greeting": "repeat_prompt",
+    "repeat_prompt": "recording_affirmation",
+    "ai_response": "chat_prompt",
+    "chat_prompt": "recording_chat",
+}
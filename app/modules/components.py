@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# Lazy application components for Morning Coffee application
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable
+
+# Configure logging
+logger = logging.getLogger('components')
+
+class _Component:
+    """Registration and build state of one component."""
+    
+    def __init__(self, name: str, factory: Callable[['ComponentRegistry'], Any], warm: bool):
+        self.name = name
+        self.factory = factory
+        self.warm = warm
+        self.lock = threading.Lock()
+        self.instance: Any = None
+        self.state = "pending"
+        self.build_ms: Optional[float] = None
+        self.trigger: Optional[str] = None
+        self.error: Optional[str] = None
+
+class ComponentRegistry:
+    """
+    Builds application components on first use.
+    
+    Each component is registered with a factory that receives the registry
+    and gets the components it depends on from it. A component is built
+    once, by whichever thread needs it first; other threads needing it wait
+    for that build. A failed build is retried on the next use.
+    
+    ``warm_up`` builds the registered components in the background,
+    concurrently, so independent remote connectors initialise in parallel
+    while the application is already serving requests.
+    """
+    
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the registry.
+        
+        Args:
+            max_workers (int): Components built concurrently during warm-up
+        """
+        self.max_workers = max_workers
+        self._components: Dict[str, _Component] = {}
+        self._local = threading.local()
+        self._created_at = time.time()
+        self._serving_at: Optional[float] = None
+        self._warm_at: Optional[float] = None
+        self._warmup_started = False
+    
+    def register(self, name: str, factory: Callable[['ComponentRegistry'], Any], warm: bool = True) -> None:
+        """
+        Register a component.
+        
+        Args:
+            name (str): Component name
+            factory (Callable[[ComponentRegistry], Any]): Builds the component; may return None
+                if the component is not available
+            warm (bool): Whether warm-up builds it and readiness waits for it
+        """
+        self._components[name] = _Component(name, factory, warm)
+    
+    def lazy(self, name: str) -> 'LazyComponent':
+        """
+        Get a stand-in that builds the component when it is first used.
+        
+        Args:
+            name (str): Component name
+        
+        Returns:
+            LazyComponent: Proxy for the component
+        """
+        if name not in self._components:
+            raise KeyError(f"Unknown component: {name}")
+        return LazyComponent(self, name)
+    
+    def get(self, name: str) -> Any:
+        """
+        Get a component, building it if needed.
+        
+        Args:
+            name (str): Component name
+        
+        Returns:
+            Any: The component (None if its factory found it unavailable)
+        
+        Raises:
+            KeyError: If the component is not registered
+            Exception: Whatever the factory raised
+        """
+        component = self._components[name]
+        if component.state == "ready":
+            return component.instance
+        
+        with component.lock:
+            if component.state == "ready":
+                return component.instance
+            
+            component.state = "building"
+            component.trigger = getattr(self._local, "trigger", None) or "on_demand"
+            start_time = time.time()
+            try:
+                component.instance = component.factory(self)
+            except Exception as e:
+                component.state = "failed"
+                component.error = str(e)
+                logger.error(f"Failed to build {name}: {e}")
+                raise
+            finally:
+                component.build_ms = (time.time() - start_time) * 1000
+            
+            component.state = "ready"
+            component.error = None
+            logger.info(f"Built {name} in {component.build_ms:.0f}ms ({component.trigger})")
+            self._check_warm()
+            return component.instance
+    
+    def is_ready(self, name: str) -> bool:
+        """
+        Check whether a component has been built.
+        
+        Args:
+            name (str): Component name
+        
+        Returns:
+            bool: True if built
+        """
+        return self._components[name].state == "ready"
+    
+    def warm_up(self, names: Optional[List[str]] = None) -> None:
+        """
+        Build components in the background.
+        
+        Components are built concurrently; one that depends on another being
+        built waits only for that build.
+        
+        Args:
+            names (Optional[List[str]]): Components to build (defaults to all warm ones)
+        """
+        names = names or [name for name, component in self._components.items() if component.warm]
+        self._warmup_started = True
+        
+        def build(name: str) -> None:
+            self._local.trigger = "warm_up"
+            try:
+                self.get(name)
+            except Exception:
+                pass  # Logged and recorded by get(); retried on first use
+            finally:
+                self._local.trigger = None
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(names))),
+                                      thread_name_prefix="component-warmup")
+        for name in names:
+            executor.submit(build, name)
+        executor.shutdown(wait=False)
+    
+    def wait_warm(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every warm component has been built.
+        
+        Args:
+            timeout (Optional[float]): Seconds to wait (forever if None)
+        
+        Returns:
+            bool: True if warm
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while not self._is_warm():
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def mark_serving(self) -> None:
+        """Record that the application accepts requests."""
+        self._serving_at = time.time()
+        logger.info(f"Serving after {(self._serving_at - self._created_at) * 1000:.0f}ms")
+        self._check_warm()
+    
+    def _is_warm(self) -> bool:
+        return all(component.state == "ready" for component in self._components.values() if component.warm)
+    
+    def _check_warm(self) -> None:
+        if self._warm_at is None and self._serving_at is not None and self._is_warm():
+            self._warm_at = time.time()
+            logger.info(f"Warm after {(self._warm_at - self._created_at) * 1000:.0f}ms")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get startup status.
+        
+        Returns:
+            Dict[str, Any]: "warm" once every warm component is built, otherwise
+                "serving" (or "starting" before the app accepts requests), with
+                the time to each stage and per component state and build time
+        """
+        def since_created(moment: Optional[float]) -> Optional[float]:
+            return (moment - self._created_at) * 1000 if moment else None
+        
+        warm = self._is_warm()
+        return {
+            "status": "warm" if warm and self._serving_at else "serving" if self._serving_at else "starting",
+            "serving": self._serving_at is not None,
+            "warm": warm,
+            "warm_up_started": self._warmup_started,
+            "serving_after_ms": since_created(self._serving_at),
+            "warm_after_ms": since_created(self._warm_at),
+            "components": {
+                name: {
+                    "state": component.state,
+                    "warm": component.warm,
+                    "build_ms": component.build_ms,
+                    "trigger": component.trigger,
+                    "error": component.error,
+                }
+                for name, component in self._components.items()
+            },
+        }
+
+class LazyComponent:
+    """
+    Stand-in for a registered component, built when it is first used.
+    
+    Attribute access and truth tests resolve the component, so code that
+    checks ``if component:`` or ``hasattr(component, ...)`` behaves as it
+    would with the component itself, including components that are None.
+    """
+    
+    __slots__ = ("_registry", "_name")
+    
+    def __init__(self, registry: ComponentRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+    
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._registry.get(self._name), attr, value)
+    
+    def __bool__(self) -> bool:
+        try:
+            return bool(self._registry.get(self._name))
+        except Exception:
+            # Logged by the registry; an unavailable component is falsy, like None
+            return False
+    
+    def __repr__(self) -> str:
+        state = "ready" if self._registry.is_ready(self._name) else "not built"
+        return f"<LazyComponent {self._name} ({state})>"
@@ -3,14 +3,22 @@
 
 import os
 import json
+import time
 import logging
 import requests
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Generator, Iterator
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .tracing import traced, traced_stream
+
 # Configure logging
 logger = logging.getLogger("llm-handler")
 
+# Default system prompt used when the conversation does not provide one
+SYSTEM_PROMPT = ("You are a helpful, positive voice assistant for a morning routine app called 'Morning Coffee'. "
+                 "Keep responses concise (1-2 sentences) as they will be read out loud over a phone call. "
+                 "Be uplifting, motivational, and help the user start their day with positivity.")
+
 class LLMHandler:
     """Handler for LLM API interactions with multiple provider support."""
     
@@ -52,6 +60,7 @@ class LLMHandler:
         if self.llm_type == 'llama' and not self.endpoint:
             raise ValueError("Llama endpoint URL is required")
     
+    @traced("llm.response")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def get_response(self, user_input: str, conversation_history: Optional[List[Dict[str, str]]] = None) -> Optional[str]:
         """
@@ -85,6 +94,71 @@ class LLMHandler:
             logger.error(f"Error getting LLM response: {e}")
             return None
     
+    @traced_stream("llm.stream")
+    def stream_response(self, user_input: str, conversation_history: Optional[List[Dict[str, str]]] = None,
+                        metrics: Optional[Dict[str, Any]] = None) -> Generator[str, None, None]:
+        """
+        Stream a response from the LLM as it is generated.
+        
+        Text deltas are yielded as soon as the backend produces them, so the
+        caller can start speaking the first sentence before the completion
+        finishes. If streaming fails before any text arrives, the blocking
+        get_response() path is used and its result yielded as a single delta.
+        
+        Args:
+            user_input (str): The user's input text
+            conversation_history (Optional[List[Dict[str, str]]]): Previous conversation history
+            metrics (Optional[Dict[str, Any]]): Dict populated with time_to_first_token,
+                total_time, deltas and streamed for this response
+            
+        Returns:
+            Generator[str, None, None]: Generator yielding text deltas
+        """
+        if conversation_history is None:
+            conversation_history = []
+        if metrics is None:
+            metrics = {}
+        
+        start_time = time.time()
+        metrics.update({"time_to_first_token": None, "total_time": None, "deltas": 0, "streamed": True})
+        
+        streamers = {
+            'openai': self._stream_openai_response,
+            'llama': self._stream_llama_response,
+            'claude': self._stream_claude_response,
+            'gemini': self._stream_gemini_response
+        }
+        streamer = streamers.get(self.llm_type)
+        if streamer is None:
+            logger.error(f"Unsupported LLM type: {self.llm_type}")
+            return
+        
+        try:
+            try:
+                for delta in streamer(user_input, conversation_history):
+                    if not delta:
+                        continue
+                    if metrics["time_to_first_token"] is None:
+                        metrics["time_to_first_token"] = time.time() - start_time
+                    metrics["deltas"] += 1
+                    yield delta
+            except Exception as e:
+                logger.error(f"Error streaming {self.llm_type} response: {e}")
+            
+            if metrics["deltas"] == 0:
+                # Nothing was streamed; fall back to a blocking completion
+                metrics["streamed"] = False
+                response = self.get_response(user_input, conversation_history)
+                if response:
+                    metrics["time_to_first_token"] = time.time() - start_time
+                    metrics["deltas"] = 1
+                    yield response
+        finally:
+            metrics["total_time"] = time.time() - start_time
+            if metrics["time_to_first_token"] is not None:
+                logger.info(f"{self.llm_type} response: first token after "
+                            f"{metrics['time_to_first_token']:.3f}s, complete after {metrics['total_time']:.3f}s")
+    
     def _get_openai_response(self, user_input: str, conversation_history: List[Dict[str, str]]) -> Optional[str]:
         """Get a response from OpenAI."""
         try:
@@ -457,6 +531,179 @@ class LLMHandler:
             logger.error(f"Error in fallback Gemini request: {e}")
             return None
     
+    def _system_prompt(self, conversation_history: List[Dict[str, str]]) -> str:
+        """Get the conversation's system prompt, or the default one."""
+        for msg in conversation_history:
+            if msg.get("role") == "system" and msg.get("content"):
+                return msg["content"]
+        return SYSTEM_PROMPT
+    
+    def _chat_messages(self, user_input: str, conversation_history: List[Dict[str, str]],
+                       include_system: bool = True) -> List[Dict[str, str]]:
+        """Build a chat-completions style message list ending with the user input."""
+        messages = []
+        if include_system:
+            messages.append({"role": "system", "content": self._system_prompt(conversation_history)})
+        
+        for msg in conversation_history:
+            role = msg.get("role", "user")
+            if role in ["user", "assistant"]:
+                messages.append({"role": role, "content": msg.get("content", "")})
+        
+        messages.append({"role": "user", "content": user_input})
+        return messages
+    
+    def _gemini_contents(self, user_input: str, conversation_history: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Build Gemini generateContent contents, with the system prompt as a tagged user turn."""
+        contents = [{
+            "role": "user",
+            "parts": [{"text": f"[SYSTEM]: {self._system_prompt(conversation_history)}"}]
+        }]
+        
+        for msg in self._chat_messages(user_input, conversation_history, include_system=False):
+            contents.append({
+                "role": "user" if msg["role"] == "user" else "model",
+                "parts": [{"text": msg["content"]}]
+            })
+        
+        return contents
+    
+    @staticmethod
+    def _iter_stream_events(response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """
+        Parse JSON events from a streamed HTTP response.
+        
+        Handles both server-sent events (``data: {...}`` lines) and
+        newline-delimited JSON.
+        """
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            if line.startswith("data:"):
+                line = line[5:].strip()
+            if line == "[DONE]":
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.debug(f"Skipping unparseable stream line: {line[:80]}")
+    
+    @staticmethod
+    def _gemini_event_text(event: Dict[str, Any]) -> str:
+        """Extract the text of a streamed Gemini generateContent event."""
+        text = ""
+        for candidate in event.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                text += part.get("text", "")
+        return text
+    
+    def _stream_openai_response(self, user_input: str, conversation_history: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a response from OpenAI."""
+        import openai
+        openai.api_key = self.api_key
+        
+        stream = openai.chat.completions.create(
+            model=self.model or "gpt-3.5-turbo",
+            messages=self._chat_messages(user_input, conversation_history),
+            max_tokens=100,  # Keep responses short for voice calls
+            temperature=0.7,
+            stream=True
+        )
+        
+        try:
+            for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+    
+    def _stream_llama_response(self, user_input: str, conversation_history: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a response from a local Llama model via API endpoint."""
+        prompt = f"{self._system_prompt(conversation_history)}\n\n"
+        for msg in self._chat_messages(user_input, conversation_history, include_system=False)[:-1]:
+            speaker = "User" if msg["role"] == "user" else "Assistant"
+            prompt += f"{speaker}: {msg['content']}\n"
+        prompt += f"User: {user_input}\nAssistant: "
+        
+        with requests.post(
+            self.endpoint,
+            json={
+                "prompt": prompt,
+                "max_tokens": 100,
+                "temperature": 0.7,
+                "stop": ["User:", "\n"],
+                "stream": True
+            },
+            headers={"Content-Type": "application/json"},
+            stream=True,
+            timeout=30
+        ) as response:
+            if response.status_code != 200:
+                logger.error(f"Error from Llama API: {response.status_code} - {response.text}")
+                return
+            
+            # Servers without streaming support answer with a single JSON body
+            if response.headers.get("Content-Type", "").startswith("application/json"):
+                yield response.json().get("output", "").strip()
+                return
+            
+            for event in self._iter_stream_events(response):
+                choices = event.get("choices") or [{}]
+                yield event.get("output") or event.get("token") or event.get("content") or choices[0].get("text", "")
+    
+    def _stream_claude_response(self, user_input: str, conversation_history: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a response from Claude."""
+        import anthropic
+        client = anthropic.Anthropic(api_key=self.api_key)
+        
+        with client.messages.stream(
+            model=self.model or "claude-3-opus-20240229",
+            max_tokens=100,
+            system=self._system_prompt(conversation_history),
+            messages=self._chat_messages(user_input, conversation_history, include_system=False)
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+    
+    def _stream_gemini_response(self, user_input: str, conversation_history: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a response from Gemini using streamGenerateContent."""
+        headers = {"Content-Type": "application/json"}
+        
+        if self.endpoint and 'googleapis.com' in self.endpoint:
+            # Vertex AI: only generateContent endpoints have a streaming variant
+            if ":generateContent" not in self.endpoint:
+                logger.debug("Vertex AI endpoint has no streaming variant; using blocking request")
+                return
+            api_url = self.endpoint.replace(":generateContent", ":streamGenerateContent")
+            api_url += ("&" if "?" in api_url else "?") + "alt=sse"
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        else:
+            model_id = self.model or "gemini-2.0-flash"
+            api_url = (f"https://generativelanguage.googleapis.com/v1/models/{model_id}:streamGenerateContent"
+                       f"?alt=sse&key={self.api_key}")
+        
+        payload = {
+            "contents": self._gemini_contents(user_input, conversation_history),
+            "generationConfig": {
+                "temperature": 0.7,
+                "maxOutputTokens": 100,
+                "topK": 40,
+                "topP": 0.95
+            }
+        }
+        
+        with requests.post(api_url, json=payload, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code != 200:
+                logger.error(f"Error from Gemini streamGenerateContent API: {response.status_code} - {response.text}")
+                return
+            
+            for event in self._iter_stream_events(response):
+                yield self._gemini_event_text(event)
+    
     def health_check(self) -> bool:
         """
         Check the health of the LLM integration.
@@ -2,7 +2,7 @@
 # Data Models Module for Morning Coffee application
 
 import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 class User:
     """User model for Morning Coffee application."""
@@ -92,6 +92,13 @@ class CallSession:
         "failed"           # Call failed
     ]
     
+    # Stored as fields of the call's Redis hash
+    SCALAR_FIELDS = ["id", "user_id", "call_control_id", "state", "affirmation",
+                     "started_at", "completed_at", "trace_id"]
+    
+    # Stored as Redis lists that only grow
+    LIST_FIELDS = ["recordings", "transcriptions", "conversation_history"]
+    
     def __init__(
         self,
         id: str,
@@ -103,7 +110,9 @@ class CallSession:
         transcriptions: Optional[List[Dict[str, Any]]] = None,
         conversation_history: Optional[List[Dict[str, Any]]] = None,
         started_at: Optional[datetime.datetime] = None,
-        completed_at: Optional[datetime.datetime] = None
+        completed_at: Optional[datetime.datetime] = None,
+        trace_id: Optional[str] = None,
+        history_offset: int = 0
     ):
         """
         Initialize a CallSession object.
@@ -119,6 +128,8 @@ class CallSession:
             conversation_history (List[Dict[str, Any]], optional): History of the conversation
             started_at (datetime.datetime, optional): When the call started
             completed_at (datetime.datetime, optional): When the call completed
+            trace_id (str, optional): Trace of the turn currently being handled
+            history_offset (int): Number of earlier conversation entries that were not loaded
         """
         self.id = id
         self.user_id = user_id
@@ -130,6 +141,12 @@ class CallSession:
         self.conversation_history = conversation_history or []
         self.started_at = started_at or datetime.datetime.now()
         self.completed_at = completed_at
+        self.trace_id = trace_id
+        self.history_offset = history_offset
+        
+        # What the store last saved, so only changes are written
+        self._saved_scalars: Dict[str, str] = {}
+        self._saved_lengths: Dict[str, int] = {}
     
     def add_recording(self, recording_url: str, recording_id: str) -> None:
         """
@@ -191,6 +208,39 @@ class CallSession:
             return True
         return False
     
+    def scalar_fields(self) -> Dict[str, str]:
+        """
+        Get the scalar fields as Redis hash values.
+        
+        Returns:
+            Dict[str, str]: Field values, with "" for unset fields
+        """
+        data = self.to_dict()
+        return {field: "" if data[field] is None else str(data[field]) for field in self.SCALAR_FIELDS}
+    
+    def changes(self) -> Tuple[Dict[str, str], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get what changed since the session was last saved or loaded.
+        
+        Returns:
+            Tuple[Dict[str, str], Dict[str, List[Dict[str, Any]]]]: Changed scalar fields,
+                and the entries appended to each list
+        """
+        scalars = {
+            field: value for field, value in self.scalar_fields().items()
+            if self._saved_scalars.get(field) != value
+        }
+        appended = {
+            field: getattr(self, field)[self._saved_lengths.get(field, 0):]
+            for field in self.LIST_FIELDS
+        }
+        return scalars, {field: entries for field, entries in appended.items() if entries}
+    
+    def mark_saved(self) -> None:
+        """Record the current state as saved, so later changes can be told apart."""
+        self._saved_scalars = self.scalar_fields()
+        self._saved_lengths = {field: len(getattr(self, field)) for field in self.LIST_FIELDS}
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert CallSession to dictionary representation.
@@ -208,7 +258,8 @@ class CallSession:
             "transcriptions": self.transcriptions,
             "conversation_history": self.conversation_history,
             "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "trace_id": self.trace_id or ""
         }
     
     @classmethod
@@ -241,10 +292,11 @@ class CallSession:
             user_id=data.get("user_id", ""),
             call_control_id=data.get("call_control_id", ""),
             state=data.get("state", "initiated"),
-            affirmation=data.get("affirmation"),
+            affirmation=data.get("affirmation") or None,
             recordings=data.get("recordings", []),
             transcriptions=data.get("transcriptions", []),
             conversation_history=data.get("conversation_history", []),
             started_at=started_at,
-            completed_at=completed_at
+            completed_at=completed_at,
+            trace_id=data.get("trace_id") or None
         )
\ No newline at end of file
@@ -1,26 +1,67 @@
 #!/usr/bin/env python
 # OpenAI Transcription Handler for Morning Coffee application
 
+import io
 import logging
 import os
-import tempfile
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Union
 
+import requests
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .tracing import traced
+
 logger = logging.getLogger("openai-transcription")
 
+class _DownloadStream:
+    """
+    Forward-only reader over a streamed HTTP download.
+    
+    Deliberately has no ``fileno``, ``tell`` or ``seek``: the upload cannot
+    know the length in advance and is sent chunked while the download is
+    still arriving, so the recording is never held in memory as a whole.
+    """
+    
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+    
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 class OpenAITranscriptionHandler:
-    """Handler for OpenAI's speech-to-text transcription service."""
+    """
+    Handler for OpenAI's speech-to-text transcription service.
+    
+    Safe to share between threads: the OpenAI client and the download
+    session are pooled and thread-safe, and every request reads the model
+    and prompt settings once instead of relying on handler state.
+    """
+    
+    # Name the upload carries; the API infers the audio format from it
+    UPLOAD_FILENAME = "recording.wav"
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini-transcribe"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini-transcribe",
+                 pool_size: int = 16, download_chunk_size: int = 64 * 1024):
         """
         Initialize the OpenAI transcription handler.
         
         Args:
             api_key (Optional[str]): OpenAI API key
             model (str): Model to use for transcription
+            pool_size (int): Connections kept per host for recording downloads
+            download_chunk_size (int): Bytes read from a download at a time
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
@@ -29,12 +70,36 @@ class OpenAITranscriptionHandler:
         self.model = model
         self.client = OpenAI(api_key=self.api_key)
         
+        # Pooled session for recording downloads
+        self.download_chunk_size = download_chunk_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         # Configuration
         self.default_prompt = "This is a phone call with short responses."
         self.language = "en"  # Default language
         
         logger.info(f"OpenAI transcription handler initialized with model: {model}")
     
+    def _transcribe(self, audio: Union[io.BytesIO, _DownloadStream], prompt: Optional[str],
+                    retries: Optional[int] = None) -> str:
+        """Send one upload to the transcription API and return its text."""
+        # Read settings once so a concurrent set_model applies to whole requests only
+        model = self.model
+        client = self.client if retries is None else self.client.with_options(max_retries=retries)
+        
+        logger.debug(f"Transcribing audio with model: {model}")
+        transcription = client.audio.transcriptions.create(
+            model=model,
+            file=(self.UPLOAD_FILENAME, audio, "audio/wav"),
+            prompt=prompt or self.default_prompt,
+            language=self.language
+        )
+        return transcription.text
+    
+    @traced("stt.openai")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def transcribe_audio_data(self, audio_data: bytes, prompt: Optional[str] = None) -> Optional[str]:
         """
@@ -52,44 +117,21 @@ class OpenAITranscriptionHandler:
                 logger.warning("Empty audio data provided")
                 return None
             
-            # Create a temporary file for the audio data
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file_path = temp_file.name
-                temp_file.write(audio_data)
-            
-            # Use a prompt if provided, otherwise use default
-            transcription_prompt = prompt or self.default_prompt
-            
-            # Open the file and transcribe
-            with open(temp_file_path, "rb") as audio_file:
-                logger.debug(f"Transcribing audio with model: {self.model}")
-                
-                transcription = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    prompt=transcription_prompt,
-                    language=self.language
-                )
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-            
-            return transcription.text
+            return self._transcribe(io.BytesIO(audio_data), prompt)
             
         except Exception as e:
             logger.error(f"Error transcribing audio: {e}")
-            
-            # Make sure to clean up temporary file
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
             return None
     
+    @traced("stt.openai")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def transcribe_audio_url(self, audio_url: str, prompt: Optional[str] = None) -> Optional[str]:
         """
         Transcribe audio from a URL.
         
+        The download is streamed into the upload as it arrives. A streamed
+        upload cannot be replayed, so the OpenAI client does not retry it.
+        
         Args:
             audio_url (str): URL of audio to transcribe
             prompt (Optional[str]): Optional prompt to guide transcription
@@ -98,15 +140,10 @@ class OpenAITranscriptionHandler:
             Optional[str]: Transcribed text or None if failed
         """
         try:
-            import requests
-            
-            # Download the audio file
-            response = requests.get(audio_url, timeout=30)
-            response.raise_for_status()
-            audio_data = response.content
-            
-            # Transcribe using the downloaded data
-            return self.transcribe_audio_data(audio_data, prompt)
+            with self.session.get(audio_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                audio_stream = _DownloadStream(response.iter_content(self.download_chunk_size))
+                return self._transcribe(audio_stream, prompt, retries=0)
             
         except Exception as e:
             logger.error(f"Error downloading or transcribing audio from URL: {e}")
@@ -131,21 +168,14 @@ class OpenAITranscriptionHandler:
                 max_tokens=10
             )
             
-            audio_data = test_response.audio_content
+            audio_file = io.BytesIO(test_response.audio_content)
+            audio_file.name = self.UPLOAD_FILENAME
             
             # Try to transcribe the test audio
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file_path = temp_file.name
-                temp_file.write(audio_data)
-            
-            with open(temp_file_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file
-                )
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+            transcription = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=audio_file
+            )
             
             return {
                 "status": "healthy",
@@ -156,11 +186,6 @@ class OpenAITranscriptionHandler:
             
         except Exception as e:
             logger.error(f"Health check failed: {e}")
-            
-            # Clean up temporary file if it exists
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
             return {
                 "status": "unhealthy",
                 "model": self.model,
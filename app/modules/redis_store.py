@@ -13,6 +13,61 @@ from .models import User, CallSession
 # Configure logging
 logger = logging.getLogger('redis-store')
 
+# Resolve a call control ID and read the call in one round trip. ARGV[2]
+# bounds each list to its most recent entries (0 reads them whole).
+_LOAD_BY_CONTROL_ID_SCRIPT = """
+local call_id = redis.call('get', KEYS[1])
+if not call_id then
+    return false
+end
+local key = ARGV[1] .. call_id
+local first = -tonumber(ARGV[2])
+return {
+    call_id,
+    redis.call('hgetall', key),
+    redis.call('lrange', key .. ':recordings', first, -1),
+    redis.call('lrange', key .. ':transcriptions', first, -1),
+    redis.call('lrange', key .. ':conversation_history', first, -1),
+    redis.call('llen', key .. ':conversation_history')
+}
+"""
+
+# Write changed call fields and append list entries, if the call exists.
+# A call that has finished leaves the active call indexes and its keys
+# expire. KEYS: call hash, user's active calls, all active calls, control
+# ID index, then the list keys. ARGV: expiry of finished calls, field
+# count, field/value pairs, then per list key an entry count followed by
+# the entries.
+_UPDATE_CALL_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+local n = tonumber(ARGV[2])
+if n > 0 then
+    redis.call('hset', KEYS[1], unpack(ARGV, 3, 2 + 2 * n))
+end
+local i = 3 + 2 * n
+for k = 5, #KEYS do
+    local count = tonumber(ARGV[i])
+    if count > 0 then
+        redis.call('rpush', KEYS[k], unpack(ARGV, i + 1, i + count))
+    end
+    i = i + 1 + count
+end
+local state = redis.call('hget', KEYS[1], 'state')
+if state == 'completed' or state == 'failed' then
+    local call_id = redis.call('hget', KEYS[1], 'id')
+    redis.call('srem', KEYS[2], call_id)
+    redis.call('zrem', KEYS[3], call_id)
+    for k = 1, #KEYS do
+        if k ~= 2 and k ~= 3 then
+            redis.call('expire', KEYS[k], ARGV[1])
+        end
+    end
+end
+return 1
+"""
+
 class RedisStore:
     """Redis storage interface for Morning Coffee application."""
     
@@ -20,8 +75,12 @@ class RedisStore:
     USER_PREFIX = 'user:'
     CALL_PREFIX = 'call:'
     USER_PHONE_INDEX = 'user_phone_index'
+    PENDING_TRANSCRIPTION_PREFIX = 'transcription:pending:'
+    USER_ACTIVE_CALLS_PREFIX = 'active_calls:user:'
+    ACTIVE_CALLS_INDEX = 'active_calls'
     
-    def __init__(self, host: str = 'redis', port: int = 6379, db: int = 0, password: Optional[str] = None):
+    def __init__(self, host: str = 'redis', port: int = 6379, db: int = 0, password: Optional[str] = None,
+                 finished_call_ttl: int = 7 * 86400):
         """
         Initialize Redis connection.
         
@@ -30,7 +89,9 @@ class RedisStore:
             port (int): Redis port
             db (int): Redis database index
             password (Optional[str]): Redis password
+            finished_call_ttl (int): Seconds a completed or failed call is kept
         """
+        self.finished_call_ttl = finished_call_ttl
         self.redis = redis.Redis(
             host=host,
             port=port,
@@ -40,6 +101,8 @@ class RedisStore:
             socket_timeout=5,  # Set socket timeout
             socket_connect_timeout=5  # Set socket connect timeout
         )
+        self._load_by_control_id = self.redis.register_script(_LOAD_BY_CONTROL_ID_SCRIPT)
+        self._update_call = self.redis.register_script(_UPDATE_CALL_SCRIPT)
         logger.info(f'Redis store initialized: {host}:{port}/{db}')
     
     def health_check(self) -> Dict[str, Any]:
@@ -175,6 +238,32 @@ class RedisStore:
             return False
     
     # Call session operations
+    def _call_key(self, call_id: str) -> str:
+        return f'{self.CALL_PREFIX}{call_id}'
+    
+    def _call_list_key(self, call_id: str, field: str) -> str:
+        return f'{self.CALL_PREFIX}{call_id}:{field}'
+    
+    def _queue_call_session_reads(self, pipe: Any, call_id: str, history_limit: Optional[int]) -> None:
+        """Queue the reads of a call session on a pipeline; each call adds 2 + len(LIST_FIELDS) replies."""
+        first = -history_limit if history_limit else 0
+        pipe.hgetall(self._call_key(call_id))
+        for field in CallSession.LIST_FIELDS:
+            pipe.lrange(self._call_list_key(call_id, field), first, -1)
+        pipe.llen(self._call_list_key(call_id, 'conversation_history'))
+    
+    def _call_session_from_replies(self, call_data: Dict[str, str], lists: List[List[str]],
+                                   conversation_length: int) -> CallSession:
+        """Build a call session from its hash, its (possibly bounded) lists and the full history length."""
+        data = dict(call_data)
+        for field, entries in zip(CallSession.LIST_FIELDS, lists):
+            data[field] = [json.loads(entry) for entry in entries]
+        
+        call_session = CallSession.from_dict(data)
+        call_session.history_offset = conversation_length - len(call_session.conversation_history)
+        call_session.mark_saved()
+        return call_session
+    
     def create_call_session(self, user_id: str, call_control_id: str, 
                             affirmation: Optional[str] = None) -> CallSession:
         """
@@ -196,55 +285,94 @@ class RedisStore:
             affirmation=affirmation
         )
         
-        # Save call session
-        call_key = f'{self.CALL_PREFIX}{call_id}'
-        self.redis.hset(call_key, mapping=call_session.to_dict())
-        
-        # Create an index by call control ID for quick lookup
-        self.redis.set(f'call_control:{call_control_id}', call_id, ex=86400)  # Expire after 24 hours
+        # Save call session, index it by call control ID for quick lookup,
+        # and add it to the active calls of the user and of the service
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(self._call_key(call_id), mapping=call_session.scalar_fields())
+        pipe.set(f'call_control:{call_control_id}', call_id, ex=86400)  # Expire after 24 hours
+        pipe.sadd(f'{self.USER_ACTIVE_CALLS_PREFIX}{user_id}', call_id)
+        pipe.zadd(self.ACTIVE_CALLS_INDEX, {call_id: call_session.started_at.timestamp()})
+        pipe.execute()
+        call_session.mark_saved()
         
         logger.info(f'Created call session {call_id} for user {user_id}')
         return call_session
     
-    def get_call_session(self, call_id: str) -> Optional[CallSession]:
+    def get_call_session(self, call_id: str, history_limit: Optional[int] = None) -> Optional[CallSession]:
         """
         Get call session by ID.
         
         Args:
             call_id (str): Call session ID
+            history_limit (Optional[int]): Load at most this many of the most recent
+                entries of each list (all entries if None)
             
         Returns:
             Optional[CallSession]: Call session if found, None otherwise
         """
-        call_key = f'{self.CALL_PREFIX}{call_id}'
-        call_data = self.redis.hgetall(call_key)
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_call_session_reads(pipe, call_id, history_limit)
+        call_data, *lists, conversation_length = pipe.execute()
         
         if not call_data:
             logger.warning(f'Call session {call_id} not found')
             return None
         
-        return CallSession.from_dict(call_data)
+        return self._call_session_from_replies(call_data, lists, conversation_length)
     
-    def get_call_by_control_id(self, call_control_id: str) -> Optional[CallSession]:
+    def get_call_by_control_id(self, call_control_id: str,
+                               history_limit: Optional[int] = None) -> Optional[CallSession]:
         """
         Get call session by Telnyx call control ID.
         
+        The index lookup and the session are read in one round trip.
+        
         Args:
             call_control_id (str): Telnyx call control ID
+            history_limit (Optional[int]): Load at most this many of the most recent
+                entries of each list (all entries if None)
             
         Returns:
             Optional[CallSession]: Call session if found, None otherwise
         """
-        call_id = self.redis.get(f'call_control:{call_control_id}')
-        if not call_id:
+        reply = self._load_by_control_id(keys=[f'call_control:{call_control_id}'],
+                                         args=[self.CALL_PREFIX, history_limit or 0])
+        if not reply:
             logger.warning(f'No call session found for control ID {call_control_id}')
             return None
         
-        return self.get_call_session(call_id)
+        call_id, flat_call_data, recordings, transcriptions, conversation, conversation_length = reply
+        if not flat_call_data:
+            logger.warning(f'Call session {call_id} not found')
+            return None
+        
+        call_data = dict(zip(flat_call_data[::2], flat_call_data[1::2]))
+        return self._call_session_from_replies(call_data, [recordings, transcriptions, conversation],
+                                               conversation_length)
+    
+    def get_conversation_history(self, call_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the most recent conversation entries of a call, e.g. to build a prompt.
+        
+        Args:
+            call_id (str): Call session ID
+            limit (int): Maximum number of entries
+            
+        Returns:
+            List[Dict[str, Any]]: Entries, oldest first
+        """
+        entries = self.redis.lrange(self._call_list_key(call_id, 'conversation_history'), -limit, -1)
+        return [json.loads(entry) for entry in entries]
     
     def update_call_session(self, call_session: CallSession) -> bool:
         """
-        Update call session data.
+        Save what changed in a call session.
+        
+        Only changed scalar fields are written, and entries added to the
+        recordings, transcriptions and conversation are appended to their
+        lists, in one atomic round trip. Sessions that do not exist are not
+        recreated. A call that has completed or failed leaves the active call
+        indexes, and its keys expire after ``finished_call_ttl``.
         
         Args:
             call_session (CallSession): Call session to update
@@ -253,16 +381,31 @@ class RedisStore:
             bool: True if successful, False otherwise
         """
         try:
-            call_key = f'{self.CALL_PREFIX}{call_session.id}'
+            scalars, appended = call_session.changes()
+            if not scalars and not appended:
+                return True
             
-            # Check if call session exists
-            if not self.redis.exists(call_key):
+            args: List[Any] = [self.finished_call_ttl, len(scalars)]
+            for field, value in scalars.items():
+                args.extend([field, value])
+            for field in CallSession.LIST_FIELDS:
+                entries = appended.get(field, [])
+                args.append(len(entries))
+                args.extend(json.dumps(entry) for entry in entries)
+            
+            keys = [
+                self._call_key(call_session.id),
+                f'{self.USER_ACTIVE_CALLS_PREFIX}{call_session.user_id}',
+                self.ACTIVE_CALLS_INDEX,
+                f'call_control:{call_session.call_control_id}',
+            ]
+            keys.extend(self._call_list_key(call_session.id, field) for field in CallSession.LIST_FIELDS)
+            
+            if not self._update_call(keys=keys, args=args):
                 logger.warning(f'Cannot update call session {call_session.id} - does not exist')
                 return False
             
-            # Update call session data
-            self.redis.hset(call_key, mapping=call_session.to_dict())
-            
+            call_session.mark_saved()
             logger.info(f'Updated call session {call_session.id}')
             return True
             
@@ -270,42 +413,111 @@ class RedisStore:
             logger.error(f'Error updating call session {call_session.id}: {str(e)}')
             return False
             
-    def get_active_calls_for_user(self, user_id: str) -> List[CallSession]:
+    def get_active_calls_for_user(self, user_id: str, history_limit: Optional[int] = None) -> List[CallSession]:
         """
         Get all active calls for a user.
         
         Args:
             user_id (str): User ID
+            history_limit (Optional[int]): Load at most this many of the most recent
+                entries of each list (all entries if None)
             
         Returns:
-            List[CallSession]: List of active call sessions
+            List[CallSession]: List of active call sessions, oldest first
         """
-        # This is an inefficient implementation that scans all calls
-        # In a production system, we would maintain indexes or use Redis Streams
-        active_calls = []
+        user_calls_key = f'{self.USER_ACTIVE_CALLS_PREFIX}{user_id}'
+        call_ids = sorted(self.redis.smembers(user_calls_key))
+        active_calls = self._get_call_sessions(call_ids, history_limit)
         
-        # Scan for all call keys
-        cursor = 0
-        while True:
-            cursor, keys = self.redis.scan(cursor, f'{self.CALL_PREFIX}*', 100)
-            
-            for key in keys:
-                call_data = self.redis.hgetall(key)
-                if not call_data:
-                    continue
-                    
-                # Check if this call belongs to the user and is not completed
-                if (call_data.get('user_id') == user_id and 
-                    call_data.get('state') not in ['completed', 'failed']):
-                    active_calls.append(CallSession.from_dict(call_data))
-            
-            # Exit the loop when we've scanned all keys
-            if cursor == 0:
-                break
+        # Drop index entries of calls that have finished or no longer exist
+        missing = set(call_ids) - {call_session.id for call_session in active_calls}
+        if missing:
+            self.redis.srem(user_calls_key, *missing)
         
         logger.info(f'Found {len(active_calls)} active calls for user {user_id}')
         return active_calls
     
+    def get_active_calls(self, limit: int = 100, started_before: Optional[float] = None) -> List[CallSession]:
+        """
+        Get active calls of all users, oldest first.
+        
+        Args:
+            limit (int): Maximum number of calls
+            started_before (Optional[float]): Only calls started before this Unix
+                time, e.g. to find calls that never finished
+            
+        Returns:
+            List[CallSession]: List of active call sessions
+        """
+        max_score = started_before if started_before is not None else '+inf'
+        call_ids = self.redis.zrangebyscore(self.ACTIVE_CALLS_INDEX, '-inf', max_score, start=0, num=limit)
+        return self._get_call_sessions(call_ids, history_limit=1)
+    
+    def _get_call_sessions(self, call_ids: List[str], history_limit: Optional[int]) -> List[CallSession]:
+        """Read active call sessions in one round trip, sorted by start time."""
+        if not call_ids:
+            return []
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for call_id in call_ids:
+            self._queue_call_session_reads(pipe, call_id, history_limit)
+        replies = pipe.execute()
+        
+        per_call = 2 + len(CallSession.LIST_FIELDS)
+        call_sessions = []
+        for offset in range(0, len(replies), per_call):
+            call_data, *lists, conversation_length = replies[offset:offset + per_call]
+            if call_data and call_data.get('state') not in ['completed', 'failed']:
+                call_sessions.append(self._call_session_from_replies(call_data, lists, conversation_length))
+        
+        call_sessions.sort(key=lambda call_session: call_session.started_at)
+        return call_sessions
+    
+    # Pending transcription operations
+    def save_pending_transcription(self, transcription_id: str, data: Dict[str, Any],
+                                   ttl: int = 3600) -> None:
+        """
+        Remember which call a submitted transcription belongs to.
+        
+        Args:
+            transcription_id (str): Transcription job ID
+            data (Dict[str, Any]): Call details needed to resume the call
+            ttl (int): Seconds to keep the entry
+        """
+        self.redis.set(f'{self.PENDING_TRANSCRIPTION_PREFIX}{transcription_id}',
+                       json.dumps(data), ex=ttl)
+    
+    def has_pending_transcription(self, transcription_id: str) -> bool:
+        """
+        Check whether a transcription is still waiting to be claimed.
+        
+        Args:
+            transcription_id (str): Transcription job ID
+            
+        Returns:
+            bool: True if it has not been claimed yet
+        """
+        return bool(self.redis.exists(f'{self.PENDING_TRANSCRIPTION_PREFIX}{transcription_id}'))
+    
+    def claim_pending_transcription(self, transcription_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take a pending transcription so that only one caller resumes its call.
+        
+        Args:
+            transcription_id (str): Transcription job ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: Saved call details, or None if already claimed or unknown
+        """
+        key = f'{self.PENDING_TRANSCRIPTION_PREFIX}{transcription_id}'
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.get(key)
+        pipe.delete(key)
+        data, deleted = pipe.execute()
+        if not data or not deleted:
+            return None
+        return json.loads(data)
+    
     def clear_test_data(self) -> None:
         """Clear all test data from Redis (for development only)."""
         # This should only be used in development/testing
@@ -330,6 +542,16 @@ class RedisStore:
             # Clear the phone index
             self.redis.delete(self.USER_PHONE_INDEX)
             
+            # Clear the active call indexes
+            self.redis.delete(self.ACTIVE_CALLS_INDEX)
+            cursor = 0
+            while True:
+                cursor, keys = self.redis.scan(cursor, f'{self.USER_ACTIVE_CALLS_PREFIX}*', 100)
+                if keys:
+                    self.redis.delete(*keys)
+                if cursor == 0:
+                    break
+            
             # Clear call control index
             cursor = 0
             while True:
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# Summary statistics for Morning Coffee metrics
+
+from typing import Dict, Iterable, Tuple
+
+def summarize(values: Iterable[float],
+              fields: Tuple[str, ...] = ("avg", "p50", "p95", "max")) -> Dict[str, float]:
+    """
+    Summarize a sample of values, e.g. recent latencies.
+    
+    Args:
+        values (Iterable[float]): Sample, in any order
+        fields (Tuple[str, ...]): Statistics to include: "avg", "max", or "pNN" for a percentile
+    
+    Returns:
+        Dict[str, float]: The requested statistics, all 0.0 for an empty sample
+    """
+    values = sorted(values)
+    if not values:
+        return {field: 0.0 for field in fields}
+    
+    summary = {}
+    for field in fields:
+        if field == "avg":
+            summary[field] = sum(values) / len(values)
+        elif field == "max":
+            summary[field] = values[-1]
+        else:
+            summary[field] = values[min(len(values) - 1, len(values) * int(field[1:]) // 100)]
+    return summary
@@ -0,0 +1,537 @@
+#!/usr/bin/env python
+# Streaming speech recognition with VAD endpointing for Morning Coffee application
+
+import base64
+import logging
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable, Iterator, Tuple
+
+import numpy as np
+
+from .tts.output_format import OutputFormat, PCM_S16LE, MULAW, mulaw_decode, wrap_wav
+
+# Configure logging
+logger = logging.getLogger('streaming-stt')
+
+@dataclass
+class TranscriptEvent:
+    """
+    Transcript of one utterance, or of its beginning while it is still spoken.
+    
+    Attributes:
+        text: Recognized text
+        is_final: True once end-of-speech was detected
+        start_ms: Utterance start, in milliseconds of audio fed so far
+        end_ms: Utterance end (or audio received so far, for partials)
+        asr_ms: Milliseconds the ASR backend took for this transcript
+    """
+    text: str
+    is_final: bool
+    start_ms: float
+    end_ms: float
+    asr_ms: float = 0.0
+
+class EnergyZCRVAD:
+    """
+    Voice activity detector based on frame energy and zero-crossing rate.
+    
+    A frame is speech if its energy is ``margin_db`` above the tracked noise
+    floor (and above ``min_speech_db``). Frames slightly quieter than that
+    still count if their zero-crossing rate is high, which keeps unvoiced
+    consonants such as "s" and "f" inside the utterance. All frames of a
+    block are classified at once with NumPy.
+    """
+    
+    def __init__(self, sample_rate: int = 8000, frame_ms: int = 20, min_speech_db: float = -50.0,
+                 margin_db: float = 12.0, unvoiced_margin_db: float = 6.0, unvoiced_zcr: float = 0.3,
+                 noise_adaptation: float = 0.05):
+        """
+        Initialize the detector.
+        
+        Args:
+            sample_rate (int): Samples per second
+            frame_ms (int): Frame length in milliseconds
+            min_speech_db (float): Lowest energy (dBFS) counted as speech
+            margin_db (float): Energy above the noise floor needed for speech
+            unvoiced_margin_db (float): Energy below the speech threshold still
+                counted as speech for frames with a high zero-crossing rate
+            unvoiced_zcr (float): Zero-crossing rate (crossings per sample) of unvoiced speech
+            noise_adaptation (float): Weight of each non-speech frame in the noise floor
+        """
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_length = sample_rate * frame_ms // 1000
+        self.min_speech_db = min_speech_db
+        self.margin_db = margin_db
+        self.unvoiced_margin_db = unvoiced_margin_db
+        self.unvoiced_zcr = unvoiced_zcr
+        self.noise_adaptation = noise_adaptation
+        self.noise_floor_db: Optional[float] = None
+    
+    @property
+    def threshold_db(self) -> float:
+        """Current energy threshold for speech in dBFS."""
+        if self.noise_floor_db is None:
+            return self.min_speech_db
+        return max(self.min_speech_db, self.noise_floor_db + self.margin_db)
+    
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Classify frames as speech or non-speech and adapt the noise floor.
+        
+        Args:
+            frames (np.ndarray): int16 samples shaped (frames, frame_length)
+        
+        Returns:
+            np.ndarray: Boolean speech flag per frame
+        """
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+        
+        samples = frames.astype(np.float64) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(samples * samples, axis=1) + 1e-10)
+        signs = np.signbit(samples)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(np.min(energy_db))
+        
+        threshold = self.threshold_db
+        speech = (energy_db >= threshold) | (
+            (energy_db >= threshold - self.unvoiced_margin_db) & (zcr >= self.unvoiced_zcr)
+        )
+        
+        # Follow the noise floor with the non-speech frames of this block
+        noise = energy_db[~speech]
+        if len(noise):
+            weight = 1.0 - (1.0 - self.noise_adaptation) ** len(noise)
+            self.noise_floor_db += weight * (float(np.mean(noise)) - self.noise_floor_db)
+        return speech
+
+class StreamingASRBackend(ABC):
+    """
+    Speech recognizer used by ``StreamingRecognizer``.
+    
+    Backends that can cheaply re-transcribe a growing utterance set
+    ``supports_partials``; others are only asked for final transcripts.
+    """
+    
+    supports_partials = True
+    
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray, sample_rate: int, final: bool) -> str:
+        """
+        Transcribe an utterance, or the part of it heard so far.
+        
+        Args:
+            samples (np.ndarray): int16 mono samples
+            sample_rate (int): Samples per second
+            final (bool): True once the utterance is complete
+        
+        Returns:
+            str: Recognized text
+        """
+        pass
+
+class BatchTranscriptionASR(StreamingASRBackend):
+    """Runs a batch transcription handler on each completed utterance."""
+    
+    supports_partials = False
+    
+    def __init__(self, transcription_handler):
+        """
+        Initialize the backend.
+        
+        Args:
+            transcription_handler: Handler with ``transcribe_audio_data(bytes)``,
+                such as ``OpenAITranscriptionHandler``
+        """
+        self.transcription_handler = transcription_handler
+    
+    def transcribe(self, samples: np.ndarray, sample_rate: int, final: bool) -> str:
+        audio = wrap_wav(samples.astype(np.int16).tobytes(), OutputFormat(PCM_S16LE, sample_rate, 1))
+        return self.transcription_handler.transcribe_audio_data(audio) or ""
+
+class StreamingRecognizer:
+    """
+    Turns a stream of caller audio into partial and final transcripts.
+    
+    Audio is split into frames and classified by ``EnergyZCRVAD``. An
+    utterance starts after ``start_ms`` of speech (including ``pre_roll_ms``
+    of audio before it) and ends after ``end_silence_ms`` of non-speech;
+    the final transcript is produced right then, without waiting for the
+    caller to hang up or a recording to be saved. Utterances shorter than
+    ``min_speech_ms`` are dropped as noise.
+    
+    ``feed`` is meant to be called from a single thread per stream.
+    """
+    
+    def __init__(self, asr: StreamingASRBackend, sample_rate: int = 8000, encoding: str = PCM_S16LE,
+                 vad: Optional[EnergyZCRVAD] = None,
+                 on_partial: Optional[Callable[[TranscriptEvent], None]] = None,
+                 on_final: Optional[Callable[[TranscriptEvent], None]] = None,
+                 start_ms: int = 60, end_silence_ms: int = 600, min_speech_ms: int = 200,
+                 pre_roll_ms: int = 200, trailing_ms: int = 100, partial_interval_ms: int = 800,
+                 max_utterance_ms: int = 15000):
+        """
+        Initialize the recognizer.
+        
+        Args:
+            asr (StreamingASRBackend): Speech recognizer
+            sample_rate (int): Samples per second of the fed audio
+            encoding (str): ``PCM_S16LE`` or ``MULAW``
+            vad (Optional[EnergyZCRVAD]): Voice activity detector
+            on_partial (Optional[Callable[[TranscriptEvent], None]]): Called with partial transcripts
+            on_final (Optional[Callable[[TranscriptEvent], None]]): Called at end-of-speech
+            start_ms (int): Speech needed to start an utterance
+            end_silence_ms (int): Non-speech that ends an utterance
+            min_speech_ms (int): Speech needed for an utterance to be transcribed
+            pre_roll_ms (int): Audio before the detected start included in the utterance
+            trailing_ms (int): Audio after the last speech frame included in the utterance
+            partial_interval_ms (int): Audio between partial transcripts (0 disables them)
+            max_utterance_ms (int): Longest utterance before it is ended regardless
+        """
+        self.asr = asr
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self.vad = vad or EnergyZCRVAD(sample_rate=sample_rate)
+        self.on_partial = on_partial
+        self.on_final = on_final
+        
+        frame_ms = self.vad.frame_ms
+        self.frame_ms = frame_ms
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.end_frames = max(1, end_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.trailing_frames = trailing_ms // frame_ms
+        self.partial_frames = partial_interval_ms // frame_ms if asr.supports_partials else 0
+        self.max_frames = max_utterance_ms // frame_ms
+        
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._frame_index = 0
+        self._pre_roll: deque = deque(maxlen=max(self.start_frames, pre_roll_ms // frame_ms + self.start_frames))
+        self._speech_run = 0
+        self._utterance: Optional[List[np.ndarray]] = None
+        self._utterance_start = 0
+        self._speech_frames = 0
+        self._last_speech = 0
+        self._last_partial_text = ""
+        
+        self.stats = {
+            "utterances": 0,
+            "dropped": 0,
+            "partials": 0,
+            "audio_ms": 0.0,
+            "speech_ms": 0.0,
+            "asr_ms": 0.0,
+        }
+    
+    def _decode(self, audio: bytes) -> np.ndarray:
+        if self.encoding == MULAW:
+            return mulaw_decode(audio)
+        return np.frombuffer(audio[:len(audio) - len(audio) % 2], dtype='<i2')
+    
+    def feed(self, audio: bytes) -> List[TranscriptEvent]:
+        """
+        Process a block of caller audio.
+        
+        Args:
+            audio (bytes): Headerless audio in the recognizer's encoding
+        
+        Returns:
+            List[TranscriptEvent]: Transcripts completed by this block
+        """
+        samples = np.concatenate([self._pending, self._decode(audio)])
+        frame_length = self.vad.frame_length
+        frame_count = len(samples) // frame_length
+        self._pending = samples[frame_count * frame_length:]
+        
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        events = []
+        for frame, is_speech in zip(frames, self.vad.classify(frames)):
+            event = self._process_frame(frame, bool(is_speech))
+            if event:
+                events.append(event)
+        self.stats["audio_ms"] += frame_count * self.frame_ms
+        return events
+    
+    def flush(self) -> List[TranscriptEvent]:
+        """
+        End the current utterance, e.g. when the stream stops.
+        
+        Returns:
+            List[TranscriptEvent]: The final transcript, if an utterance was in progress
+        """
+        event = self._end_utterance() if self._utterance is not None else None
+        return [event] if event else []
+    
+    def _process_frame(self, frame: np.ndarray, is_speech: bool) -> Optional[TranscriptEvent]:
+        self._frame_index += 1
+        
+        if self._utterance is None:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if is_speech else 0
+            if self._speech_run < self.start_frames:
+                return None
+            
+            # Speech started: keep the pre-roll, which ends with the speech run
+            self._utterance = list(self._pre_roll)
+            self._utterance_start = self._frame_index - len(self._utterance)
+            self._speech_frames = self._speech_run
+            self._last_speech = len(self._utterance)
+            self._last_partial_text = ""
+            self._pre_roll.clear()
+            self._speech_run = 0
+            return None
+        
+        self._utterance.append(frame)
+        if is_speech:
+            self._speech_frames += 1
+            self._last_speech = len(self._utterance)
+        
+        if (len(self._utterance) - self._last_speech >= self.end_frames
+                or len(self._utterance) >= self.max_frames):
+            return self._end_utterance()
+        
+        if self.partial_frames and len(self._utterance) % self.partial_frames == 0:
+            return self._partial()
+        return None
+    
+    def _transcribe(self, frames: List[np.ndarray], final: bool) -> Tuple[str, float]:
+        start_time = time.time()
+        try:
+            text = self.asr.transcribe(np.concatenate(frames), self.sample_rate, final).strip()
+        except Exception as e:
+            logger.error(f"Streaming ASR failed: {e}")
+            text = ""
+        asr_ms = (time.time() - start_time) * 1000
+        self.stats["asr_ms"] += asr_ms
+        return text, asr_ms
+    
+    def _partial(self) -> Optional[TranscriptEvent]:
+        text, asr_ms = self._transcribe(self._utterance, final=False)
+        if not text or text == self._last_partial_text:
+            return None
+        
+        self._last_partial_text = text
+        self.stats["partials"] += 1
+        event = TranscriptEvent(text=text, is_final=False,
+                                start_ms=self._utterance_start * self.frame_ms,
+                                end_ms=self._frame_index * self.frame_ms, asr_ms=asr_ms)
+        if self.on_partial:
+            self.on_partial(event)
+        return event
+    
+    def _end_utterance(self) -> Optional[TranscriptEvent]:
+        frames = self._utterance[:self._last_speech + self.trailing_frames]
+        speech_frames = self._speech_frames
+        start = self._utterance_start
+        self._utterance = None
+        
+        if speech_frames < self.min_speech_frames:
+            self.stats["dropped"] += 1
+            return None
+        
+        text, asr_ms = self._transcribe(frames, final=True)
+        self.stats["utterances"] += 1
+        self.stats["speech_ms"] += speech_frames * self.frame_ms
+        if not text:
+            return None
+        
+        event = TranscriptEvent(text=text, is_final=True, start_ms=start * self.frame_ms,
+                                end_ms=(start + len(frames)) * self.frame_ms, asr_ms=asr_ms)
+        if self.on_final:
+            self.on_final(event)
+        return event
+
+class StreamingSTTManager:
+    """
+    Streaming recognizers for the inbound audio of active calls.
+    
+    A media transport (e.g. the WebSocket Telnyx media streaming connects
+    to) passes each message to ``handle_media_message``. When a caller
+    stops speaking, ``on_final`` is called with the call control ID, the
+    client state the stream was started with and the final transcript.
+    Calls count as active only once their stream has delivered audio, so
+    without a transport calls keep using recordings.
+    """
+    
+    def __init__(self, asr: StreamingASRBackend,
+                 on_final: Callable[[str, Optional[str], TranscriptEvent], None],
+                 on_partial: Optional[Callable[[str, TranscriptEvent], None]] = None,
+                 **recognizer_options):
+        """
+        Initialize the manager.
+        
+        Args:
+            asr (StreamingASRBackend): Speech recognizer shared by all calls
+            on_final (Callable[[str, Optional[str], TranscriptEvent], None]): Called at end-of-speech
+            on_partial (Optional[Callable[[str, TranscriptEvent], None]]): Called with partial transcripts
+            **recognizer_options: Passed to each ``StreamingRecognizer``
+        """
+        self.asr = asr
+        self.on_final = on_final
+        self.on_partial = on_partial
+        self.recognizer_options = recognizer_options
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def start_call(self, call_control_id: str, client_state: Optional[str] = None,
+                   encoding: str = MULAW, sample_rate: int = 8000) -> StreamingRecognizer:
+        """
+        Start recognizing a call's inbound audio.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+            client_state (Optional[str]): State passed to ``on_final`` with each transcript
+            encoding (str): Encoding of the streamed audio (Telnyx streams μ-law by default)
+            sample_rate (int): Sample rate of the streamed audio
+        
+        Returns:
+            StreamingRecognizer: The call's recognizer
+        """
+        recognizer = StreamingRecognizer(
+            self.asr, sample_rate=sample_rate, encoding=encoding,
+            vad=EnergyZCRVAD(sample_rate=sample_rate),
+            on_partial=(lambda event: self.on_partial(call_control_id, event)) if self.on_partial else None,
+            on_final=lambda event: self._finalize(call_control_id, event),
+            **self.recognizer_options
+        )
+        with self._lock:
+            self._calls[call_control_id] = {"recognizer": recognizer, "client_state": client_state,
+                                            "receiving": False}
+        logger.info(f"Started streaming recognition for call {call_control_id}")
+        return recognizer
+    
+    def is_active(self, call_control_id: str) -> bool:
+        """
+        Check whether a call's inbound audio is being recognized.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+        
+        Returns:
+            bool: True while the call's stream is recognized and has delivered audio
+        """
+        with self._lock:
+            call = self._calls.get(call_control_id)
+            return bool(call) and call["receiving"]
+    
+    def set_client_state(self, call_control_id: str, client_state: Optional[str]) -> None:
+        """
+        Change the client state reported with a call's next transcripts.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+            client_state (Optional[str]): New client state
+        """
+        with self._lock:
+            if call_control_id in self._calls:
+                self._calls[call_control_id]["client_state"] = client_state
+    
+    def _finalize(self, call_control_id: str, event: TranscriptEvent) -> None:
+        call = self._calls.get(call_control_id)
+        try:
+            self.on_final(call_control_id, call["client_state"] if call else None, event)
+        except Exception as e:
+            logger.error(f"Error handling final transcript for call {call_control_id}: {e}")
+    
+    def feed(self, call_control_id: str, audio: bytes) -> List[TranscriptEvent]:
+        """
+        Process inbound audio of a call.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+            audio (bytes): Headerless audio in the call's stream encoding
+        
+        Returns:
+            List[TranscriptEvent]: Transcripts completed by this audio
+        """
+        call = self._calls.get(call_control_id)
+        if not call:
+            return []
+        if audio:
+            call["receiving"] = True
+        return call["recognizer"].feed(audio)
+    
+    def handle_media_message(self, call_control_id: str, message: Dict[str, Any]) -> List[TranscriptEvent]:
+        """
+        Process one Telnyx media streaming message.
+        
+        Inbound "media" frames are recognized, "stop" ends the call's
+        recognition, and other messages are ignored.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+            message (Dict[str, Any]): Decoded media streaming message
+        
+        Returns:
+            List[TranscriptEvent]: Transcripts completed by this message
+        """
+        event = message.get('event')
+        if event == 'media':
+            media = message.get('media', {})
+            if media.get('track', 'inbound') != 'inbound':
+                return []
+            return self.feed(call_control_id, base64.b64decode(media.get('payload', '')))
+        if event == 'stop':
+            return self.end_call(call_control_id)
+        return []
+    
+    def end_call(self, call_control_id: str) -> List[TranscriptEvent]:
+        """
+        Stop recognizing a call, finishing any utterance in progress.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+        
+        Returns:
+            List[TranscriptEvent]: The final transcript, if an utterance was in progress
+        """
+        with self._lock:
+            call = self._calls.get(call_control_id)
+        if not call:
+            return []
+        
+        events = call["recognizer"].flush()
+        with self._lock:
+            self._calls.pop(call_control_id, None)
+        return events
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get recognition statistics.
+        
+        Returns:
+            Dict[str, Any]: Active calls and per-call utterance counts and audio totals
+        """
+        with self._lock:
+            calls = dict(self._calls)
+        return {
+            "active_calls": len(calls),
+            "calls": {call_id: dict(call["recognizer"].stats) for call_id, call in calls.items()},
+        }
+
+def iter_wav_chunks(path: str, chunk_ms: int = 20) -> Iterator[bytes]:
+    """
+    Read a 16-bit mono WAV file in chunks, as it would arrive from a call.
+    
+    Args:
+        path (str): WAV file path
+        chunk_ms (int): Chunk length in milliseconds
+    
+    Returns:
+        Iterator[bytes]: Headerless PCM chunks
+    """
+    with wave.open(path, 'rb') as wav_file:
+        frames_per_chunk = wav_file.getframerate() * chunk_ms // 1000
+        while True:
+            chunk = wav_file.readframes(frames_per_chunk)
+            if not chunk:
+                break
+            yield chunk
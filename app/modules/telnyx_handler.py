@@ -10,6 +10,8 @@ from typing import Optional, Dict, Any, List, Union
 from tenacity import retry, stop_after_attempt, wait_exponential
 import telnyx
 
+from .tracing import encode_client_state, traced
+
 # Configure logging
 logger = logging.getLogger("telnyx-handler")
 
@@ -117,7 +119,7 @@ class TelnyxHandler:
             telnyx.Call.play_audio(
                 call_control_id=call_control_id,
                 audio_url=audio_url,
-                client_state=client_state
+                client_state=encode_client_state(client_state)
             )
             
             logger.info(f"Playing audio with client state: {client_state}")
@@ -144,7 +146,7 @@ class TelnyxHandler:
                 call_control_id=call_control_id,
                 format="wav",
                 channels="single",
-                client_state=client_state
+                client_state=encode_client_state(client_state)
             )
             
             logger.info(f"Started recording with client state: {client_state}")
@@ -195,6 +197,7 @@ class TelnyxHandler:
             logger.error(f"Error hanging up call via Telnyx: {e}")
             return False
     
+    @traced("telnyx.storage_upload")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def upload_to_storage(self, file_data: bytes, filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+# Per-turn latency tracing for Morning Coffee application
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable
+
+from .stats import summarize
+
+# Configure logging
+logger = logging.getLogger('tracing')
+
+# Separates the call state from the trace id in Telnyx client_state
+CLIENT_STATE_SEPARATOR = "|"
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('trace_id', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('span_id', default=None)
+
+def new_trace_id() -> str:
+    """Create a trace id."""
+    return uuid.uuid4().hex[:16]
+
+def current_trace_id() -> Optional[str]:
+    """
+    Get the trace of the turn being handled by this thread.
+    
+    Returns:
+        Optional[str]: Trace id, or None outside a trace
+    """
+    return _current_trace.get()
+
+def encode_client_state(client_state: Optional[str], trace_id: Optional[str] = None) -> Optional[str]:
+    """
+    Attach a trace id to a Telnyx client state.
+    
+    Telnyx echoes the client state in the webhooks for the command, so the
+    webhook continues the trace of the turn that issued the command.
+    
+    Args:
+        client_state (Optional[str]): Call state, e.g. "greeting"
+        trace_id (Optional[str]): Trace id (defaults to the current trace)
+    
+    Returns:
+        Optional[str]: Client state carrying the trace id
+    """
+    trace_id = trace_id or current_trace_id()
+    if not client_state or not trace_id:
+        return client_state
+    return f"{decode_client_state(client_state)[0]}{CLIENT_STATE_SEPARATOR}{trace_id}"
+
+def decode_client_state(client_state: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a Telnyx client state into call state and trace id.
+    
+    Args:
+        client_state (Optional[str]): Client state from a webhook
+    
+    Returns:
+        Tuple[Optional[str], Optional[str]]: Call state and trace id (None if absent)
+    """
+    if not client_state or CLIENT_STATE_SEPARATOR not in client_state:
+        return client_state, None
+    state, trace_id = client_state.rsplit(CLIENT_STATE_SEPARATOR, 1)
+    return state, trace_id or None
+
+class Span:
+    """
+    One timed stage of a turn.
+    
+    Spans without a trace still count towards the stage percentiles.
+    """
+    
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "error")
+    
+    def __init__(self, name: str, trace_id: Optional[str], parent_id: Optional[str] = None,
+                 start: Optional[float] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.start = start if start is not None else time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a value to the span, e.g. the winning provider."""
+        self.attributes[key] = value
+    
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.time()) - self.start) * 1000
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+class Tracer:
+    """
+    Collects spans into an in-process ring buffer.
+    
+    The current trace and span are kept in context variables, so nested
+    spans in one thread join their parent without passing ids around.
+    Work handed to other threads passes the trace id explicitly (or runs
+    in a copied context). Finished spans are kept in a bounded deque for
+    waterfalls, and recent durations per stage for percentiles.
+    """
+    
+    def __init__(self, capacity: int = 5000, window: int = 1000, enabled: bool = True):
+        """
+        Initialize the tracer.
+        
+        Args:
+            capacity (int): Finished spans kept for waterfalls
+            window (int): Recent durations kept per stage for percentiles
+            enabled (bool): Whether spans are recorded
+        """
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._spans: deque = deque(maxlen=capacity)
+        self._durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+    
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None) -> None:
+        """
+        Change whether spans are recorded and how many are kept.
+        
+        Args:
+            enabled (Optional[bool]): Whether spans are recorded
+            capacity (Optional[int]): Finished spans kept for waterfalls
+        """
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if capacity is not None and capacity != self._spans.maxlen:
+                self._spans = deque(self._spans, maxlen=capacity)
+    
+    @contextmanager
+    def trace(self, trace_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Handle a turn within a trace.
+        
+        Args:
+            trace_id (Optional[str]): Trace to continue (a new one if None)
+        
+        Yields:
+            str: The trace id
+        """
+        trace_id = trace_id or new_trace_id()
+        trace_token = _current_trace.set(trace_id)
+        span_token = _current_span.set(None)
+        try:
+            yield trace_id
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+    
+    @contextmanager
+    def span(self, name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Span]:
+        """
+        Time a stage.
+        
+        Args:
+            name (str): Stage name, e.g. "llm.response"
+            trace_id (Optional[str]): Trace to record in (defaults to the current trace)
+            **attributes: Values attached to the span
+        
+        Yields:
+            Span: The running span
+        """
+        current = current_trace_id()
+        trace_id = trace_id or current
+        parent_id = _current_span.get() if trace_id == current else None
+        span = Span(name, trace_id, parent_id, attributes=attributes)
+        
+        trace_token = _current_trace.set(trace_id)
+        span_token = _current_span.set(span.span_id)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            span.end = time.time()
+            self._export(span)
+    
+    def record(self, name: str, start: float, end: float, trace_id: Optional[str] = None,
+               error: Optional[str] = None, **attributes) -> None:
+        """
+        Record a stage that was timed elsewhere, e.g. in a worker thread.
+        
+        Args:
+            name (str): Stage name
+            start (float): Epoch seconds the stage started
+            end (float): Epoch seconds the stage ended
+            trace_id (Optional[str]): Trace to record in (defaults to the current trace)
+            error (Optional[str]): Error, if the stage failed
+            **attributes: Values attached to the span
+        """
+        trace_id = trace_id or current_trace_id()
+        parent_id = _current_span.get() if trace_id == current_trace_id() else None
+        span = Span(name, trace_id, parent_id, start=start, attributes=attributes)
+        span.end = end
+        span.error = error
+        self._export(span)
+    
+    def trace_stream(self, name: str, chunks: Iterator[Any], **attributes) -> Iterator[Any]:
+        """
+        Time a generator from its first request to its last item.
+        
+        The time to the first item is recorded as ``first_item_ms``. The
+        span is recorded when the stream ends, so it never becomes the parent
+        of work the consumer does between items.
+        
+        Args:
+            name (str): Stage name
+            chunks (Iterator[Any]): Stream to time
+            **attributes: Values attached to the span
+        
+        Returns:
+            Iterator[Any]: The same items
+        """
+        trace_id = current_trace_id()
+        
+        def timed() -> Iterator[Any]:
+            start = time.time()
+            first = None
+            count = 0
+            error = None
+            try:
+                for chunk in chunks:
+                    if first is None:
+                        first = time.time()
+                    count += 1
+                    yield chunk
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.record(name, start, time.time(), trace_id=trace_id, error=error, items=count,
+                            first_item_ms=(first - start) * 1000 if first is not None else None,
+                            **attributes)
+        
+        return timed()
+    
+    def _export(self, span: Span) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._spans.append(span)
+            self._durations[span.name].append(span.duration_ms)
+            self._counts[span.name] += 1
+            if span.error:
+                self._errors[span.name] += 1
+    
+    @staticmethod
+    def _waterfall(trace_id: str, spans: List[Span]) -> Dict[str, Any]:
+        spans = sorted(spans, key=lambda span: span.start)
+        started = spans[0].start
+        ended = max(span.end or span.start for span in spans)
+        return {
+            "trace_id": trace_id,
+            "started_at": started,
+            "total_ms": (ended - started) * 1000,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "offset_ms": (span.start - started) * 1000,
+                    "duration_ms": span.duration_ms,
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in spans
+            ],
+        }
+    
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the waterfall of one trace.
+        
+        Args:
+            trace_id (str): Trace id
+        
+        Returns:
+            Optional[Dict[str, Any]]: Spans with offsets from the start of the trace,
+                or None if none are buffered
+        """
+        with self._lock:
+            spans = [span for span in self._spans if span.trace_id == trace_id]
+        return self._waterfall(trace_id, spans) if spans else None
+    
+    def recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get waterfalls of the most recently active traces.
+        
+        Args:
+            limit (int): Maximum number of traces
+        
+        Returns:
+            List[Dict[str, Any]]: Waterfalls, most recent first
+        """
+        with self._lock:
+            spans = list(self._spans)
+        
+        traces: Dict[str, List[Span]] = {}
+        for span in reversed(spans):
+            if span.trace_id is None:
+                continue
+            if span.trace_id not in traces:
+                if len(traces) >= limit:
+                    continue
+                traces[span.trace_id] = []
+            traces[span.trace_id].append(span)
+        return [self._waterfall(trace_id, trace_spans) for trace_id, trace_spans in traces.items()]
+    
+    def get_stage_stats(self) -> Dict[str, Any]:
+        """
+        Get duration percentiles per stage.
+        
+        Returns:
+            Dict[str, Any]: Count, errors and avg/p50/p95/p99/max milliseconds per stage
+        """
+        with self._lock:
+            return {
+                name: {"count": self._counts[name], "errors": self._errors[name],
+                       **summarize(durations, ("avg", "p50", "p95", "p99", "max"))}
+                for name, durations in self._durations.items()
+            }
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """
+    Get the process-wide tracer.
+    
+    Returns:
+        Tracer: The tracer shared by every component in this process
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
+
+def traced(name: str) -> Callable:
+    """
+    Decorate a function so each call is recorded as a span.
+    
+    Args:
+        name (str): Stage name
+    
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def traced_stream(name: str) -> Callable:
+    """
+    Decorate a generator function so each stream is recorded as a span.
+    
+    Args:
+        name (str): Stage name
+    
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_tracer().trace_stream(name, func(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# Transcription provider racing for Morning Coffee application
+
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+
+from .stats import summarize
+from .tracing import Span, get_tracer
+
+# Configure logging
+logger = logging.getLogger('transcription-coordinator')
+
+def _words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_disagreement(first: str, second: str) -> float:
+    """
+    Word-level edit distance between two transcripts, normalized by the longer one.
+    
+    Args:
+        first (str): One transcript
+        second (str): Another transcript of the same audio
+    
+    Returns:
+        float: 0.0 for identical wording, up to 1.0 for nothing in common
+    """
+    a, b = _words(first), _words(second)
+    if not a and not b:
+        return 0.0
+    
+    previous = list(range(len(b) + 1))
+    for i, word in enumerate(a, start=1):
+        current = [i]
+        for j, other in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other)))
+        previous = current
+    return previous[-1] / max(len(a), len(b))
+
+class TranscriptionCoordinator:
+    """
+    Races transcription providers and returns the first non-empty transcript.
+    
+    Every turn is submitted to all providers at once. The first non-empty
+    result wins; the others are ignored, and providers that poll (AssemblyAI)
+    are told to stop. Late results are still compared with the winner, so
+    the stats show how often and how much providers disagree.
+    
+    Racing costs one request per provider per turn. Once one provider has
+    won at least ``dominance`` of the last ``window`` races (after at least
+    ``min_races``), turns go to that provider alone; every ``probe_every``-th
+    turn is still raced to keep the stats current, and a solo turn that
+    fails is raced among the other providers at once.
+    """
+    
+    def __init__(self, providers: Dict[str, Any], timeout: float = 30.0, window: int = 50,
+                 min_races: int = 20, dominance: float = 0.9, probe_every: int = 10):
+        """
+        Initialize the coordinator.
+        
+        Args:
+            providers (Dict[str, Any]): Transcription handlers by name; each has
+                ``transcribe_and_wait(url, should_stop=...)`` or ``transcribe_audio_url(url)``
+            timeout (float): Seconds to wait for a transcript
+            window (int): Number of recent races the policy looks at
+            min_races (int): Races needed before racing can stop
+            dominance (float): Share of races a provider must win to be used alone
+            probe_every (int): While one provider is used alone, race every n-th turn
+        """
+        self.providers = providers
+        self.timeout = timeout
+        self.min_races = min_races
+        self.dominance = dominance
+        self.probe_every = probe_every
+        self.executor = ThreadPoolExecutor(max_workers=max(4, 4 * len(providers)),
+                                           thread_name_prefix="transcription-race")
+        
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window)
+        self._turns = 0
+        self._races = 0
+        self._solo_turns = 0
+        self._stats: Dict[str, Dict[str, Any]] = {
+            name: {
+                "requests": 0,
+                "successes": 0,
+                "failures": 0,
+                "cancelled": 0,
+                "wins": 0,
+                "latency": deque(maxlen=200),
+                "compared": 0,
+                "disagreements": 0,
+                "word_disagreement": 0.0,
+            }
+            for name in providers
+        }
+    
+    def _call(self, name: str, audio_url: str, cancelled: threading.Event) -> Optional[str]:
+        provider = self.providers[name]
+        if hasattr(provider, 'transcribe_and_wait'):
+            return provider.transcribe_and_wait(audio_url, timeout=self.timeout, should_stop=cancelled.is_set)
+        return provider.transcribe_audio_url(audio_url)
+    
+    def dominant_provider(self) -> Optional[str]:
+        """
+        Get the provider that wins consistently enough to be used alone.
+        
+        Returns:
+            Optional[str]: Provider name, or None while racing is worthwhile
+        """
+        with self._lock:
+            if len(self._outcomes) < self.min_races:
+                return None
+            for name in self.providers:
+                if sum(1 for winner in self._outcomes if winner == name) >= self.dominance * len(self._outcomes):
+                    return name
+            return None
+    
+    def transcribe_audio_url(self, audio_url: str) -> Optional[str]:
+        """
+        Transcribe audio from a URL with the fastest provider.
+        
+        Args:
+            audio_url (str): URL of audio to transcribe
+        
+        Returns:
+            Optional[str]: First non-empty transcript, or None if every provider failed
+        """
+        return self.transcribe_with_provider(audio_url)[0]
+    
+    def transcribe_with_provider(self, audio_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Transcribe audio from a URL with the fastest provider, reporting which one it was.
+        
+        Args:
+            audio_url (str): URL of audio to transcribe
+        
+        Returns:
+            Tuple[Optional[str], Optional[str]]: First non-empty transcript and the provider
+                that produced it, or (None, None) if every provider failed
+        """
+        with self._lock:
+            self._turns += 1
+            probe = self.probe_every and self._turns % self.probe_every == 0
+        
+        dominant = None if probe else self.dominant_provider()
+        with get_tracer().span("stt.race", mode=f"solo:{dominant}" if dominant else "race") as span:
+            if dominant:
+                with self._lock:
+                    self._solo_turns += 1
+                text, winner = self._race([dominant], audio_url, record=False, span=span)
+                if text:
+                    return text, winner
+                logger.warning(f"Transcription by {dominant} failed, racing the other providers")
+                return self._race([name for name in self.providers if name != dominant], audio_url, span=span)
+            
+            return self._race(list(self.providers), audio_url, span=span)
+    
+    def _race(self, names: List[str], audio_url: str, record: bool = True,
+              span: Optional[Span] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Run providers concurrently and return the first non-empty transcript and its provider."""
+        cancelled = threading.Event()
+        decided = threading.Event()
+        race = {"winner": None, "text": None, "pending": len(names)}
+        
+        def run(name: str) -> None:
+            start_time = time.time()
+            try:
+                text = (self._call(name, audio_url, cancelled) or "").strip()
+            except Exception as e:
+                logger.error(f"Transcription by {name} failed: {e}")
+                text = ""
+            self._finish(name, text, time.time() - start_time, race, cancelled, decided)
+        
+        for name in names:
+            # Providers run in the current trace, so their spans join this turn
+            self.executor.submit(contextvars.copy_context().run, run, name)
+        decided.wait(self.timeout)
+        cancelled.set()
+        
+        with self._lock:
+            winner, text = race["winner"], race["text"]
+            if record:
+                self._races += 1
+                self._outcomes.append(winner)
+            if winner:
+                self._stats[winner]["wins"] += 1
+        if span is not None:
+            span.set_attribute("winner", winner)
+        return text, winner
+    
+    def _finish(self, name: str, text: str, latency: float, race: Dict[str, Any],
+                cancelled: threading.Event, decided: threading.Event) -> None:
+        """Record one provider's result and decide the race if it is the first good one."""
+        with self._lock:
+            stats = self._stats[name]
+            stats["requests"] += 1
+            race["pending"] -= 1
+            
+            if not text:
+                # Providers told to stop return nothing; that is not a failure
+                stats["cancelled" if cancelled.is_set() else "failures"] += 1
+            else:
+                stats["successes"] += 1
+                stats["latency"].append(latency)
+                if race["winner"] is None:
+                    race["winner"], race["text"] = name, text
+                else:
+                    distance = word_disagreement(race["text"], text)
+                    for compared in (name, race["winner"]):
+                        self._stats[compared]["compared"] += 1
+                        self._stats[compared]["disagreements"] += int(distance > 0)
+                        self._stats[compared]["word_disagreement"] += distance
+            
+            if race["winner"] is not None or race["pending"] == 0:
+                decided.set()
+    
+    def health_check(self) -> Dict[str, Any]:
+        """
+        Check the health of the raced providers.
+        
+        Returns:
+            Dict[str, Any]: Healthy if any provider is, with each provider's result
+        """
+        checks = {}
+        for name, provider in self.providers.items():
+            try:
+                checks[name] = provider.health_check() if hasattr(provider, 'health_check') else {"status": "unknown"}
+            except Exception as e:
+                checks[name] = {"status": "error", "message": str(e)}
+        
+        healthy = any(check.get("status") in ("healthy", "unknown") for check in checks.values())
+        return {"status": "healthy" if healthy else "unhealthy", "providers": checks}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get racing statistics.
+        
+        Returns:
+            Dict[str, Any]: Current mode, race counts, and per provider wins,
+                failures, latency and disagreement with the winner
+        """
+        dominant = self.dominant_provider()
+        
+        with self._lock:
+            outcomes = list(self._outcomes)
+            providers = {
+                name: {
+                    "requests": stats["requests"],
+                    "successes": stats["successes"],
+                    "failures": stats["failures"],
+                    "cancelled": stats["cancelled"],
+                    "wins": stats["wins"],
+                    "recent_win_rate": (sum(1 for winner in outcomes if winner == name) / len(outcomes)
+                                        if outcomes else 0.0),
+                    "latency": summarize(stats["latency"], ("avg", "p50", "p95")),
+                    "disagreement_rate": stats["disagreements"] / stats["compared"] if stats["compared"] else 0.0,
+                    "avg_word_disagreement": (stats["word_disagreement"] / stats["compared"]
+                                              if stats["compared"] else 0.0),
+                }
+                for name, stats in self._stats.items()
+            }
+            return {
+                "mode": f"solo:{dominant}" if dominant else "race",
+                "turns": self._turns,
+                "races": self._races,
+                "solo_turns": self._solo_turns,
+                "providers": providers,
+            }
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# Transcription latency metrics for Morning Coffee application
+
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Any
+
+from .stats import summarize
+
+# Configure logging
+logger = logging.getLogger('transcription-metrics')
+
+class TranscriptionLatencyTracker:
+    """
+    Records the time from submitting a recording to having its text.
+    
+    Latencies are kept per path, e.g. "openai", "assemblyai_webhook" and
+    "assemblyai_poll", so callback and polling completions can be compared.
+    Raced transcriptions are kept under the provider that won the race.
+    """
+    
+    def __init__(self, window: int = 500):
+        """
+        Initialize the tracker.
+        
+        Args:
+            window (int): Number of recent latencies kept per path
+        """
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: Dict[str, int] = defaultdict(int)
+    
+    def record(self, path: str, seconds: float) -> None:
+        """
+        Record one submit-to-text latency.
+        
+        Args:
+            path (str): How the transcript was obtained
+            seconds (float): Seconds from submission to text
+        """
+        with self._lock:
+            self._latencies[path].append(seconds)
+            self._counts[path] += 1
+        logger.info(f"Transcript via {path} after {seconds:.2f}s")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get latency statistics.
+        
+        Returns:
+            Dict[str, Any]: Count and avg/p50/p95/max latency in seconds per path
+        """
+        with self._lock:
+            return {
+                path: {"count": self._counts[path], **summarize(latencies)}
+                for path, latencies in self._latencies.items()
+            }
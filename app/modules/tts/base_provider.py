@@ -2,17 +2,62 @@
 # Base TTS Provider for Morning Coffee application
 
 import logging
-from typing import Dict, Any, Optional, Tuple, Generator
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Generator, Mapping
 from abc import ABC, abstractmethod
 
+from .output_format import OutputFormat, PCM_S16LE
+from .text_processing import SentenceSegmenter
+
 logger = logging.getLogger("tts-base")
 
+def _frozen_settings(settings: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
+    """Return a read-only copy of provider-specific voice settings."""
+    return MappingProxyType(dict(settings or {}))
+
+@dataclass(frozen=True)
+class VoiceSpec:
+    """
+    Voice parameters resolved for a single request.
+    
+    A spec is immutable and owned by the request that resolved it, so a
+    provider instance can serve concurrent requests with different voices.
+    
+    Attributes:
+        voice_id: Provider voice identifier (without style suffixes)
+        speed: Speech speed factor
+        style: Speaking style, if the provider supports one
+        settings: Read-only provider-specific settings
+    """
+    voice_id: str
+    speed: float = 1.0
+    style: Optional[str] = None
+    settings: Mapping[str, Any] = field(default_factory=_frozen_settings)
+    
+    def __post_init__(self):
+        if not isinstance(self.settings, MappingProxyType):
+            object.__setattr__(self, "settings", _frozen_settings(self.settings))
+
 class BaseTTSProvider(ABC):
-    """Base abstract class for TTS providers."""
+    """
+    Base abstract class for TTS providers.
+    
+    Requests never mutate provider state: ``generate_speech`` and
+    ``generate_speech_stream`` resolve their ``voice_id`` and ``speed`` into
+    a ``VoiceSpec`` with ``resolve_voice`` and build the request from it.
+    ``set_voice`` only changes the default used when no voice is given.
+    """
+    
+    # Guards the one-time load of voice metadata
+    _voice_metadata_lock = threading.Lock()
     
     @abstractmethod
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech from text.
         
@@ -20,6 +65,8 @@ class BaseTTSProvider(ABC):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): One of ``get_output_formats()``;
+                if given, headerless samples in this format are returned
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -36,10 +83,67 @@ class BaseTTSProvider(ABC):
         """
         pass
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters into an immutable spec.
+        
+        Must not perform network calls; voice metadata is consulted only if
+        it has already been cached by ``cached_voices``. Unknown voices fall
+        back to the provider's default voice.
+        
+        Args:
+            voice_id (Optional[str]): Voice identifier, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters for one request
+        """
+        return VoiceSpec(voice_id=voice_id or getattr(self, "current_voice", None) or "", speed=speed)
+    
+    def cached_voices(self) -> Dict[str, Any]:
+        """
+        Get voice metadata, loading it at most once per provider instance.
+        
+        Returns:
+            Dict[str, Any]: Voice metadata keyed by voice identifier
+        """
+        if getattr(self, "_voices", None) is None:
+            with self._voice_metadata_lock:
+                if getattr(self, "_voices", None) is None:
+                    self.get_voices()
+        return getattr(self, "_voices", None) or {}
+    
+    def warm_up(self, voice_ids: Optional[List[Optional[str]]] = None,
+                phrase: Optional[str] = None) -> Dict[str, float]:
+        """
+        Prepare the provider to serve its first request quickly.
+        
+        Loads voice metadata and, if a phrase is given, synthesizes it once
+        per voice so that models are loaded and connections are open.
+        
+        Args:
+            voice_ids (Optional[List[Optional[str]]]): Voices to warm (None for the default voice)
+            phrase (Optional[str]): Text to synthesize, or None to skip synthesis
+        
+        Returns:
+            Dict[str, float]: Seconds spent per step ("voices", and per voice if synthesized)
+        """
+        timings = {}
+        start_time = time.time()
+        self.cached_voices()
+        timings["voices"] = time.time() - start_time
+        
+        if phrase:
+            for voice_id in voice_ids or [None]:
+                start_time = time.time()
+                self.generate_speech(phrase, voice_id)
+                timings[voice_id or "default"] = time.time() - start_time
+        return timings
+    
     @abstractmethod
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -83,13 +187,28 @@ class BaseTTSProvider(ABC):
         # Default implementation (typically 16-bit signed PCM, mono, 16kHz)
         import pyaudio
         return pyaudio.paInt16, 1, 16000 
+    
+    def get_output_formats(self) -> List[OutputFormat]:
+        """
+        Get the formats this provider can produce natively.
+        
+        Consumers negotiate one of these with ``negotiate_output_format`` and
+        pass it as ``output_format``; anything else is transcoded locally.
+        Defaults to the 16-bit PCM format reported by ``get_stream_info``.
+        
+        Returns:
+            List[OutputFormat]: Natively supported output formats
+        """
+        _, channels, sample_rate = self.get_stream_info()
+        return [OutputFormat(PCM_S16LE, sample_rate, channels)]
 
 class StreamingTTSProvider(BaseTTSProvider):
     """Base abstract class for streaming-capable TTS providers."""
     
     @abstractmethod
     def generate_speech_stream(self, text: str, voice_id: Optional[str] = None, 
-                             speed: float = 1.0) -> Generator[bytes, None, None]:
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
         """
         Generate speech as a stream of audio chunks.
         
@@ -97,6 +216,8 @@ class StreamingTTSProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): One of ``get_output_formats()``;
+                defaults to the format reported by ``get_stream_info``
             
         Returns:
             Generator[bytes, None, None]: Generator of audio chunks
@@ -144,4 +265,156 @@ class StreamingTTSProvider(BaseTTSProvider):
         Returns:
             bool: True if session was ended successfully
         """
-        pass 
\ No newline at end of file
+        pass
+
+class SentenceStreamingProvider(StreamingTTSProvider):
+    """
+    Streaming provider whose text sessions synthesize sentence by sentence.
+    
+    Text added to a session is segmented incrementally and every completed
+    sentence is synthesized with ``generate_speech_stream`` into the
+    session's audio buffer. Subclasses call ``_init_stream_sessions`` in
+    their constructor and implement ``generate_speech_stream``.
+    
+    Ending a session synthesizes the text left in it; the session is removed
+    once its remaining audio has been read. Sessions left idle for longer
+    than ``stream_session_idle_timeout`` are evicted when a new one begins,
+    so abandoned sessions do not hold their audio forever.
+    """
+    
+    # Seconds a session may go without text being added or audio read
+    stream_session_idle_timeout = 300.0
+    
+    def _init_stream_sessions(self) -> None:
+        """Initialize streaming session state."""
+        self._stream_sessions: Dict[str, Dict[str, Any]] = {}
+        self._stream_sessions_lock = threading.Lock()
+    
+    def evict_idle_sessions(self) -> int:
+        """
+        Remove streaming sessions idle for longer than the idle timeout.
+        
+        Returns:
+            int: Number of sessions removed
+        """
+        now = time.time()
+        with self._stream_sessions_lock:
+            idle = [session_id for session_id, session in self._stream_sessions.items()
+                    if now - session["last_activity"] > self.stream_session_idle_timeout]
+            for session_id in idle:
+                session = self._stream_sessions.pop(session_id)
+                logger.warning(f"Evicting session {session_id} idle for "
+                               f"{now - session['last_activity']:.0f}s "
+                               f"({now - session['created_at']:.0f}s old), "
+                               f"{len(session['audio_buffer'])} bytes unread")
+        return len(idle)
+    
+    def begin_streaming_session(self, session_id: str, voice_id: Optional[str] = None,
+                              speed: float = 1.0) -> bool:
+        """
+        Begin a streaming session for incremental speech generation.
+        
+        Args:
+            session_id (str): Unique session identifier
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+        
+        Returns:
+            bool: True if session was started successfully
+        """
+        self.evict_idle_sessions()
+        with self._stream_sessions_lock:
+            if session_id in self._stream_sessions:
+                logger.warning(f"Session {session_id} already exists, replacing it")
+            self._stream_sessions[session_id] = {
+                "voice_id": voice_id,
+                "speed": speed,
+                "segmenter": SentenceSegmenter(),
+                "audio_buffer": bytearray(),
+                "ended": False,
+                "created_at": time.time(),
+                "last_activity": time.time()
+            }
+        return True
+    
+    def add_text_to_stream(self, session_id: str, text: str) -> bool:
+        """
+        Add text to a streaming session, synthesizing completed sentences.
+        
+        Args:
+            session_id (str): Session identifier
+            text (str): Text to add to the stream
+        
+        Returns:
+            bool: True if text was added successfully
+        """
+        session = self._stream_sessions.get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            return False
+        
+        try:
+            session["last_activity"] = time.time()
+            for sentence in session["segmenter"].feed(text):
+                self._synthesize_into_session(session, sentence)
+            return True
+        except Exception as e:
+            logger.error(f"Error adding text to streaming session {session_id}: {e}")
+            return False
+    
+    def read_session_audio(self, session_id: str) -> bytes:
+        """
+        Take the audio synthesized so far in a streaming session.
+        
+        Reading an ended session drains it and removes it.
+        
+        Args:
+            session_id (str): Session identifier
+        
+        Returns:
+            bytes: PCM audio not yet read
+        """
+        with self._stream_sessions_lock:
+            session = self._stream_sessions.get(session_id)
+            if session is None:
+                return b""
+            
+            session["last_activity"] = time.time()
+            audio = bytes(session["audio_buffer"])
+            del session["audio_buffer"][:len(audio)]
+            if session["ended"]:
+                del self._stream_sessions[session_id]
+            return audio
+    
+    def end_streaming_session(self, session_id: str) -> bool:
+        """
+        End a streaming session, synthesizing any remaining text.
+        
+        The session stays registered until its remaining audio is read with
+        ``read_session_audio``.
+        
+        Args:
+            session_id (str): Session identifier
+        
+        Returns:
+            bool: True if session was ended successfully
+        """
+        session = self._stream_sessions.get(session_id)
+        if session is None:
+            logger.warning(f"Session {session_id} not found")
+            return False
+        
+        try:
+            for sentence in session["segmenter"].flush():
+                self._synthesize_into_session(session, sentence)
+            return True
+        except Exception as e:
+            logger.error(f"Error ending streaming session {session_id}: {e}")
+            return False
+        finally:
+            session["ended"] = True
+    
+    def _synthesize_into_session(self, session: Dict[str, Any], sentence: str) -> None:
+        """Stream one sentence's audio into a session's audio buffer."""
+        for chunk in self.generate_speech_stream(sentence, session["voice_id"], session["speed"]):
+            session["audio_buffer"].extend(chunk)
@@ -738,4 +738,108 @@ class TTSBenchmark:
         return {
             "metrics": comparison,
             "winners": winners
-        } 
\ No newline at end of file
+        } 
+
+
+def _nltk_stream_sentences(chunks: List[str]) -> List[str]:
+    """
+    Reference streaming segmentation that re-tokenizes the whole buffer with
+    NLTK after every chunk (the approach SentenceSegmenter replaces).
+    """
+    import nltk
+    
+    try:
+        nltk.sent_tokenize("Probe.")
+        tokenize = nltk.sent_tokenize
+    except LookupError:
+        # Without the punkt data, an untrained Punkt tokenizer has the same cost profile
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+        tokenize = PunktSentenceTokenizer().tokenize
+    
+    sentences = []
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        tokenized = tokenize(buffer)
+        if len(tokenized) > 1:
+            sentences.extend(tokenized[:-1])
+            buffer = tokenized[-1] + (" " if buffer[-1:].isspace() else "")
+    if buffer.strip():
+        sentences.append(buffer.strip())
+    return sentences
+
+
+def benchmark_sentence_segmentation(text: Optional[str] = None, chunk_size: int = 4,
+                                    iterations: int = 3) -> Dict[str, Any]:
+    """
+    Compare streaming sentence segmentation throughput against NLTK.
+    
+    The text is fed in ``chunk_size`` character chunks, as an LLM token stream
+    would arrive, to both the incremental SentenceSegmenter and a buffer
+    re-tokenizing NLTK loop.
+    
+    Args:
+        text: Text to segment (defaults to a long multi-sentence passage)
+        chunk_size: Characters per streamed chunk
+        iterations: Number of timed runs per method (best run is reported)
+        
+    Returns:
+        Dictionary with characters per second for each method and the speedup
+    """
+    from .text_processing import SentenceSegmenter
+    
+    if text is None:
+        text = " ".join([
+            "Dr. Smith arrived at 9:30 a.m. with a 2.5 kg parcel.",
+            "Wait... are you sure?",
+            "The U.S. team won! Everyone cheered, e.g. the fans and the players.",
+            "Good morning... let's start the day with a smile."
+        ] * 50)
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    
+    def run_incremental() -> List[str]:
+        segmenter = SentenceSegmenter()
+        sentences = []
+        for chunk in chunks:
+            sentences.extend(segmenter.feed(chunk))
+        return sentences + segmenter.flush()
+    
+    def best_time(method) -> Tuple[float, List[str]]:
+        times = []
+        result = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = method()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+    
+    results: Dict[str, Any] = {
+        "characters": len(text),
+        "chunks": len(chunks),
+        "chunk_size": chunk_size
+    }
+    
+    incremental_time, incremental_sentences = best_time(run_incremental)
+    results["incremental"] = {
+        "seconds": incremental_time,
+        "chars_per_sec": len(text) / incremental_time if incremental_time > 0 else float("inf"),
+        "sentences": len(incremental_sentences)
+    }
+    
+    try:
+        nltk_time, nltk_sentences = best_time(lambda: _nltk_stream_sentences(chunks))
+        results["nltk"] = {
+            "seconds": nltk_time,
+            "chars_per_sec": len(text) / nltk_time if nltk_time > 0 else float("inf"),
+            "sentences": len(nltk_sentences)
+        }
+        results["speedup"] = nltk_time / incremental_time if incremental_time > 0 else None
+    except Exception as e:
+        # NLTK or its punkt data is not installed
+        logger.warning(f"NLTK segmentation benchmark unavailable: {e}")
+        results["nltk"] = None
+        results["speedup"] = None
+    
+    logger.info(f"Sentence segmentation: {results['incremental']['chars_per_sec']:.0f} chars/s incremental, "
+                f"speedup over NLTK: {results['speedup']}")
+    return results
@@ -8,7 +8,7 @@ import hashlib
 import logging
 import threading
 import functools
-from typing import Dict, Any, Optional, List, Tuple, Callable, Union
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union, Iterator, Set
 from pathlib import Path
 from datetime import datetime, timedelta
 import shutil
@@ -119,6 +119,37 @@ class MemoryCacheBackend:
             self.hits += 1
             return value
     
+    def iter_chunks(self, key: str, chunk_size: int = 65536) -> Optional[Iterator[bytes]]:
+        """
+        Read an item in chunks.
+        
+        Args:
+            key: Cache key
+            chunk_size: Maximum bytes per chunk
+            
+        Returns:
+            Iterator over the value's chunks, or None if not found
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        return (value[i:i + chunk_size] for i in range(0, len(value), chunk_size))
+    
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        Find which keys are cached.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Set of keys present and not expired
+        """
+        now = time.time()
+        with self.lock:
+            return {key for key in keys
+                    if key in self.cache and now - self.cache[key][1] <= self.ttl}
+    
     def set(self, key: str, value: bytes) -> bool:
         """
         Set item in cache.
@@ -291,6 +322,65 @@ class RedisCacheBackend:
             logger.error(f"Redis get error: {e}")
             return None
     
+    def iter_chunks(self, key: str, chunk_size: int = 65536) -> Optional[Iterator[bytes]]:
+        """
+        Read an item in chunks with GETRANGE, without loading it whole.
+        
+        Args:
+            key: Cache key
+            chunk_size: Maximum bytes per chunk
+            
+        Returns:
+            Iterator over the value's chunks, or None if not found
+        """
+        if not self.available:
+            return None
+        
+        try:
+            formatted_key = self._format_key(key)
+            size = self.client.strlen(formatted_key)
+        except Exception as e:
+            logger.error(f"Redis strlen error: {e}")
+            return None
+        
+        if not size:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return self._read_ranges(formatted_key, size, chunk_size)
+    
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        Find which keys are cached with one pipelined round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Set of keys present
+        """
+        if not self.available or not keys:
+            return set()
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(self._format_key(key))
+            return {key for key, exists in zip(keys, pipe.execute()) if exists}
+        except Exception as e:
+            logger.error(f"Redis exists error: {e}")
+            return set()
+    
+    def _read_ranges(self, formatted_key: str, size: int, chunk_size: int) -> Iterator[bytes]:
+        """Yield consecutive byte ranges of a Redis value."""
+        for start in range(0, size, chunk_size):
+            chunk = self.client.getrange(formatted_key, start, min(start + chunk_size, size) - 1)
+            if not chunk:
+                # Evicted while reading
+                return
+            yield chunk
+    
     def set(self, key: str, value: bytes) -> bool:
         """
         Set item in cache.
@@ -512,6 +602,58 @@ class FilesystemCacheBackend:
             self.misses += 1
             return None
     
+    def iter_chunks(self, key: str, chunk_size: int = 65536) -> Optional[Iterator[bytes]]:
+        """
+        Read an item in chunks straight from its file.
+        
+        Args:
+            key: Cache key
+            chunk_size: Maximum bytes per chunk
+            
+        Returns:
+            Iterator over the file's chunks, or None if not found
+        """
+        file_path = self._get_file_path(key)
+        
+        if not os.path.exists(file_path):
+            self.misses += 1
+            return None
+        
+        if key in self.metadata:
+            if time.time() - self.metadata[key].get("timestamp", 0) > self.ttl:
+                self.delete(key)
+                self.misses += 1
+                return None
+            self.metadata[key]["last_accessed"] = time.time()
+        
+        self.hits += 1
+        return self._read_file(file_path, chunk_size)
+    
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        Find which keys are cached.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Set of keys with an unexpired file
+        """
+        now = time.time()
+        return {key for key in keys
+                if os.path.exists(self._get_file_path(key))
+                and now - self.metadata.get(key, {}).get("timestamp", now) <= self.ttl}
+    
+    @staticmethod
+    def _read_file(file_path: str, chunk_size: int) -> Iterator[bytes]:
+        """Yield a file's contents in chunks."""
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    
     def set(self, key: str, value: bytes) -> bool:
         """
         Set item in cache.
@@ -842,6 +984,64 @@ class TTSCacheManager:
         
         return None
     
+    def stream(self, key: str, chunk_size: int = 65536) -> Optional[Iterator[bytes]]:
+        """
+        Read an item in chunks from the first tier that holds it.
+        
+        Unlike get(), the Redis and filesystem tiers are read incrementally
+        and the item is not copied into faster tiers, so large audio never
+        has to be held in memory at once.
+        
+        Args:
+            key: Cache key
+            chunk_size: Maximum bytes per chunk
+            
+        Returns:
+            Iterator over the item's chunks, or None if not found
+        """
+        with self.lock:
+            self.stats["gets"] += 1
+        
+        for backend_name, backend in self.backends:
+            chunks = backend.iter_chunks(key, chunk_size)
+            if chunks is not None:
+                with self.lock:
+                    self.stats["hits"] += 1
+                    self.stats["tier_hits"][backend_name] += 1
+                    self.stats["hit_ratio"] = self.stats["hits"] / self.stats["gets"]
+                return chunks
+        
+        with self.lock:
+            self.stats["misses"] += 1
+            self.stats["hit_ratio"] = self.stats["hits"] / self.stats["gets"]
+        
+        return None
+    
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        Find which keys are cached in any tier without fetching them.
+        
+        Each tier is probed once for all keys not found in a faster tier,
+        which is a single pipelined round trip for Redis.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Set of keys present in at least one tier
+        """
+        remaining = list(dict.fromkeys(keys))
+        found: Set[str] = set()
+        
+        for _, backend in self.backends:
+            if not remaining:
+                break
+            hits = backend.contains_many(remaining)
+            found |= hits
+            remaining = [key for key in remaining if key not in hits]
+        
+        return found
+    
     def _propagate_to_higher_tiers(self, key: str, value: bytes, found_tier: str):
         """
         Propagate a cache item to higher (faster) tiers.
@@ -46,6 +46,9 @@ class CallQualityMetrics:
         self.total_chunks = 0
         self.total_audio_size = 0
         
+        # Conversational turn metrics (LLM response spoken while generating)
+        self.llm_turns = []
+        
         # Error tracking
         self.errors = []
         self.error_count = 0
@@ -135,6 +138,23 @@ class CallQualityMetrics:
         if latency is not None:
             self.first_chunk_latencies.append(latency)
 
+    def record_llm_turn(self, time_to_first_token: Optional[float],
+                        time_to_first_audio: Optional[float], total_time: float = 0):
+        """
+        Record latency of a streamed LLM response turn.
+        
+        Args:
+            time_to_first_token: Seconds until the LLM produced its first token
+            time_to_first_audio: Seconds until the first audio chunk was ready
+            total_time: Seconds until the turn was fully synthesized
+        """
+        self.llm_turns.append({
+            "timestamp": time.time(),
+            "time_to_first_token": time_to_first_token,
+            "time_to_first_audio": time_to_first_audio,
+            "total_time": total_time
+        })
+
     def start_streaming_session(self, session_id: str):
         """
         Record the start of a streaming session.
@@ -446,6 +466,25 @@ class CallQualityMonitor:
             else:
                 logger.warning(f"Attempted to record error for unknown call: {call_id}")
 
+    def record_llm_turn(self, call_id: str, time_to_first_token: Optional[float],
+                        time_to_first_audio: Optional[float], total_time: float = 0) -> None:
+        """
+        Record latency of a streamed LLM response turn.
+        
+        Args:
+            call_id: Call ID
+            time_to_first_token: Seconds until the LLM produced its first token
+            time_to_first_audio: Seconds until the first audio chunk was ready
+            total_time: Seconds until the turn was fully synthesized
+        """
+        with self.metrics_lock:
+            if call_id in self.call_metrics:
+                self.call_metrics[call_id].record_llm_turn(time_to_first_token, time_to_first_audio, total_time)
+                logger.debug(f"Recorded LLM turn for call {call_id}: "
+                             f"ttft={time_to_first_token}, ttfa={time_to_first_audio}")
+            else:
+                logger.warning(f"Attempted to record LLM turn for unknown call: {call_id}")
+
     def record_user_response(self, call_id: str, response_type: str, duration: float = 0) -> None:
         """
         Record a user response.
@@ -794,6 +833,9 @@ class CallQualityMonitor:
 
     def _format_call_metrics(self, metrics):
         """Format call metrics for API response."""
+        ttft = [t["time_to_first_token"] for t in metrics.llm_turns if t["time_to_first_token"] is not None]
+        ttfa = [t["time_to_first_audio"] for t in metrics.llm_turns if t["time_to_first_audio"] is not None]
+        
         # Convert CallQualityMetrics object to dictionary
         result = {
             "call_id": metrics.call_id,
@@ -816,6 +858,13 @@ class CallQualityMonitor:
                 "avg_first_chunk_latency": statistics.mean(metrics.first_chunk_latencies) if metrics.first_chunk_latencies else 0
             },
             
+            "llm_turn_metrics": {
+                "turn_count": len(metrics.llm_turns),
+                "avg_time_to_first_token": statistics.mean(ttft) if ttft else 0,
+                "avg_time_to_first_audio": statistics.mean(ttfa) if ttfa else 0,
+                "turns": metrics.llm_turns[-10:]  # Limit to last 10 turns
+            },
+            
             "error_metrics": {
                 "error_count": metrics.error_count,
                 "errors": metrics.errors[:10]  # Limit to first 10 errors
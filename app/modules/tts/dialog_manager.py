@@ -8,13 +8,7 @@ import threading
 from typing import List, Dict, Any, Optional, Tuple, Generator, Callable
 from enum import Enum
 
-# Try to import nltk for sentence tokenization
-try:
-    import nltk
-    from nltk.tokenize import sent_tokenize
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
+from .text_processing import SentenceSegmenter
 
 logger = logging.getLogger('dialog-manager')
 
@@ -31,7 +25,7 @@ class DialogManager:
     Manages conversation flow, sentence processing, and turn-taking for natural dialog.
     
     Features:
-    - Natural sentence processing with NLTK integration
+    - Natural sentence processing with incremental sentence segmentation
     - Fragment generation for low-latency initial responses
     - Turn-taking management with state tracking
     - Natural pauses between sentences and turns
@@ -76,17 +70,6 @@ class DialogManager:
         self.state_lock = threading.Lock()
         self.conversation_history = []
         self.current_turn_id = None
-        
-        # Initialize NLTK if available
-        if NLTK_AVAILABLE:
-            try:
-                # Check if punkt tokenizer is downloaded
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                logger.info("Downloading NLTK punkt tokenizer")
-                nltk.download('punkt', quiet=True)
-        else:
-            logger.warning("NLTK not available, falling back to basic sentence splitting")
     
     def process_text(self, text: str, urgency: float = 0.0) -> Generator[Tuple[str, int], None, None]:
         """
@@ -156,7 +139,8 @@ class DialogManager:
                            text: str, 
                            turn_id: Optional[str] = None,
                            context: Optional[Dict[str, Any]] = None,
-                           urgency: float = 0.0) -> Generator[Dict[str, Any], None, None]:
+                           urgency: float = 0.0,
+                           apply_pauses: bool = True) -> Generator[Dict[str, Any], None, None]:
         """
         Process a complete dialog turn with additional metadata.
         
@@ -165,6 +149,9 @@ class DialogManager:
             turn_id: Unique ID for this turn
             context: Additional context for this turn
             urgency: Urgency factor (0.0-1.0)
+            apply_pauses: Sleep for each fragment's pause here. Consumers that
+                          render pauses themselves (e.g. as silence samples)
+                          should pass False so pauses are not paid twice.
             
         Returns:
             Generator yielding fragment info dictionaries
@@ -221,7 +208,7 @@ class DialogManager:
             yield fragment_info
             
             # Apply the pause if specified
-            if pause_ms > 0:
+            if apply_pauses and pause_ms > 0:
                 time.sleep(pause_ms / 1000.0)
                 
             fragment_index += 1
@@ -336,7 +323,7 @@ class DialogManager:
     
     def _tokenize_sentences(self, text: str) -> List[str]:
         """
-        Tokenize text into sentences using NLTK if available.
+        Tokenize text into sentences using SentenceSegmenter.
         
         Args:
             text: Input text
@@ -347,11 +334,10 @@ class DialogManager:
         if not text:
             return []
             
-        if NLTK_AVAILABLE:
-            try:
-                return sent_tokenize(text)
-            except Exception as e:
-                logger.error(f"Error tokenizing text with NLTK: {e}")
+        try:
+            return SentenceSegmenter().split(text)
+        except Exception as e:
+            logger.error(f"Error tokenizing text: {e}")
         
         # Fallback to basic sentence splitting
         basic_splits = re.split(r'(?<=[.!?])\s+', text)
@@ -36,6 +36,16 @@ class TTSEventType(Enum):
     FALLBACK_ACTIVATED = "fallback_activated"
     
     LATENCY_MEASURED = "latency_measured"
+    
+    DIALOG_TURN_START = "dialog_turn_start"
+    DIALOG_TURN_END = "dialog_turn_end"
+    DIALOG_PAUSE = "dialog_pause"
+    FRAGMENT_PROCESSING = "fragment_processing"
+    FIRST_RESPONSE_LATENCY = "first_response_latency"
+    AUDIO_CHUNK_GENERATED = "audio_chunk_generated"
+    LLM_TURN_LATENCY = "llm_turn_latency"
+    
+    ERROR = "error"
 
 @dataclass
 class TTSEvent:
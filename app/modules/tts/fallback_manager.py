@@ -5,6 +5,8 @@ import logging
 import time
 import threading
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any, Optional, List, Callable, Tuple
 
 from .provider_factory import TTSProviderFactory
@@ -30,6 +32,38 @@ class ProviderStatus:
         self.failure_count = 0
         self.last_error = None
         self.recovery_attempts = 0
+        
+        # Passive health signal: (timestamp, success) of recent real requests
+        self.recent_outcomes = deque(maxlen=50)
+    
+    def record_outcome(self, success: bool) -> None:
+        """
+        Record the outcome of a real request served by this provider.
+        
+        Args:
+            success: Whether the request succeeded
+        """
+        self.recent_outcomes.append((time.time(), success))
+    
+    def passive_health(self, window: float, min_samples: int) -> Optional[bool]:
+        """
+        Derive health from recent request outcomes.
+        
+        Args:
+            window: Only outcomes newer than this many seconds are considered
+            min_samples: Minimum number of outcomes required for a verdict
+            
+        Returns:
+            True/False if there is enough recent traffic, None otherwise
+        """
+        cutoff = time.time() - window
+        outcomes = [ok for ts, ok in self.recent_outcomes if ts >= cutoff]
+        
+        if len(outcomes) < min_samples:
+            return None
+        
+        failures = outcomes.count(False)
+        return failures / len(outcomes) < 0.5
 
 class TTSFallbackManager:
     """
@@ -48,7 +82,10 @@ class TTSFallbackManager:
                  health_check_interval: int = 300,
                  max_failures: int = 3,
                  auto_recovery: bool = True,
-                 recovery_backoff_base: int = 30):
+                 recovery_backoff_base: int = 30,
+                 probe_timeout: float = 10.0,
+                 passive_window: Optional[float] = None,
+                 min_passive_samples: int = 3):
         """
         Initialize the fallback manager.
         
@@ -62,6 +99,11 @@ class TTSFallbackManager:
             max_failures: Maximum failures before provider is marked unhealthy
             auto_recovery: Whether to automatically try to recover primary provider
             recovery_backoff_base: Base seconds for exponential backoff on recovery attempts
+            probe_timeout: Seconds to wait for a single synthetic health probe
+            passive_window: Seconds of request history used as a passive health signal
+                            (defaults to health_check_interval)
+            min_passive_samples: Requests needed in the window before the passive
+                                 signal replaces a synthetic probe
         """
         self.primary_provider_name = primary_provider
         self.fallback_provider_names = fallback_providers
@@ -71,6 +113,9 @@ class TTSFallbackManager:
         self.max_failures = max_failures
         self.auto_recovery = auto_recovery
         self.recovery_backoff_base = recovery_backoff_base
+        self.probe_timeout = probe_timeout
+        self.passive_window = passive_window or health_check_interval
+        self.min_passive_samples = min_passive_samples
         
         # Use the provided factory or default to TTSProviderFactory
         self.provider_factory = provider_factory or TTSProviderFactory.create_provider
@@ -81,9 +126,24 @@ class TTSFallbackManager:
         # Provider tracking
         self.providers: Dict[str, ProviderStatus] = {}
         
+        # Probes run here so a slow provider never holds the lock
+        self._probe_executor = ThreadPoolExecutor(
+            max_workers=max(2, 1 + len(fallback_providers)),
+            thread_name_prefix="tts-health-probe"
+        )
+        
         # Current active provider
         self.current_provider_name = primary_provider
         
+        # Stats
+        self.stats = {
+            "fallbacks": 0,
+            "recoveries": 0,
+            "health_checks": 0,
+            "passive_checks": 0,
+            "probe_timeouts": 0
+        }
+        
         # Initialize providers
         self._initialize_providers()
         
@@ -91,13 +151,6 @@ class TTSFallbackManager:
         if self.auto_recovery:
             self._start_health_check_thread()
         
-        # Stats
-        self.stats = {
-            "fallbacks": 0,
-            "recoveries": 0,
-            "health_checks": 0
-        }
-        
         logger.info(f"Fallback manager initialized with primary: {primary_provider}, " + 
                    f"fallbacks: {fallback_providers}")
     
@@ -114,6 +167,19 @@ class TTSFallbackManager:
             for provider_name in self.fallback_provider_names:
                 self._create_provider(provider_name)
     
+    def _build_provider(self, provider_name: str) -> BaseTTSProvider:
+        """
+        Construct a provider instance without registering it.
+        
+        Args:
+            provider_name: Provider name
+            
+        Returns:
+            Provider instance
+        """
+        config = self.provider_configs.get(provider_name, {})
+        return self.provider_factory(provider_name, self.redis_client, config)
+    
     def _create_provider(self, provider_name: str) -> Optional[BaseTTSProvider]:
         """
         Create a provider instance.
@@ -125,15 +191,8 @@ class TTSFallbackManager:
             Provider instance or None if creation failed
         """
         try:
-            # Get configuration for this provider
-            config = self.provider_configs.get(provider_name, {})
-            
             # Create provider using factory
-            provider = self.provider_factory(
-                provider_name, 
-                self.redis_client, 
-                config
-            )
+            provider = self._build_provider(provider_name)
             
             # Create status object
             provider_status = ProviderStatus(provider_name, provider)
@@ -168,10 +227,159 @@ class TTSFallbackManager:
             
             return provider_status.provider
     
+    def get_provider_by_name(self, provider_name: str) -> Optional[BaseTTSProvider]:
+        """
+        Get the shared instance of a specific provider without switching to it.
+
+        Args:
+            provider_name: Provider name
+
+        Returns:
+            Provider instance or None if not managed here
+        """
+        with self.lock:
+            provider_status = self.providers.get(provider_name)
+            return provider_status.provider if provider_status else None
+
+    def get_candidate_providers(self) -> List[str]:
+        """
+        Get provider names in the order a single request should try them.
+
+        The current provider comes first, then fallbacks, then the primary.
+        Healthy providers are listed before unhealthy ones, which are kept
+        only as a last resort. Nothing is switched or mutated.
+
+        Returns:
+            Ordered list of provider names
+        """
+        with self.lock:
+            ordered = [self.current_provider_name] + self.fallback_provider_names + [self.primary_provider_name]
+            names = []
+            for name in ordered:
+                if name in self.providers and name not in names:
+                    names.append(name)
+
+            healthy = [n for n in names if self.providers[n].is_healthy]
+            unhealthy = [n for n in names if not self.providers[n].is_healthy]
+            return healthy + unhealthy
+
+    def force_provider(self, provider_name: str) -> bool:
+        """
+        Make a provider current, creating it first if it is not managed yet.
+
+        Args:
+            provider_name: Provider name
+
+        Returns:
+            True if the provider is now current
+        """
+        with self.lock:
+            known = provider_name in self.providers
+
+        if not known:
+            # Construct outside the lock; provider set-up may be slow
+            try:
+                provider = self._build_provider(provider_name)
+            except Exception as e:
+                logger.error(f"Failed to create provider {provider_name}: {e}")
+                return False
+
+            with self.lock:
+                self.providers.setdefault(provider_name, ProviderStatus(provider_name, provider))
+
+        with self.lock:
+            self.current_provider_name = provider_name
+            logger.info(f"Forced current provider to {provider_name}")
+            return True
+
+    def _probe(self, provider: BaseTTSProvider) -> Tuple[bool, Optional[str]]:
+        """
+        Run a synthetic health probe against a provider.
+        
+        Args:
+            provider: Provider instance to probe
+            
+        Returns:
+            Tuple of (is_healthy, error message)
+        """
+        try:
+            health = provider.health_check()
+            if health.get("status") in ["healthy", "ok"]:
+                return True, None
+            return False, health.get("error", "Unknown error")
+        except Exception as e:
+            return False, str(e)
+    
+    def _probe_providers(self, providers: Dict[str, BaseTTSProvider]) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Probe several providers concurrently, bounded by the probe timeout.
+        
+        Must be called without holding the lock.
+        
+        Args:
+            providers: Mapping of provider name to provider instance
+            
+        Returns:
+            Mapping of provider name to (is_healthy, error message)
+        """
+        if not providers:
+            return {}
+        
+        futures = {
+            self._probe_executor.submit(self._probe, provider): name
+            for name, provider in providers.items()
+        }
+        done, not_done = wait(futures, timeout=self.probe_timeout)
+        
+        results = {}
+        for future in done:
+            results[futures[future]] = future.result()
+        
+        for future in not_done:
+            # A hung probe keeps its worker thread but no longer blocks anyone
+            future.cancel()
+            name = futures[future]
+            results[name] = (False, f"Health probe timed out after {self.probe_timeout}s")
+            with self.lock:
+                self.stats["probe_timeouts"] += 1
+            logger.warning(f"Health probe for {name} timed out")
+        
+        return results
+    
+    def _apply_health_result(self, provider_name: str, is_healthy: bool,
+                             error: Optional[str] = None) -> None:
+        """
+        Atomically update a provider's status from a health verdict.
+        
+        Args:
+            provider_name: Provider name
+            is_healthy: Health verdict
+            error: Error message if unhealthy
+        """
+        with self.lock:
+            provider_status = self.providers.get(provider_name)
+            if not provider_status:
+                return
+            
+            provider_status.last_check_time = time.time()
+            provider_status.is_healthy = is_healthy
+            
+            if is_healthy:
+                # Reset failure count on successful check
+                provider_status.failure_count = 0
+                provider_status.last_error = None
+            else:
+                logger.warning(f"Provider {provider_name} reported unhealthy: {error}")
+                provider_status.failure_count += 1
+                provider_status.last_error = error
+    
     def check_provider_health(self, provider_name: str) -> bool:
         """
         Check if a provider is healthy.
         
+        Recent request outcomes are used when there is enough traffic; a
+        synthetic probe is only run otherwise, and always outside the lock.
+        
         Args:
             provider_name: Provider name to check
             
@@ -187,37 +395,33 @@ class TTSFallbackManager:
             if time.time() - provider_status.last_check_time < self.health_check_interval:
                 return provider_status.is_healthy
             
-            try:
-                # Perform health check
-                provider_status.last_check_time = time.time()
+            passive = provider_status.passive_health(self.passive_window, self.min_passive_samples)
+            provider = provider_status.provider
+            
+            if passive is not None:
+                self.stats["passive_checks"] += 1
+            else:
                 self.stats["health_checks"] += 1
-                
-                # Get provider instance
-                provider = provider_status.provider
-                
-                # Run health check
-                health = provider.health_check()
-                
-                # Check health status
-                is_healthy = health.get("status") in ["healthy", "ok"]
-                provider_status.is_healthy = is_healthy
-                
-                if not is_healthy:
-                    logger.warning(f"Provider {provider_name} reported unhealthy: {health}")
-                    provider_status.failure_count += 1
-                    provider_status.last_error = health.get("error", "Unknown error")
-                else:
-                    # Reset failure count on successful check
-                    provider_status.failure_count = 0
-                    provider_status.last_error = None
-                
-                return is_healthy
-            except Exception as e:
-                logger.error(f"Error checking health for provider {provider_name}: {e}")
-                provider_status.is_healthy = False
-                provider_status.failure_count += 1
-                provider_status.last_error = str(e)
-                return False
+        
+        if passive is not None:
+            self._apply_health_result(provider_name, passive, None if passive else "Recent requests failing")
+            return passive
+        
+        is_healthy, error = self._probe_providers({provider_name: provider})[provider_name]
+        self._apply_health_result(provider_name, is_healthy, error)
+        return is_healthy
+    
+    def record_success(self, provider_name: str) -> None:
+        """
+        Record a successful request as a passive health signal.
+        
+        Args:
+            provider_name: Provider name
+        """
+        with self.lock:
+            provider_status = self.providers.get(provider_name)
+            if provider_status:
+                provider_status.record_outcome(True)
     
     def mark_provider_failure(self, provider_name: str, error: Optional[str] = None) -> None:
         """
@@ -234,6 +438,7 @@ class TTSFallbackManager:
             
             provider_status.failure_count += 1
             provider_status.last_error = error
+            provider_status.record_outcome(False)
             
             # Mark unhealthy if too many failures
             if provider_status.failure_count >= self.max_failures:
@@ -274,10 +479,8 @@ class TTSFallbackManager:
                 if not provider_status:
                     continue
                 
-                # Check health if we haven't recently
-                if time.time() - provider_status.last_check_time >= self.health_check_interval:
-                    self.check_provider_health(provider_name)
-                
+                # Status is kept fresh by the health check thread; probing
+                # here would stall every request waiting on the lock
                 # Use this provider if it's healthy
                 if provider_status.is_healthy:
                     self.current_provider_name = provider_name
@@ -306,25 +509,135 @@ class TTSFallbackManager:
                 # Already using primary
                 return True, self.get_provider()
             
-            # Check if primary is healthy
-            primary_status = self.providers.get(self.primary_provider_name)
-            if not primary_status:
+            if not self.providers.get(self.primary_provider_name):
                 logger.error("Primary provider not found!")
                 return False, self.get_provider()
-            
-            # Update health check
-            is_healthy = self.check_provider_health(self.primary_provider_name)
-            
-            if is_healthy:
-                # Reset to primary
+        
+        # Update health check (probes run outside the lock)
+        is_healthy = self.check_provider_health(self.primary_provider_name)
+        
+        with self.lock:
+            primary_status = self.providers.get(self.primary_provider_name)
+            if is_healthy and primary_status:
+                previous_name = self.current_provider_name
                 self.current_provider_name = self.primary_provider_name
                 self.stats["recoveries"] += 1
                 
-                logger.info(f"Reset from {self.current_provider_name} to primary {self.primary_provider_name}")
+                logger.info(f"Reset from {previous_name} to primary {self.primary_provider_name}")
                 return True, primary_status.provider
-            else:
-                logger.warning(f"Cannot reset to primary provider {self.primary_provider_name}: not healthy")
-                return False, self.get_provider()
+            
+            logger.warning(f"Cannot reset to primary provider {self.primary_provider_name}: not healthy")
+            return False, self.get_provider()
+    
+    def run_health_checks(self) -> None:
+        """
+        Run one round of health checks and recovery.
+        
+        Providers with enough recent traffic are judged from request outcomes;
+        the rest are probed concurrently. Unhealthy providers whose backoff has
+        elapsed are rebuilt and probed in parallel. The lock is only held to
+        snapshot and swap status, never during remote calls.
+        """
+        now = time.time()
+        to_probe: Dict[str, BaseTTSProvider] = {}
+        to_recover: List[str] = []
+        
+        with self.lock:
+            for provider_name, provider_status in self.providers.items():
+                if not provider_status.is_healthy:
+                    # Apply exponential backoff with jitter to avoid thundering herd
+                    backoff = self.recovery_backoff_base * (2 ** provider_status.recovery_attempts)
+                    backoff = backoff * (0.75 + 0.5 * random.random())
+                    if now - provider_status.last_check_time >= backoff:
+                        to_recover.append(provider_name)
+                    continue
+                
+                # Skip health check if we've checked recently
+                if now - provider_status.last_check_time < self.health_check_interval:
+                    continue
+                
+                passive = provider_status.passive_health(self.passive_window, self.min_passive_samples)
+                if passive is not None:
+                    self.stats["passive_checks"] += 1
+                    provider_status.last_check_time = now
+                    if not passive:
+                        provider_status.is_healthy = False
+                        provider_status.failure_count += 1
+                        provider_status.last_error = "Recent requests failing"
+                        logger.warning(f"Provider {provider_name} marked unhealthy from recent request failures")
+                    continue
+                
+                self.stats["health_checks"] += 1
+                to_probe[provider_name] = provider_status.provider
+        
+        for provider_name, (is_healthy, error) in self._probe_providers(to_probe).items():
+            self._apply_health_result(provider_name, is_healthy, error)
+        
+        if to_recover:
+            self._recover_providers(to_recover)
+        
+        # Try to recover primary if not current and it's healthy
+        with self.lock:
+            primary_status = self.providers.get(self.primary_provider_name)
+            if (self.current_provider_name != self.primary_provider_name and
+                    primary_status and primary_status.is_healthy):
+                logger.info(f"Reset from {self.current_provider_name} to primary {self.primary_provider_name}")
+                self.current_provider_name = self.primary_provider_name
+                self.stats["recoveries"] += 1
+    
+    def _recover_providers(self, provider_names: List[str]) -> None:
+        """
+        Rebuild and probe unhealthy providers concurrently, swapping in
+        healthy replacements.
+        
+        Args:
+            provider_names: Names of providers to attempt recovery for
+        """
+        def rebuild(provider_name: str) -> Tuple[Optional[BaseTTSProvider], bool, Optional[str]]:
+            logger.info(f"Attempting recovery for {provider_name}")
+            try:
+                new_provider = self._build_provider(provider_name)
+            except Exception as e:
+                return None, False, str(e)
+            is_healthy, error = self._probe(new_provider)
+            return new_provider, is_healthy, error
+        
+        futures = {
+            self._probe_executor.submit(rebuild, name): name
+            for name in provider_names
+        }
+        done, not_done = wait(futures, timeout=self.probe_timeout)
+        
+        for future in not_done:
+            future.cancel()
+        
+        with self.lock:
+            for future, provider_name in futures.items():
+                provider_status = self.providers.get(provider_name)
+                if not provider_status:
+                    continue
+                
+                provider_status.last_check_time = time.time()
+                
+                if future not in done:
+                    provider_status.recovery_attempts += 1
+                    self.stats["probe_timeouts"] += 1
+                    logger.warning(f"Recovery attempt for {provider_name} timed out, will retry later")
+                    continue
+                
+                new_provider, is_healthy, error = future.result()
+                if new_provider is not None and is_healthy:
+                    provider_status.provider = new_provider
+                    provider_status.is_healthy = True
+                    provider_status.failure_count = 0
+                    provider_status.last_error = None
+                    provider_status.recovery_attempts = 0
+                    provider_status.recent_outcomes.clear()
+                    logger.info(f"Successfully recovered {provider_name}")
+                else:
+                    provider_status.recovery_attempts += 1
+                    provider_status.last_error = error
+                    logger.warning(f"Recovery attempt for {provider_name} failed, will retry later: {error}")
     
     def _start_health_check_thread(self) -> None:
         """Start background thread for health checks and recovery."""
@@ -334,56 +647,7 @@ class TTSFallbackManager:
                 try:
                     # Sleep first to avoid immediate check
                     time.sleep(self.health_check_interval)
-                    
-                    with self.lock:
-                        # Check health of all providers
-                        for provider_name, provider_status in self.providers.items():
-                            # Skip health check if we've checked recently
-                            if time.time() - provider_status.last_check_time < self.health_check_interval:
-                                continue
-                            
-                            # Perform health check
-                            self.check_provider_health(provider_name)
-                        
-                        # Try to recover primary if not current and it's healthy
-                        if (self.current_provider_name != self.primary_provider_name and
-                            self.providers.get(self.primary_provider_name).is_healthy):
-                            self.reset_to_primary()
-                        
-                        # Try to recover unhealthy providers with backoff
-                        for provider_name, provider_status in self.providers.items():
-                            if not provider_status.is_healthy:
-                                # Apply exponential backoff
-                                backoff = self.recovery_backoff_base * (2 ** provider_status.recovery_attempts)
-                                
-                                # Add some jitter to avoid thundering herd
-                                backoff = backoff * (0.75 + 0.5 * random.random())
-                                
-                                # Check if it's time to retry
-                                if time.time() - provider_status.last_check_time >= backoff:
-                                    logger.info(f"Attempting recovery for {provider_name}")
-                                    
-                                    # Try to recreate the provider
-                                    try:
-                                        new_provider = self._create_provider(provider_name)
-                                        if new_provider:
-                                            # Check health of new instance
-                                            health = new_provider.health_check()
-                                            
-                                            is_healthy = health.get("status") in ["healthy", "ok"]
-                                            if is_healthy:
-                                                provider_status.is_healthy = True
-                                                provider_status.failure_count = 0
-                                                provider_status.last_error = None
-                                                provider_status.recovery_attempts = 0
-                                                logger.info(f"Successfully recovered {provider_name}")
-                                            else:
-                                                provider_status.recovery_attempts += 1
-                                                logger.warning(f"Recovery attempt for {provider_name} failed, will retry later")
-                                    except Exception as e:
-                                        provider_status.recovery_attempts += 1
-                                        logger.error(f"Error attempting recovery for {provider_name}: {e}")
-                
+                    self.run_health_checks()
                 except Exception as e:
                     logger.error(f"Error in health check thread: {e}")
         
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# Shared HTTP streaming support for REST-based TTS providers
+
+import logging
+import threading
+import time
+from typing import Optional, Generator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .base_provider import SentenceStreamingProvider
+from .output_format import wav_data_offset
+
+logger = logging.getLogger("tts-http-streaming")
+
+class HTTPStreamingProvider(SentenceStreamingProvider):
+    """
+    Base class for TTS providers that stream audio over HTTP.
+    
+    Requests go through a pooled keep-alive ``requests.Session`` and audio is
+    read incrementally with ``iter_content`` as the provider sends it. Yielded
+    chunks are 16-bit PCM, aligned to whole samples, with any WAV header
+    removed. Text sessions come from ``SentenceStreamingProvider``.
+    
+    Subclasses implement ``generate_speech_stream`` using ``_stream_pcm``.
+    """
+    
+    # Bytes read from the socket per iteration
+    stream_chunk_size = 4096
+    
+    def _init_http(self, pool_size: int = 10, timeout: float = 30.0) -> None:
+        """
+        Initialize HTTP pooling and streaming session state.
+        
+        Args:
+            pool_size (int): Maximum pooled connections to the provider
+            timeout (float): Request timeout in seconds
+        """
+        self.http_timeout = timeout
+        self._http_pool_size = pool_size
+        self._http_session: Optional[requests.Session] = None
+        self._http_lock = threading.Lock()
+        self._init_stream_sessions()
+    
+    @property
+    def http(self) -> requests.Session:
+        """Pooled keep-alive HTTP session shared by all requests of this provider."""
+        with self._http_lock:
+            if self._http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self._http_pool_size,
+                                      pool_maxsize=self._http_pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
+    
+    def _stream_pcm(self, method: str, url: str, sample_width: int = 2,
+                    **kwargs) -> Generator[bytes, None, None]:
+        """
+        Send a request and yield the response body as PCM while it arrives.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            sample_width (int): Bytes per sample; yielded chunks are aligned to it
+            **kwargs: Additional arguments for requests
+        
+        Returns:
+            Generator[bytes, None, None]: Generator of PCM chunks
+        
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        kwargs.setdefault("timeout", self.http_timeout)
+        start_time = time.time()
+        first_chunk_time = None
+        
+        with self.http.request(method, url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            
+            pending = b""
+            header_checked = False
+            for data in response.iter_content(chunk_size=self.stream_chunk_size):
+                if not data:
+                    continue
+                pending += data
+                
+                if not header_checked:
+                    # Wait for enough bytes to recognise and skip a WAV header
+                    if pending.startswith(b"RIFF"):
+                        offset = wav_data_offset(pending)
+                        if offset is None:
+                            continue
+                        pending = pending[offset:]
+                    elif len(pending) < 4 and b"RIFF".startswith(pending):
+                        continue
+                    header_checked = True
+                
+                usable = len(pending) - len(pending) % sample_width
+                if usable:
+                    if first_chunk_time is None:
+                        first_chunk_time = time.time() - start_time
+                        logger.debug(f"First audio chunk after {first_chunk_time:.3f}s from {url}")
+                    yield pending[:usable]
+                    pending = pending[usable:]
+            
+            if pending and header_checked:
+                # Drop a trailing partial sample
+                usable = len(pending) - len(pending) % sample_width
+                if usable:
+                    yield pending[:usable]
+
+def parse_pcm_sample_rate(output_format: str, default: int = 24000) -> int:
+    """
+    Extract the sample rate from a provider output format name.
+    
+    Handles names such as "pcm_16000" and "raw-8khz-16bit-mono-pcm".
+    
+    Args:
+        output_format (str): Output format name
+        default (int): Rate returned if none is found
+    
+    Returns:
+        int: Sample rate in Hz
+    """
+    for part in output_format.replace("_", "-").split("-"):
+        if part.endswith("khz") and part[:-3].isdigit():
+            return int(part[:-3]) * 1000
+        if part.isdigit() and int(part) >= 8000:
+            return int(part)
+    return default
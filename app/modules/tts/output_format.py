@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# Output format negotiation and local transcoding for TTS audio
+
+import io
+import logging
+import struct
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger("tts-output-format")
+
+# Sample encodings
+PCM_S16LE = "pcm_s16le"
+MULAW = "mulaw"
+
+# Bytes per sample for each encoding
+SAMPLE_WIDTHS = {PCM_S16LE: 2, MULAW: 1}
+
+# WAV format tags for each encoding
+WAV_FORMAT_TAGS = {PCM_S16LE: 1, MULAW: 7}
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """
+    Audio format requested from a provider or delivered to a consumer.
+    
+    Attributes:
+        encoding: Sample encoding (``PCM_S16LE`` or ``MULAW``)
+        sample_rate: Sample rate in Hz
+        channels: Number of channels
+        container: "raw" for headerless samples or "wav" for a WAV file
+    """
+    encoding: str = PCM_S16LE
+    sample_rate: int = 24000
+    channels: int = 1
+    container: str = "raw"
+    
+    @property
+    def sample_width(self) -> int:
+        """Bytes per sample."""
+        return SAMPLE_WIDTHS[self.encoding]
+    
+    @property
+    def bytes_per_second(self) -> int:
+        """Audio data rate in bytes per second."""
+        return self.sample_rate * self.channels * self.sample_width
+    
+    @property
+    def key(self) -> str:
+        """Stable identifier, e.g. "mulaw_8000_1_raw", used in cache keys."""
+        return f"{self.encoding}_{self.sample_rate}_{self.channels}_{self.container}"
+    
+    def same_samples(self, other: "OutputFormat") -> bool:
+        """Whether two formats carry identical samples, ignoring the container."""
+        return (self.encoding, self.sample_rate, self.channels) == \
+            (other.encoding, other.sample_rate, other.channels)
+    
+    def as_raw(self) -> "OutputFormat":
+        """The same format without a container."""
+        return replace(self, container="raw")
+
+# Consumer profiles: PSTN calls are 8 kHz, HD voice is 16 kHz
+OUTPUT_PROFILES = {
+    "pstn": OutputFormat(MULAW, 8000),
+    "pstn_l16": OutputFormat(PCM_S16LE, 8000),
+    "hd": OutputFormat(PCM_S16LE, 16000),
+    "wideband": OutputFormat(PCM_S16LE, 24000),
+}
+
+def resolve_output_format(output_format: Union[str, OutputFormat, None],
+                          container: Optional[str] = None) -> Optional[OutputFormat]:
+    """
+    Resolve a profile name or format into an OutputFormat.
+    
+    Args:
+        output_format (Union[str, OutputFormat, None]): Profile name ("pstn",
+            "pstn_l16", "hd", "wideband"), format, or None
+        container (Optional[str]): Override the container ("raw" or "wav")
+    
+    Returns:
+        Optional[OutputFormat]: The format, or None if none was requested
+    
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if output_format is None:
+        return None
+    if isinstance(output_format, str):
+        if output_format not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output format profile: {output_format}")
+        output_format = OUTPUT_PROFILES[output_format]
+    if container:
+        output_format = replace(output_format, container=container)
+    return output_format
+
+def negotiate_output_format(supported: Sequence[OutputFormat], target: OutputFormat) -> OutputFormat:
+    """
+    Choose the format to request from a provider for a consumer's target format.
+    
+    The provider's own copy of the target is preferred. Otherwise a format
+    at the target rate is chosen, which needs only companding. Failing
+    that, the lowest rate above the target is chosen so that the fewest
+    bytes cross the network before local resampling.
+    
+    Args:
+        supported (Sequence[OutputFormat]): Formats the provider can produce natively
+        target (OutputFormat): Format the consumer needs
+    
+    Returns:
+        OutputFormat: Format to request (headerless), transcoded locally if it differs
+    """
+    if not supported:
+        return target.as_raw()
+    
+    for fmt in supported:
+        if fmt.same_samples(target):
+            return fmt.as_raw()
+    
+    same_rate = [fmt for fmt in supported if fmt.sample_rate == target.sample_rate]
+    if same_rate:
+        return min(same_rate, key=lambda fmt: fmt.bytes_per_second).as_raw()
+    
+    higher = [fmt for fmt in supported if fmt.sample_rate > target.sample_rate]
+    if higher:
+        return min(higher, key=lambda fmt: (fmt.sample_rate, fmt.bytes_per_second)).as_raw()
+    
+    return max(supported, key=lambda fmt: fmt.sample_rate).as_raw()
+
+def wav_data_offset(data: bytes) -> Optional[int]:
+    """
+    Find where samples start in a buffer beginning with a WAV header.
+    
+    Args:
+        data (bytes): Buffer starting with "RIFF"
+    
+    Returns:
+        Optional[int]: Offset of the first sample, or None if more bytes are needed
+    """
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack("<I", data[offset + 4:offset + 8])[0]
+        if chunk_id == b"data":
+            return offset + 8
+        offset += 8 + chunk_size + (chunk_size % 2)
+    return None
+
+def strip_wav_header(data: bytes) -> bytes:
+    """
+    Remove a WAV header if present.
+    
+    Args:
+        data (bytes): Audio that may start with a WAV header
+    
+    Returns:
+        bytes: Headerless samples
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        offset = wav_data_offset(data)
+        if offset is not None:
+            return data[offset:]
+    return data
+
+def wrap_wav(samples: bytes, fmt: OutputFormat) -> bytes:
+    """
+    Wrap headerless samples in a WAV container.
+    
+    Args:
+        samples (bytes): Headerless samples
+        fmt (OutputFormat): Format of the samples
+    
+    Returns:
+        bytes: WAV file contents
+    """
+    block_align = fmt.channels * fmt.sample_width
+    header = io.BytesIO()
+    header.write(b"RIFF")
+    header.write(struct.pack("<I", 36 + len(samples)))
+    header.write(b"WAVEfmt ")
+    header.write(struct.pack("<IHHIIHH", 16, WAV_FORMAT_TAGS[fmt.encoding], fmt.channels,
+                             fmt.sample_rate, fmt.sample_rate * block_align, block_align,
+                             fmt.sample_width * 8))
+    header.write(b"data")
+    header.write(struct.pack("<I", len(samples)))
+    return header.getvalue() + samples
+
+def describe_audio(audio: bytes, raw_format: Optional[OutputFormat] = None) -> Dict[str, Any]:
+    """
+    Summarize encoded audio without decoding it.
+    
+    WAV headers are parsed for their format and duration; MP3 is only
+    recognised. Headerless audio is described with ``raw_format`` if given.
+    
+    Args:
+        audio (bytes): Audio data
+        raw_format (Optional[OutputFormat]): Format of the audio if it is headerless
+    
+    Returns:
+        Dict[str, Any]: size (bytes), format (a format key, "mp3" or None) and
+            duration (seconds, or None if unknown)
+    """
+    info: Dict[str, Any] = {"size": len(audio), "format": None, "duration": None}
+    
+    if audio[:4] == b"RIFF" and audio[8:12] == b"WAVE":
+        tags = {tag: encoding for encoding, tag in WAV_FORMAT_TAGS.items()}
+        offset = 12
+        fmt = None
+        while offset + 8 <= len(audio):
+            chunk_id = audio[offset:offset + 4]
+            chunk_size = struct.unpack("<I", audio[offset + 4:offset + 8])[0]
+            if chunk_id == b"fmt " and offset + 24 <= len(audio):
+                tag, channels, sample_rate = struct.unpack("<HHI", audio[offset + 8:offset + 16])
+                if tag in tags:
+                    fmt = OutputFormat(tags[tag], sample_rate, channels, "wav")
+            elif chunk_id == b"data":
+                if fmt is not None:
+                    data_size = min(chunk_size, len(audio) - offset - 8)
+                    info["format"] = fmt.key
+                    info["duration"] = data_size / fmt.bytes_per_second
+                break
+            offset += 8 + chunk_size + (chunk_size % 2)
+        return info
+    
+    if audio[:3] == b"ID3" or (len(audio) > 1 and audio[0] == 0xFF and audio[1] & 0xE0 == 0xE0):
+        info["format"] = "mp3"
+    elif raw_format is not None:
+        info["format"] = raw_format.as_raw().key
+        info["duration"] = len(audio) / raw_format.bytes_per_second
+    return info
+
+def mulaw_encode(samples: np.ndarray) -> bytes:
+    """
+    Encode 16-bit samples with G.711 μ-law.
+    
+    Args:
+        samples (np.ndarray): int16 samples
+    
+    Returns:
+        bytes: μ-law bytes
+    """
+    pcm = samples.astype(np.int32)
+    sign = np.where(pcm < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(pcm), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+def mulaw_decode(data: bytes) -> np.ndarray:
+    """
+    Decode G.711 μ-law bytes to 16-bit samples.
+    
+    Args:
+        data (bytes): μ-law bytes
+    
+    Returns:
+        np.ndarray: int16 samples
+    """
+    codes = ~np.frombuffer(data, dtype=np.uint8).astype(np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+class StreamTranscoder:
+    """
+    Converts a stream of headerless audio chunks between formats.
+    
+    Chunks may split samples anywhere; partial samples and resampling
+    state carry over to the next chunk, so the output matches converting
+    the concatenated stream.
+    """
+    
+    def __init__(self, source: OutputFormat, target: OutputFormat):
+        """
+        Initialize the transcoder.
+        
+        Args:
+            source (OutputFormat): Format of incoming chunks
+            target (OutputFormat): Format of outgoing chunks (headerless)
+        """
+        if source.channels != 1 or target.channels != 1:
+            raise ValueError("Only mono audio can be transcoded")
+        self.source = source
+        self.target = target
+        self._pending = b""
+        self._header_checked = False
+        self._ratio = source.sample_rate / target.sample_rate
+        # Integer downsampling averages each block of samples (a simple low-pass)
+        self._factor = int(self._ratio) if self._ratio >= 1 and self._ratio.is_integer() else None
+        self._carry = np.zeros(0, dtype=np.float64)
+        self._position = 0.0
+    
+    @property
+    def passthrough(self) -> bool:
+        """Whether chunks need no conversion."""
+        return self.source.same_samples(self.target)
+    
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        Convert the next chunk.
+        
+        Args:
+            chunk (bytes): Audio in the source format
+        
+        Returns:
+            bytes: Audio in the target format (may be empty)
+        """
+        data = self._pending + chunk
+        if not self._header_checked:
+            if data[:4] == b"RIFF" or (len(data) < 4 and b"RIFF".startswith(data)):
+                offset = wav_data_offset(data) if data[:4] == b"RIFF" else None
+                if offset is None:
+                    self._pending = data
+                    return b""
+                data = data[offset:]
+            self._header_checked = True
+        
+        width = self.source.sample_width
+        usable = len(data) - len(data) % width
+        self._pending = data[usable:]
+        if not usable:
+            return b""
+        if self.passthrough:
+            return data[:usable]
+        
+        return self._encode(self._resample(self._decode(data[:usable])))
+    
+    def flush(self) -> bytes:
+        """
+        Convert any buffered samples at the end of the stream.
+        
+        Returns:
+            bytes: Remaining audio in the target format
+        """
+        if self.passthrough or self._factor is None or not len(self._carry):
+            return b""
+        # Average the final partial block
+        tail = np.array([self._carry.mean()])
+        self._carry = np.zeros(0, dtype=np.float64)
+        return self._encode(tail)
+    
+    def _decode(self, data: bytes) -> np.ndarray:
+        """Decode source bytes to float samples."""
+        if self.source.encoding == MULAW:
+            return mulaw_decode(data).astype(np.float64)
+        return np.frombuffer(data, dtype="<i2").astype(np.float64)
+    
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        """Resample float samples to the target rate, keeping state between chunks."""
+        if self.source.sample_rate == self.target.sample_rate:
+            return samples
+        
+        samples = np.concatenate([self._carry, samples])
+        if self._factor is not None:
+            blocks = len(samples) // self._factor
+            self._carry = samples[blocks * self._factor:]
+            return samples[:blocks * self._factor].reshape(blocks, self._factor).mean(axis=1)
+        
+        # Linear interpolation; the last sample is kept to interpolate across chunks
+        if len(samples) < 2:
+            self._carry = samples
+            return np.zeros(0)
+        positions = np.arange(self._position, len(samples) - 1, self._ratio)
+        output = np.interp(positions, np.arange(len(samples)), samples)
+        next_position = (positions[-1] + self._ratio) if len(positions) else self._position
+        self._position = next_position - (len(samples) - 1)
+        self._carry = samples[-1:]
+        return output
+    
+    def _encode(self, samples: np.ndarray) -> bytes:
+        """Encode float samples in the target encoding."""
+        pcm = np.clip(np.round(samples), -32768, 32767).astype(np.int16)
+        if self.target.encoding == MULAW:
+            return mulaw_encode(pcm)
+        return pcm.astype("<i2").tobytes()
+
+def transcode(audio: bytes, source: OutputFormat, target: OutputFormat) -> bytes:
+    """
+    Convert complete audio between formats.
+    
+    Args:
+        audio (bytes): Audio in the source format (a WAV header is skipped)
+        source (OutputFormat): Format of the audio
+        target (OutputFormat): Format to produce, including its container
+    
+    Returns:
+        bytes: Converted audio
+    """
+    transcoder = StreamTranscoder(source, target)
+    samples = transcoder.feed(audio) + transcoder.flush()
+    if target.container == "wav":
+        return wrap_wav(samples, target)
+    return samples
@@ -6,6 +6,8 @@ import threading
 import time
 import uuid
 import json
+import itertools
+from collections import defaultdict
 from typing import Dict, List, Set, Optional, Callable, Any, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
@@ -17,6 +19,7 @@ import concurrent.futures
 # Local imports
 from .cache_manager import TTSCacheManager, TTSCacheKey
 from .events import TTSEventEmitter, TTSEventType, TTSEvent
+from .scheduler import SchedulingClass, TTSScheduler, get_scheduler
 
 logger = logging.getLogger("tts-predictive")
 
@@ -25,6 +28,13 @@ class PredictionPriority(Enum):
     HIGH = 0    # Immediate next phrases in call flow
     MEDIUM = 1  # Likely but not immediate phrases
     LOW = 2     # Possible but less likely phrases
+    
+    @property
+    def scheduling_class(self) -> SchedulingClass:
+        """Class of the provider requests made for predictions of this priority."""
+        if self is PredictionPriority.HIGH:
+            return SchedulingClass.FIRST_FRAGMENT
+        return SchedulingClass.PREDICTION
 
 
 @dataclass
@@ -110,11 +120,18 @@ class CallState:
     current_step_id: str
     history: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Phrases predicted for steps ahead, keyed by (step_id, phrase), and whether they were used
+    predictions: Dict[Tuple[str, str], bool] = field(default_factory=dict)
+    # Bumped on every step change; predictions queued in older epochs are stale
+    epoch: int = 0
+    # Estimated seconds of synthesis queued for this call, against the synthesis budget
+    synthesis_spent: float = 0.0
     
     def update_step(self, new_step_id: str) -> None:
-        """Update the current step and add to history."""
+        """Update the current step, add to history and start a new prediction epoch."""
         self.history.append(self.current_step_id)
         self.current_step_id = new_step_id
+        self.epoch += 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
@@ -122,11 +139,131 @@ class CallState:
             "call_id": self.call_id,
             "flow_id": self.flow_id,
             "current_step_id": self.current_step_id,
+            "epoch": self.epoch,
+            "synthesis_spent": self.synthesis_spent,
             "history": self.history,
             "metadata": self.metadata
         }
 
 
+class TransitionModel:
+    """
+    Step transition counts learned from the step changes of calls.
+    
+    Counts are kept in Redis hashes (one per flow step, field = next step)
+    so that they are shared by every process and survive restarts, with a
+    local copy refreshed every ``refresh_interval`` seconds. Without Redis
+    the counts are only kept in memory.
+    """
+    
+    def __init__(self, redis_client=None, key_prefix: str = "tts:predict:transitions",
+                 prior_weight: float = 1.0, refresh_interval: float = 60.0):
+        """
+        Initialize the transition model.
+        
+        Args:
+            redis_client: Redis client for persisting counts (optional)
+            key_prefix: Prefix of the Redis hash keys
+            prior_weight: Pseudo-count given to every transition declared in the flow
+            refresh_interval: Seconds before counts are re-read from Redis
+        """
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.prior_weight = prior_weight
+        self.refresh_interval = refresh_interval
+        self._counts: Dict[Tuple[str, str], Tuple[float, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, flow_id: str, step_id: str) -> str:
+        return f"{self.key_prefix}:{flow_id}:{step_id}"
+    
+    def record_path(self, flow_id: str, path: List[str]) -> None:
+        """
+        Count the transitions along the steps a call went through.
+        
+        Args:
+            flow_id: ID of the call flow
+            path: Step IDs in the order they were visited
+        """
+        transitions = list(zip(path, path[1:]))
+        if not transitions:
+            return
+        
+        with self._lock:
+            for from_step, to_step in transitions:
+                cached = self._counts.get((flow_id, from_step))
+                if cached:
+                    cached[1][to_step] = cached[1].get(to_step, 0) + 1
+                else:
+                    self._counts[(flow_id, from_step)] = (0.0, {to_step: 1})
+        
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                for from_step, to_step in transitions:
+                    pipe.hincrby(self._key(flow_id, from_step), to_step, 1)
+                pipe.execute()
+            except Exception as e:
+                logger.error(f"Error recording transitions for flow {flow_id}: {e}")
+    
+    def counts(self, flow_id: str, step_id: str) -> Dict[str, int]:
+        """
+        Get how often each next step followed a step.
+        
+        Args:
+            flow_id: ID of the call flow
+            step_id: Step ID
+            
+        Returns:
+            Counts keyed by next step ID
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._counts.get((flow_id, step_id))
+            if cached and (not self.redis_client or now - cached[0] < self.refresh_interval):
+                return dict(cached[1])
+        
+        counts = dict(cached[1]) if cached else {}
+        if self.redis_client:
+            try:
+                stored = self.redis_client.hgetall(self._key(flow_id, step_id))
+                counts = {
+                    (k.decode() if isinstance(k, bytes) else k): int(v)
+                    for k, v in stored.items()
+                }
+            except Exception as e:
+                logger.error(f"Error loading transitions for {flow_id}:{step_id}: {e}")
+        
+        with self._lock:
+            self._counts[(flow_id, step_id)] = (now, counts)
+        return dict(counts)
+    
+    def probabilities(self, flow_id: str, step: "CallFlowStep") -> Dict[str, float]:
+        """
+        Estimate the probability of each next step.
+        
+        Transitions declared in the flow get ``prior_weight`` pseudo-counts, so
+        an unseen step starts with equal probabilities and converges on the
+        observed frequencies as calls complete.
+        
+        Args:
+            flow_id: ID of the call flow
+            step: The current step
+            
+        Returns:
+            Probabilities keyed by next step ID
+        """
+        counts = self.counts(flow_id, step.id)
+        weights = {step_id: float(count) for step_id, count in counts.items()}
+        for step_id in set(step.get_all_possible_next_steps()):
+            weights[step_id] = weights.get(step_id, 0.0) + self.prior_weight
+        
+        total = sum(weights.values())
+        if total <= 0:
+            return {}
+        return {step_id: weight / total for step_id, weight in weights.items()}
+
+
 @dataclass
 class PredictionTask:
     """A task for generating a predicted phrase."""
@@ -140,6 +277,7 @@ class PredictionTask:
     speed: float = 1.0
     created_at: float = field(default_factory=time.time)
     params: Dict[str, Any] = field(default_factory=dict)
+    epoch: int = 0
     
     def get_cache_key(self) -> str:
         """Get cache key for this prediction task."""
@@ -162,9 +300,12 @@ class PredictiveGenerator:
     
     Features:
     - Call flow definition and tracking
-    - Pattern-based prediction of next phrases
+    - Next-step probabilities learned from the step changes of calls
+    - Phrases ranked by probability of being needed times the latency saved,
+      within a synthesis budget per call
     - Background generation with prioritization
     - Integration with the caching system
+    - Precision and recall of predictions
     """
     
     def __init__(self, 
@@ -172,7 +313,12 @@ class PredictiveGenerator:
                  tts_generator: Callable,
                  max_workers: int = 2,
                  prediction_depth: int = 2,
-                 enabled: bool = True):
+                 enabled: bool = True,
+                 scheduler: Optional[TTSScheduler] = None,
+                 redis_client=None,
+                 synthesis_budget: float = 10.0,
+                 min_probability: float = 0.05,
+                 seconds_per_char: float = 0.02):
         """
         Initialize the predictive generator.
         
@@ -182,12 +328,26 @@ class PredictiveGenerator:
             max_workers: Maximum number of background generation threads
             prediction_depth: How many steps ahead to predict
             enabled: Whether predictive generation is enabled
+            scheduler: Scheduler that provider requests wait on (defaults to the process-wide one)
+            redis_client: Redis client for persisting learned step transitions (optional)
+            synthesis_budget: Estimated seconds of synthesis queued per call; the
+                phrases of the step a call is at are queued beyond it
+            min_probability: Steps less likely than this to be reached are not predicted
+            seconds_per_char: Initial estimate of synthesis time per character, refined
+                from measured generation times
         """
         self.cache_manager = cache_manager
         self.tts_generator = tts_generator
         self.max_workers = max_workers
         self.prediction_depth = prediction_depth
         self.enabled = enabled
+        self.scheduler = scheduler or get_scheduler()
+        self.synthesis_budget = synthesis_budget
+        self.min_probability = min_probability
+        self.seconds_per_char = seconds_per_char
+        
+        # Step transition probabilities learned from completed calls
+        self.transitions = TransitionModel(redis_client)
         
         # Call flows by ID
         self.call_flows: Dict[str, CallFlow] = {}
@@ -196,12 +356,19 @@ class PredictiveGenerator:
         self.call_states: Dict[str, CallState] = {}
         
         # Task queue for background generation
-        self.task_queue: "queue.PriorityQueue[Tuple[int, PredictionTask]]" = queue.PriorityQueue()
+        # Entries are (priority, sequence, task); the sequence keeps ranked order within a priority
+        self.task_queue: "queue.PriorityQueue[Tuple[int, int, PredictionTask]]" = queue.PriorityQueue()
+        self._task_sequence = itertools.count()
         
         # Track currently processing tasks to avoid duplicates
         self.processing_tasks: Set[str] = set()
         self.processing_lock = threading.RLock()
         
+        # Per cache key: the calls (and their epochs) waiting for it, and the
+        # best priority it is queued at. Calls sharing a phrase share one task.
+        self._interest: Dict[str, Dict[str, int]] = {}
+        self._queued_priority: Dict[str, int] = {}
+        
         # Thread pool for generation tasks
         self.executor = concurrent.futures.ThreadPoolExecutor(
             max_workers=max_workers,
@@ -215,8 +382,14 @@ class PredictiveGenerator:
         self.stats = {
             "tasks_generated": 0,
             "cache_hits": 0,
-            "successful_predictions": 0,
-            "total_predictions": 0,
+            "predictions_made": 0,
+            "predictions_used": 0,
+            "phrases_needed": 0,
+            "phrases_predicted": 0,
+            "deferred": 0,
+            "deduplicated": 0,
+            "stale_dropped": 0,
+            "wasted_seconds_avoided": 0.0,
             "generation_times": []
         }
         self.stats_lock = threading.RLock()
@@ -267,13 +440,15 @@ class PredictiveGenerator:
         
         return self.register_call_flow(flow_data)
     
-    def start_call(self, call_id: str, flow_id: str) -> bool:
+    def start_call(self, call_id: str, flow_id: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Start tracking a new call with a particular flow.
         
         Args:
             call_id: Unique call identifier
             flow_id: ID of the call flow to use
+            metadata: Synthesis settings of the call's phrases (provider_type,
+                voice_id, speed), so predictions match what the call requests
             
         Returns:
             Success status
@@ -293,7 +468,8 @@ class PredictiveGenerator:
         state = CallState(
             call_id=call_id,
             flow_id=flow_id,
-            current_step_id=entry_step.id
+            current_step_id=entry_step.id,
+            metadata=dict(metadata or {})
         )
         self.call_states[call_id] = state
         
@@ -302,13 +478,15 @@ class PredictiveGenerator:
             self.predict_next_phrases(call_id)
         
         logger.info(f"Started call {call_id} with flow {flow_id}")
-        self.event_emitter.emit(TTSEventType.INFO, f"Call {call_id} started with flow {flow_id}")
         return True
     
     def update_call_step(self, call_id: str, step_id: str) -> bool:
         """
         Update a call's current step and trigger new predictions.
         
+        The transition is counted at once, so calls in progress elsewhere
+        learn from it without waiting for this call to end.
+        
         Args:
             call_id: The call identifier
             step_id: The new step ID
@@ -327,8 +505,11 @@ class PredictiveGenerator:
             logger.error(f"Invalid step ID: {step_id} for call {call_id}")
             return False
         
-        # Update the call state
+        # Learn from the transition, then update the call state and score the
+        # predictions for the step it reached
+        self.transitions.record_path(state.flow_id, [state.current_step_id, step_id])
         state.update_step(step_id)
+        self._score_step(state, flow.get_step(step_id))
         
         # Generate new predictions based on updated state
         if self.enabled:
@@ -344,11 +525,32 @@ class PredictiveGenerator:
         Args:
             call_id: The call identifier
         """
-        if call_id in self.call_states:
-            # Record final state for learning (could be implemented later)
-            del self.call_states[call_id]
+        if self.call_states.pop(call_id, None):
             logger.info(f"Ended call {call_id}")
-            self.event_emitter.emit(TTSEventType.INFO, f"Call {call_id} ended")
+    
+    def _score_step(self, state: CallState, step: CallFlowStep) -> None:
+        """
+        Count the phrases a call needs on reaching a step, and which were predicted.
+        
+        Args:
+            state: The call state
+            step: The step the call reached
+        """
+        needed = len(step.phrases)
+        predicted = 0
+        used = 0
+        for phrase in step.phrases:
+            key = (step.id, phrase)
+            if key in state.predictions:
+                predicted += 1
+                if not state.predictions[key]:
+                    state.predictions[key] = True
+                    used += 1
+        
+        with self.stats_lock:
+            self.stats["phrases_needed"] += needed
+            self.stats["phrases_predicted"] += predicted
+            self.stats["predictions_used"] += used
     
     def predict_next_phrases(self, call_id: str) -> List[str]:
         """
@@ -374,64 +576,48 @@ class PredictiveGenerator:
         if not current_step:
             return []
         
-        queued_phrases = []
+        provider_type = state.metadata.get("provider_type", "default")
+        voice_id = state.metadata.get("voice_id", "default")
+        speed = state.metadata.get("speed", 1.0)
         
-        # Use prediction depth to determine how far ahead to look
-        self._predict_ahead(
-            flow=flow,
-            call_id=call_id,
-            start_step=current_step,
-            depth=0,
-            max_depth=self.prediction_depth,
-            queued_phrases=queued_phrases,
-            visited=set()
-        )
-        
-        return queued_phrases
-    
-    def _predict_ahead(self, flow: CallFlow, call_id: str, start_step: CallFlowStep, 
-                      depth: int, max_depth: int, queued_phrases: List[str], 
-                      visited: Set[str]) -> None:
-        """
-        Recursively predict and queue phrases ahead in the call flow.
-        
-        Args:
-            flow: The call flow
-            call_id: The call identifier
-            start_step: The starting step for prediction
-            depth: Current recursion depth
-            max_depth: Maximum recursion depth
-            queued_phrases: List to collect queued phrases
-            visited: Set of visited step IDs to prevent cycles
-        """
-        if depth > max_depth or start_step.id in visited:
-            return
-        
-        visited.add(start_step.id)
-        
-        # Queue all phrases in this step with priority based on depth
-        priority = PredictionPriority.HIGH if depth == 0 else (
-            PredictionPriority.MEDIUM if depth == 1 else PredictionPriority.LOW
-        )
-        
-        for phrase in start_step.phrases:
-            # Get default provider and voice from call state metadata
-            state = self.call_states.get(call_id)
-            if not state:
+        # The current step's phrases are needed now; steps ahead are ranked by
+        # probability of being reached times the synthesis latency they would save
+        candidates = [(float("inf"), 1.0, current_step.id, phrase) for phrase in current_step.phrases]
+        for step_id, probability in self._reach_probabilities(flow, state.flow_id, current_step).items():
+            step = flow.get_step(step_id)
+            if step is None or step_id == current_step.id or probability < self.min_probability:
                 continue
-                
-            provider_type = state.metadata.get("provider_type", "default")
-            voice_id = state.metadata.get("voice_id", "default")
-            speed = state.metadata.get("speed", 1.0)
+            for phrase in step.phrases:
+                candidates.append((probability * self._estimate_latency(phrase), probability, step_id, phrase))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        
+        queued_phrases = []
+        for score, probability, step_id, phrase in candidates:
+            ahead = step_id != current_step.id
             
-            # Skip if already in cache
+            # Cached phrases are predicted at no cost
             cache_key = TTSCacheKey.generate(phrase, provider_type, voice_id, speed)
             if self.cache_manager.get(cache_key):
                 with self.stats_lock:
                     self.stats["cache_hits"] += 1
+                if ahead:
+                    self._record_prediction(state, step_id, phrase)
                 continue
             
-            # Queue for generation
+            # Phrases predicted for this call before were paid for then
+            if (step_id, phrase) not in state.predictions:
+                cost = self._estimate_latency(phrase)
+                if ahead and state.synthesis_spent + cost > self.synthesis_budget:
+                    continue
+                state.synthesis_spent += cost
+            
+            if not ahead:
+                priority = PredictionPriority.HIGH
+            elif probability >= 0.5:
+                priority = PredictionPriority.MEDIUM
+            else:
+                priority = PredictionPriority.LOW
+            
             self._queue_prediction_task(
                 call_id=call_id,
                 phrase=phrase,
@@ -439,32 +625,73 @@ class PredictiveGenerator:
                 voice_id=voice_id,
                 speed=speed,
                 priority=priority,
-                step_id=start_step.id
+                step_id=step_id,
+                epoch=state.epoch
             )
+            if ahead:
+                self._record_prediction(state, step_id, phrase)
             queued_phrases.append(phrase)
         
-        # Recursively process next steps
-        next_step_ids = start_step.get_all_possible_next_steps()
-        for next_id in next_step_ids:
-            next_step = flow.get_step(next_id)
-            if next_step:
-                self._predict_ahead(
-                    flow=flow,
-                    call_id=call_id, 
-                    start_step=next_step,
-                    depth=depth + 1,
-                    max_depth=max_depth,
-                    queued_phrases=queued_phrases,
-                    visited=visited.copy()  # Copy to allow different recursion paths
-                )
+        return queued_phrases
+    
+    def _reach_probabilities(self, flow: CallFlow, flow_id: str,
+                             start_step: CallFlowStep) -> Dict[str, float]:
+        """
+        Estimate the probability of reaching each step within the prediction depth.
+        
+        Walks the learned transition probabilities for ``prediction_depth``
+        steps; a step reachable at several depths sums its probabilities,
+        capped at 1.
+        
+        Args:
+            flow: The call flow
+            flow_id: ID of the call flow
+            start_step: The call's current step
+            
+        Returns:
+            Probabilities keyed by step ID
+        """
+        reached: Dict[str, float] = defaultdict(float)
+        frontier = {start_step.id: 1.0}
+        for _ in range(self.prediction_depth):
+            next_frontier: Dict[str, float] = defaultdict(float)
+            for step_id, probability in frontier.items():
+                step = flow.get_step(step_id)
+                if step is None:
+                    continue
+                for next_id, transition in self.transitions.probabilities(flow_id, step).items():
+                    next_frontier[next_id] += probability * transition
+            
+            for step_id, probability in next_frontier.items():
+                reached[step_id] = min(1.0, reached[step_id] + probability)
+            frontier = next_frontier
+        
+        return dict(reached)
+    
+    def _estimate_latency(self, phrase: str) -> float:
+        """Estimate the seconds a caller would wait for a phrase that was not predicted."""
+        return max(0.1, len(phrase) * self.seconds_per_char)
+    
+    def _record_prediction(self, state: CallState, step_id: str, phrase: str) -> None:
+        """Remember a phrase predicted for a step ahead, once per call."""
+        key = (step_id, phrase)
+        if key not in state.predictions:
+            state.predictions[key] = False
+            with self.stats_lock:
+                self.stats["predictions_made"] += 1
     
     def _queue_prediction_task(self, call_id: str, phrase: str, 
                               provider_type: str, voice_id: str,
                               speed: float, priority: PredictionPriority,
-                              step_id: str, params: Dict[str, Any] = None) -> str:
+                              step_id: str, params: Dict[str, Any] = None,
+                              epoch: int = 0) -> Optional[str]:
         """
         Queue a prediction task for background processing.
         
+        If the phrase is already queued (for any call) at the same or a higher
+        priority, or is being generated, the call is only registered as
+        waiting for it.
+        
         Args:
             call_id: The call identifier
             phrase: Text to synthesize
@@ -474,9 +701,10 @@ class PredictiveGenerator:
             priority: Task priority
             step_id: Source step ID
             params: Additional parameters
+            epoch: The call's prediction epoch
             
         Returns:
-            Task ID
+            Task ID, or None if an existing task covers the phrase
         """
         if params is None:
             params = {}
@@ -491,14 +719,22 @@ class PredictiveGenerator:
             speed=speed,
             priority=priority,
             step_id=step_id,
-            params=params
+            params=params,
+            epoch=epoch
         )
         
-        # Queue task with priority
-        self.task_queue.put((priority.value, task))
+        cache_key = task.get_cache_key()
+        with self.processing_lock:
+            self._interest.setdefault(cache_key, {})[call_id] = epoch
+            queued = self._queued_priority.get(cache_key)
+            if cache_key in self.processing_tasks or (queued is not None and queued <= priority.value):
+                with self.stats_lock:
+                    self.stats["deduplicated"] += 1
+                return None
+            self._queued_priority[cache_key] = priority.value
         
-        with self.stats_lock:
-            self.stats["total_predictions"] += 1
+        # Queue task with priority
+        self.task_queue.put((priority.value, next(self._task_sequence), task))
         
         logger.debug(f"Queued prediction for '{phrase[:30]}...' with {priority.name} priority")
         return task_id
@@ -509,41 +745,87 @@ class PredictiveGenerator:
             try:
                 # Try to get a task with timeout
                 try:
-                    _, task = self.task_queue.get(timeout=1.0)
+                    _, _, task = self.task_queue.get(timeout=1.0)
                 except queue.Empty:
                     continue
                 
-                # Skip if call no longer exists
-                if task.call_id not in self.call_states:
-                    self.task_queue.task_done()
-                    continue
-                
-                # Check if already in cache (could have been added since queueing)
-                cache_key = task.get_cache_key()
-                if self.cache_manager.get(cache_key):
-                    with self.stats_lock:
-                        self.stats["cache_hits"] += 1
+                try:
+                    self._dispatch_task(task)
+                finally:
                     self.task_queue.task_done()
-                    continue
-                
-                # Check if already processing
-                with self.processing_lock:
-                    if cache_key in self.processing_tasks:
-                        self.task_queue.task_done()
-                        continue
-                    self.processing_tasks.add(cache_key)
-                
-                # Submit to thread pool
-                self.executor.submit(
-                    self._generate_audio, 
-                    task
-                )
-                
-                self.task_queue.task_done()
                 
             except Exception as e:
                 logger.error(f"Error in prediction worker: {e}")
     
+    def _dispatch_task(self, task: PredictionTask) -> bool:
+        """
+        Submit a dequeued task to the thread pool unless it is obsolete.
+        
+        Args:
+            task: The prediction task
+            
+        Returns:
+            True if the task was submitted for generation
+        """
+        cache_key = task.get_cache_key()
+        with self.processing_lock:
+            # Skip entries superseded by a higher-priority entry for the same phrase
+            if self._queued_priority.get(cache_key) != task.priority.value:
+                return False
+            del self._queued_priority[cache_key]
+            
+            # Drop the task if every call waiting for it has moved on or ended
+            if self._drop_if_stale(task):
+                return False
+        
+        # Check if already in cache (could have been added since queueing)
+        if self.cache_manager.get(cache_key):
+            with self.stats_lock:
+                self.stats["cache_hits"] += 1
+            with self.processing_lock:
+                self._interest.pop(cache_key, None)
+            return False
+        
+        # Check if already processing
+        with self.processing_lock:
+            if cache_key in self.processing_tasks:
+                return False
+            self.processing_tasks.add(cache_key)
+        
+        # Submit to thread pool
+        self.executor.submit(self._generate_audio, task)
+        return True
+    
+    def _is_wanted(self, cache_key: str) -> bool:
+        """Whether a call is still in the epoch in which it asked for a phrase."""
+        for call_id, epoch in self._interest.get(cache_key, {}).items():
+            state = self.call_states.get(call_id)
+            if state is not None and state.epoch == epoch:
+                return True
+        return False
+    
+    def _drop_if_stale(self, task: PredictionTask) -> bool:
+        """
+        Drop a task that no call needs anymore. Call with processing_lock held.
+        
+        Args:
+            task: The prediction task
+            
+        Returns:
+            True if the task was dropped
+        """
+        cache_key = task.get_cache_key()
+        if self._is_wanted(cache_key):
+            return False
+        
+        self._interest.pop(cache_key, None)
+        self.processing_tasks.discard(cache_key)
+        with self.stats_lock:
+            self.stats["stale_dropped"] += 1
+            self.stats["wasted_seconds_avoided"] += self._estimate_latency(task.phrase)
+        logger.debug(f"Dropped stale prediction for '{task.phrase[:30]}...' (epoch {task.epoch})")
+        return True
+    
     def _generate_audio(self, task: PredictionTask) -> None:
         """
         Generate TTS audio for a prediction task.
@@ -551,14 +833,32 @@ class PredictiveGenerator:
         Args:
             task: The prediction task
         """
+        # Wait behind live turns; nested requests in tts_generator inherit this slot's class
+        permit = self.scheduler.acquire(task.provider_type, task.priority.scheduling_class)
+        if permit is None:
+            logger.debug(f"Deferred prediction for '{task.phrase[:30]}...'")
+            with self.stats_lock:
+                self.stats["deferred"] += 1
+            with self.processing_lock:
+                self.processing_tasks.discard(task.get_cache_key())
+                self._interest.pop(task.get_cache_key(), None)
+            return
+        
+        # Calls may have moved on while the task waited in the executor or for a slot
+        with self.processing_lock:
+            if self._drop_if_stale(task):
+                permit.release()
+                return
+        
         try:
             start_time = time.time()
             
             # Generate TTS audio
-            self.event_emitter.emit(
-                TTSEventType.GENERATION_START, 
-                f"Predictive generation for: {task.phrase[:50]}...",
-                extra={"call_id": task.call_id, "predictive": True}
+            self.event_emitter.create_and_emit(
+                TTSEventType.GENERATION_START,
+                provider_type=task.provider_type,
+                text_length=len(task.phrase),
+                additional_data={"call_id": task.call_id, "predictive": True}
             )
             
             audio_data = self.tts_generator(
@@ -575,20 +875,24 @@ class PredictiveGenerator:
                 generation_time = time.time() - start_time
                 with self.stats_lock:
                     self.stats["tasks_generated"] += 1
-                    self.stats["successful_predictions"] += 1
                     # Keep only the last 100 generation times for stats
                     self.stats["generation_times"].append(generation_time)
                     if len(self.stats["generation_times"]) > 100:
                         self.stats["generation_times"].pop(0)
+                    # Refine the per-character estimate used to rank phrases
+                    self.seconds_per_char += 0.1 * (
+                        generation_time / max(1, len(task.phrase)) - self.seconds_per_char
+                    )
                 
-                self.event_emitter.emit(
-                    TTSEventType.GENERATION_COMPLETE, 
-                    f"Predictive generation complete: {len(audio_data)} bytes in {generation_time:.2f}s",
-                    extra={
-                        "call_id": task.call_id, 
+                self.event_emitter.create_and_emit(
+                    TTSEventType.GENERATION_END,
+                    provider_type=task.provider_type,
+                    duration_ms=generation_time * 1000,
+                    text_length=len(task.phrase),
+                    additional_data={
+                        "call_id": task.call_id,
                         "predictive": True,
-                        "audio_size": len(audio_data),
-                        "generation_time": generation_time
+                        "audio_size": len(audio_data)
                     }
                 )
                 
@@ -598,24 +902,28 @@ class PredictiveGenerator:
                 )
             else:
                 logger.warning(f"Failed to generate prediction for: {task.phrase[:50]}...")
-                self.event_emitter.emit(
-                    TTSEventType.ERROR, 
-                    f"Predictive generation failed for: {task.phrase[:50]}...",
-                    extra={"call_id": task.call_id, "predictive": True}
+                self.event_emitter.create_and_emit(
+                    TTSEventType.GENERATION_ERROR,
+                    provider_type=task.provider_type,
+                    error_message=f"Predictive generation failed for: {task.phrase[:50]}...",
+                    additional_data={"call_id": task.call_id, "predictive": True}
                 )
         
         except Exception as e:
             logger.error(f"Error in predictive generation: {e}")
-            self.event_emitter.emit(
-                TTSEventType.ERROR, 
-                f"Error in predictive generation: {str(e)}",
-                extra={"call_id": task.call_id, "predictive": True}
+            self.event_emitter.create_and_emit(
+                TTSEventType.GENERATION_ERROR,
+                provider_type=task.provider_type,
+                error_message=f"Error in predictive generation: {str(e)}",
+                additional_data={"call_id": task.call_id, "predictive": True}
             )
         
         finally:
+            permit.release()
             # Remove from processing set
             with self.processing_lock:
                 self.processing_tasks.discard(task.get_cache_key())
+                self._interest.pop(task.get_cache_key(), None)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -627,14 +935,14 @@ class PredictiveGenerator:
         with self.stats_lock:
             stats = dict(self.stats)
             
-            # Calculate additional metrics
-            total_preds = stats["total_predictions"]
-            if total_preds > 0:
-                stats["success_rate"] = stats["successful_predictions"] / total_preds
-                stats["cache_hit_rate"] = stats["cache_hits"] / total_preds
-            else:
-                stats["success_rate"] = 0
-                stats["cache_hit_rate"] = 0
+            # Precision: share of predicted phrases that a call went on to need.
+            # Recall: share of needed phrases that had been predicted.
+            made = stats["predictions_made"]
+            needed = stats["phrases_needed"]
+            stats["precision"] = stats["predictions_used"] / made if made else 0
+            stats["recall"] = stats["phrases_predicted"] / needed if needed else 0
+            looked_up = stats["cache_hits"] + stats["tasks_generated"]
+            stats["cache_hit_rate"] = stats["cache_hits"] / looked_up if looked_up else 0
             
             if stats["generation_times"]:
                 stats["avg_generation_time"] = sum(stats["generation_times"]) / len(stats["generation_times"])
@@ -1,68 +1,66 @@
 #!/usr/bin/env python
 # Provider Factory Module for Morning Coffee TTS
 
+import importlib
 import logging
-from typing import Dict, Any, Optional, Type, List
+import threading
+from typing import Dict, Any, Optional, Type, List, Set
 
 from .base_provider import BaseTTSProvider
-from .providers.openai_provider import OpenAITTSProvider
-
-# Import new providers
-try:
-    from .providers.kokoro_provider import KokoroProvider
-except ImportError:
-    logging.warning("KokoroProvider could not be imported. Make sure RealtimeTTS is installed.")
-    KokoroProvider = None
-
-try:
-    from .providers.google_provider import GoogleProvider
-except ImportError:
-    logging.warning("GoogleProvider could not be imported. Make sure google-cloud-texttospeech is installed.")
-    GoogleProvider = None
-
-try:
-    from .providers.murf_provider import MurfProvider
-except ImportError:
-    logging.warning("MurfProvider could not be imported.")
-    MurfProvider = None
-
-try:
-    from .providers.elevenlabs_provider import ElevenlabsProvider
-except ImportError:
-    logging.warning("ElevenlabsProvider could not be imported.")
-    ElevenlabsProvider = None
-
-try:
-    from .providers.azure_provider import AzureProvider
-except ImportError:
-    logging.warning("AzureProvider could not be imported.")
-    AzureProvider = None
 
 logger = logging.getLogger("tts-factory")
 
+# Provider modules are imported when a provider is first requested, so a
+# process only loads the SDKs of the providers it actually uses
+_PROVIDER_MODULES = {
+    "openai": (".providers.openai_provider", "OpenAITTSProvider", "Make sure openai is installed."),
+    "kokoro": (".providers.kokoro_provider", "KokoroProvider", "Make sure RealtimeTTS is installed."),
+    "google": (".providers.google_provider", "EnhancedGoogleProvider", "Make sure google-cloud-texttospeech is installed."),
+    "murf": (".providers.murf_provider", "MurfProvider", ""),
+    "elevenlabs": (".providers.elevenlabs_provider", "ElevenlabsProvider", ""),
+    "azure": (".providers.azure_provider", "AzureProvider", ""),
+}
+
 class TTSProviderFactory:
     """Factory class for creating TTS provider instances."""
     
-    # Registry of available providers
-    _providers = {
-        "openai": OpenAITTSProvider  # Register the OpenAI provider
-    }
+    # Registry of loaded and registered providers
+    _providers: Dict[str, Type[BaseTTSProvider]] = {}
     
-    # Add other providers if available
-    if KokoroProvider:
-        _providers["kokoro"] = KokoroProvider
+    # Known providers whose module could not be imported
+    _unavailable: Set[str] = set()
+    _import_lock = threading.Lock()
     
-    if GoogleProvider:
-        _providers["google"] = GoogleProvider
-    
-    if MurfProvider:
-        _providers["murf"] = MurfProvider
-    
-    if ElevenlabsProvider:
-        _providers["elevenlabs"] = ElevenlabsProvider
-    
-    if AzureProvider:
-        _providers["azure"] = AzureProvider
+    @classmethod
+    def _load_provider(cls, name: str) -> Optional[Type[BaseTTSProvider]]:
+        """
+        Get a provider class, importing its module on first use.
+        
+        Args:
+            name (str): Provider name
+            
+        Returns:
+            Optional[Type[BaseTTSProvider]]: Provider class, or None if unknown or not importable
+        """
+        provider_class = cls._providers.get(name)
+        if provider_class or name not in _PROVIDER_MODULES:
+            return provider_class
+        
+        with cls._import_lock:
+            if name in cls._providers or name in cls._unavailable:
+                return cls._providers.get(name)
+            
+            module_name, class_name, hint = _PROVIDER_MODULES[name]
+            try:
+                module = importlib.import_module(module_name, package=__package__)
+                cls._providers[name] = getattr(module, class_name)
+            except (ImportError, AttributeError):
+                logger.warning(f"{class_name} could not be imported. {hint}".strip())
+                cls._unavailable.add(name)
+                return None
+            
+            logger.debug(f"Loaded TTS provider module for {name}")
+            return cls._providers[name]
     
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[BaseTTSProvider]) -> None:
@@ -78,7 +76,8 @@ class TTSProviderFactory:
     
     @classmethod
     def create_provider(cls, provider_type: str, redis_client=None, 
-                        config: Optional[Dict[str, Any]] = None) -> BaseTTSProvider:
+                        config: Optional[Dict[str, Any]] = None,
+                        event_emitter=None) -> BaseTTSProvider:
         """
         Create and return a TTS provider based on type.
         
@@ -86,6 +85,7 @@ class TTSProviderFactory:
             provider_type (str): Type of provider to create
             redis_client: Redis client for caching (optional)
             config (Optional[Dict[str, Any]]): Provider configuration
+            event_emitter: Event emitter for providers that report their own events (optional)
             
         Returns:
             BaseTTSProvider: Instantiated provider
@@ -96,23 +96,24 @@ class TTSProviderFactory:
         config = config or {}
         provider_type = provider_type.lower()
         
-        if provider_type not in cls._providers:
-            available = ", ".join(cls._providers.keys())
+        provider_class = cls._load_provider(provider_type)
+        if provider_class is None:
+            available = ", ".join(cls.get_available_providers())
             raise ValueError(f"Unknown provider type: {provider_type}. Available providers: {available}")
         
-        provider_class = cls._providers[provider_type]
-        
         # Filter out problematic parameters like 'proxies' that might cause issues
         filtered_config = {}
         for key, value in config.items():
             if key != 'proxies':
                 filtered_config[key] = value
         
-        # Pass redis_client if the provider supports it
-        if "redis_client" in provider_class.__init__.__code__.co_varnames:
-            provider = provider_class(redis_client=redis_client, **filtered_config)
-        else:
-            provider = provider_class(**filtered_config)
+        # Pass redis_client and event_emitter if the provider supports them
+        init_params = provider_class.__init__.__code__.co_varnames
+        if "redis_client" in init_params:
+            filtered_config["redis_client"] = redis_client
+        if event_emitter is not None and "event_emitter" in init_params:
+            filtered_config["event_emitter"] = event_emitter
+        provider = provider_class(**filtered_config)
         
         logger.info(f"Created TTS provider: {provider_type}")
         return provider
@@ -122,7 +123,11 @@ class TTSProviderFactory:
         """
         Get list of available provider types.
         
+        Imports every known provider module that has not been loaded yet.
+        
         Returns:
             List[str]: List of available provider names
         """
+        for name in _PROVIDER_MODULES:
+            cls._load_provider(name)
         return list(cls._providers.keys()) 
\ No newline at end of file
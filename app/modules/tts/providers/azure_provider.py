@@ -4,18 +4,20 @@
 import logging
 import time
 import traceback
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Generator
 import requests
 import xml.etree.ElementTree as ET
 import uuid
 
 import pyaudio
 
-from ..base_provider import BaseTTSProvider
+from ..base_provider import VoiceSpec
+from ..http_streaming import HTTPStreamingProvider, parse_pcm_sample_rate
+from ..output_format import OutputFormat, MULAW, PCM_S16LE
 
 logger = logging.getLogger("azure-provider")
 
-class AzureProvider(BaseTTSProvider):
+class AzureProvider(HTTPStreamingProvider):
     """TTS provider using Microsoft Azure Cognitive Services Speech API."""
     
     def __init__(self, redis_client=None, **kwargs):
@@ -27,6 +29,10 @@ class AzureProvider(BaseTTSProvider):
             **kwargs: Additional configuration options including:
                 - speech_key: Azure Speech service key (required)
                 - speech_region: Azure Speech service region (required)
+                - telephony: Stream 8 kHz PCM for phone calls (default: False)
+                - stream_format: Streaming output format (default: 'raw-8khz-16bit-mono-pcm'
+                  for telephony, otherwise 'raw-24khz-16bit-mono-pcm')
+                - pool_size: Pooled HTTP connections (default: 10)
         """
         self.speech_key = kwargs.get("speech_key")
         self.speech_region = kwargs.get("speech_region")
@@ -37,6 +43,14 @@ class AzureProvider(BaseTTSProvider):
         self.api_url = f"https://{self.speech_region}.tts.speech.microsoft.com/cognitiveservices/v1"
         self.current_voice = None
         
+        # Streaming output: headerless PCM, at the phone network's native rate for telephony
+        self.telephony = kwargs.get("telephony", False)
+        self.stream_format = kwargs.get(
+            "stream_format",
+            "raw-8khz-16bit-mono-pcm" if self.telephony else "raw-24khz-16bit-mono-pcm"
+        )
+        self._init_http(pool_size=kwargs.get("pool_size", 10), timeout=kwargs.get("timeout", 30.0))
+        
         # Default voice configuration
         self.voice_config = {
             "name": "en-US-JennyNeural",
@@ -51,7 +65,8 @@ class AzureProvider(BaseTTSProvider):
         logger.info("Azure TTS provider initialized")
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech using Azure Speech API.
         
@@ -59,6 +74,7 @@ class AzureProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -67,29 +83,22 @@ class AzureProvider(BaseTTSProvider):
             if not text:
                 return None
             
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
+            spec = self.resolve_voice(voice_id, speed)
             
             logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
             
             # Create SSML document
-            ssml = self._create_ssml(text, speed)
-            
-            # Prepare API request
-            headers = {
-                "Ocp-Apim-Subscription-Key": self.speech_key,
-                "Content-Type": "application/ssml+xml",
-                "X-Microsoft-OutputFormat": "riff-24khz-16bit-mono-pcm",
-                "User-Agent": "MorningCoffeeApplication"
-            }
+            ssml = self._create_ssml(text, spec)
             
             # Make API request
             start_time = time.time()
-            response = requests.post(
+            response = self.http.post(
                 self.api_url,
-                headers=headers,
-                data=ssml.encode('utf-8')
+                headers=self._synthesis_headers(
+                    self._format_name(output_format) if output_format else "riff-24khz-16bit-mono-pcm"
+                ),
+                data=ssml.encode('utf-8'),
+                timeout=self.http_timeout
             )
             response.raise_for_status()
             
@@ -106,19 +115,104 @@ class AzureProvider(BaseTTSProvider):
             logger.debug(traceback.format_exc())
             return None
     
-    def _create_ssml(self, text: str, speed: float) -> str:
+    def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
         """
-        Create SSML document for Azure TTS.
+        Stream speech from Azure Speech API.
+        
+        Audio is requested in ``output_format`` (``stream_format`` by default)
+        and yielded as the service sends it, instead of waiting for the
+        complete response.
         
         Args:
             text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
+            
+        Returns:
+            Generator[bytes, None, None]: Generator of PCM chunks
+            
+        Raises:
+            requests.exceptions.RequestException: If the streaming request fails
+        """
+        if not text:
+            return
+        
+        ssml = self._create_ssml(text, self.resolve_voice(voice_id, speed))
+        try:
+            yield from self._stream_pcm(
+                "POST",
+                self.api_url,
+                sample_width=output_format.sample_width if output_format else 2,
+                headers=self._synthesis_headers(
+                    self._format_name(output_format) if output_format else self.stream_format
+                ),
+                data=ssml.encode('utf-8')
+            )
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"API streaming request error: {req_err}")
+            raise
+    
+    def get_output_formats(self) -> List[OutputFormat]:
+        """
+        Get the formats Azure can produce natively.
+        
+        Returns:
+            List[OutputFormat]: 8 kHz μ-law and 8-48 kHz 16-bit PCM
+        """
+        return [OutputFormat(MULAW, 8000)] + [
+            OutputFormat(PCM_S16LE, rate) for rate in (8000, 16000, 24000, 48000)
+        ]
+    
+    @staticmethod
+    def _format_name(output_format: OutputFormat) -> str:
+        """
+        Get the headerless Azure output format name for a format.
+        
+        Args:
+            output_format (OutputFormat): Output format
+            
+        Returns:
+            str: Name such as "raw-8khz-8bit-mono-mulaw"
+        """
+        rate = output_format.sample_rate // 1000
+        if output_format.encoding == MULAW:
+            return f"raw-{rate}khz-8bit-mono-mulaw"
+        return f"raw-{rate}khz-16bit-mono-pcm"
+    
+    def _synthesis_headers(self, output_format: str) -> Dict[str, str]:
+        """
+        Build headers for a synthesis request.
+        
+        Args:
+            output_format (str): Azure output format name
+            
+        Returns:
+            Dict[str, str]: Request headers
+        """
+        return {
+            "Ocp-Apim-Subscription-Key": self.speech_key,
+            "Content-Type": "application/ssml+xml",
+            "X-Microsoft-OutputFormat": output_format,
+            "User-Agent": "MorningCoffeeApplication"
+        }
+    
+    def _create_ssml(self, text: str, spec: VoiceSpec) -> str:
+        """
+        Create SSML document for Azure TTS.
+        
+        Args:
+            text (str): Text to convert to speech
+            spec (VoiceSpec): Resolved voice parameters
             
         Returns:
             str: SSML document
         """
-        voice_name = self.voice_config["name"]
-        style = self.voice_config.get("style", "")
+        voice_name = spec.voice_id
+        style = spec.style or ""
+        speed = spec.speed
         
         # Format rate attribute based on speed
         rate_str = ""
@@ -162,7 +256,8 @@ class AzureProvider(BaseTTSProvider):
                 }
                 
                 # Get authentication token
-                token_response = requests.post(token_url, headers=token_headers)
+                token_response = self.http.post(token_url, headers=token_headers,
+                                                timeout=self.http_timeout)
                 token_response.raise_for_status()
                 access_token = token_response.text
                 
@@ -172,7 +267,8 @@ class AzureProvider(BaseTTSProvider):
                     "Authorization": f"Bearer {access_token}"
                 }
                 
-                response = requests.get(voices_url, headers=voices_headers)
+                response = self.http.get(voices_url, headers=voices_headers,
+                                         timeout=self.http_timeout)
                 response.raise_for_status()
                 
                 voices_data = response.json()
@@ -206,9 +302,41 @@ class AzureProvider(BaseTTSProvider):
         
         return {"voices": self._voices}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters without touching provider state.
+        
+        Voice IDs can include a style: "en-US-JennyNeural:cheerful".
+        
+        Args:
+            voice_id (Optional[str]): Voice identifier, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters for one request
+        """
+        config = self.voice_config
+        if not voice_id:
+            return VoiceSpec(voice_id=config["name"], speed=speed, style=config.get("style") or None)
+        
+        parts = voice_id.split(":")
+        base_voice_id = parts[0]
+        style = parts[1] if len(parts) > 1 else ""
+        
+        # Validate against voice metadata only if it is already cached
+        if self._voices:
+            if base_voice_id not in self._voices:
+                logger.warning(f"Voice {base_voice_id} not found in available voices, using {config['name']}")
+                return VoiceSpec(voice_id=config["name"], speed=speed, style=config.get("style") or None)
+            if style and style not in self._voices[base_voice_id].get("styles", []):
+                logger.warning(f"Style {style} not available for voice {base_voice_id}")
+                style = ""  # Reset style if not available
+        
+        return VoiceSpec(voice_id=base_voice_id, speed=speed, style=style or None)
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set the voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -217,36 +345,20 @@ class AzureProvider(BaseTTSProvider):
             bool: True if successful, False otherwise
         """
         try:
-            # Parse voice ID format (can include style): "en-US-JennyNeural:cheerful"
-            parts = voice_id.split(":")
-            base_voice_id = parts[0]
-            style = parts[1] if len(parts) > 1 else ""
-            
-            # Load voices if not already loaded
-            if self._voices is None:
-                self.get_voices()
-            
-            # Check if the voice exists
-            if base_voice_id not in self._voices:
+            voices = self.cached_voices()
+            base_voice_id = voice_id.split(":")[0]
+            if base_voice_id not in voices:
                 logger.warning(f"Voice {base_voice_id} not found in available voices")
                 return False
             
-            # Check if the style is valid
-            if style:
-                voice_info = self._voices[base_voice_id]
-                styles = voice_info.get("styles", [])
-                
-                if style not in styles:
-                    logger.warning(f"Style {style} not available for voice {base_voice_id}")
-                    style = ""  # Reset style if not available
-            
-            # Update voice configuration
-            voice_info = self._voices[base_voice_id]
+            # Replace rather than mutate so concurrent requests see a consistent config
+            spec = self.resolve_voice(voice_id)
+            voice_info = voices[base_voice_id]
             self.voice_config = {
                 "name": base_voice_id,
                 "language": voice_info["language"],
                 "gender": voice_info["gender"],
-                "style": style
+                "style": spec.style or ""
             }
             
             self.current_voice = voice_id
@@ -272,10 +384,7 @@ class AzureProvider(BaseTTSProvider):
         base_voice_id = parts[0]
         
         # Check if voice exists
-        if self._voices is None:
-            self.get_voices()
-        
-        return base_voice_id in self._voices
+        return base_voice_id in self.cached_voices()
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -291,7 +400,8 @@ class AzureProvider(BaseTTSProvider):
                 "Ocp-Apim-Subscription-Key": self.speech_key
             }
             
-            token_response = requests.post(token_url, headers=token_headers)
+            token_response = self.http.post(token_url, headers=token_headers,
+                                            timeout=self.http_timeout)
             token_response.raise_for_status()
             
             return {
@@ -315,4 +425,4 @@ class AzureProvider(BaseTTSProvider):
         Returns:
             Tuple[int, int, int]: Audio format, number of channels, and sample rate
         """
-        return pyaudio.paInt16, 1, 24000  # 16-bit, mono, 24kHz 
\ No newline at end of file
+        return pyaudio.paInt16, 1, parse_pcm_sample_rate(self.stream_format)  # 16-bit, mono 
\ No newline at end of file
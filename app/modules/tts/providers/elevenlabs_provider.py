@@ -4,18 +4,23 @@
 import logging
 import time
 import traceback
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Generator
 import requests
 
 import pyaudio
 
-from ..base_provider import BaseTTSProvider
+from ..base_provider import VoiceSpec
+from ..http_streaming import HTTPStreamingProvider, parse_pcm_sample_rate
+from ..output_format import OutputFormat, MULAW, PCM_S16LE
 
 logger = logging.getLogger("elevenlabs-provider")
 
-class ElevenlabsProvider(BaseTTSProvider):
+class ElevenlabsProvider(HTTPStreamingProvider):
     """TTS provider using ElevenLabs API."""
     
+    # Per-voice settings sent with every request
+    VOICE_SETTINGS = ("stability", "similarity_boost", "style", "use_speaker_boost")
+    
     def __init__(self, redis_client=None, **kwargs):
         """
         Initialize ElevenLabs provider.
@@ -25,6 +30,11 @@ class ElevenlabsProvider(BaseTTSProvider):
             **kwargs: Additional configuration options including:
                 - api_key: ElevenLabs API key
                 - model_id: Model ID to use (default: 'eleven_monolingual_v1')
+                - telephony: Stream 8 kHz PCM for phone calls (default: False)
+                - output_format: Streaming output format (default: 'pcm_8000' for
+                  telephony, otherwise 'pcm_24000')
+                - optimize_streaming_latency: Latency optimization level 0-4 (default: 3)
+                - pool_size: Pooled HTTP connections (default: 10)
         """
         self.api_key = kwargs.get("api_key")
         if not self.api_key:
@@ -34,6 +44,12 @@ class ElevenlabsProvider(BaseTTSProvider):
         self.current_voice = None
         self.model_id = kwargs.get("model_id", "eleven_monolingual_v1")
         
+        # Streaming output: raw PCM, at the phone network's native rate for telephony
+        self.telephony = kwargs.get("telephony", False)
+        self.output_format = kwargs.get("output_format", "pcm_8000" if self.telephony else "pcm_24000")
+        self.optimize_streaming_latency = kwargs.get("optimize_streaming_latency", 3)
+        self._init_http(pool_size=kwargs.get("pool_size", 10), timeout=kwargs.get("timeout", 30.0))
+        
         # Default voice configuration
         self.voice_config = {
             "voice_id": "21m00Tcm4TlvDq8ikWAM",  # Rachel voice
@@ -49,7 +65,8 @@ class ElevenlabsProvider(BaseTTSProvider):
         logger.info("ElevenLabs TTS provider initialized")
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech using ElevenLabs API.
         
@@ -57,6 +74,7 @@ class ElevenlabsProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -65,48 +83,21 @@ class ElevenlabsProvider(BaseTTSProvider):
             if not text:
                 return None
             
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
+            spec = self.resolve_voice(voice_id, speed)
             
             logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
             
             # Prepare API request
-            headers = {
-                "xi-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "Accept": "audio/wav"
-            }
-            
-            # Use the configured voice_id
-            voice_id = self.voice_config["voice_id"]
-            
-            # Voice settings
-            voice_settings = {
-                "stability": self.voice_config["stability"],
-                "similarity_boost": self.voice_config["similarity_boost"],
-                "style": self.voice_config["style"],
-                "use_speaker_boost": self.voice_config["use_speaker_boost"]
-            }
-            
-            # Model settings (including speed)
-            model_settings = {
-                "model_id": self.model_id,
-                "speed": speed
-            }
-            
-            payload = {
-                "text": text,
-                "voice_settings": voice_settings,
-                "model_id": self.model_id
-            }
+            headers, payload = self._build_request(text, spec, accept="audio/wav")
             
             # Make API request
             start_time = time.time()
-            response = requests.post(
-                f"{self.api_url}/text-to-speech/{voice_id}",
+            response = self.http.post(
+                f"{self.api_url}/text-to-speech/{spec.voice_id}",
                 headers=headers,
-                json=payload
+                json=payload,
+                params={"output_format": self._format_name(output_format)} if output_format else None,
+                timeout=self.http_timeout
             )
             response.raise_for_status()
             
@@ -123,6 +114,103 @@ class ElevenlabsProvider(BaseTTSProvider):
             logger.debug(traceback.format_exc())
             return None
     
+    def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
+        """
+        Stream speech from the ElevenLabs streaming endpoint.
+        
+        Audio is requested in ``output_format`` (raw PCM by default) and
+        yielded as it arrives over the pooled connection.
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
+            
+        Returns:
+            Generator[bytes, None, None]: Generator of PCM chunks
+            
+        Raises:
+            requests.exceptions.RequestException: If the streaming request fails
+        """
+        if not text:
+            return
+        
+        spec = self.resolve_voice(voice_id, speed)
+        headers, payload = self._build_request(text, spec, accept="audio/pcm")
+        try:
+            yield from self._stream_pcm(
+                "POST",
+                f"{self.api_url}/text-to-speech/{spec.voice_id}/stream",
+                sample_width=output_format.sample_width if output_format else 2,
+                headers=headers,
+                json=payload,
+                params={
+                    "output_format": self._format_name(output_format) if output_format else self.output_format,
+                    "optimize_streaming_latency": self.optimize_streaming_latency
+                }
+            )
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"API streaming request error: {req_err}")
+            raise
+    
+    def get_output_formats(self) -> List[OutputFormat]:
+        """
+        Get the formats ElevenLabs can produce natively.
+        
+        Returns:
+            List[OutputFormat]: 8 kHz μ-law and 8-24 kHz 16-bit PCM
+        """
+        return [OutputFormat(MULAW, 8000)] + [
+            OutputFormat(PCM_S16LE, rate) for rate in (8000, 16000, 22050, 24000)
+        ]
+    
+    @staticmethod
+    def _format_name(output_format: OutputFormat) -> str:
+        """
+        Get the ElevenLabs output_format name for a format.
+        
+        Args:
+            output_format (OutputFormat): Output format
+            
+        Returns:
+            str: Name such as "ulaw_8000" or "pcm_16000"
+        """
+        prefix = "ulaw" if output_format.encoding == MULAW else "pcm"
+        return f"{prefix}_{output_format.sample_rate}"
+    
+    def _build_request(self, text: str, spec: VoiceSpec,
+                       accept: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build headers and payload for a text-to-speech request.
+        
+        Args:
+            text (str): Text to convert to speech
+            spec (VoiceSpec): Resolved voice parameters
+            accept (str): Accepted audio MIME type
+            
+        Returns:
+            Tuple[Dict[str, str], Dict[str, Any]]: Request headers and JSON payload
+        """
+        headers = {
+            "xi-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "Accept": accept
+        }
+        
+        # Voice settings
+        voice_settings = dict(spec.settings)
+        
+        payload = {
+            "text": text,
+            "voice_settings": voice_settings,
+            "model_id": self.model_id
+        }
+        
+        return headers, payload
+    
     def get_voices(self) -> Dict[str, Any]:
         """
         Get available ElevenLabs voices.
@@ -137,9 +225,10 @@ class ElevenlabsProvider(BaseTTSProvider):
                     "Accept": "application/json"
                 }
                 
-                response = requests.get(
+                response = self.http.get(
                     f"{self.api_url}/voices",
-                    headers=headers
+                    headers=headers,
+                    timeout=self.http_timeout
                 )
                 response.raise_for_status()
                 
@@ -168,9 +257,41 @@ class ElevenlabsProvider(BaseTTSProvider):
         
         return {"voices": self._voices}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters without touching provider state.
+        
+        Voice IDs can carry settings: "voice_id:stability:similarity:style".
+        
+        Args:
+            voice_id (Optional[str]): Voice identifier, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters for one request
+        """
+        config = self.voice_config
+        settings = {key: config[key] for key in self.VOICE_SETTINGS}
+        base_voice_id = config["voice_id"]
+        
+        if voice_id:
+            parts = voice_id.split(":")
+            if self._voices and parts[0] not in self._voices:
+                logger.warning(f"Voice {parts[0]} not found in available voices, using {base_voice_id}")
+            else:
+                base_voice_id = parts[0]
+                try:
+                    for key, value in zip(("stability", "similarity_boost", "style"), parts[1:]):
+                        if value:
+                            settings[key] = float(value)
+                except ValueError:
+                    logger.warning(f"Invalid voice settings in {voice_id}, using defaults")
+        
+        return VoiceSpec(voice_id=base_voice_id, speed=speed, settings=settings)
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set the voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -179,30 +300,14 @@ class ElevenlabsProvider(BaseTTSProvider):
             bool: True if successful, False otherwise
         """
         try:
-            # Parse voice ID format (can include style params): "voice_id:stability:similarity"
-            parts = voice_id.split(":")
-            base_voice_id = parts[0]
-            
-            # Load voices if not already loaded
-            if self._voices is None:
-                self.get_voices()
-            
-            # Check if the voice exists
-            if base_voice_id not in self._voices:
+            base_voice_id = voice_id.split(":")[0]
+            if base_voice_id not in self.cached_voices():
                 logger.warning(f"Voice {base_voice_id} not found in available voices")
                 return False
             
-            # Update voice configuration
-            self.voice_config["voice_id"] = base_voice_id
-            
-            # Update additional settings if provided
-            if len(parts) > 1 and parts[1]:
-                self.voice_config["stability"] = float(parts[1])
-            if len(parts) > 2 and parts[2]:
-                self.voice_config["similarity_boost"] = float(parts[2])
-            if len(parts) > 3 and parts[3]:
-                self.voice_config["style"] = float(parts[3])
-            
+            # Replace rather than mutate so concurrent requests see a consistent config
+            spec = self.resolve_voice(voice_id)
+            self.voice_config = {"voice_id": spec.voice_id, **spec.settings}
             self.current_voice = voice_id
             logger.debug(f"Voice set to {voice_id}")
             return True
@@ -226,10 +331,7 @@ class ElevenlabsProvider(BaseTTSProvider):
         base_voice_id = parts[0]
         
         # Check if voice exists
-        if self._voices is None:
-            self.get_voices()
-        
-        return base_voice_id in self._voices
+        return base_voice_id in self.cached_voices()
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -245,9 +347,10 @@ class ElevenlabsProvider(BaseTTSProvider):
                 "Accept": "application/json"
             }
             
-            response = requests.get(
+            response = self.http.get(
                 f"{self.api_url}/user",
-                headers=headers
+                headers=headers,
+                timeout=self.http_timeout
             )
             response.raise_for_status()
             
@@ -279,4 +382,4 @@ class ElevenlabsProvider(BaseTTSProvider):
         Returns:
             Tuple[int, int, int]: Audio format, number of channels, and sample rate
         """
-        return pyaudio.paInt16, 1, 24000  # 16-bit, mono, 24kHz 
\ No newline at end of file
+        return pyaudio.paInt16, 1, parse_pcm_sample_rate(self.output_format)  # 16-bit, mono 
\ No newline at end of file
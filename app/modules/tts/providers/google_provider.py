@@ -4,12 +4,16 @@
 import logging
 import os
 import tempfile
+import threading
 import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Generator, List, Tuple
 
-from ..base_provider import StreamingTTSProvider
-from ..text_processing import TextFragmenter
+from ..base_provider import StreamingTTSProvider, VoiceSpec
+from ..output_format import OutputFormat, MULAW, PCM_S16LE, strip_wav_header
+from ..text_processing import TextFragmenter, SentenceSegmenter
 from ..events import TTSEventType
 
 logger = logging.getLogger("tts-google")
@@ -80,6 +84,18 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
         self.buffer_threshold = self.config.get("buffer_threshold", 0.2)  # seconds
         self.max_sentence_length = self.config.get("max_sentence_length", 100)
         
+        # Concurrent sentence synthesis: at most this many requests per stream
+        # are in flight, audio is still yielded in sentence order
+        self.stream_concurrency = max(1, self.config.get("stream_concurrency", 3))
+        self._stream_executor = None
+        self._executor_lock = threading.Lock()
+        
+        # VoiceSelectionParams/AudioConfig reused per (language, voice, speed, format),
+        # least recently used first; speeds are rounded so free-form rates share entries
+        self.max_request_configs = self.config.get("max_request_configs", 64)
+        self._request_configs: "OrderedDict[Tuple[Any, ...], Tuple[Any, Any]]" = OrderedDict()
+        self._request_configs_lock = threading.Lock()
+        
         # Text processor for sentence splitting
         self.text_processor = TextFragmenter(
             min_fragment_size=self.config.get("min_fragment_size", 5),
@@ -170,9 +186,35 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             logger.error(f"Error getting Google voices: {e}")
             return {"voices": []}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters without touching provider state.
+        
+        Args:
+            voice_id (Optional[str]): Voice name, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters with the language code in its settings
+        """
+        config = self.voice_config
+        if not voice_id:
+            return VoiceSpec(voice_id=config["name"], speed=speed,
+                             settings={"language_code": config["language_code"]})
+        
+        # If using Chirp3, ensure it's a valid Chirp3 voice if specified
+        if self.use_chirp3 and not any(chirp_voice in voice_id for chirp_voice in self.chirp3_voices):
+            logger.warning(f"Voice {voice_id} is not a Chirp3 voice, using anyway")
+        
+        # Extract language code from voice name (e.g., en-US-Chirp3-Standard-F -> en-US)
+        parts = voice_id.split('-')
+        language_code = f"{parts[0]}-{parts[1]}" if len(parts) >= 2 else config["language_code"]
+        
+        return VoiceSpec(voice_id=voice_id, speed=speed, settings={"language_code": language_code})
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -184,17 +226,13 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             return False
         
         try:
-            # If using Chirp3, ensure it's a valid Chirp3 voice if specified
-            if self.use_chirp3 and not any(chirp_voice in voice_id for chirp_voice in self.chirp3_voices):
-                logger.warning(f"Voice {voice_id} is not a Chirp3 voice, using anyway")
-            
-            # Extract language code from voice name (e.g., en-US-Chirp3-Standard-F -> en-US)
-            parts = voice_id.split('-')
-            if len(parts) >= 2:
-                language_code = f"{parts[0]}-{parts[1]}"
-                self.voice_config["language_code"] = language_code
-            
-            self.voice_config["name"] = voice_id
+            # Replace rather than mutate so concurrent requests see a consistent config
+            spec = self.resolve_voice(voice_id)
+            self.voice_config = {
+                **self.voice_config,
+                "language_code": spec.settings["language_code"],
+                "name": spec.voice_id
+            }
             return True
         except Exception as e:
             logger.error(f"Error setting voice: {e}")
@@ -221,7 +259,8 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             return False
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech from text.
         
@@ -229,6 +268,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -241,18 +281,15 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             logger.warning("Empty text provided to Google TTS")
             return None
         
+        spec = self.resolve_voice(voice_id, speed)
         try:
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
-            
             # Emit event if available
             if self.event_emitter:
                 self.event_emitter.create_and_emit(
                     TTSEventType.GENERATION_START,
                     provider_type="google",
                     text_length=len(text),
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
             start_time = time.time()
@@ -260,18 +297,8 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             # Prepare input
             input_text = self.texttospeech.SynthesisInput(text=text)
             
-            # Configure voice
-            voice = self.texttospeech.VoiceSelectionParams(
-                language_code=self.voice_config["language_code"],
-                name=self.voice_config["name"]
-            )
-            
-            # Configure audio output
-            audio_config = self.texttospeech.AudioConfig(
-                audio_encoding=self.texttospeech.AudioEncoding.LINEAR16,
-                speaking_rate=speed,
-                sample_rate_hertz=24000
-            )
+            # Configure voice and audio output
+            voice, audio_config = self._get_request_config(spec, output_format)
             
             # Make API request
             response = self.client.synthesize_speech(
@@ -280,8 +307,10 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                 audio_config=audio_config
             )
             
-            # Get audio content
+            # Get audio content (Google adds a WAV header to LINEAR16 and MULAW)
             audio_data = response.audio_content
+            if output_format:
+                audio_data = strip_wav_header(audio_data)
             
             # Calculate duration
             duration_ms = (time.time() - start_time) * 1000
@@ -293,7 +322,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     provider_type="google",
                     text_length=len(text),
                     duration_ms=duration_ms,
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
             return audio_data
@@ -308,20 +337,161 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     provider_type="google",
                     text_length=len(text),
                     error_message=str(e),
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
             return None
     
+    def _get_request_config(self, spec: VoiceSpec,
+                            output_format: Optional[OutputFormat] = None) -> Tuple[Any, Any]:
+        """
+        Get the voice and audio config for a resolved voice.
+        
+        Request objects are built once per (language, voice, speed, format) and
+        reused. Speed is rounded to two decimals, and at most
+        ``max_request_configs`` are kept.
+        
+        Args:
+            spec (VoiceSpec): Resolved voice parameters
+            output_format (Optional[OutputFormat]): Output format (default: 24 kHz PCM)
+            
+        Returns:
+            Tuple[Any, Any]: VoiceSelectionParams and AudioConfig
+        """
+        speed = round(float(spec.speed), 2)
+        output_format = output_format or OutputFormat(PCM_S16LE, 24000)
+        key = (spec.settings["language_code"], spec.voice_id, speed,
+               output_format.encoding, output_format.sample_rate)
+        with self._request_configs_lock:
+            config = self._request_configs.get(key)
+            if config is not None:
+                self._request_configs.move_to_end(key)
+            else:
+                voice = self.texttospeech.VoiceSelectionParams(
+                    language_code=key[0],
+                    name=key[1]
+                )
+                encoding = (self.texttospeech.AudioEncoding.MULAW
+                            if output_format.encoding == MULAW
+                            else self.texttospeech.AudioEncoding.LINEAR16)
+                audio_config = self.texttospeech.AudioConfig(
+                    audio_encoding=encoding,
+                    speaking_rate=speed,
+                    sample_rate_hertz=output_format.sample_rate
+                )
+                config = (voice, audio_config)
+                self._request_configs[key] = config
+                while len(self._request_configs) > self.max_request_configs:
+                    self._request_configs.popitem(last=False)
+            return config
+    
+    def get_output_formats(self) -> List[OutputFormat]:
+        """
+        Get the formats Google Cloud TTS can produce natively.
+        
+        Returns:
+            List[OutputFormat]: 8 kHz μ-law and 8-24 kHz 16-bit PCM
+        """
+        return [OutputFormat(MULAW, 8000)] + [
+            OutputFormat(PCM_S16LE, rate) for rate in (8000, 16000, 24000)
+        ]
+    
+    def _get_stream_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the executor used for concurrent sentence synthesis.
+        
+        Returns:
+            ThreadPoolExecutor: Executor instance
+        """
+        with self._executor_lock:
+            if self._stream_executor is None:
+                self._stream_executor = ThreadPoolExecutor(
+                    max_workers=self.config.get("stream_workers", self.stream_concurrency * 4),
+                    thread_name_prefix="tts-google"
+                )
+            return self._stream_executor
+    
+    def _synthesize_segment(self, text: str, voice: Any, audio_config: Any,
+                            headerless: bool = False) -> bytes:
+        """
+        Synthesize one text segment.
+        
+        Args:
+            text (str): Text segment
+            voice: VoiceSelectionParams
+            audio_config: AudioConfig
+            headerless (bool): Strip the WAV header from the audio
+            
+        Returns:
+            bytes: Audio content
+        """
+        response = self.client.synthesize_speech(
+            input=self.texttospeech.SynthesisInput(text=text),
+            voice=voice,
+            audio_config=audio_config
+        )
+        if headerless:
+            return strip_wav_header(response.audio_content)
+        return response.audio_content
+    
+    def _split_stream_segments(self, text: str) -> List[str]:
+        """
+        Split text into the ordered segments synthesized by generate_speech_stream.
+        
+        Args:
+            text (str): Text to convert to speech
+            
+        Returns:
+            List[str]: Initial fragment (if any) followed by sentence segments
+        """
+        segments = []
+        
+        # Get the initial fragment for immediate playback
+        initial_fragment = self.text_processor.get_initial_fragment(text)
+        if initial_fragment:
+            segments.append(initial_fragment)
+        
+        # Process remaining text by sentences
+        sentences = self.text_processor.split_into_sentences(text)
+        if initial_fragment and sentences:
+            # Skip first sentence if we already processed the initial fragment
+            if sentences[0].startswith(initial_fragment):
+                remaining_part = sentences[0][len(initial_fragment):].strip()
+                if remaining_part:
+                    sentences[0] = remaining_part
+                else:
+                    sentences = sentences[1:]
+        
+        for sentence in sentences:
+            # Skip empty sentences
+            if not sentence.strip():
+                continue
+            
+            # Process in smaller chunks if sentence is too long
+            if len(sentence) > self.max_sentence_length:
+                segments.extend(sentence[i:i+self.max_sentence_length]
+                                for i in range(0, len(sentence), self.max_sentence_length))
+            else:
+                segments.append(sentence)
+        
+        return segments
+    
     def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
-                             speed: float = 1.0) -> Generator[bytes, None, None]:
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
         """
         Generate speech as a stream of audio chunks.
         
+        Up to ``stream_concurrency`` segments are synthesized in parallel; audio
+        is yielded strictly in segment order as soon as the head-of-line segment
+        is ready. Time to first and last chunk are reported on STREAMING_END.
+        
         Args:
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request;
+                if given, segments are yielded without WAV headers
             
         Returns:
             Generator[bytes, None, None]: Generator of audio chunks
@@ -334,10 +504,12 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             logger.warning("Empty text provided to Google TTS streaming")
             return
         
+        spec = self.resolve_voice(voice_id, speed)
+        pending = deque()
         try:
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
+            start_time = time.time()
+            first_chunk_time = None
+            last_chunk_time = None
             
             # Emit event if available
             if self.event_emitter:
@@ -345,102 +517,44 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     TTSEventType.STREAMING_START,
                     provider_type="google",
                     text_length=len(text),
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
-            # Get the initial fragment for immediate playback
-            initial_fragment = self.text_processor.get_initial_fragment(text)
-            
-            if initial_fragment:
-                # Generate initial fragment immediately for low latency
-                input_text = self.texttospeech.SynthesisInput(text=initial_fragment)
-                
-                voice = self.texttospeech.VoiceSelectionParams(
-                    language_code=self.voice_config["language_code"],
-                    name=self.voice_config["name"]
-                )
-                
-                audio_config = self.texttospeech.AudioConfig(
-                    audio_encoding=self.texttospeech.AudioEncoding.LINEAR16,
-                    speaking_rate=speed,
-                    sample_rate_hertz=24000
-                )
-                
-                response = self.client.synthesize_speech(
-                    input=input_text,
-                    voice=voice,
-                    audio_config=audio_config
-                )
+            voice, audio_config = self._get_request_config(spec, output_format)
+            headerless = output_format is not None
+            segments = deque(self._split_stream_segments(text))
+            executor = self._get_stream_executor() if self.stream_concurrency > 1 else None
+            
+            def dispatch() -> None:
+                # Keep up to stream_concurrency segments in flight
+                while segments and len(pending) < self.stream_concurrency:
+                    pending.append(executor.submit(self._synthesize_segment, segments.popleft(),
+                                                   voice, audio_config, headerless))
+            
+            while segments or pending:
+                if executor is not None:
+                    dispatch()
+                    audio_data = pending.popleft().result()
+                    dispatch()
+                else:
+                    audio_data = self._synthesize_segment(segments.popleft(), voice, audio_config, headerless)
                 
                 # Stream the audio in chunks
-                audio_data = response.audio_content
                 for i in range(0, len(audio_data), self.chunk_size):
-                    chunk = audio_data[i:i+self.chunk_size]
+                    audio_chunk = audio_data[i:i+self.chunk_size]
+                    if first_chunk_time is None:
+                        first_chunk_time = time.time() - start_time
+                    last_chunk_time = time.time() - start_time
                     # Emit chunk event if available
                     if self.event_emitter:
                         self.event_emitter.create_and_emit(
                             TTSEventType.STREAMING_CHUNK,
                             provider_type="google",
-                            additional_data={"chunk_size": len(chunk)}
+                            additional_data={"chunk_size": len(audio_chunk)}
                         )
-                    yield chunk
-            
-            # Process remaining text by sentences
-            sentences = self.text_processor.split_into_sentences(text)
-            if initial_fragment and sentences:
-                # Skip first sentence if we already processed the initial fragment
-                if sentences[0].startswith(initial_fragment):
-                    remaining_part = sentences[0][len(initial_fragment):].strip()
-                    if remaining_part:
-                        sentences[0] = remaining_part
-                    else:
-                        sentences = sentences[1:]
-            
-            for sentence in sentences:
-                # Skip empty sentences
-                if not sentence.strip():
-                    continue
-                    
-                # Process in smaller chunks if sentence is too long
-                if len(sentence) > self.max_sentence_length:
-                    chunks = [sentence[i:i+self.max_sentence_length] 
-                            for i in range(0, len(sentence), self.max_sentence_length)]
-                else:
-                    chunks = [sentence]
-                
-                for chunk in chunks:
-                    # Generate speech for the chunk
-                    input_text = self.texttospeech.SynthesisInput(text=chunk)
-                    
-                    voice = self.texttospeech.VoiceSelectionParams(
-                        language_code=self.voice_config["language_code"],
-                        name=self.voice_config["name"]
-                    )
-                    
-                    audio_config = self.texttospeech.AudioConfig(
-                        audio_encoding=self.texttospeech.AudioEncoding.LINEAR16,
-                        speaking_rate=speed,
-                        sample_rate_hertz=24000
-                    )
-                    
-                    response = self.client.synthesize_speech(
-                        input=input_text,
-                        voice=voice,
-                        audio_config=audio_config
-                    )
-                    
-                    # Stream the audio in chunks
-                    audio_data = response.audio_content
-                    for i in range(0, len(audio_data), self.chunk_size):
-                        audio_chunk = audio_data[i:i+self.chunk_size]
-                        # Emit chunk event if available
-                        if self.event_emitter:
-                            self.event_emitter.create_and_emit(
-                                TTSEventType.STREAMING_CHUNK,
-                                provider_type="google",
-                                additional_data={"chunk_size": len(audio_chunk)}
-                            )
-                        yield audio_chunk
+                    yield audio_chunk
+            
+            logger.debug(f"Google stream: first chunk {first_chunk_time}s, last chunk {last_chunk_time}s")
             
             # Emit end event if available
             if self.event_emitter:
@@ -448,7 +562,13 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     TTSEventType.STREAMING_END,
                     provider_type="google",
                     text_length=len(text),
-                    voice_id=voice_id or self.voice_config["name"]
+                    duration_ms=(time.time() - start_time) * 1000,
+                    voice_id=spec.voice_id,
+                    additional_data={
+                        "time_to_first_chunk": first_chunk_time,
+                        "time_to_last_chunk": last_chunk_time,
+                        "concurrency": self.stream_concurrency
+                    }
                 )
             
         except Exception as e:
@@ -461,8 +581,12 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     provider_type="google",
                     text_length=len(text),
                     error_message=str(e),
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
+        finally:
+            # Don't synthesize audio nobody will consume
+            for future in pending:
+                future.cancel()
     
     def begin_streaming_session(self, session_id: str, voice_id: Optional[str] = None, 
                               speed: float = 1.0) -> bool:
@@ -481,22 +605,20 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             logger.error("Google Cloud TTS client not available")
             return False
         
+        spec = self.resolve_voice(voice_id, speed)
         try:
             if session_id in self.active_sessions:
                 logger.warning(f"Session {session_id} already exists, ending previous session")
                 self.end_streaming_session(session_id)
             
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
-            
             # Store session data
             self.active_sessions[session_id] = {
-                "voice_id": voice_id or self.voice_config["name"],
+                "voice_id": spec.voice_id,
+                "spec": spec,
                 "speed": speed,
                 "created_at": time.time(),
                 "last_activity": time.time(),
-                "text_buffer": "",
+                "segmenter": SentenceSegmenter(),
                 "audio_buffer": bytearray(),
                 "processed_sentences": []
             }
@@ -507,7 +629,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     TTSEventType.SESSION_START,
                     provider_type="google",
                     session_id=session_id,
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
             return True
@@ -522,7 +644,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                     provider_type="google",
                     session_id=session_id,
                     error_message=str(e),
-                    voice_id=voice_id or self.voice_config["name"]
+                    voice_id=spec.voice_id
                 )
             
             return False
@@ -551,48 +673,26 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             session = self.active_sessions[session_id]
             session["last_activity"] = time.time()
             
-            # Add text to buffer
-            session["text_buffer"] += text
-            
-            # Process buffer if it contains complete sentences
-            sentences = self.text_processor.split_into_sentences(session["text_buffer"])
-            
-            if len(sentences) > 1:
-                # Process all but the last sentence (which may be incomplete)
-                for sentence in sentences[:-1]:
-                    # Skip if we've already processed this sentence
-                    if sentence in session["processed_sentences"]:
-                        continue
-                    
-                    # Generate speech for the sentence
-                    input_text = self.texttospeech.SynthesisInput(text=sentence)
-                    
-                    voice = self.texttospeech.VoiceSelectionParams(
-                        language_code=self.voice_config["language_code"],
-                        name=self.voice_config["name"]
-                    )
-                    
-                    audio_config = self.texttospeech.AudioConfig(
-                        audio_encoding=self.texttospeech.AudioEncoding.LINEAR16,
-                        speaking_rate=session["speed"],
-                        sample_rate_hertz=24000
-                    )
-                    
-                    # Make API request
-                    response = self.client.synthesize_speech(
-                        input=input_text,
-                        voice=voice,
-                        audio_config=audio_config
-                    )
-                    
-                    # Store the audio in the session buffer
-                    session["audio_buffer"].extend(response.audio_content)
-                    
-                    # Add to processed sentences
-                    session["processed_sentences"].append(sentence)
+            # Only the new text is scanned; completed sentences are synthesized
+            # and any incomplete one stays buffered in the segmenter
+            for sentence in session["segmenter"].feed(text):
+                # Generate speech for the sentence
+                input_text = self.texttospeech.SynthesisInput(text=sentence)
+                
+                voice, audio_config = self._get_request_config(session["spec"])
+                
+                # Make API request
+                response = self.client.synthesize_speech(
+                    input=input_text,
+                    voice=voice,
+                    audio_config=audio_config
+                )
+                
+                # Store the audio in the session buffer
+                session["audio_buffer"].extend(response.audio_content)
                 
-                # Keep the last sentence in buffer (may be incomplete)
-                session["text_buffer"] = sentences[-1]
+                # Add to processed sentences
+                session["processed_sentences"].append(sentence)
             
             # Emit event if available
             if self.event_emitter:
@@ -605,7 +705,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                 )
             
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error adding text to Google streaming session: {e}")
             
@@ -627,7 +727,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
         
         Args:
             session_id (str): Session identifier
-            
+        
         Returns:
             bool: True if session was ended successfully
         """
@@ -640,31 +740,21 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
             session = self.active_sessions[session_id]
             
             # Process any remaining text in buffer
-            if session["text_buffer"]:
-                if session["text_buffer"] not in session["processed_sentences"]:
-                    # Generate speech for the remaining text
-                    input_text = self.texttospeech.SynthesisInput(text=session["text_buffer"])
-                    
-                    voice = self.texttospeech.VoiceSelectionParams(
-                        language_code=self.voice_config["language_code"],
-                        name=self.voice_config["name"]
-                    )
-                    
-                    audio_config = self.texttospeech.AudioConfig(
-                        audio_encoding=self.texttospeech.AudioEncoding.LINEAR16,
-                        speaking_rate=session["speed"],
-                        sample_rate_hertz=24000
-                    )
-                    
-                    # Make API request
-                    response = self.client.synthesize_speech(
-                        input=input_text,
-                        voice=voice,
-                        audio_config=audio_config
-                    )
-                    
-                    # Add to audio buffer
-                    session["audio_buffer"].extend(response.audio_content)
+            for remaining_text in session["segmenter"].flush():
+                # Generate speech for the remaining text
+                input_text = self.texttospeech.SynthesisInput(text=remaining_text)
+                
+                voice, audio_config = self._get_request_config(session["spec"])
+                
+                # Make API request
+                response = self.client.synthesize_speech(
+                    input=input_text,
+                    voice=voice,
+                    audio_config=audio_config
+                )
+                
+                # Add to audio buffer
+                session["audio_buffer"].extend(response.audio_content)
             
             # Remove session
             del self.active_sessions[session_id]
@@ -679,7 +769,7 @@ class EnhancedGoogleProvider(StreamingTTSProvider):
                 )
             
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error ending Google streaming session: {e}")
             
@@ -1,25 +1,41 @@
 #!/usr/bin/env python
 # Kokoro TTS Provider Module for Morning Coffee application
 
+import io
 import logging
-import tempfile
-import os
+import queue
+import threading
 import time
 import traceback
-from typing import Dict, Any, Optional, Tuple
+import wave
+from typing import Dict, Any, Optional, Tuple, Generator
 
+import numpy as np
 import pyaudio
 try:
-    from RealtimeTTS import TextToAudioStream, KokoroEngine
+    from RealtimeTTS import KokoroEngine
 except ImportError:
     logging.warning("RealtimeTTS not installed, Kokoro TTS provider will not work")
 
-from ..base_provider import BaseTTSProvider
+from ..base_provider import SentenceStreamingProvider, VoiceSpec
+from ..output_format import OutputFormat
 
 logger = logging.getLogger("kokoro-provider")
 
-class KokoroProvider(BaseTTSProvider):
-    """TTS provider using Kokoro engine via RealtimeTTS."""
+class KokoroProvider(SentenceStreamingProvider):
+    """
+    TTS provider using Kokoro engine via RealtimeTTS.
+    
+    Audio is taken directly from the engine's output queue, so synthesis
+    needs no TextToAudioStream and no temporary files. Each provider instance
+    owns one long-lived engine; requests on the same instance are serialized,
+    and concurrency comes from pooling instances.
+    """
+    
+    # Seconds between checks for synthesis completion while waiting for audio
+    queue_poll_interval = 0.05
+    # Seconds to wait for the engine to stop after a stream is abandoned
+    stop_timeout = 5.0
     
     def __init__(self, redis_client=None, **kwargs):
         """
@@ -33,6 +49,11 @@ class KokoroProvider(BaseTTSProvider):
             self.engine = KokoroEngine()
             self.current_voice = None
             
+            # The engine's queue is shared state, so one synthesis runs at a time
+            self._engine_lock = threading.Lock()
+            self._engine_format, _, self._sample_rate = self.engine.get_stream_info()
+            self._init_stream_sessions()
+            
             # Cache for available voices
             self._voices = None
             
@@ -56,7 +77,8 @@ class KokoroProvider(BaseTTSProvider):
             raise ImportError("RealtimeTTS not installed. Please install with: pip install RealtimeTTS")
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech using Kokoro engine.
         
@@ -64,6 +86,7 @@ class KokoroProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): If given, return headerless PCM
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -72,41 +95,128 @@ class KokoroProvider(BaseTTSProvider):
             if not text:
                 return None
             
-            # Set voice if provided and different from current
-            if voice_id and voice_id != self.current_voice:
-                self.set_voice(voice_id)
-            
             logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
             
-            # Create a temporary file to store the audio
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                output_path = temp_file.name
-            
-            # Create stream and generate audio
             start_time = time.time()
-            
-            # Create a TextToAudioStream with the engine
-            stream = TextToAudioStream(self.engine, muted=True)
-            stream.feed(text)
-            stream.play(output_wavfile=output_path, log_synthesized_text=False)
+            pcm = b"".join(self.generate_speech_stream(text, voice_id, speed))
             
             generation_time = time.time() - start_time
             logger.debug(f"Speech generation took {generation_time:.2f} seconds")
             
-            # Read the generated WAV file
-            with open(output_path, 'rb') as audio_file:
-                audio_data = audio_file.read()
+            if output_format:
+                return pcm
             
-            # Clean up the temporary file
-            os.unlink(output_path)
+            # Wrap the PCM in a WAV container in memory
+            output = io.BytesIO()
+            with wave.open(output, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self._sample_rate)
+                wav_file.writeframes(pcm)
             
-            return audio_data
+            return output.getvalue()
             
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
             logger.debug(traceback.format_exc())
             return None
     
+    def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
+        """
+        Generate speech as a stream of 16-bit PCM chunks.
+        
+        The engine synthesizes on a worker thread while chunks are taken from
+        its queue and yielded as soon as they are produced.
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Accepted for compatibility; the
+                engine always produces 16-bit PCM at its native rate
+            
+        Returns:
+            Generator[bytes, None, None]: Generator of PCM chunks
+            
+        Raises:
+            RuntimeError: If the engine fails to synthesize the text
+        """
+        if not text:
+            return
+        
+        spec = self.resolve_voice(voice_id, speed)
+        logger.debug(f"Kokoro synthesis with voice {spec.voice_id or 'default'}")
+        
+        with self._engine_lock:
+            self._drain_engine_queue()
+            
+            done = threading.Event()
+            errors = []
+            
+            def synthesize():
+                try:
+                    if not self.engine.synthesize(text):
+                        errors.append(RuntimeError("Kokoro engine failed to synthesize text"))
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    done.set()
+            
+            worker = threading.Thread(target=synthesize, name="kokoro-synthesis", daemon=True)
+            worker.start()
+            
+            stop_event = getattr(self.engine, "stop_synthesis_event", None)
+            try:
+                while True:
+                    try:
+                        chunk = self.engine.queue.get(timeout=self.queue_poll_interval)
+                    except queue.Empty:
+                        if done.is_set() and self.engine.queue.empty():
+                            break
+                        continue
+                    
+                    pcm = self._to_pcm16(chunk)
+                    if pcm:
+                        yield pcm
+                
+                if errors:
+                    raise errors[0]
+            finally:
+                if not done.is_set() and stop_event is not None:
+                    # The consumer stopped early; interrupt the engine
+                    stop_event.set()
+                worker.join(self.stop_timeout)
+                if worker.is_alive():
+                    logger.warning("Kokoro synthesis did not stop in time")
+                if stop_event is not None:
+                    stop_event.clear()
+                self._drain_engine_queue()
+    
+    def _drain_engine_queue(self) -> None:
+        """Discard audio left in the engine queue by an interrupted synthesis."""
+        while True:
+            try:
+                self.engine.queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _to_pcm16(self, chunk: Any) -> bytes:
+        """
+        Convert an engine audio chunk to 16-bit PCM bytes.
+        
+        Args:
+            chunk (Any): Audio chunk from the engine queue
+            
+        Returns:
+            bytes: 16-bit PCM audio
+        """
+        if self._engine_format == pyaudio.paFloat32:
+            samples = np.frombuffer(chunk, dtype=np.float32)
+            return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        return bytes(chunk)
+    
     def get_voices(self) -> Dict[str, Any]:
         """
         Get available Kokoro voices.
@@ -132,9 +242,25 @@ class KokoroProvider(BaseTTSProvider):
         
         return {"voices": self._voices}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters without touching provider state.
+        
+        Args:
+            voice_id (Optional[str]): Voice identifier, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters for one request
+        """
+        if voice_id and voice_id not in self._voice_mapping:
+            logger.warning(f"Voice {voice_id} not found")
+            voice_id = None
+        return VoiceSpec(voice_id=voice_id or self.current_voice or "", speed=speed)
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -144,7 +270,6 @@ class KokoroProvider(BaseTTSProvider):
         """
         try:
             if voice_id in self._voice_mapping:
-                # Map to internal voice name if needed
                 self.current_voice = voice_id
                 logger.debug(f"Voice set to {voice_id}")
                 return True
@@ -197,4 +322,4 @@ class KokoroProvider(BaseTTSProvider):
         Returns:
             Tuple[int, int, int]: Audio format, number of channels, and sample rate
         """
-        return pyaudio.paInt16, 1, 24000  # 16-bit, mono, 24kHz 
\ No newline at end of file
+        return pyaudio.paInt16, 1, self._sample_rate  # 16-bit, mono 
\ No newline at end of file
@@ -1,20 +1,23 @@
 #!/usr/bin/env python
 # Murf.ai TTS Provider Module for Morning Coffee application
 
+import base64
 import logging
 import time
 import traceback
 import json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Generator
 import requests
 
 import pyaudio
 
-from ..base_provider import BaseTTSProvider
+from ..base_provider import VoiceSpec
+from ..http_streaming import HTTPStreamingProvider
+from ..output_format import OutputFormat, PCM_S16LE
 
 logger = logging.getLogger("murf-provider")
 
-class MurfProvider(BaseTTSProvider):
+class MurfProvider(HTTPStreamingProvider):
     """TTS provider using Murf.ai API."""
     
     def __init__(self, redis_client=None, **kwargs):
@@ -26,6 +29,10 @@ class MurfProvider(BaseTTSProvider):
             **kwargs: Additional configuration options including:
                 - api_key: Murf.ai API key
                 - api_url: Custom API URL (optional)
+                - telephony: Stream 8 kHz PCM for phone calls (default: False)
+                - stream_sample_rate: Streaming sample rate (default: 8000 for
+                  telephony, otherwise 24000)
+                - pool_size: Pooled HTTP connections (default: 10)
         """
         self.api_key = kwargs.get("api_key")
         if not self.api_key:
@@ -34,6 +41,11 @@ class MurfProvider(BaseTTSProvider):
         self.api_url = kwargs.get("api_url", "https://api.murf.ai/v1")
         self.current_voice = None
         
+        # Streaming output: raw PCM, at the phone network's native rate for telephony
+        self.telephony = kwargs.get("telephony", False)
+        self.stream_sample_rate = kwargs.get("stream_sample_rate", 8000 if self.telephony else 24000)
+        self._init_http(pool_size=kwargs.get("pool_size", 10), timeout=kwargs.get("timeout", 30.0))
+        
         # Default voice configuration
         self.voice_config = {
             "voice_id": "en-US-ryan",
@@ -48,7 +60,8 @@ class MurfProvider(BaseTTSProvider):
         logger.info("Murf.ai TTS provider initialized")
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech using Murf.ai API.
         
@@ -56,6 +69,7 @@ class MurfProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -64,35 +78,25 @@ class MurfProvider(BaseTTSProvider):
             if not text:
                 return None
             
-            # Set voice if provided
-            if voice_id:
-                self.set_voice(voice_id)
+            if output_format:
+                # Headerless audio comes from the streaming endpoint
+                return b"".join(self.generate_speech_stream(text, voice_id, speed, output_format))
             
-            logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
+            spec = self.resolve_voice(voice_id, speed)
             
-            # Prepare API request
-            headers = {
-                "accept": "application/json",
-                "content-type": "application/json",
-                "x-api-key": self.api_key
-            }
+            logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
             
-            payload = {
-                "text": text,
-                "voiceId": self.voice_config["voice_id"],
-                "style": self.voice_config["style"],
-                "rate": speed * self.voice_config["speed"],
-                "pitch": self.voice_config["pitch"],
-                "sampleRate": 24000,
-                "format": "WAV"
-            }
+            # Prepare API request; inline base64 audio saves a second round trip
+            payload = self._build_payload(text, spec, "WAV", 24000)
+            payload["encodeAsBase64"] = True
             
             # Make API request
             start_time = time.time()
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/speech",
-                headers=headers,
-                json=payload
+                headers=self._headers("application/json"),
+                json=payload,
+                timeout=self.http_timeout
             )
             response.raise_for_status()
             
@@ -102,19 +106,25 @@ class MurfProvider(BaseTTSProvider):
                 logger.error(f"Murf.ai API error: {result.get('message', 'Unknown error')}")
                 return None
             
-            # Download audio file
-            audio_url = result.get("data", {}).get("audioUrl")
-            if not audio_url:
-                logger.error("No audio URL in response")
-                return None
-            
-            audio_response = requests.get(audio_url)
-            audio_response.raise_for_status()
+            data = result.get("data", {})
+            encoded_audio = data.get("encodedAudio")
+            if encoded_audio:
+                audio = base64.b64decode(encoded_audio)
+            else:
+                # Download audio file
+                audio_url = data.get("audioUrl")
+                if not audio_url:
+                    logger.error("No audio URL in response")
+                    return None
+                
+                audio_response = self.http.get(audio_url, timeout=self.http_timeout)
+                audio_response.raise_for_status()
+                audio = audio_response.content
             
             generation_time = time.time() - start_time
             logger.debug(f"Speech generation took {generation_time:.2f} seconds")
             
-            return audio_response.content
+            return audio
             
         except requests.exceptions.RequestException as req_err:
             logger.error(f"API request error: {req_err}")
@@ -124,6 +134,95 @@ class MurfProvider(BaseTTSProvider):
             logger.debug(traceback.format_exc())
             return None
     
+    def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
+                             speed: float = 1.0,
+                             output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
+        """
+        Stream speech from the Murf.ai streaming endpoint.
+        
+        Audio is requested as mono PCM at the rate of ``output_format``
+        (``stream_sample_rate`` by default) and yielded as it arrives over
+        the pooled connection.
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Native format to request
+            
+        Returns:
+            Generator[bytes, None, None]: Generator of PCM chunks
+            
+        Raises:
+            requests.exceptions.RequestException: If the streaming request fails
+        """
+        if not text:
+            return
+        
+        spec = self.resolve_voice(voice_id, speed)
+        sample_rate = output_format.sample_rate if output_format else self.stream_sample_rate
+        payload = self._build_payload(text, spec, "PCM", sample_rate)
+        payload["channelType"] = "MONO"
+        try:
+            yield from self._stream_pcm(
+                "POST",
+                f"{self.api_url}/speech/stream",
+                headers=self._headers("audio/pcm"),
+                json=payload
+            )
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"API streaming request error: {req_err}")
+            raise
+    
+    def get_output_formats(self) -> List[OutputFormat]:
+        """
+        Get the formats Murf.ai can stream natively.
+        
+        Returns:
+            List[OutputFormat]: 8-48 kHz 16-bit PCM
+        """
+        return [OutputFormat(PCM_S16LE, rate) for rate in (8000, 16000, 24000, 44100, 48000)]
+    
+    def _headers(self, accept: str) -> Dict[str, str]:
+        """
+        Build headers for a speech request.
+        
+        Args:
+            accept (str): Accepted response MIME type
+            
+        Returns:
+            Dict[str, str]: Request headers
+        """
+        return {
+            "accept": accept,
+            "content-type": "application/json",
+            "x-api-key": self.api_key
+        }
+    
+    def _build_payload(self, text: str, spec: VoiceSpec, audio_format: str,
+                      sample_rate: int) -> Dict[str, Any]:
+        """
+        Build the JSON payload for a speech request.
+        
+        Args:
+            text (str): Text to convert to speech
+            spec (VoiceSpec): Resolved voice parameters
+            audio_format (str): Murf.ai audio format name
+            sample_rate (int): Output sample rate in Hz
+            
+        Returns:
+            Dict[str, Any]: Request payload
+        """
+        return {
+            "text": text,
+            "voiceId": spec.voice_id,
+            "style": spec.style,
+            "rate": spec.speed * spec.settings["speed"],
+            "pitch": spec.settings["pitch"],
+            "sampleRate": sample_rate,
+            "format": audio_format
+        }
+    
     def get_voices(self) -> Dict[str, Any]:
         """
         Get available Murf.ai voices.
@@ -138,9 +237,10 @@ class MurfProvider(BaseTTSProvider):
                     "x-api-key": self.api_key
                 }
                 
-                response = requests.get(
+                response = self.http.get(
                     f"{self.api_url}/voices",
-                    headers=headers
+                    headers=headers,
+                    timeout=self.http_timeout
                 )
                 response.raise_for_status()
                 
@@ -174,9 +274,42 @@ class MurfProvider(BaseTTSProvider):
         
         return {"voices": self._voices}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve request voice parameters without touching provider state.
+        
+        Voice IDs can include a style: "en-US-ryan:excited".
+        
+        Args:
+            voice_id (Optional[str]): Voice identifier, or None for the default voice
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters for one request
+        """
+        config = self.voice_config
+        settings = {"speed": config["speed"], "pitch": config["pitch"]}
+        if not voice_id:
+            return VoiceSpec(voice_id=config["voice_id"], speed=speed, style=config["style"], settings=settings)
+        
+        parts = voice_id.split(":")
+        base_voice_id = parts[0]
+        style = parts[1] if len(parts) > 1 else "neutral"
+        
+        # Validate against voice metadata only if it is already cached
+        if self._voices:
+            if base_voice_id not in self._voices:
+                logger.warning(f"Voice {base_voice_id} not found in available voices, using {config['voice_id']}")
+                return VoiceSpec(voice_id=config["voice_id"], speed=speed, style=config["style"], settings=settings)
+            if style not in self._voices[base_voice_id].get("styles", ["neutral"]):
+                logger.warning(f"Style {style} not available for voice {base_voice_id}")
+                style = "neutral"  # Default to neutral
+        
+        return VoiceSpec(voice_id=base_voice_id, speed=speed, style=style, settings=settings)
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set the voice to use for TTS.
+        Set the default voice used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier
@@ -185,31 +318,14 @@ class MurfProvider(BaseTTSProvider):
             bool: True if successful, False otherwise
         """
         try:
-            # Parse voice ID format (can include style): "en-US-ryan:excited"
-            parts = voice_id.split(":")
-            base_voice_id = parts[0]
-            style = parts[1] if len(parts) > 1 else "neutral"
-            
-            # Load voices if not already loaded
-            if self._voices is None:
-                self.get_voices()
-            
-            # Check if the voice exists
-            if base_voice_id not in self._voices:
+            base_voice_id = voice_id.split(":")[0]
+            if base_voice_id not in self.cached_voices():
                 logger.warning(f"Voice {base_voice_id} not found in available voices")
                 return False
             
-            # Check if the style is valid
-            voice_info = self._voices[base_voice_id]
-            styles = voice_info.get("styles", ["neutral"])
-            
-            if style not in styles:
-                logger.warning(f"Style {style} not available for voice {base_voice_id}")
-                style = "neutral"  # Default to neutral
-            
-            # Update voice configuration
-            self.voice_config["voice_id"] = base_voice_id
-            self.voice_config["style"] = style
+            # Replace rather than mutate so concurrent requests see a consistent config
+            spec = self.resolve_voice(voice_id)
+            self.voice_config = {**self.voice_config, "voice_id": spec.voice_id, "style": spec.style}
             
             self.current_voice = voice_id
             logger.debug(f"Voice set to {voice_id}")
@@ -234,10 +350,7 @@ class MurfProvider(BaseTTSProvider):
         base_voice_id = parts[0]
         
         # Check if voice exists
-        if self._voices is None:
-            self.get_voices()
-        
-        return base_voice_id in self._voices
+        return base_voice_id in self.cached_voices()
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -253,9 +366,10 @@ class MurfProvider(BaseTTSProvider):
                 "x-api-key": self.api_key
             }
             
-            response = requests.get(
+            response = self.http.get(
                 f"{self.api_url}/voices",
-                headers=headers
+                headers=headers,
+                timeout=self.http_timeout
             )
             response.raise_for_status()
             
@@ -287,4 +401,4 @@ class MurfProvider(BaseTTSProvider):
         Returns:
             Tuple[int, int, int]: Audio format, number of channels, and sample rate
         """
-        return pyaudio.paInt16, 1, 24000  # 16-bit, mono, 24kHz 
\ No newline at end of file
+        return pyaudio.paInt16, 1, self.stream_sample_rate  # 16-bit, mono 
\ No newline at end of file
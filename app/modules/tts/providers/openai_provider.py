@@ -17,7 +17,8 @@ except ImportError:
 
 from openai import OpenAI
 
-from ..base_provider import BaseTTSProvider
+from ..base_provider import BaseTTSProvider, VoiceSpec
+from ..output_format import OutputFormat, strip_wav_header
 
 logger = logging.getLogger("openai-provider")
 
@@ -76,7 +77,8 @@ class OpenAITTSProvider(BaseTTSProvider):
         logger.info("OpenAI TTS provider initialized")
     
     def generate_speech(self, text: str, voice_id: Optional[str] = None, 
-                       speed: float = 1.0) -> Optional[bytes]:
+                       speed: float = 1.0,
+                       output_format: Optional[OutputFormat] = None) -> Optional[bytes]:
         """
         Generate speech using OpenAI's TTS API.
         
@@ -84,6 +86,7 @@ class OpenAITTSProvider(BaseTTSProvider):
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier or style
             speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): If given, return headerless PCM
             
         Returns:
             Optional[bytes]: Audio data as bytes or None if generation failed
@@ -92,14 +95,8 @@ class OpenAITTSProvider(BaseTTSProvider):
             if not text:
                 return None
             
-            # Set voice style if provided
-            voice_style = self.voice_style
-            if voice_id:
-                if voice_id in self.voice_styles:
-                    voice_style = self.voice_styles[voice_id]
-                elif self.voice_exists(voice_id):
-                    voice_style = voice_id  # Use directly if it's a custom style instruction
-                self.current_voice = voice_id
+            spec = self.resolve_voice(voice_id, speed)
+            voice_style = spec.style
             
             # Prepare the input for the TTS model
             logger.debug(f"Generating speech for text: {text[:50]}{'...' if len(text) > 50 else ''}")
@@ -128,6 +125,8 @@ class OpenAITTSProvider(BaseTTSProvider):
             generation_time = time.time() - start_time
             logger.debug(f"Speech generation took {generation_time:.2f} seconds")
             
+            if output_format and audio_data:
+                return strip_wav_header(audio_data)
             return audio_data
             
         except Exception as e:
@@ -157,9 +156,26 @@ class OpenAITTSProvider(BaseTTSProvider):
         
         return {"voices": self._voices}
     
+    def resolve_voice(self, voice_id: Optional[str] = None, speed: float = 1.0) -> VoiceSpec:
+        """
+        Resolve a voice style without touching provider state.
+        
+        Args:
+            voice_id (Optional[str]): Named style, custom style instruction, or None
+            speed (float): Speech speed factor
+            
+        Returns:
+            VoiceSpec: Voice parameters whose style is the spoken style instruction
+        """
+        if not voice_id:
+            return VoiceSpec(voice_id=self.current_voice or "default", speed=speed, style=self.voice_style)
+        
+        # Named styles map to instructions; anything else is a custom instruction
+        return VoiceSpec(voice_id=voice_id, speed=speed, style=self.voice_styles.get(voice_id, voice_id))
+    
     def set_voice(self, voice_id: str) -> bool:
         """
-        Set the voice style to use for TTS.
+        Set the default voice style used when a request does not specify one.
         
         Args:
             voice_id (str): Voice identifier or style
@@ -168,20 +184,14 @@ class OpenAITTSProvider(BaseTTSProvider):
             bool: True if successful, False otherwise
         """
         try:
-            if voice_id in self.voice_styles:
-                self.voice_style = self.voice_styles[voice_id]
-                self.current_voice = voice_id
-                logger.debug(f"Voice set to {voice_id}: {self.voice_style}")
-                return True
-            elif voice_id and isinstance(voice_id, str):
-                # Allow for custom voice style instructions
-                self.voice_style = voice_id
-                self.current_voice = voice_id
-                logger.debug(f"Custom voice style set: {voice_id}")
-                return True
-            else:
+            if not voice_id or not isinstance(voice_id, str):
                 logger.warning(f"Voice {voice_id} not found in available voices")
                 return False
+            
+            self.voice_style = self.resolve_voice(voice_id).style
+            self.current_voice = voice_id
+            logger.debug(f"Voice set to {voice_id}: {self.voice_style}")
+            return True
         except Exception as e:
             logger.error(f"Error setting voice: {e}")
             return False
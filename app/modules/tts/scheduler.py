@@ -0,0 +1,455 @@
+#!/usr/bin/env python
+# Priority scheduling of TTS provider requests
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Any, Optional, List
+
+from ..stats import summarize
+
+logger = logging.getLogger("tts-scheduler")
+
+class SchedulingClass(IntEnum):
+    """Priority classes for provider requests; lower values are served first."""
+    LIVE_TURN = 0       # Audio a caller is waiting for now
+    FIRST_FRAGMENT = 1  # Opening phrases of the next expected turn
+    PREDICTION = 2      # Phrases further ahead in the call flow
+    PREWARM = 3         # Startup, cache and batch prewarming
+
+# Classes held back while live latency is above target
+DEFERRABLE_CLASSES = (SchedulingClass.PREDICTION, SchedulingClass.PREWARM)
+
+# Seconds a request waits for a slot before it is given up
+DEFAULT_MAX_WAIT = {
+    SchedulingClass.LIVE_TURN: 30.0,
+    SchedulingClass.FIRST_FRAGMENT: 10.0,
+    SchedulingClass.PREDICTION: 10.0,
+    SchedulingClass.PREWARM: 60.0,
+}
+
+# Default limits per provider: in-process concurrent requests, parallel
+# sub-tasks of a Celery fan-out, and requests per minute. Override any of
+# them (and "burst", the token bucket size) in the provider config. Live
+# turns are not held back by the request rate; they use up tokens that
+# background work then waits for.
+PROVIDER_LIMITS = {
+    'openai': {'max_concurrency': 8, 'batch_concurrency': 8, 'requests_per_minute': 500},
+    'elevenlabs': {'max_concurrency': 4, 'batch_concurrency': 4, 'requests_per_minute': 120},
+    'azure': {'max_concurrency': 8, 'batch_concurrency': 8, 'requests_per_minute': 600},
+    'google': {'max_concurrency': 8, 'batch_concurrency': 8, 'requests_per_minute': 1000},
+    'murf': {'max_concurrency': 4, 'batch_concurrency': 4, 'requests_per_minute': 60},
+    'kokoro': {'max_concurrency': 2, 'batch_concurrency': 2, 'requests_per_minute': None},
+}
+DEFAULT_PROVIDER_LIMITS = {'max_concurrency': 4, 'batch_concurrency': 4, 'requests_per_minute': 60}
+
+def provider_limits(provider_type: str, provider_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get a provider's rate limits.
+    
+    Args:
+        provider_type (str): Provider type
+        provider_config (Optional[Dict[str, Any]]): Provider configuration, may override the defaults
+    
+    Returns:
+        Dict[str, Any]: max_concurrency, batch_concurrency, requests_per_minute and optionally burst
+    """
+    limits = dict(PROVIDER_LIMITS.get(provider_type, DEFAULT_PROVIDER_LIMITS))
+    for name in ('max_concurrency', 'batch_concurrency', 'requests_per_minute', 'burst'):
+        if provider_config and provider_config.get(name) is not None:
+            limits[name] = provider_config[name]
+    return limits
+
+class ProviderBusyError(TimeoutError):
+    """Raised when no provider slot was granted within the request's maximum wait."""
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Not thread-safe on its own; the scheduler guards it with its lock.
+    """
+    
+    def __init__(self, requests_per_minute: Optional[float], burst: Optional[float] = None):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            requests_per_minute (Optional[float]): Refill rate, or None for no limit
+            burst (Optional[float]): Bucket size (defaults to one second of requests, at least 1)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.rate = requests_per_minute / 60.0 if requests_per_minute else None
+        self.capacity = float(burst or max(1.0, self.rate or 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """
+        Get the seconds until a token is available.
+        
+        Args:
+            now (Optional[float]): Current monotonic time
+        
+        Returns:
+            float: 0 if a token is available now
+        """
+        if not self.rate:
+            return 0.0
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+    
+    def take(self, now: Optional[float] = None) -> None:
+        """Consume one token."""
+        if self.rate:
+            self._refill(time.monotonic() if now is None else now)
+            self.tokens -= 1.0
+
+class _ProviderState:
+    """Slots, rate limit and waiting requests of one provider."""
+    
+    def __init__(self, limits: Dict[str, Any], reserved_live_slots: int):
+        self.waiters: List[List[int]] = []
+        self.in_flight = 0
+        self.bucket: Optional[TokenBucket] = None
+        self.apply(limits, reserved_live_slots)
+    
+    def apply(self, limits: Dict[str, Any], reserved_live_slots: int) -> None:
+        self.limit = max(1, int(limits.get('max_concurrency') or 1))
+        # Slots only live turns may use; a single-slot provider reserves none
+        self.reserved = max(0, min(reserved_live_slots, self.limit - 1))
+        rate_limits = (limits.get('requests_per_minute'), limits.get('burst'))
+        if self.bucket is not None and rate_limits == (self.bucket.requests_per_minute, self.bucket.burst):
+            return
+        bucket = TokenBucket(*rate_limits)
+        if self.bucket is not None:
+            # A new rate does not refill the bucket
+            self.bucket._refill(time.monotonic())
+            bucket.tokens = min(bucket.capacity, self.bucket.tokens)
+        self.bucket = bucket
+
+class SchedulerPermit:
+    """
+    A provider slot granted by the scheduler.
+    
+    Release it when the provider request completes, or use it as a context
+    manager. Call ``mark_first_audio`` when audio starts to flow; only live
+    turns that marked it count toward the live latency, so a request whose
+    audio arrives all at once does not count its full synthesis time.
+    """
+    
+    def __init__(self, scheduler: "TTSScheduler", provider_name: str,
+                 priority: SchedulingClass, requested_at: float, nested: bool = False):
+        self.scheduler = scheduler
+        self.provider_name = provider_name
+        self.priority = priority
+        self.requested_at = requested_at
+        self.nested = nested
+        self.thread_id = threading.get_ident()
+        self.first_audio_at: Optional[float] = None
+        self._released = False
+    
+    def mark_first_audio(self) -> None:
+        """Record that the request produced its first audio."""
+        if self.first_audio_at is None:
+            self.first_audio_at = time.monotonic()
+    
+    def release(self) -> None:
+        """Release the slot. Subsequent calls are ignored."""
+        if self._released:
+            return
+        self._released = True
+        if not self.nested:
+            self.scheduler._release(self)
+    
+    def __enter__(self) -> "SchedulerPermit":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.release()
+        return False
+
+class TTSScheduler:
+    """
+    In-process scheduler shared by every caller of TTS providers.
+    
+    Each provider has a number of slots (max_concurrency) and a token bucket
+    (requests_per_minute). Waiting requests are granted strictly by class
+    and then arrival order, so live turns always go before first fragments,
+    predictions and prewarming. The last ``reserved_live_slots`` slots of a
+    provider are kept for live turns.
+    
+    Only slots limit live turns: they never wait for the token bucket, so
+    every fragment of a turn can start at once. Their requests still take
+    tokens, which the other classes have to wait for.
+    
+    Live turns are measured from request to first audio. While the moving
+    average exceeds ``live_latency_target``, and for ``degraded_hold``
+    seconds after, prediction and prewarm requests are deferred: they are
+    not granted until latency recovers, and are given up after their class's
+    maximum wait. Requests already running are not interrupted.
+    
+    A thread that already holds a slot for a provider reuses it for nested
+    requests, and nested requests without a class inherit the class of the
+    thread's current slot.
+    """
+    
+    def __init__(self, provider_configs: Optional[Dict[str, Dict[str, Any]]] = None,
+                 live_latency_target: float = 1.5, reserved_live_slots: int = 1,
+                 degraded_hold: float = 10.0, max_wait: Optional[Dict[str, float]] = None,
+                 latency_smoothing: float = 0.2):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            provider_configs (Optional[Dict[str, Dict[str, Any]]]): Provider configs keyed by name
+            live_latency_target (float): Live time-to-first-audio, in seconds, above which
+                deferrable work is held back
+            reserved_live_slots (int): Slots per provider kept for live turns
+            degraded_hold (float): Seconds deferrable work stays held back after latency was high
+            max_wait (Optional[Dict[str, float]]): Maximum wait per class name (e.g. "prewarm")
+            latency_smoothing (float): Weight of each new sample in the latency average
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._seq = itertools.count()
+        self._providers: Dict[str, _ProviderState] = {}
+        self._provider_configs: Dict[str, Dict[str, Any]] = {}
+        self._held: Dict[int, List[SchedulerPermit]] = {}
+        self._queued = {cls: 0 for cls in SchedulingClass}
+        self._stats = {
+            cls: {"granted": 0, "deferred": 0, "waits": deque(maxlen=500)}
+            for cls in SchedulingClass
+        }
+        self._live_latency: Optional[float] = None
+        self._degraded_until = 0.0
+        self.max_wait = dict(DEFAULT_MAX_WAIT)
+        self.configure(provider_configs, live_latency_target=live_latency_target,
+                       reserved_live_slots=reserved_live_slots, degraded_hold=degraded_hold,
+                       max_wait=max_wait, latency_smoothing=latency_smoothing)
+    
+    def configure(self, provider_configs: Optional[Dict[str, Dict[str, Any]]] = None,
+                  **options) -> None:
+        """
+        Update provider limits and scheduling options.
+        
+        Limits are re-applied only to providers whose config changed. A new
+        rate limit keeps the tokens already spent, so reconfiguring never
+        refills a provider's bucket.
+        
+        Args:
+            provider_configs (Optional[Dict[str, Dict[str, Any]]]): Provider configs keyed by name
+            **options: Any of the constructor's scheduling options
+        """
+        with self._cond:
+            reserved_live_slots = getattr(self, "reserved_live_slots", None)
+            for name in ("live_latency_target", "reserved_live_slots", "degraded_hold",
+                         "latency_smoothing"):
+                if options.get(name) is not None:
+                    setattr(self, name, options[name])
+            for name, seconds in (options.get("max_wait") or {}).items():
+                self.max_wait[SchedulingClass[name.upper()]] = seconds
+            
+            # Only providers whose limits may have changed are re-applied
+            changed = {name for name, config in (provider_configs or {}).items()
+                       if self._provider_configs.get(name) != config}
+            if self.reserved_live_slots != reserved_live_slots:
+                changed = set(self._providers)
+            self._provider_configs.update(provider_configs or {})
+            for name in changed & set(self._providers):
+                self._providers[name].apply(provider_limits(name, self._provider_configs.get(name)),
+                                            self.reserved_live_slots)
+            self._cond.notify_all()
+    
+    def _state(self, provider_name: str) -> _ProviderState:
+        state = self._providers.get(provider_name)
+        if state is None:
+            limits = provider_limits(provider_name, self._provider_configs.get(provider_name))
+            state = self._providers[provider_name] = _ProviderState(limits, self.reserved_live_slots)
+        return state
+    
+    def is_degraded(self) -> bool:
+        """Whether deferrable work is currently held back."""
+        return time.monotonic() < self._degraded_until
+    
+    def _admit_delay(self, state: _ProviderState, entry: List[int], now: float) -> Optional[float]:
+        """
+        Check whether a waiting request can be granted.
+        
+        Returns:
+            Optional[float]: 0 if it can, else seconds until it should check again
+                (None to wait for a release)
+        """
+        if state.waiters[0] is not entry:
+            return None
+        priority = SchedulingClass(entry[0])
+        if priority in DEFERRABLE_CLASSES and now < self._degraded_until:
+            return self._degraded_until - now
+        if priority == SchedulingClass.LIVE_TURN:
+            return None if state.in_flight >= state.limit else 0.0
+        if state.in_flight >= state.limit - state.reserved:
+            return None
+        return state.bucket.wait_time(now)
+    
+    def acquire(self, provider_name: str, priority: Optional[SchedulingClass] = None,
+                timeout: Optional[float] = None) -> Optional[SchedulerPermit]:
+        """
+        Wait for a provider slot.
+        
+        Args:
+            provider_name (str): Provider the request goes to
+            priority (Optional[SchedulingClass]): Request class; None inherits the class of
+                a slot this thread already holds, or is a live turn
+            timeout (Optional[float]): Maximum seconds to wait (defaults to the class's max_wait)
+        
+        Returns:
+            Optional[SchedulerPermit]: The granted slot, or None if the request was deferred
+                past its maximum wait
+        """
+        thread_id = threading.get_ident()
+        requested_at = time.monotonic()
+        
+        with self._cond:
+            held = self._held.get(thread_id, [])
+            if priority is None:
+                priority = held[-1].priority if held else SchedulingClass.LIVE_TURN
+            priority = SchedulingClass(priority)
+            if any(permit.provider_name == provider_name for permit in held):
+                return SchedulerPermit(self, provider_name, priority, requested_at, nested=True)
+            
+            state = self._state(provider_name)
+            wait = self.max_wait.get(priority) if timeout is None else timeout
+            deadline = requested_at + wait if wait is not None else None
+            entry = [int(priority), next(self._seq)]
+            heapq.heappush(state.waiters, entry)
+            self._queued[priority] += 1
+            granted = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._admit_delay(state, entry, now)
+                    if delay == 0:
+                        granted = True
+                        break
+                    if deadline is not None and now >= deadline:
+                        break
+                    remaining = deadline - now if deadline is not None else None
+                    waits = [value for value in (delay, remaining) if value is not None]
+                    self._cond.wait(min(waits) if waits else None)
+            finally:
+                state.waiters.remove(entry)
+                heapq.heapify(state.waiters)
+                self._queued[priority] -= 1
+                self._cond.notify_all()
+            
+            stats = self._stats[priority]
+            if not granted:
+                stats["deferred"] += 1
+                logger.debug(f"Deferred {priority.name.lower()} request for {provider_name} "
+                             f"after {now - requested_at:.2f}s")
+                return None
+            
+            state.in_flight += 1
+            state.bucket.take(now)
+            stats["granted"] += 1
+            stats["waits"].append(now - requested_at)
+            permit = SchedulerPermit(self, provider_name, priority, requested_at)
+            self._held.setdefault(thread_id, []).append(permit)
+            return permit
+    
+    def _release(self, permit: SchedulerPermit) -> None:
+        now = time.monotonic()
+        with self._cond:
+            state = self._providers[permit.provider_name]
+            state.in_flight -= 1
+            held = self._held.get(permit.thread_id, [])
+            if permit in held:
+                held.remove(permit)
+            if not held:
+                self._held.pop(permit.thread_id, None)
+            
+            if permit.priority == SchedulingClass.LIVE_TURN and permit.first_audio_at is not None:
+                self._record_live_latency(permit.first_audio_at - permit.requested_at, now)
+            self._cond.notify_all()
+    
+    def _record_live_latency(self, latency: float, now: float) -> None:
+        if self._live_latency is None:
+            self._live_latency = latency
+        else:
+            self._live_latency += self.latency_smoothing * (latency - self._live_latency)
+        
+        if self._live_latency > self.live_latency_target:
+            if now >= self._degraded_until:
+                logger.warning(f"Live TTS latency {self._live_latency:.2f}s above target "
+                               f"{self.live_latency_target:.2f}s, deferring background synthesis")
+            self._degraded_until = now + self.degraded_hold
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduling statistics.
+        
+        Returns:
+            Dict[str, Any]: Live latency state, per class queue depth, granted and deferred
+                counts and wait times, and per provider slot usage
+        """
+        with self._cond:
+            classes = {}
+            for cls in SchedulingClass:
+                stats = self._stats[cls]
+                waits = summarize(stats["waits"], ("avg", "p95", "max"))
+                classes[cls.name.lower()] = {
+                    "queue_depth": self._queued[cls],
+                    "granted": stats["granted"],
+                    "deferred": stats["deferred"],
+                    "avg_wait": waits["avg"],
+                    "p95_wait": waits["p95"],
+                    "max_wait": waits["max"],
+                }
+            
+            now = time.monotonic()
+            providers = {
+                name: {
+                    "in_flight": state.in_flight,
+                    "max_concurrency": state.limit,
+                    "reserved_live_slots": state.reserved,
+                    "queue_depth": len(state.waiters),
+                    "requests_per_minute": state.bucket.requests_per_minute,
+                    "rate_wait": state.bucket.wait_time(now),
+                }
+                for name, state in self._providers.items()
+            }
+            
+            return {
+                "degraded": now < self._degraded_until,
+                "live_latency": self._live_latency,
+                "live_latency_target": self.live_latency_target,
+                "classes": classes,
+                "providers": providers,
+            }
+
+_scheduler: Optional[TTSScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> TTSScheduler:
+    """
+    Get the process-wide scheduler.
+    
+    Returns:
+        TTSScheduler: The scheduler shared by every TTS caller in this process
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TTSScheduler()
+        return _scheduler
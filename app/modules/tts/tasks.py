@@ -6,14 +6,16 @@ import logging
 import time
 import tempfile
 import json
+import hashlib
 from typing import Dict, Any, Optional, List, Tuple, Union
 from functools import wraps
+from urllib.parse import urlparse
 import threading
 
 # Celery imports
-from celery import Celery, Task, current_task
+from celery import Celery, Task, chord, current_task
 from celery.exceptions import SoftTimeLimitExceeded
-from celery.signals import task_failure, task_success, task_retry
+from celery.signals import task_failure, task_success, task_retry, worker_init, worker_process_init
 
 # Redis for results and caching
 import redis
@@ -21,6 +23,9 @@ import redis
 # Import local modules
 from .provider_factory import TTSProviderFactory
 from .base_provider import BaseTTSProvider
+from .cache_manager import TTSCacheManager, TTSCacheKey
+from .output_format import describe_audio
+from .scheduler import SchedulingClass, get_scheduler, provider_limits
 
 logger = logging.getLogger("tts-tasks")
 
@@ -29,9 +34,10 @@ celery_app = Celery('tts_tasks')
 celery_app.conf.update(
     broker_url=os.environ.get('CELERY_BROKER_URL', 'redis://redis:6379/0'),
     result_backend=os.environ.get('CELERY_RESULT_BACKEND', 'redis://redis:6379/0'),
-    task_serializer='pickle',  # Use pickle for binary data
-    accept_content=['json', 'pickle'],
-    result_serializer='pickle',
+    # Audio is passed by cache reference, so payloads and results are small JSON
+    task_serializer='json',
+    accept_content=['json'],
+    result_serializer='json',
     task_time_limit=60,  # 1 minute hard limit
     task_soft_time_limit=30,  # 30 seconds soft limit
     worker_prefetch_multiplier=1,  # Process one task at a time
@@ -40,6 +46,8 @@ celery_app.conf.update(
     result_expires=3600,  # Results expire after 1 hour
     task_track_started=True,  # Track when tasks are started
     worker_max_tasks_per_child=100,  # Restart worker after 100 tasks
+    # Worker processes warm their providers before taking tasks (see warm_providers)
+    worker_proc_alive_timeout=float(os.environ.get('TTS_WORKER_WARM_TIMEOUT', 120)),
 )
 
 # Define task queues with priorities
@@ -70,6 +78,83 @@ def get_redis_client():
         logger.error(f"Error connecting to Redis: {e}")
         return None
 
+# Task audio is kept in the cache for a day and returned by reference
+TASK_AUDIO_TTL = int(os.environ.get('TTS_TASK_AUDIO_TTL', 86400))
+
+_cache_manager = None
+_cache_manager_lock = threading.Lock()
+
+def get_cache_manager() -> TTSCacheManager:
+    """
+    Get the cache that holds task audio.
+    
+    Workers write generated audio here and return its key; the web process
+    reads it back through the same Redis tier.
+    """
+    global _cache_manager
+    with _cache_manager_lock:
+        if _cache_manager is None:
+            parsed = urlparse(redis_url)
+            _cache_manager = TTSCacheManager({
+                "memory": {"max_size": int(os.environ.get('TTS_TASK_CACHE_MEMORY_ITEMS', 50))},
+                "redis": {
+                    "enabled": True,
+                    "host": parsed.hostname or 'localhost',
+                    "port": parsed.port or 6379,
+                    "db": int(parsed.path.lstrip('/') or 0),
+                    "password": parsed.password,
+                    "ttl": TASK_AUDIO_TTL,
+                    "prefix": 'tts:audio:'
+                },
+                # Workers and the web process need not share a disk
+                "filesystem": {"enabled": False}
+            })
+            if _cache_manager.redis_cache is None or not _cache_manager.redis_cache.available:
+                logger.warning("Redis unavailable, task audio is only visible to this process")
+        return _cache_manager
+
+def task_cache_key(text: str, provider_type: str, voice_id: Optional[str], speed: float) -> str:
+    """Cache key for audio generated by a task."""
+    return TTSCacheKey.generate(text, provider_type, voice_id or 'default', speed)
+
+def _store_audio(cache: TTSCacheManager, cache_key: str, audio_data: bytes) -> Dict[str, Any]:
+    """
+    Write task audio and its description to the cache.
+    
+    A result referring to missing audio is useless, so failing to store it
+    fails the task.
+    
+    Returns:
+        Dict[str, Any]: Reference to the stored audio
+    """
+    if not cache.set(cache_key, audio_data):
+        raise RuntimeError(f"Could not store task audio under {cache_key}")
+    info = describe_audio(audio_data)
+    # Lets later tasks describe cached audio without fetching it
+    cache.set(f"{cache_key}.meta", json.dumps(info).encode())
+    return _audio_reference(cache_key, info, cached=False)
+
+def _audio_reference(cache_key: str, info: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+    """
+    Build the JSON task result for audio stored in the cache.
+    
+    Returns:
+        Dict[str, Any]: cache_key, size, duration, format and whether the audio was already cached
+    """
+    reference = dict(info)
+    reference.update({"cache_key": cache_key, "cached": cached})
+    return reference
+
+def _cached_reference(cache: TTSCacheManager, cache_key: str) -> Optional[Dict[str, Any]]:
+    """Reference to audio already in the cache, or None if it is not there."""
+    meta = cache.get(f"{cache_key}.meta")
+    if meta:
+        return _audio_reference(cache_key, json.loads(meta), cached=True)
+    audio_data = cache.get(cache_key)
+    if audio_data:
+        return _audio_reference(cache_key, describe_audio(audio_data), cached=True)
+    return None
+
 # Task metrics and logging
 @task_failure.connect
 def log_task_failure(sender=None, task_id=None, exception=None, args=None, kwargs=None, **extras):
@@ -97,16 +182,26 @@ def log_task_success(sender=None, result=None, **kwargs):
     task_id = kwargs.get('task_id', 'unknown')
     task_name = sender.name if sender else 'unknown'
     
-    # Only log metadata for successful tasks (avoid logging large audio data)
-    if result and isinstance(result, bytes):
-        logger.info(f"Task {task_id} ({task_name}) completed successfully: {len(result)} bytes generated")
+    if isinstance(result, dict) and 'cache_key' in result:
+        logger.info(f"Task {task_id} ({task_name}) completed successfully: {result.get('size')} bytes "
+                    f"stored as {result['cache_key']}")
     else:
         logger.info(f"Task {task_id} ({task_name}) completed successfully")
 
+def provider_cache_key(provider_type: str, provider_config: Optional[Dict[str, Any]] = None) -> str:
+    """Key a provider instance by its type and a hash of its configuration."""
+    config_json = json.dumps(provider_config or {}, sort_keys=True, default=str)
+    return f"{provider_type}:{hashlib.sha256(config_json.encode()).hexdigest()[:16]}"
+
 class TTSTask(Task):
     """Base class for TTS tasks with common functionality."""
     
-    _providers = {}  # Cache for provider instances
+    _providers = {}  # Cache for provider instances, keyed by provider_cache_key()
+    _providers_lock = threading.Lock()
+    
+    # Set by _get_provider for the running task
+    cold_start = False
+    provider_init_time = 0.0
     
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """Handle task failure."""
@@ -122,14 +217,19 @@ class TTSTask(Task):
         provider_name = kwargs.get('provider_type', 'unknown')
         self._increment_counter(f"tts:metrics:successes:{provider_name}")
         
-        # Track latency if we have start time
+        # Track latency if we have start time, separately for tasks that had to create their provider
         if hasattr(self, 'start_time'):
             duration = time.time() - self.start_time
+            start_kind = 'cold' if self.cold_start else 'warm'
             redis_client = get_redis_client()
             if redis_client:
                 try:
-                    redis_client.lpush(f"tts:metrics:latency:{provider_name}", str(duration))
-                    redis_client.ltrim(f"tts:metrics:latency:{provider_name}", 0, 99)
+                    pipe = redis_client.pipeline()
+                    for key in (f"tts:metrics:latency:{provider_name}",
+                                f"tts:metrics:latency:{provider_name}:{start_kind}"):
+                        pipe.lpush(key, str(duration))
+                        pipe.ltrim(key, 0, 99)
+                    pipe.execute()
                 except Exception:
                     pass
     
@@ -143,28 +243,131 @@ class TTSTask(Task):
                 pass
     
     def _get_provider(self, provider_type, provider_config=None):
-        """Get or create a TTS provider instance."""
+        """
+        Get or create a TTS provider instance.
+        
+        Records on the task whether the provider had to be created
+        (cold_start) and how long that took (provider_init_time).
+        """
+        provider, init_time = self.load_provider(provider_type, provider_config)
+        self.cold_start = init_time is not None
+        self.provider_init_time = init_time or 0.0
+        return provider
+    
+    @classmethod
+    def load_provider(cls, provider_type, provider_config=None):
+        """
+        Get a cached provider for a type and configuration, creating it if needed.
+        
+        Returns:
+            Tuple[BaseTTSProvider, Optional[float]]: The provider, and the seconds
+                spent creating it (None if it was already cached)
+        """
+        key = provider_cache_key(provider_type, provider_config)
         # Try to reuse provider if available
-        if provider_type in self._providers:
-            return self._providers[provider_type]
+        provider = cls._providers.get(key)
+        if provider is not None:
+            return provider, None
         
-        # Create new provider
-        redis_client = get_redis_client()
-        config = provider_config or {}
+        with cls._providers_lock:
+            provider = cls._providers.get(key)
+            if provider is not None:
+                return provider, None
+            
+            start_time = time.time()
+            try:
+                provider = TTSProviderFactory.create_provider(
+                    provider_type,
+                    get_redis_client(),
+                    provider_config or {}
+                )
+            except Exception as e:
+                logger.error(f"Error creating provider {provider_type}: {e}")
+                raise
+            
+            # Cache provider for reuse; its requests are limited by the process scheduler
+            cls._providers[key] = provider
+            get_scheduler().configure({provider_type: provider_config or {}})
+            return provider, time.time() - start_time
+
+# Engines that load models locally; warming them synthesizes a phrase by default
+LOCAL_ENGINES = {'kokoro'}
+
+def _default_provider_configs() -> Dict[str, Dict[str, Any]]:
+    """Provider configs as the web app sends them with tasks, so warm providers match."""
+    try:
+        from config import config as app_config
+        return app_config.get_tts_provider_config()
+    except Exception:
+        return {}
+
+def _warm_plan() -> Dict[str, Dict[str, Any]]:
+    """
+    Read which providers to warm from TTS_WORKER_WARM_PROVIDERS.
+    
+    The variable is either a comma-separated list of provider types or a JSON
+    object mapping provider types to {"config": {...}, "voices": [...],
+    "phrase": "..."}. It defaults to TTS_PROVIDER.
+    """
+    raw = os.environ.get('TTS_WORKER_WARM_PROVIDERS', os.environ.get('TTS_PROVIDER', 'openai')).strip()
+    if not raw:
+        return {}
+    if raw.startswith('{'):
+        return json.loads(raw)
+    return {name.strip(): {} for name in raw.split(',') if name.strip()}
+
+def warm_providers(plan: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Create and warm providers so the first task in a worker process is not a cold start.
+    
+    Args:
+        plan: Providers to warm, see _warm_plan() (defaults to the environment)
         
+    Returns:
+        Dict[str, Any]: Per provider its cache key and timings, or an error
+    """
+    plan = _warm_plan() if plan is None else plan
+    default_configs = _default_provider_configs()
+    report = {}
+    
+    for provider_type, options in plan.items():
+        provider_config = options.get('config', default_configs.get(provider_type, {}))
+        phrase = options.get('phrase', 'Hello.' if provider_type in LOCAL_ENGINES else None)
         try:
-            provider = TTSProviderFactory.create_provider(
-                provider_type,
-                redis_client,
-                config
-            )
-            
-            # Cache provider for reuse
-            self._providers[provider_type] = provider
-            return provider
+            provider, init_time = TTSTask.load_provider(provider_type, provider_config)
+            timings = provider.warm_up(options.get('voices'), phrase)
+            report[provider_type] = {
+                'key': provider_cache_key(provider_type, provider_config),
+                'init_time': init_time or 0.0,
+                'warm_up': timings
+            }
+            logger.info(f"Warmed {provider_type} in {(init_time or 0.0) + sum(timings.values()):.2f}s")
         except Exception as e:
-            logger.error(f"Error creating provider {provider_type}: {e}")
-            raise
+            logger.error(f"Error warming provider {provider_type}: {e}")
+            report[provider_type] = {'error': str(e)}
+    
+    return report
+
+@worker_process_init.connect
+def warm_worker_process(**kwargs):
+    """Warm providers in each prefork child before it consumes tasks."""
+    warm_providers()
+
+@worker_init.connect
+def warm_worker(sender=None, **kwargs):
+    """Warm providers in-process for pools without child processes (solo, threads)."""
+    pool = str(getattr(sender, 'pool_cls', '') or '').lower()
+    if pool and 'prefork' not in pool and 'processes' not in pool:
+        warm_providers()
+
+def _with_timing(task: TTSTask, reference: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the task's latency and cold-start information to an audio reference."""
+    reference.update({
+        'latency': time.time() - task.start_time,
+        'cold_start': task.cold_start,
+        'provider_init_time': task.provider_init_time
+    })
+    return reference
 
 @celery_app.task(bind=True, base=TTSTask, max_retries=3, 
                 retry_backoff=True, retry_backoff_max=60,
@@ -184,38 +387,40 @@ def generate_speech_task(self, text, provider_type, provider_config=None,
         use_cache: Whether to use cache (default: True)
         
     Returns:
-        bytes: Audio data
+        Optional[Dict[str, Any]]: Reference to the audio in the task cache
+            (cache_key, size, duration, format, cached) with the task's latency,
+            cold_start and provider_init_time, or None if nothing was generated
     """
     self.start_time = time.time()
+    self.cold_start = False
+    self.provider_init_time = 0.0
     logger.info(f"Generating speech with {provider_type}: {text[:50]}...")
     
     try:
-        # Get Redis client for caching
-        redis_client = get_redis_client()
+        cache = get_cache_manager()
+        cache_key = task_cache_key(text, provider_type, voice_id, speed)
         
         # Check cache if enabled
-        if use_cache and redis_client:
-            cache_key = f"tts:cache:{provider_type}:{voice_id or 'default'}:{hash(text)}"
-            cached_audio = redis_client.get(cache_key)
-            if cached_audio:
+        if use_cache:
+            reference = _cached_reference(cache, cache_key)
+            if reference:
                 logger.info(f"Cache hit for {text[:30]}...")
-                return cached_audio
+                return _with_timing(self, reference)
         
         # Get provider
         provider = self._get_provider(provider_type, provider_config)
         
-        # Set voice if provided
-        if voice_id and hasattr(provider, 'set_voice'):
-            provider.set_voice(voice_id)
-        
-        # Generate speech
-        audio_data = provider.generate_speech(text, voice_id, speed)
-        
-        # Cache result if successful
-        if audio_data and use_cache and redis_client:
-            redis_client.setex(cache_key, 86400, audio_data)  # 24 hour TTL
+        # Generate speech; the voice is resolved per request, not set on the shared provider
+        permit = get_scheduler().acquire(provider_type, SchedulingClass.PREDICTION)
+        if permit is None:
+            raise RuntimeError(f"No {provider_type} slot available")
+        with permit:
+            audio_data = provider.generate_speech(text, voice_id, speed)
+        if not audio_data:
+            return None
         
-        return audio_data
+        # The audio stays in the cache; only its reference goes through the result backend
+        return _with_timing(self, _store_audio(cache, cache_key, audio_data))
         
     except SoftTimeLimitExceeded:
         logger.warning(f"Task timed out: {text[:50]}...")
@@ -235,13 +440,215 @@ def generate_speech_task(self, text, provider_type, provider_config=None,
             logger.error(f"Max retries reached, failing task")
             raise
 
-@celery_app.task(bind=True, base=TTSTask, 
+def batch_limits(provider_type: str, provider_config: Optional[Dict[str, Any]],
+                 item_count: int) -> Tuple[int, float]:
+    """
+    Size a fan-out to a provider's rate limits.
+    
+    Args:
+        provider_type: Provider type
+        provider_config: Provider configuration, may override the defaults
+            (see scheduler.PROVIDER_LIMITS)
+        item_count: Number of items to synthesize
+        
+    Returns:
+        Tuple[int, float]: Number of parallel sub-tasks, and the seconds each
+            sub-task waits between requests so that together they stay within
+            the provider's requests per minute
+    """
+    limits = provider_limits(provider_type, provider_config)
+    concurrency = max(1, min(int(limits['batch_concurrency']), item_count))
+    rate = limits['requests_per_minute']
+    interval = concurrency * 60.0 / rate if rate else 0.0
+    return concurrency, interval
+
+class BatchProgress:
+    """
+    Per-item progress of a fanned-out batch, kept in Redis.
+    
+    Items are keyed by cache key and move from "pending" to "done" or
+    "failed"; items found in the cache start as "cached". Progress is best
+    effort: Redis errors are logged and never fail a task.
+    """
+    
+    STATUSES = ('cached', 'done', 'failed')
+    
+    def __init__(self, batch_id: str, redis_client=None):
+        """
+        Initialize batch progress tracking.
+        
+        Args:
+            batch_id: ID of the task that planned the batch
+            redis_client: Redis client (defaults to get_redis_client())
+        """
+        self.counts_key = f"tts:batch:{batch_id}"
+        self.items_key = f"tts:batch:{batch_id}:items"
+        self.redis = redis_client or get_redis_client()
+    
+    def start(self, keys: List[str], cached: set) -> None:
+        """Record the batch's items, marking those already cached."""
+        if not self.redis:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self.counts_key, self.items_key)
+            if keys:
+                pipe.hset(self.items_key, mapping={
+                    key: 'cached' if key in cached else 'pending' for key in keys
+                })
+            pipe.hset(self.counts_key, mapping={
+                'total': len(keys), 'cached': len(cached), 'done': 0, 'failed': 0
+            })
+            pipe.expire(self.items_key, celery_app.conf.result_expires)
+            pipe.expire(self.counts_key, celery_app.conf.result_expires)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error recording batch progress: {e}")
+    
+    def mark(self, key: str, status: str) -> None:
+        """Record an item's outcome ("done" or "failed")."""
+        if not self.redis:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(self.items_key, key, status)
+            pipe.hincrby(self.counts_key, status, 1)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error recording batch progress: {e}")
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the batch's progress.
+        
+        Returns:
+            Optional[Dict[str, Any]]: total, cached, done, failed and pending
+                counts plus each item's status, or None if unknown
+        """
+        if not self.redis:
+            return None
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hgetall(self.counts_key)
+            pipe.hgetall(self.items_key)
+            counts, items = pipe.execute()
+        except Exception as e:
+            logger.error(f"Error reading batch progress: {e}")
+            return None
+        
+        if not counts:
+            return None
+        progress = {name.decode(): int(value) for name, value in counts.items()}
+        progress['pending'] = progress['total'] - sum(progress.get(status, 0) for status in self.STATUSES)
+        progress['items'] = {key.decode(): status.decode() for key, status in items.items()}
+        return progress
+
+def get_batch_progress(batch_id: str) -> Optional[Dict[str, Any]]:
+    """Progress of a batch or prewarm task, see BatchProgress.load()."""
+    return BatchProgress(batch_id).load()
+
+def _fan_out(task: Task, batch_id: str, items_by_provider: Dict[str, List[Dict[str, Any]]],
+             provider_configs: Dict[str, Dict[str, Any]], callback):
+    """
+    Replace a planning task with a chord of synthesize_chunk_task sub-tasks.
+    
+    Each provider's items are dealt round-robin into as many chunks as its
+    rate limits allow; the callback receives the list of chunk results and
+    its result becomes the planning task's result.
+    """
+    header = []
+    for provider_type, items in items_by_provider.items():
+        if not items:
+            continue
+        provider_config = provider_configs.get(provider_type) or {}
+        concurrency, interval = batch_limits(provider_type, provider_config, len(items))
+        logger.info(f"Batch {batch_id}: {len(items)} items for {provider_type} "
+                    f"in {concurrency} sub-tasks, {interval:.2f}s apart")
+        header.extend(
+            synthesize_chunk_task.s(
+                batch_id=batch_id,
+                provider_type=provider_type,
+                items=items[i::concurrency],
+                provider_config=provider_config,
+                interval=interval
+            )
+            for i in range(concurrency)
+        )
+    
+    if not header:
+        return task.replace(callback.clone(args=([],)))
+    return task.replace(chord(header, callback))
+
+@celery_app.task(bind=True, base=TTSTask,
                 time_limit=300, soft_time_limit=240,
                 queue='tts_normal')
+def synthesize_chunk_task(self, batch_id, provider_type, items, provider_config=None, interval=0.0):
+    """
+    Synthesize one chunk of a fanned-out batch into the task cache.
+    
+    Args:
+        batch_id: ID of the task that planned the batch
+        provider_type: Provider type to use
+        items: Items with key, text, voice_id and speed
+        provider_config: Provider configuration (optional)
+        interval: Minimum seconds between the starts of consecutive requests
+        
+    Returns:
+        List[Dict[str, Any]]: Per item its key, and either a reference or an error
+    """
+    self.start_time = time.time()
+    provider = self._get_provider(provider_type, provider_config)
+    cache = get_cache_manager()
+    progress = BatchProgress(batch_id)
+    
+    results = []
+    next_start = time.time()
+    for index, item in enumerate(items):
+        try:
+            delay = next_start - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            next_start = time.time() + interval
+            
+            permit = get_scheduler().acquire(provider_type, SchedulingClass.PREWARM)
+            if permit is None:
+                raise RuntimeError(f"No {provider_type} slot available")
+            with permit:
+                audio_data = provider.generate_speech(item['text'], item['voice_id'], item['speed'])
+            if not audio_data:
+                raise RuntimeError("No audio generated")
+            results.append({'key': item['key'], 'reference': _store_audio(cache, item['key'], audio_data)})
+            progress.mark(item['key'], 'done')
+        except SoftTimeLimitExceeded:
+            logger.warning(f"Batch {batch_id} chunk timed out with {len(items) - index} items left")
+            for remaining in items[index:]:
+                results.append({'key': remaining['key'], 'error': 'timed out'})
+                progress.mark(remaining['key'], 'failed')
+            break
+        except Exception as e:
+            logger.error(f"Error generating speech for text '{item['text'][:30]}...': {e}")
+            results.append({'key': item['key'], 'error': str(e)})
+            progress.mark(item['key'], 'failed')
+    
+    return results
+
+def _collect_chunk_results(chunk_results: List[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Index the results of all chunks by cache key."""
+    return {entry['key']: entry for chunk in chunk_results or [] for entry in chunk}
+
+@celery_app.task(bind=True, base=TTSTask,
+                time_limit=60, soft_time_limit=30,
+                queue='tts_normal')
 def batch_generation_task(self, texts, provider_type, provider_config=None, 
                          voice_id=None, speed=1.0, use_cache=True):
     """
-    Generate speech for multiple texts in batch.
+    Generate speech for multiple texts in parallel.
+    
+    Texts are deduplicated by cache key and cached ones are found with one
+    multi-key probe. The rest fan out as a chord of synthesize_chunk_task
+    sub-tasks sized to the provider's rate limits, and this task's result
+    becomes the manifest built by aggregate_batch_task. Per-item progress is
+    available from get_batch_progress() meanwhile.
     
     Args:
         texts: List of texts to convert to speech
@@ -252,79 +659,142 @@ def batch_generation_task(self, texts, provider_type, provider_config=None,
         use_cache: Whether to use cache (default: True)
         
     Returns:
-        Dict[str, bytes]: Dictionary mapping text to audio data
+        Dict[str, Any]: Manifest, see aggregate_batch_task
     """
-    self.start_time = time.time()
+    batch_id = self.request.id
     logger.info(f"Batch generating speech with {provider_type}: {len(texts)} texts")
     
-    results = {}
-    provider = None
+    keys = {text: task_cache_key(text, provider_type, voice_id, speed) for text in texts if text}
+    unique_keys = list(dict.fromkeys(keys.values()))
+    cached = get_cache_manager().contains_many(unique_keys) if use_cache else set()
+    BatchProgress(batch_id).start(unique_keys, cached)
     
-    try:
-        # Get provider
-        provider = self._get_provider(provider_type, provider_config)
-        
-        # Set voice if provided
-        if voice_id and hasattr(provider, 'set_voice'):
-            provider.set_voice(voice_id)
-        
-        # Get Redis client for caching
-        redis_client = get_redis_client()
-        
-        # Process each text
-        for text in texts:
-            try:
-                # Skip empty text
-                if not text:
-                    continue
-                
-                # Check cache if enabled
-                cache_key = None
-                if use_cache and redis_client:
-                    cache_key = f"tts:cache:{provider_type}:{voice_id or 'default'}:{hash(text)}"
-                    cached_audio = redis_client.get(cache_key)
-                    if cached_audio:
-                        results[text] = cached_audio
-                        continue
-                
-                # Generate speech
-                audio_data = provider.generate_speech(text, voice_id, speed)
-                
-                # Cache result if successful
-                if audio_data and use_cache and redis_client and cache_key:
-                    redis_client.setex(cache_key, 86400, audio_data)  # 24 hour TTL
-                
-                results[text] = audio_data
-                
-            except Exception as e:
-                logger.error(f"Error generating speech for text '{text[:30]}...': {e}")
-                results[text] = None
-        
-        return results
-        
-    except SoftTimeLimitExceeded:
-        logger.warning(f"Batch task timed out")
-        return results
+    texts_by_key = {key: text for text, key in keys.items()}
+    misses = [
+        {'key': key, 'text': texts_by_key[key], 'voice_id': voice_id, 'speed': speed}
+        for key in unique_keys if key not in cached
+    ]
+    
+    manifest = {
+        'batch_id': batch_id,
+        'provider_type': provider_type,
+        'requested': len(texts),
+        'duplicates': sum(1 for text in texts if text) - len(keys),
+        'keys': keys
+    }
+    return _fan_out(self, batch_id, {provider_type: misses}, {provider_type: provider_config},
+                    aggregate_batch_task.s(manifest=manifest))
+
+@celery_app.task(bind=True, base=TTSTask,
+                time_limit=60, soft_time_limit=30,
+                queue='tts_normal')
+def aggregate_batch_task(self, chunk_results, manifest):
+    """
+    Combine a batch's chunk results into its manifest.
+    
+    Args:
+        chunk_results: Results of the batch's synthesize_chunk_task sub-tasks
+        manifest: Batch plan from batch_generation_task
         
-    except Exception as e:
-        logger.error(f"Error in batch generation: {e}")
-        raise
+    Returns:
+        Dict[str, Any]: Manifest with "items" mapping each text to an audio
+            reference (None if it failed), "errors" mapping failed texts to
+            their error, and requested/unique/duplicates/cached/generated/failed counts
+    """
+    cache = get_cache_manager()
+    generated = _collect_chunk_results(chunk_results)
+    
+    items = {}
+    errors = {}
+    cached_count = 0
+    for text, key in manifest['keys'].items():
+        entry = generated.get(key)
+        if entry is None:
+            # Found by the probe; it may have been evicted since
+            items[text] = _cached_reference(cache, key)
+            if items[text] is None:
+                errors[text] = 'not in cache'
+            else:
+                cached_count += 1
+        else:
+            items[text] = entry.get('reference')
+            if 'error' in entry:
+                errors[text] = entry['error']
+    
+    unique = len(manifest['keys'])
+    return {
+        'batch_id': manifest['batch_id'],
+        'provider_type': manifest['provider_type'],
+        'items': items,
+        'errors': errors,
+        'requested': manifest['requested'],
+        'unique': unique,
+        'duplicates': manifest['duplicates'],
+        'cached': cached_count,
+        'generated': unique - cached_count - len(errors),
+        'failed': len(errors)
+    }
 
 @celery_app.task(bind=True, base=TTSTask,
-                time_limit=600, soft_time_limit=540,
+                time_limit=60, soft_time_limit=30,
                 queue='tts_low')
 def prewarm_task(self, common_phrases, provider_types, voice_ids=None):
     """
     Prewarm TTS providers by generating common phrases.
     
+    Phrases are deduplicated by cache key across providers and voices and
+    probed in the cache at once; the misses fan out like batch_generation_task,
+    each provider within its own rate limits.
+    
     Args:
         common_phrases: List of common phrases to generate
         provider_types: List of provider types to prewarm
         voice_ids: Dictionary mapping provider types to list of voice IDs
         
     Returns:
-        Dict: Results of prewarming
+        Dict: Results of prewarming, see aggregate_prewarm_task
+    """
+    batch_id = self.request.id
+    logger.info(f"Prewarming {len(provider_types)} providers with {len(common_phrases)} phrases")
+    
+    voice_ids = voice_ids or {}
+    plan = []
+    items_by_key = {}
+    for provider_type in provider_types:
+        for voice_id in voice_ids.get(provider_type) or [None]:
+            for phrase in common_phrases:
+                key = task_cache_key(phrase, provider_type, voice_id, 1.0)
+                plan.append([provider_type, voice_id or 'default', key])
+                items_by_key.setdefault(key, (provider_type, {
+                    'key': key, 'text': phrase, 'voice_id': voice_id, 'speed': 1.0
+                }))
+    
+    unique_keys = list(items_by_key)
+    cached = get_cache_manager().contains_many(unique_keys)
+    BatchProgress(batch_id).start(unique_keys, cached)
+    
+    misses = {provider_type: [] for provider_type in provider_types}
+    for key, (provider_type, item) in items_by_key.items():
+        if key not in cached:
+            misses[provider_type].append(item)
+    
+    return _fan_out(self, batch_id, misses, {}, aggregate_prewarm_task.s(plan=plan))
+
+@celery_app.task(bind=True, base=TTSTask,
+                time_limit=60, soft_time_limit=30,
+                queue='tts_low')
+def aggregate_prewarm_task(self, chunk_results, plan):
+    """
+    Combine prewarm chunk results into per-provider and per-voice statistics.
+    
+    Args:
+        chunk_results: Results of the prewarm's synthesize_chunk_task sub-tasks
+        plan: [provider_type, voice, cache_key] for every phrase requested
+        
+    Returns:
+        Dict: total/success/errors counts, overall and per provider and voice
     """
+    generated = _collect_chunk_results(chunk_results)
     results = {
         'total': 0,
         'success': 0,
@@ -332,78 +802,23 @@ def prewarm_task(self, common_phrases, provider_types, voice_ids=None):
         'providers': {}
     }
     
-    logger.info(f"Prewarming {len(provider_types)} providers with {len(common_phrases)} phrases")
-    
-    voice_ids = voice_ids or {}
-    redis_client = get_redis_client()
-    
-    for provider_type in provider_types:
-        try:
-            # Get provider
-            provider = self._get_provider(provider_type)
-            
-            # Get voices for this provider
-            provider_voices = voice_ids.get(provider_type, [None])
-            
-            # Initialize provider stats
-            results['providers'][provider_type] = {
-                'total': 0,
-                'success': 0,
-                'errors': 0,
-                'voices': {}
-            }
-            
-            # Process each voice
-            for voice_id in provider_voices:
-                # Set voice if provided
-                if voice_id and hasattr(provider, 'set_voice'):
-                    provider.set_voice(voice_id)
-                
-                # Initialize voice stats
-                results['providers'][provider_type]['voices'][voice_id or 'default'] = {
-                    'total': 0,
-                    'success': 0,
-                    'errors': 0
-                }
-                
-                # Generate speech for each phrase
-                for phrase in common_phrases:
-                    try:
-                        results['total'] += 1
-                        results['providers'][provider_type]['total'] += 1
-                        results['providers'][provider_type]['voices'][voice_id or 'default']['total'] += 1
-                        
-                        # Check cache first
-                        cache_key = f"tts:cache:{provider_type}:{voice_id or 'default'}:{hash(phrase)}"
-                        cached = False
-                        
-                        if redis_client:
-                            cached_audio = redis_client.get(cache_key)
-                            if cached_audio:
-                                # Already cached
-                                cached = True
-                        
-                        if not cached:
-                            # Generate and cache
-                            audio_data = provider.generate_speech(phrase, voice_id, 1.0)
-                            
-                            if audio_data and redis_client:
-                                redis_client.setex(cache_key, 86400, audio_data)  # 24 hour TTL
-                        
-                        # Update success stats
-                        results['success'] += 1
-                        results['providers'][provider_type]['success'] += 1
-                        results['providers'][provider_type]['voices'][voice_id or 'default']['success'] += 1
-                        
-                    except Exception as e:
-                        # Update error stats
-                        results['errors'] += 1
-                        results['providers'][provider_type]['errors'] += 1
-                        results['providers'][provider_type]['voices'][voice_id or 'default']['errors'] += 1
-                        logger.error(f"Error prewarming {provider_type} with voice {voice_id} for phrase '{phrase[:30]}...': {e}")
-            
-        except Exception as e:
-            logger.error(f"Error prewarming provider {provider_type}: {e}")
+    for provider_type, voice, key in plan:
+        provider_stats = results['providers'].setdefault(provider_type, {
+            'total': 0,
+            'success': 0,
+            'errors': 0,
+            'voices': {}
+        })
+        voice_stats = provider_stats['voices'].setdefault(voice, {
+            'total': 0,
+            'success': 0,
+            'errors': 0
+        })
+        
+        outcome = 'errors' if 'error' in generated.get(key, {}) else 'success'
+        for stats in (results, provider_stats, voice_stats):
+            stats['total'] += 1
+            stats[outcome] += 1
     
     logger.info(f"Prewarming completed: {results['success']}/{results['total']} successful")
-    return results 
\ No newline at end of file
+    return results
@@ -19,6 +19,7 @@ from datetime import datetime, timedelta
 # Local imports
 from .audio_buffer import AudioBuffer, AudioChunk, BufferThreshold
 from .events import TTSEventEmitter, TTSEventType
+from ..tracing import current_trace_id, encode_client_state, get_tracer
 
 # Optional backoff library for retries
 try:
@@ -87,6 +88,8 @@ class TelnyxStreamingSession:
         self.call_control_id = call_control_id
         self.client_state = client_state
         self.command_id = command_id or str(uuid.uuid4())
+        # Trace of the turn this audio answers; uploads run in the worker thread
+        self.trace_id = current_trace_id()
         self.stream_id = None
         
         # Session state
@@ -384,6 +387,9 @@ class TelnyxStreamingSession:
                 
                 # Calculate latency
                 latency_ms = (end_time - start_time) * 1000
+                get_tracer().record("telnyx.upload", start_time, end_time, trace_id=self.trace_id,
+                                    error=None if success else "upload failed",
+                                    bytes=len(chunk.data))
                 
                 # Update statistics
                 if success:
@@ -624,6 +630,7 @@ class TelnyxStreamingManager:
             # Check if session already exists
             if call_control_id in self.sessions:
                 logger.warning(f"Streaming session already exists for call {call_control_id}")
+                self.sessions[call_control_id].trace_id = current_trace_id() or self.sessions[call_control_id].trace_id
                 return call_control_id
             
             # Check if too many sessions
@@ -1158,7 +1165,7 @@ class TelnyxStreamingManager:
         
         # Build JSON payload
         payload = {
-            "client_state": session.client_state,
+            "client_state": encode_client_state(session.client_state, session.trace_id),
             "command_id": session.command_id,
             "audio_stream": {
                 "content_type": content_type,
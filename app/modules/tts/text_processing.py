@@ -3,11 +3,225 @@
 
 import logging
 import re
-import nltk
-from typing import List, Generator, Optional, Tuple
+from typing import List, Generator, Iterable, Optional, Tuple
 
 logger = logging.getLogger("tts-text-processing")
 
+# Abbreviations whose trailing period never ends a sentence (lowercase, without the final period)
+ABBREVIATIONS = frozenset([
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "ft", "vs", "etc",
+    "e.g", "i.e", "a.m", "p.m", "u.s", "u.k", "inc", "ltd", "corp", "dept",
+    "approx", "fig", "vol", "jan", "feb", "apr", "jun", "jul", "aug", "sep",
+    "sept", "oct", "nov", "dec", "tue", "thu", "fri"
+])
+
+class SentenceSegmenter:
+    """
+    Incremental sentence boundary detector.
+    
+    Text is fed in arbitrary chunks and each character is scanned once;
+    only an undecided terminator at the end of the buffer is revisited when
+    more text arrives. A sentence is emitted as soon as the first character
+    of the following sentence proves it is complete, so there is no model
+    to load and no re-tokenization of earlier text.
+    
+    Periods after abbreviations and initials, inside decimals ("3.5") and in
+    ellipses followed by a lowercase continuation do not end a sentence.
+    """
+    
+    TERMINATORS = ".!?\u2026"
+    CLOSERS = "\"')]}\u201d\u2019"
+    
+    def __init__(self, abbreviations: Optional[Iterable[str]] = None):
+        """
+        Initialize the segmenter.
+        
+        Args:
+            abbreviations (Optional[Iterable[str]]): Lowercase abbreviations, without
+                their final period, that never end a sentence
+        """
+        self.abbreviations = frozenset(abbreviations) if abbreviations is not None else ABBREVIATIONS
+        self._buffer = ""
+        self._start = 0  # Start of the current sentence in the buffer
+        self._scan = 0   # Next character to scan
+    
+    @property
+    def pending(self) -> str:
+        """Text received but not yet emitted as a sentence."""
+        return self._buffer[self._start:]
+    
+    def feed(self, text: str) -> List[str]:
+        """
+        Add text and return the sentences it completes.
+        
+        Args:
+            text (str): Next chunk of text
+            
+        Returns:
+            List[str]: Newly completed sentences, in order
+        """
+        if not text:
+            return []
+        
+        self._buffer += text
+        sentences = []
+        buffer = self._buffer
+        length = len(buffer)
+        i = self._scan
+        
+        while i < length:
+            char = buffer[i]
+            
+            if char == "\n":
+                # A blank line ends a paragraph, and with it any open sentence
+                j = i + 1
+                while j < length and buffer[j] in " \t\r":
+                    j += 1
+                if j == length:
+                    break
+                if buffer[j] == "\n":
+                    self._emit(i, j + 1, sentences)
+                    i = j + 1
+                    continue
+                i += 1
+                continue
+            
+            if char not in self.TERMINATORS:
+                i += 1
+                continue
+            
+            # Terminator run and closing quotes/brackets
+            end = i
+            while end < length and buffer[end] in self.TERMINATORS:
+                end += 1
+            while end < length and buffer[end] in self.CLOSERS:
+                end += 1
+            
+            # Find the first character of what follows
+            nxt = end
+            while nxt < length and buffer[nxt].isspace():
+                nxt += 1
+            if nxt == length:
+                # Undecided until more text arrives
+                break
+            
+            if self._is_boundary(buffer, i, end, nxt):
+                self._emit(end, nxt, sentences)
+                i = nxt
+            else:
+                i = end
+        
+        self._scan = i
+        self._compact()
+        return sentences
+    
+    def flush(self) -> List[str]:
+        """
+        Return any remaining text as a final sentence and reset.
+        
+        Returns:
+            List[str]: The remaining sentence, if any
+        """
+        remainder = self.pending.strip()
+        self.reset()
+        return [remainder] if remainder else []
+    
+    def force_break(self, max_size: int, min_size: int = 0) -> Optional[str]:
+        """
+        Emit part of an overlong pending sentence, breaking at a space.
+        
+        Args:
+            max_size (int): Pending length above which a break is forced
+            min_size (int): Minimum length of the emitted fragment
+            
+        Returns:
+            Optional[str]: The emitted fragment, or None if no break was needed
+        """
+        pending = self.pending
+        if len(pending) <= max_size:
+            return None
+        
+        break_point = pending.rfind(" ", min_size, max_size)
+        if break_point == -1:
+            break_point = max_size
+        
+        self._start += break_point
+        self._scan = max(self._scan, self._start)
+        self._compact()
+        return pending[:break_point].strip() or None
+    
+    def reset(self) -> None:
+        """Discard all buffered text."""
+        self._buffer = ""
+        self._start = 0
+        self._scan = 0
+    
+    def split(self, text: str) -> List[str]:
+        """
+        Split a complete text into sentences.
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            List[str]: List of sentences
+        """
+        self.reset()
+        return self.feed(text) + self.flush()
+    
+    def _is_boundary(self, buffer: str, i: int, end: int, nxt: int) -> bool:
+        """
+        Decide whether the terminator run starting at i ends a sentence.
+        
+        Args:
+            buffer (str): Text buffer
+            i (int): Index of the first terminator
+            end (int): Index after the terminator run and closers
+            nxt (int): Index of the next non-space character
+        """
+        following = buffer[nxt]
+        
+        # "3.5", "e.g.x", "U.S." inside a token: no whitespace after the run
+        if nxt == end:
+            return False
+        
+        run = buffer[i:end].rstrip(self.CLOSERS)
+        if "!" in run or "?" in run:
+            return True
+        
+        if run.startswith("..") or run.startswith("\u2026"):
+            # An ellipsis only ends a sentence if a new one clearly starts
+            return not following.islower()
+        
+        # Single period: check the word it follows
+        word_start = i
+        while word_start > self._start and not buffer[word_start - 1].isspace():
+            word_start -= 1
+        word = buffer[word_start:i].lstrip("\"'([{\u201c\u2018")
+        
+        if word.lower() in self.abbreviations:
+            return False
+        if len(word) == 1 and word.isupper() and word != "I":
+            # Initial such as "J. Smith"
+            return False
+        
+        # New sentences do not start in lowercase
+        return not following.islower()
+    
+    def _emit(self, end: int, next_start: int, sentences: List[str]) -> None:
+        """Emit buffer[start:end] as a sentence and start the next one."""
+        sentence = self._buffer[self._start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        self._start = next_start
+    
+    def _compact(self) -> None:
+        """Drop emitted text from the buffer."""
+        if self._start:
+            self._buffer = self._buffer[self._start:]
+            self._scan -= self._start
+            self._start = 0
+
 class TextFragmenter:
     """
     Handles text fragmentation for optimal streaming TTS.
@@ -28,18 +242,19 @@ class TextFragmenter:
             min_fragment_size (int): Minimum fragment size in characters
             max_fragment_size (int): Maximum fragment size in characters
             fast_first_response (bool): Enable quick first response
-            force_nltk_download (bool): Force download of NLTK data
+            force_nltk_download (bool): Download NLTK punkt data (not needed for splitting)
         """
         self.min_fragment_size = min_fragment_size
         self.max_fragment_size = max_fragment_size
         self.fast_first_response = fast_first_response
         
-        # Download NLTK data if needed
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            logger.info("Downloading NLTK punkt tokenizer...")
-            nltk.download('punkt')
+        # Sentence splitting uses SentenceSegmenter; NLTK is only loaded on request
+        if force_nltk_download:
+            try:
+                import nltk
+                nltk.download('punkt')
+            except Exception as e:
+                logger.warning(f"Could not download NLTK punkt tokenizer: {e}")
         
         # Initialize custom punctuation regex
         self.punctuation_regex = re.compile(r'([.!?])\s+')
@@ -72,7 +287,7 @@ class TextFragmenter:
     
     def split_into_sentences(self, text: str) -> List[str]:
         """
-        Split text into sentences using NLTK.
+        Split text into sentences using SentenceSegmenter.
         
         Args:
             text (str): Input text
@@ -81,9 +296,9 @@ class TextFragmenter:
             List[str]: List of sentences
         """
         try:
-            return nltk.sent_tokenize(text)
+            return SentenceSegmenter().split(text)
         except Exception as e:
-            logger.error(f"Error in NLTK sentence tokenization: {e}")
+            logger.error(f"Error in sentence segmentation: {e}")
             # Fallback to simple regex-based splitting
             return self._regex_split_sentences(text)
     
@@ -114,52 +329,36 @@ class TextFragmenter:
         
         return [s.strip() for s in result if s.strip()]
     
-    def process_stream(self, text_stream: Generator[str, None, None]) -> Generator[str, None, None]:
+    def process_stream(self, text_stream: Iterable[str]) -> Generator[str, None, None]:
         """
         Process a stream of text into optimal fragments.
         
+        Each incoming chunk is scanned once by an incremental SentenceSegmenter,
+        so sentences are emitted as soon as they are complete and the cost is
+        linear in the length of the stream.
+        
         Args:
-            text_stream (Generator[str, None, None]): Stream of text chunks
+            text_stream (Iterable[str]): Stream of text chunks
             
         Returns:
             Generator[str, None, None]: Stream of optimized fragments
         """
-        buffer = ""
+        segmenter = SentenceSegmenter()
         
         for chunk in text_stream:
-            buffer += chunk
-            
-            # Process complete sentences from buffer
-            sentences = self.split_into_sentences(buffer)
-            
-            # Keep the last (potentially incomplete) sentence in buffer
-            if sentences:
-                # Yield all but the last sentence
-                for sentence in sentences[:-1]:
-                    yield sentence
-                
-                # Check if the last sentence appears complete
-                last_sentence = sentences[-1]
-                if buffer.strip().endswith(last_sentence.strip()) and last_sentence.strip()[-1] in '.!?':
-                    yield last_sentence
-                    buffer = ""
-                else:
-                    # Keep last sentence in buffer as it may be incomplete
-                    buffer = last_sentence
+            for sentence in segmenter.feed(chunk):
+                yield sentence
             
-            # Handle very long buffers by force-breaking
-            if len(buffer) > self.max_fragment_size:
-                # Find the last good break point
-                break_point = buffer.rfind(' ', self.min_fragment_size, self.max_fragment_size)
-                if break_point == -1:
-                    break_point = self.max_fragment_size
-                
-                yield buffer[:break_point].strip()
-                buffer = buffer[break_point:].strip()
+            # Handle very long sentences by force-breaking
+            while True:
+                fragment = segmenter.force_break(self.max_fragment_size, self.min_fragment_size)
+                if fragment is None:
+                    break
+                yield fragment
         
         # Yield any remaining text in buffer
-        if buffer:
-            yield buffer
+        for sentence in segmenter.flush():
+            yield sentence
     
     def fragment_text(self, text: str) -> Tuple[Optional[str], Generator[str, None, None]]:
         """
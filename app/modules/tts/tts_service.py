@@ -5,16 +5,103 @@ import logging
 import json
 import hashlib
 import time
-from typing import Dict, Any, Optional, List, Tuple, Generator
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Generator, Callable, Set, Iterable, Union
 
 from .provider_factory import TTSProviderFactory
 from .base_provider import BaseTTSProvider, StreamingTTSProvider
+from .output_format import (
+    OutputFormat, StreamTranscoder, MULAW, negotiate_output_format, resolve_output_format, transcode
+)
 from .fallback_manager import TTSFallbackManager
-from .tasks import generate_speech_task, batch_generation_task, prewarm_task
-from .events import TTSEvent, TTSEventType, TTSEventEmitter
+from .scheduler import ProviderBusyError, SchedulingClass, get_scheduler
+from .tasks import (
+    generate_speech_task, batch_generation_task, prewarm_task, get_cache_manager, get_batch_progress
+)
+from .events import TTSEventType, TTSEventEmitter
+from ..tracing import traced, traced_stream
 
 logger = logging.getLogger("tts-service")
 
+class ProviderLease:
+    """
+    A provider checked out for the duration of a single request.
+    
+    Requests never swap the service-wide provider; each one holds a lease
+    and releases it (reporting success or failure) when it completes.
+    """
+    
+    def __init__(self, provider_name: str, provider: BaseTTSProvider,
+                 on_release: Optional[Callable[[bool], None]] = None):
+        """
+        Initialize a provider lease.
+        
+        Args:
+            provider_name: Configured name of the leased provider
+            provider: Provider instance
+            on_release: Callback invoked once with the error flag on release
+        """
+        self.provider_name = provider_name
+        self.provider = provider
+        self._on_release = on_release
+        self._released = False
+    
+    def release(self, error: bool = False) -> None:
+        """
+        Release the lease. Subsequent calls are ignored.
+        
+        Args:
+            error: Whether the request failed with this provider
+        """
+        if self._released:
+            return
+        self._released = True
+        
+        if self._on_release:
+            try:
+                self._on_release(error)
+            except Exception as e:
+                logger.error(f"Error releasing provider {self.provider_name}: {e}")
+    
+    def __enter__(self) -> "ProviderLease":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.release(error=exc_type is not None)
+        return False
+
+class _FragmentJob:
+    """A dialog fragment being synthesized ahead of playback."""
+    
+    # Marks the end of a fragment's chunk queue
+    END = object()
+    
+    def __init__(self, index: int, fragment_info: Dict[str, Any]):
+        """
+        Initialize a fragment job.
+        
+        Args:
+            index: Position of the fragment in the turn
+            fragment_info: Fragment info from DialogManager.process_dialog_turn
+        """
+        self.index = index
+        self.info = fragment_info
+        self.text = fragment_info.get("fragment", "")
+        self.chunks: "queue.Queue[Any]" = queue.Queue()
+        self.cancelled = threading.Event()
+        self.error: Optional[Exception] = None
+        self.future = None
+        self.provider_name: Optional[str] = None
+    
+    def cancel(self) -> None:
+        """Stop synthesis of this fragment as soon as possible."""
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
 class TTSService:
     """
     TTS service that coordinates providers and Telnyx integration.
@@ -25,7 +112,8 @@ class TTSService:
     """
     
     def __init__(self, redis_client=None, telnyx_handler=None, 
-                 config: Optional[Dict[str, Any]] = None):
+                 config: Optional[Dict[str, Any]] = None,
+                 voice_pool_manager=None):
         """
         Initialize the TTS service.
         
@@ -33,38 +121,51 @@ class TTSService:
             redis_client: Redis client for caching
             telnyx_handler: Telnyx handler for audio upload
             config (Optional[Dict[str, Any]]): Service configuration
+            voice_pool_manager: Optional VoicePoolManager to lease providers from
         """
         self.redis_client = redis_client
         self.telnyx_handler = telnyx_handler
         self.config = config or {}
+        self.voice_pool_manager = voice_pool_manager
+        
+        # Providers built outside the fallback manager, created once and shared
+        self._provider_cache: Dict[str, BaseTTSProvider] = {}
+        self._provider_cache_lock = threading.Lock()
         
         # Get default provider type from config or use openai
         default_provider = self.config.get("default_provider", "openai")
+        self.default_provider_name = default_provider
         fallback_providers = self.config.get("fallback_providers", [])
         provider_configs = self.config.get("provider_config", {})
         
+        # Event emitter for TTS events, shared with providers that emit their own
+        self.events = TTSEventEmitter()
+        
         # Initialize fallback manager if fallback providers configured
         if fallback_providers:
             logger.info(f"Initializing with fallback providers: {fallback_providers}")
             self.fallback_manager = TTSFallbackManager(
                 primary_provider=default_provider,
                 fallback_providers=fallback_providers,
+                provider_factory=self._create_provider,
                 redis_client=redis_client,
                 provider_configs=provider_configs,
                 health_check_interval=self.config.get("health_check_interval", 300),
                 max_failures=self.config.get("max_failures", 3),
-                auto_recovery=self.config.get("auto_recovery", True)
+                auto_recovery=self.config.get("auto_recovery", True),
+                probe_timeout=self.config.get("health_probe_timeout", 10.0)
             )
-            # Use provider from fallback manager
-            self.provider = self.fallback_manager.get_provider()
+            self._provider = None
         else:
             # No fallback, create single provider directly
             provider_config = provider_configs.get(default_provider, {})
-            self.provider = TTSProviderFactory.create_provider(
-                default_provider, redis_client, provider_config
-            )
+            self._provider = self._create_provider(default_provider, redis_client, provider_config)
             self.fallback_manager = None
         
+        # Provider requests from every caller in this process share one scheduler
+        self.scheduler = get_scheduler()
+        self.scheduler.configure(provider_configs, **self.config.get("scheduler", {}))
+        
         # Cache settings
         self.cache_enabled = self.config.get("cache_enabled", True)
         self.cache_ttl = self.config.get("cache_ttl", 86400)  # 24 hours default
@@ -72,8 +173,15 @@ class TTSService:
         # Voice mapping
         self.voice_mapping = self.config.get("voice_mapping", {})
         
-        # Event emitter for TTS events
-        self.events = TTSEventEmitter()
+        # Default consumer format ("pstn", "pstn_l16", "hd", "wideband");
+        # None returns each provider's own format
+        self.output_format = self.config.get("output_format")
+        
+        # Look-ahead synthesis for dialog turns (created on first pipelined turn)
+        self._pipeline_executor = None
+        self._pipeline_lock = threading.Lock()
+        self._active_dialog_turns: Dict[str, threading.Event] = {}
+        self._text_fragmenter = None
         
         # Initialize dialog manager if dialog config is present
         self.dialog_manager = None
@@ -87,76 +195,370 @@ class TTSService:
             "openai": ["high_quality", "emotional", "cloud", "voice_style"]
         }
         
-    def generate_speech(self, text: str, voice_id: Optional[str] = None,
-                        speed: float = 1.0, use_cache: bool = True) -> Optional[bytes]:
+    @property
+    def provider(self) -> BaseTTSProvider:
         """
-        Generate speech using current provider with fallback support.
+        The service's current default provider.
+        
+        With a fallback manager this is whatever the manager currently routes
+        to; requests do not change it, they lease providers instead.
+        """
+        if self.fallback_manager:
+            return self.fallback_manager.get_provider()
+        return self._provider
+    
+    def _create_provider(self, provider_name: str, redis_client=None,
+                         provider_config: Optional[Dict[str, Any]] = None) -> BaseTTSProvider:
+        """
+        Create a provider that reports its events through this service's emitter.
+        
+        Args:
+            provider_name (str): Provider name
+            redis_client: Redis client for caching (optional)
+            provider_config (Optional[Dict[str, Any]]): Provider configuration
+            
+        Returns:
+            BaseTTSProvider: Instantiated provider
+        """
+        return TTSProviderFactory.create_provider(
+            provider_name, redis_client, provider_config, event_emitter=self.events
+        )
+    
+    def _candidate_provider_names(self, capability: Optional[str] = None) -> List[str]:
+        """
+        Get provider names in the order a request should try them.
+        
+        Args:
+            capability (Optional[str]): Only include providers with this capability
+            
+        Returns:
+            List[str]: Ordered provider names
+        """
+        if self.fallback_manager:
+            names = self.fallback_manager.get_candidate_providers()
+        else:
+            names = [self.default_provider_name]
+        
+        if capability:
+            names = [n for n in names if capability in self.provider_capabilities.get(n, [])]
+        
+        return names
+    
+    def _get_shared_provider(self, provider_name: str) -> Optional[BaseTTSProvider]:
+        """
+        Get the shared instance for a provider, creating it at most once.
+        
+        Args:
+            provider_name (str): Provider name
+            
+        Returns:
+            Optional[BaseTTSProvider]: Provider instance or None if unavailable
+        """
+        if self.fallback_manager:
+            provider = self.fallback_manager.get_provider_by_name(provider_name)
+            if provider is not None:
+                return provider
+        elif provider_name == self.default_provider_name:
+            return self._provider
+        
+        with self._provider_cache_lock:
+            provider = self._provider_cache.get(provider_name)
+            if provider is None:
+                try:
+                    provider_config = self.config.get("provider_config", {}).get(provider_name, {})
+                    provider = self._create_provider(provider_name, self.redis_client, provider_config)
+                    self._provider_cache[provider_name] = provider
+                except Exception as e:
+                    logger.error(f"Error creating provider {provider_name}: {e}")
+                    return None
+            return provider
+    
+    def _record_outcome(self, provider_name: str, error: bool) -> None:
+        """
+        Report a request outcome for a provider to the fallback manager.
+        
+        Args:
+            provider_name (str): Provider name
+            error (bool): Whether the request failed
+        """
+        if not self.fallback_manager:
+            return
+        
+        if error:
+            self.fallback_manager.mark_provider_failure(provider_name)
+        else:
+            self.fallback_manager.record_success(provider_name)
+    
+    def _lease_provider(self, voice_id: Optional[str] = None, require_streaming: bool = False,
+                        capability: Optional[str] = None,
+                        exclude: Optional[Set[str]] = None) -> Optional[ProviderLease]:
+        """
+        Lease a provider for a single request.
+        
+        Pooled instances are preferred when a voice pool exists for the
+        provider and voice; otherwise the shared instance is leased.
+        
+        Args:
+            voice_id (Optional[str]): Requested voice (used for pool lookup)
+            require_streaming (bool): Only lease StreamingTTSProvider instances
+            capability (Optional[str]): Only lease providers with this capability
+            exclude (Optional[Set[str]]): Provider names already tried by this request
+            
+        Returns:
+            Optional[ProviderLease]: Lease or None if no provider is available
+        """
+        exclude = exclude or set()
+        
+        for provider_name in self._candidate_provider_names(capability):
+            if provider_name in exclude:
+                continue
+            
+            if self.voice_pool_manager and voice_id:
+                pooled_voice = self._map_voice_id_for_provider(voice_id, provider_name)
+                result = self.voice_pool_manager.get_provider(provider_name, pooled_voice)
+                if result:
+                    provider_id, provider = result
+                    if require_streaming and not isinstance(provider, StreamingTTSProvider):
+                        self.voice_pool_manager.return_provider(provider_id)
+                    else:
+                        def release_pooled(error, provider_id=provider_id, provider_name=provider_name):
+                            self.voice_pool_manager.return_provider(provider_id, error)
+                            self._record_outcome(provider_name, error)
+                        return ProviderLease(provider_name, provider, release_pooled)
+            
+            provider = self._get_shared_provider(provider_name)
+            if provider is None:
+                continue
+            if require_streaming and not isinstance(provider, StreamingTTSProvider):
+                continue
+            
+            return ProviderLease(
+                provider_name, provider,
+                lambda error, provider_name=provider_name: self._record_outcome(provider_name, error)
+            )
+        
+        return None
+    
+    def _target_format(self, output_format: Union[str, OutputFormat, None],
+                       container: str) -> Optional[OutputFormat]:
+        """
+        Resolve the format a caller wants, falling back to the configured default.
+        
+        Args:
+            output_format (Union[str, OutputFormat, None]): Profile name or format
+            container (str): "wav" for complete audio, "raw" for streams
+            
+        Returns:
+            Optional[OutputFormat]: Target format, or None for the provider's own format
+        """
+        return resolve_output_format(output_format or self.output_format, container)
+    
+    def _provider_audio(self, provider: BaseTTSProvider, text: str, voice_id: Optional[str],
+                        speed: float, target: Optional[OutputFormat]) -> Optional[bytes]:
+        """
+        Generate complete audio in the target format.
+        
+        The provider is asked for its closest native format, so audio is only
+        transcoded locally when the provider cannot produce the target itself.
         
         Args:
+            provider (BaseTTSProvider): Provider to synthesize with
             text (str): Text to convert to speech
-            voice_id (Optional[str]): Voice identifier
+            voice_id (Optional[str]): Provider-specific voice ID
+            speed (float): Speech speed factor
+            target (Optional[OutputFormat]): Target format, or None for the provider's own
+            
+        Returns:
+            Optional[bytes]: Audio data or None if generation failed
+        """
+        if target is None:
+            return provider.generate_speech(text, voice_id, speed)
+        
+        native = negotiate_output_format(provider.get_output_formats(), target)
+        audio_data = provider.generate_speech(text, voice_id, speed, output_format=native)
+        if not audio_data:
+            return audio_data
+        if not native.same_samples(target):
+            logger.debug(f"Transcoding {native.key} to {target.key}")
+        return transcode(audio_data, native, target)
+    
+    def _provider_stream(self, provider: StreamingTTSProvider, text: str, voice_id: Optional[str],
+                         speed: float, target: Optional[OutputFormat]) -> Generator[bytes, None, None]:
+        """
+        Stream audio in the target format.
+        
+        Args:
+            provider (StreamingTTSProvider): Provider to synthesize with
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Provider-specific voice ID
+            speed (float): Speech speed factor
+            target (Optional[OutputFormat]): Headerless target format, or None for the provider's own
+            
+        Returns:
+            Generator[bytes, None, None]: Generator yielding audio chunks
+        """
+        if target is None:
+            yield from provider.generate_speech_stream(text, voice_id, speed)
+            return
+        
+        native = negotiate_output_format(provider.get_output_formats(), target)
+        transcoder = StreamTranscoder(native, target)
+        for chunk in provider.generate_speech_stream(text, voice_id, speed, output_format=native):
+            converted = transcoder.feed(chunk)
+            if converted:
+                yield converted
+        tail = transcoder.flush()
+        if tail:
+            yield tail
+    
+    def _scheduled_stream(self, provider_name: str, provider: StreamingTTSProvider, text: str,
+                          voice_id: Optional[str], speed: float,
+                          target: Optional[OutputFormat] = None,
+                          priority: Optional[SchedulingClass] = None) -> Generator[bytes, None, None]:
+        """
+        Stream audio from a provider while holding a scheduler slot for it.
+        
+        Args:
+            provider_name (str): Configured name of the provider
+            provider (StreamingTTSProvider): Provider to stream from
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Provider-specific voice ID
+            speed (float): Speech speed factor
+            target (Optional[OutputFormat]): Format the consumer wants, or None for the provider's own
+            priority (Optional[SchedulingClass]): Scheduling class (defaults to a live turn)
+            
+        Returns:
+            Generator[bytes, None, None]: Generator of audio chunks
+            
+        Raises:
+            ProviderBusyError: If no slot was granted within the class's maximum wait
+        """
+        permit = self.scheduler.acquire(provider_name, priority)
+        if permit is None:
+            raise ProviderBusyError(f"No {provider_name} slot available")
+        with permit:
+            for chunk in self._provider_stream(provider, text, voice_id, speed, target):
+                permit.mark_first_audio()
+                yield chunk
+    
+    def _synthesize(self, text: str, voice_id: Optional[str], speed: float,
+                    use_cache: bool, map_voice: bool = True,
+                    capability: Optional[str] = None,
+                    output_format: Optional[OutputFormat] = None,
+                    priority: Optional[SchedulingClass] = None) -> Optional[bytes]:
+        """
+        Synthesize text with a leased provider, trying the next candidate on failure.
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier (or style instruction)
             speed (float): Speech speed factor
             use_cache (bool): Whether to use cache
+            map_voice (bool): Whether to map voice_id per provider
+            capability (Optional[str]): Only use providers with this capability
+            output_format (Optional[OutputFormat]): Target format, or None for the provider's own
+            priority (Optional[SchedulingClass]): Scheduling class (defaults to a live turn)
             
         Returns:
-            Optional[bytes]: Audio data as bytes or None if generation failed
+            Optional[bytes]: Audio data or None if every candidate failed or was busy
         """
-        if not text:
-            logger.warning("Empty text provided, skipping TTS generation")
+        candidates = self._candidate_provider_names(capability)
+        if not candidates:
             return None
         
-        # Map voice ID if needed
-        mapped_voice_id = self._map_voice_id(voice_id)
+        def provider_voice(provider_name: str) -> Optional[str]:
+            if not map_voice:
+                return voice_id
+            return self._map_voice_id_for_provider(voice_id, provider_name)
         
         # Check cache if enabled and requested
-        cache_key = None
-        if self.cache_enabled and use_cache and self.redis_client:
-            cache_key = self._get_cache_key(text, mapped_voice_id, speed)
+        use_cache = bool(self.cache_enabled and use_cache and self.redis_client)
+        if use_cache:
+            cache_key = self._get_cache_key(text, provider_voice(candidates[0]), speed, candidates[0],
+                                            output_format)
             cached_audio = self.redis_client.get(cache_key)
             if cached_audio:
                 logger.debug(f"Cache hit for text: {text[:30]}...")
                 return cached_audio
         
-        # Try with current provider
-        try:
-            # Generate speech with provider
-            audio_data = self.provider.generate_speech(text, mapped_voice_id, speed)
+        tried: Set[str] = set()
+        while True:
+            lease = self._lease_provider(voice_id, capability=capability, exclude=tried)
+            if lease is None:
+                break
+            tried.add(lease.provider_name)
             
-            # Cache result if successful
-            if audio_data and self.cache_enabled and cache_key and self.redis_client:
-                self.redis_client.setex(cache_key, self.cache_ttl, audio_data)
-                logger.debug(f"Cached audio for text: {text[:30]}...")
+            permit = self.scheduler.acquire(lease.provider_name, priority)
+            if permit is None:
+                # Busy rather than failing; leave its health untouched
+                logger.warning(f"No {lease.provider_name} slot available for: {text[:30]}...")
+                lease.release()
+                if not self.fallback_manager:
+                    break
+                continue
             
-            return audio_data
-        except Exception as e:
-            logger.error(f"Error generating speech: {e}")
+            try:
+                with permit:
+                    audio_data = self._provider_audio(lease.provider, text, provider_voice(lease.provider_name),
+                                                      speed, output_format)
+            except Exception as e:
+                logger.error(f"Error generating speech with {lease.provider_name}: {e}")
+                audio_data = None
             
-            # Try fallback if available
-            if self.fallback_manager:
-                logger.info("Attempting fallback to alternative provider")
-                success, fallback_provider = self.fallback_manager.try_fallback(str(e))
-                
-                if success:
-                    # Update provider reference
-                    self.provider = fallback_provider
-                    
-                    try:
-                        # Try with fallback provider
-                        audio_data = self.provider.generate_speech(text, mapped_voice_id, speed)
-                        
-                        # Cache result if successful
-                        if audio_data and self.cache_enabled and cache_key and self.redis_client:
-                            self.redis_client.setex(cache_key, self.cache_ttl, audio_data)
-                            logger.debug(f"Cached audio from fallback provider for text: {text[:30]}...")
-                        
-                        return audio_data
-                    except Exception as fallback_error:
-                        logger.error(f"Fallback provider also failed: {fallback_error}")
+            lease.release(error=not audio_data)
+            
+            if audio_data:
+                # Cache result under the provider and voice that produced it
+                if use_cache:
+                    cache_key = self._get_cache_key(text, provider_voice(lease.provider_name), speed,
+                                                    lease.provider_name, output_format)
+                    self.redis_client.setex(cache_key, self.cache_ttl, audio_data)
+                    logger.debug(f"Cached audio for text: {text[:30]}...")
+                return audio_data
             
+            if not self.fallback_manager:
+                break
+            logger.info("Attempting fallback to alternative provider")
+        
+        return None
+    
+    @traced("tts.generate")
+    def generate_speech(self, text: str, voice_id: Optional[str] = None,
+                        speed: float = 1.0, use_cache: bool = True,
+                        output_format: Union[str, OutputFormat, None] = None,
+                        priority: Optional[SchedulingClass] = None) -> Optional[bytes]:
+        """
+        Generate speech using current provider with fallback support.
+        
+        Each call leases its own provider, so a failure in one request never
+        changes the provider used by other in-flight requests.
+        
+        Args:
+            text (str): Text to convert to speech
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+            use_cache (bool): Whether to use cache
+            output_format (Union[str, OutputFormat, None]): Output profile or format,
+                returned as a WAV file (defaults to the configured output_format)
+            priority (Optional[SchedulingClass]): Scheduling class; defaults to a live
+                turn, or the class of a slot the calling thread already holds
+            
+        Returns:
+            Optional[bytes]: Audio data as bytes or None if generation failed
+        """
+        if not text:
+            logger.warning("Empty text provided, skipping TTS generation")
             return None
+        
+        return self._synthesize(text, voice_id, speed, use_cache,
+                                output_format=self._target_format(output_format, "wav"),
+                                priority=priority)
     
+    @traced_stream("tts.stream")
     def generate_speech_stream(self, text: str, voice_id: Optional[str] = None,
-                             speed: float = 1.0) -> Generator[bytes, None, None]:
+                             speed: float = 1.0,
+                             output_format: Union[str, OutputFormat, None] = None,
+                             priority: Optional[SchedulingClass] = None) -> Generator[bytes, None, None]:
         """
         Generate speech as a stream with fallback support.
         
@@ -164,6 +566,9 @@ class TTSService:
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier
             speed (float): Speech speed factor
+            output_format (Union[str, OutputFormat, None]): Output profile or format of
+                the headerless chunks (defaults to the configured output_format)
+            priority (Optional[SchedulingClass]): Scheduling class (defaults to a live turn)
             
         Returns:
             Generator[bytes, None, None]: Generator yielding audio chunks
@@ -171,66 +576,48 @@ class TTSService:
         Raises:
             ValueError: If provider doesn't support streaming
         """
-        # Map voice ID if needed
-        mapped_voice_id = self._map_voice_id(voice_id)
+        target = self._target_format(output_format, "raw")
+        tried: Set[str] = set()
         
-        # Check if provider supports streaming
-        if not isinstance(self.provider, StreamingTTSProvider):
-            logger.error("Current provider doesn't support streaming")
-            # Try to get a streaming-capable provider through fallback
-            if self.fallback_manager:
-                found_streaming_provider = False
-                
-                # Try each fallback provider to find one that supports streaming
-                for provider_name in self.fallback_manager.fallback_provider_names:
-                    try:
-                        # Create provider
-                        provider_config = self.config.get("provider_config", {}).get(provider_name, {})
-                        provider = TTSProviderFactory.create_provider(
-                            provider_name, self.redis_client, provider_config
-                        )
-                        
-                        # Check if it supports streaming
-                        if isinstance(provider, StreamingTTSProvider):
-                            logger.info(f"Found streaming-capable provider: {provider_name}")
-                            self.provider = provider
-                            found_streaming_provider = True
-                            break
-                    except Exception as e:
-                        logger.error(f"Error checking fallback provider {provider_name}: {e}")
-                
-                if not found_streaming_provider:
+        while True:
+            lease = self._lease_provider(voice_id, require_streaming=True, exclude=tried)
+            if lease is None:
+                if not tried:
                     raise ValueError("No streaming-capable provider available")
-            else:
-                raise ValueError("Current provider doesn't support streaming and no fallbacks available")
-        
-        try:
-            # Try with current provider
-            for chunk in self.provider.generate_speech_stream(text, mapped_voice_id, speed):
-                yield chunk
-        except Exception as e:
-            logger.error(f"Error in streaming speech generation: {e}")
+                break
+            tried.add(lease.provider_name)
             
-            # Try fallback if available
-            if self.fallback_manager:
-                logger.info("Attempting fallback to alternative provider for streaming")
-                success, fallback_provider = self.fallback_manager.try_fallback(str(e))
-                
-                if success and isinstance(fallback_provider, StreamingTTSProvider):
-                    # Update provider reference
-                    self.provider = fallback_provider
-                    
-                    try:
-                        # Try with fallback provider
-                        for chunk in self.provider.generate_speech_stream(text, mapped_voice_id, speed):
-                            yield chunk
-                        return
-                    except Exception as fallback_error:
-                        logger.error(f"Fallback provider also failed for streaming: {fallback_error}")
+            mapped_voice_id = self._map_voice_id_for_provider(voice_id, lease.provider_name)
+            chunks_yielded = 0
+            error = True
+            try:
+                for chunk in self._scheduled_stream(lease.provider_name, lease.provider, text,
+                                                    mapped_voice_id, speed, target, priority):
+                    chunks_yielded += 1
+                    yield chunk
+                error = False
+                return
+            except GeneratorExit:
+                # Consumer stopped early; not a provider failure
+                error = False
+                raise
+            except ProviderBusyError as e:
+                # Busy rather than failing; leave its health untouched
+                logger.warning(f"{e} for streaming: {text[:30]}...")
+                error = False
+            except Exception as e:
+                logger.error(f"Error in streaming speech generation with {lease.provider_name}: {e}")
+            finally:
+                lease.release(error=error)
             
-            # If we get here, all providers failed or none support streaming
-            logger.error("All streaming providers failed")
-            yield b""  # Empty chunk to avoid breaking generators
+            # Restarting after partial audio would replay the start of the text
+            if chunks_yielded or not self.fallback_manager:
+                break
+            logger.info("Attempting fallback to alternative provider for streaming")
+        
+        # If we get here, all providers failed or none support streaming
+        logger.error("All streaming providers failed")
+        yield b""  # Empty chunk to avoid breaking generators
     
     def generate_with_style(self, text: str, style: str,
                           speed: float = 1.0, use_cache: bool = True) -> Optional[bytes]:
@@ -255,58 +642,15 @@ class TTSService:
             logger.warning("Empty text provided, skipping TTS generation")
             return None
         
-        # Check cache if enabled and requested
-        cache_key = None
-        if self.cache_enabled and use_cache and self.redis_client:
-            # Include style in cache key for styled voices
-            cache_key = self._get_cache_key(text, style, speed)
-            cached_audio = self.redis_client.get(cache_key)
-            if cached_audio:
-                logger.debug(f"Cache hit for styled text: {text[:30]}...")
-                return cached_audio
-        
-        # Try with current provider
-        try:
-            # Use style as voice_id for OpenAI provider
-            audio_data = self.provider.generate_speech(text, style, speed)
-            
-            # Cache result if successful
-            if audio_data and self.cache_enabled and cache_key and self.redis_client:
-                self.redis_client.setex(cache_key, self.cache_ttl, audio_data)
-                logger.debug(f"Cached styled audio for text: {text[:30]}...")
-            
+        # Use style as voice_id; only styling-capable providers are leased
+        audio_data = self._synthesize(text, style, speed, use_cache,
+                                      map_voice=False, capability="voice_style",
+                                      output_format=self._target_format(None, "wav"))
+        if audio_data:
             return audio_data
-        except Exception as e:
-            logger.error(f"Error generating styled speech: {e}")
-            
-            # Try fallback if available
-            if self.fallback_manager:
-                logger.info("Attempting fallback to alternative provider for styled speech")
-                success, fallback_provider = self.fallback_manager.try_fallback(str(e))
-                
-                if success:
-                    # Update provider reference
-                    self.provider = fallback_provider
-                    
-                    # Check if fallback provider supports styling
-                    if self.supports_capability("voice_style"):
-                        try:
-                            # Try with fallback provider
-                            audio_data = self.provider.generate_speech(text, style, speed)
-                            
-                            # Cache result if successful
-                            if audio_data and self.cache_enabled and cache_key and self.redis_client:
-                                self.redis_client.setex(cache_key, self.cache_ttl, audio_data)
-                                logger.debug(f"Cached styled audio from fallback for text: {text[:30]}...")
-                            
-                            return audio_data
-                        except Exception as fallback_error:
-                            logger.error(f"Fallback provider also failed for styled speech: {fallback_error}")
-                    else:
-                        logger.warning("Fallback provider doesn't support styling, using standard generation")
-                        return self.generate_speech(text, None, speed, use_cache)
-            
-            return None
+        
+        logger.warning("No styling-capable provider succeeded, using standard generation")
+        return self.generate_speech(text, None, speed, use_cache)
     
     def generate_and_upload(self, text: str, voice_id: Optional[str] = None,
                            speed: float = 1.0, use_cache: bool = True) -> Optional[Dict[str, Any]]:
@@ -383,39 +727,33 @@ class TTSService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get config from main config if not provided
-            if provider_config is None:
-                provider_config = self.config.get("provider_config", {}).get(provider_type, {})
-            
             # Use fallback manager if available
             if self.fallback_manager:
                 # Check if this is the primary provider
                 if provider_type == self.fallback_manager.primary_provider_name:
-                    success, provider = self.fallback_manager.reset_to_primary()
+                    success, _ = self.fallback_manager.reset_to_primary()
                     if success:
-                        self.provider = provider
                         logger.info(f"Reset to primary provider: {provider_type}")
                         return True
                 
-                # Otherwise create provider directly
-                new_provider = TTSProviderFactory.create_provider(
-                    provider_type, self.redis_client, provider_config
-                )
-                
-                # Replace current provider
-                self.provider = new_provider
-                logger.info(f"Changed TTS provider to: {provider_type}")
-                return True
-            else:
-                # No fallback manager, create provider directly
-                new_provider = TTSProviderFactory.create_provider(
-                    provider_type, self.redis_client, provider_config
-                )
-                
-                # Replace current provider
-                self.provider = new_provider
-                logger.info(f"Changed TTS provider to: {provider_type}")
-                return True
+                # Otherwise route to it through the fallback manager
+                if self.fallback_manager.force_provider(provider_type):
+                    logger.info(f"Changed TTS provider to: {provider_type}")
+                    return True
+                return False
+            
+            # Get config from main config if not provided
+            if provider_config is None:
+                provider_config = self.config.get("provider_config", {}).get(provider_type, {})
+            
+            # No fallback manager, create provider directly
+            new_provider = self._create_provider(provider_type, self.redis_client, provider_config)
+            
+            # Replace current provider
+            self._provider = new_provider
+            self.default_provider_name = provider_type
+            logger.info(f"Changed TTS provider to: {provider_type}")
+            return True
         except Exception as e:
             logger.error(f"Error changing provider to {provider_type}: {e}")
             return False
@@ -441,12 +779,10 @@ class TTSService:
         """
         if provider_type:
             try:
-                # Create temporary provider to get voices
-                provider_config = self.config.get("provider_config", {}).get(provider_type, {})
-                temp_provider = TTSProviderFactory.create_provider(
-                    provider_type, self.redis_client, provider_config
-                )
-                return temp_provider.get_voices()
+                provider = self._get_shared_provider(provider_type)
+                if provider is None:
+                    raise ValueError(f"Provider {provider_type} is not available")
+                return provider.get_voices()
             except Exception as e:
                 logger.error(f"Error getting voices for provider {provider_type}: {e}")
                 return {"voices": {}, "error": str(e)}
@@ -557,16 +893,9 @@ class TTSService:
         Returns:
             str: Provider type
         """
-        # Get provider type from class name
-        provider_class = self.provider.__class__.__name__
-        
-        # Extract provider type from class name
-        if provider_class.endswith("Provider"):
-            provider_type = provider_class[:-8].lower()
-        else:
-            provider_type = provider_class.lower()
-            
-        return provider_type
+        if self.fallback_manager:
+            return self.fallback_manager.current_provider_name
+        return self.default_provider_name
     
     def _map_voice_id(self, voice_id: Optional[str]) -> Optional[str]:
         """
@@ -578,20 +907,11 @@ class TTSService:
         Returns:
             Optional[str]: Mapped voice ID
         """
-        if not voice_id or not self.voice_mapping:
-            return voice_id
-            
-        provider_type = self._get_provider_type()
-        
-        # Check if voice mapping exists for this voice and provider
-        if voice_id in self.voice_mapping and provider_type in self.voice_mapping[voice_id]:
-            mapped_voice = self.voice_mapping[voice_id][provider_type]
-            logger.debug(f"Mapped voice {voice_id} to {mapped_voice} for {provider_type}")
-            return mapped_voice
-            
-        return voice_id
+        return self._map_voice_id_for_provider(voice_id, self._get_provider_type())
     
-    def _get_cache_key(self, text: str, voice_id: Optional[str], speed: float) -> str:
+    def _get_cache_key(self, text: str, voice_id: Optional[str], speed: float,
+                       provider_type: Optional[str] = None,
+                       output_format: Optional[OutputFormat] = None) -> str:
         """
         Generate cache key for TTS output.
         
@@ -599,20 +919,21 @@ class TTSService:
             text (str): Text to convert to speech
             voice_id (Optional[str]): Voice identifier or style
             speed (float): Speech speed factor
+            provider_type (Optional[str]): Provider the audio is for (defaults to current)
+            output_format (Optional[OutputFormat]): Format the audio is stored in
             
         Returns:
             str: Cache key
         """
-        # Get provider type for cache key
-        provider_type = self._get_provider_type()
-        
         # Create hashable representation of params
         params = {
             "text": text,
             "voice_id": voice_id or "default",
             "speed": speed,
-            "provider": provider_type
+            "provider": provider_type or self._get_provider_type()
         }
+        if output_format is not None:
+            params["format"] = output_format.key
         
         # Serialize params and hash
         params_str = json.dumps(params, sort_keys=True)
@@ -637,6 +958,15 @@ class TTSService:
             logger.error(f"Error getting fallback stats: {e}")
             return {"error": str(e)}
             
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and wait times per scheduling class, and slot usage per provider.
+        
+        Returns:
+            Dict[str, Any]: Scheduler statistics
+        """
+        return self.scheduler.get_stats()
+    
     def reset_to_primary_provider(self) -> bool:
         """
         Reset to the primary provider.
@@ -649,9 +979,8 @@ class TTSService:
             return False
         
         try:
-            success, provider = self.fallback_manager.reset_to_primary()
+            success, _ = self.fallback_manager.reset_to_primary()
             if success:
-                self.provider = provider
                 logger.info("Reset to primary provider")
             else:
                 logger.warning("Failed to reset to primary provider")
@@ -747,7 +1076,11 @@ class TTSService:
             timeout (Optional[int]): Maximum time to wait in seconds
             
         Returns:
-            Dict[str, Any]: Task result information including status and data if available
+            Dict[str, Any]: Task result information including status and, once the
+                task succeeded, the audio's cache_key, data_size, duration and format,
+                and the task's latency and whether it was a cold_start.
+                Batch and prewarm tasks report per-item "progress" while running and
+                the manifest counts once done
         """
         from celery.result import AsyncResult
         
@@ -766,22 +1099,42 @@ class TTSService:
             "ready": task.ready()
         }
         
+        if not task.ready():
+            progress = get_batch_progress(task_id)
+            if progress is not None:
+                result["progress"] = progress
+        
         if task.failed():
             result["error"] = str(task.result)
         elif task.successful():
-            result["result_available"] = True
-            # Don't include actual audio data in status response for size reasons
-            if isinstance(task.result, bytes):
-                result["data_size"] = len(task.result)
-            elif isinstance(task.result, dict):
-                result["item_count"] = len(task.result)
+            # Results are small audio references; the audio itself stays in the cache
+            value = task.result
+            result["result_available"] = value is not None
+            if isinstance(value, dict) and "cache_key" in value:
+                result.update({
+                    "cache_key": value["cache_key"],
+                    "data_size": value.get("size"),
+                    "duration": value.get("duration"),
+                    "format": value.get("format"),
+                    "latency": value.get("latency"),
+                    "cold_start": value.get("cold_start")
+                })
+            elif isinstance(value, dict) and "items" in value:
+                # Batch manifest
+                items = value["items"]
+                result["item_count"] = len(items)
+                result["data_size"] = sum(item["size"] for item in items.values() if item)
+                for name in ("unique", "duplicates", "cached", "generated", "failed", "errors"):
+                    result[name] = value.get(name)
+            elif isinstance(value, dict):
+                result["item_count"] = len(value)
         
         return result
     
-    def get_task_audio(self, task_id: str, wait: bool = False,
-                      timeout: Optional[int] = None) -> Optional[bytes]:
+    def _get_task_reference(self, task_id: str, wait: bool = False,
+                            timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
-        Get audio data from an async TTS task.
+        Get the audio reference returned by a finished generate_speech_async task.
         
         Args:
             task_id (str): Task ID returned from generate_speech_async
@@ -789,7 +1142,7 @@ class TTSService:
             timeout (Optional[int]): Maximum time to wait in seconds
             
         Returns:
-            Optional[bytes]: Audio data if available
+            Optional[Dict[str, Any]]: Audio reference, or None if not available
         """
         from celery.result import AsyncResult
         
@@ -812,12 +1165,54 @@ class TTSService:
             return None
         
         result = task.result
-        if isinstance(result, bytes):
+        if isinstance(result, dict) and "cache_key" in result:
             return result
         
-        logger.error(f"Task {task_id} result is not audio data")
+        logger.error(f"Task {task_id} result is not an audio reference")
         return None
     
+    def stream_task_audio(self, task_id: str, wait: bool = False,
+                          timeout: Optional[int] = None,
+                          chunk_size: int = 65536) -> Optional[Iterable[bytes]]:
+        """
+        Stream audio from an async TTS task out of the cache.
+        
+        Args:
+            task_id (str): Task ID returned from generate_speech_async
+            wait (bool): Whether to wait for task completion
+            timeout (Optional[int]): Maximum time to wait in seconds
+            chunk_size (int): Maximum bytes per chunk
+            
+        Returns:
+            Optional[Iterable[bytes]]: Audio chunks, or None if not available
+        """
+        reference = self._get_task_reference(task_id, wait, timeout)
+        if reference is None:
+            return None
+        
+        chunks = get_cache_manager().stream(reference["cache_key"], chunk_size)
+        if chunks is None:
+            logger.error(f"Audio for task {task_id} has expired from the cache")
+        return chunks
+    
+    def get_task_audio(self, task_id: str, wait: bool = False,
+                      timeout: Optional[int] = None) -> Optional[bytes]:
+        """
+        Get audio data from an async TTS task.
+        
+        Args:
+            task_id (str): Task ID returned from generate_speech_async
+            wait (bool): Whether to wait for task completion
+            timeout (Optional[int]): Maximum time to wait in seconds
+            
+        Returns:
+            Optional[bytes]: Audio data if available
+        """
+        chunks = self.stream_task_audio(task_id, wait, timeout)
+        if chunks is None:
+            return None
+        return b"".join(chunks)
+    
     def cancel_task(self, task_id: str) -> bool:
         """
         Cancel an async TTS task if possible.
@@ -931,10 +1326,13 @@ class TTSService:
         
         logger.info("Dialog manager initialized with configured settings")
     
+    @traced_stream("tts.dialog_stream")
     def generate_dialog_speech_stream(self, text: str, voice_id: Optional[str] = None,
                                      speed: float = 1.0, urgency: float = 0.0,
                                      context: Optional[Dict[str, Any]] = None,
-                                     turn_id: Optional[str] = None) -> Generator[bytes, None, None]:
+                                     turn_id: Optional[str] = None,
+                                     pipelined: Optional[bool] = None,
+                                     output_format: Union[str, OutputFormat, None] = None) -> Generator[bytes, None, None]:
         """
         Generate speech stream optimized for dialog with natural pauses and turn-taking.
         
@@ -942,6 +1340,11 @@ class TTSService:
         fragments with appropriate pauses. It includes optimizations for initial response
         latency and natural dialog flow.
         
+        In pipelined mode a bounded number of upcoming fragments are synthesized
+        while the current one streams, and pauses are emitted as silence samples
+        instead of sleeping. Output order is preserved and the turn can be
+        cancelled with cancel_dialog_turn().
+        
         Args:
             text (str): Dialog text to convert to speech
             voice_id (Optional[str]): Voice identifier
@@ -949,6 +1352,9 @@ class TTSService:
             urgency (float): Urgency factor (0.0-1.0) that reduces pauses for urgent messages
             context (Optional[Dict[str, Any]]): Additional context for the dialog turn
             turn_id (Optional[str]): Unique ID for this dialog turn
+            pipelined (Optional[bool]): Use look-ahead synthesis (defaults to dialog config)
+            output_format (Union[str, OutputFormat, None]): Output profile or format of
+                the headerless chunks (defaults to the configured output_format)
             
         Returns:
             Generator[bytes, None, None]: Generator yielding audio chunks
@@ -964,60 +1370,57 @@ class TTSService:
         mapped_voice_id = self._map_voice_id(voice_id)
         
         # Emit dialog turn start event
-        self.events.emit(TTSEvent(
+        self.events.create_and_emit(
             TTSEventType.DIALOG_TURN_START,
-            {"text": text, "turn_id": turn_id, "voice_id": mapped_voice_id}
-        ))
+            additional_data={"text": text, "turn_id": turn_id, "voice_id": mapped_voice_id}
+        )
         
         start_time = time.time()
         total_fragments = 0
         audio_generated = False
+        target = self._target_format(output_format, "raw")
         
-        # Check if provider supports streaming
-        if not isinstance(self.provider, StreamingTTSProvider):
-            logger.warning("Current provider doesn't support streaming for dialog")
-            
-            # Try to find a streaming provider via fallback
-            if self.fallback_manager:
-                found_streaming_provider = False
-                
-                # Try each fallback provider
-                for provider_name in self.fallback_manager.fallback_provider_names:
-                    try:
-                        provider_config = self.config.get("provider_config", {}).get(provider_name, {})
-                        provider = TTSProviderFactory.create_provider(
-                            provider_name, self.redis_client, provider_config
-                        )
-                        
-                        if isinstance(provider, StreamingTTSProvider):
-                            logger.info(f"Found streaming provider for dialog: {provider_name}")
-                            self.provider = provider
-                            found_streaming_provider = True
-                            break
-                    except Exception as e:
-                        logger.error(f"Error checking provider {provider_name} for dialog: {e}")
-                
-                if not found_streaming_provider:
-                    raise ValueError("No streaming-capable provider available for dialog")
-            else:
-                raise ValueError("Current provider doesn't support streaming and no fallbacks available")
+        # Lease one streaming provider for the whole turn
+        tried: Set[str] = set()
+        lease = self._lease_provider(voice_id, require_streaming=True)
+        if lease is None:
+            raise ValueError("No streaming-capable provider available for dialog")
+        tried.add(lease.provider_name)
+        
+        dialog_config = self.config.get("dialog", {})
+        if pipelined is None:
+            pipelined = dialog_config.get("pipelined", True)
+        
+        if pipelined:
+            # The pipeline may swap the lease on provider errors
+            lease_ref = [lease]
+            try:
+                yield from self._generate_dialog_pipelined(
+                    text, voice_id, speed, urgency, context, turn_id, lease_ref, tried, start_time,
+                    target
+                )
+            finally:
+                if lease_ref[0] is not None:
+                    lease_ref[0].release()
+            return
         
         try:
-            # Process the dialog turn into fragments with appropriate timing
+            # Process the dialog turn into fragments with appropriate timing;
+            # pauses are applied below, so the dialog manager must not sleep too
             for fragment_info in self.dialog_manager.process_dialog_turn(
-                text, turn_id=turn_id, context=context, urgency=urgency
+                text, turn_id=turn_id, context=context, urgency=urgency, apply_pauses=False
             ):
                 # Skip final marker
                 if fragment_info.get("turn_complete", False):
                     # Emit dialog turn end event
-                    self.events.emit(TTSEvent(
+                    self.events.create_and_emit(
                         TTSEventType.DIALOG_TURN_END,
-                        {
+                        additional_data={
                             "turn_id": turn_id,
                             "fragment_count": fragment_info.get("fragment_count", total_fragments),
                             "duration": fragment_info.get("turn_duration", time.time() - start_time)
                         }
-                    ))
+                    )
                     continue
                 
                 fragment_text = fragment_info.get("fragment", "")
@@ -1027,39 +1430,42 @@ class TTSService:
                 total_fragments += 1
                 
                 # Emit fragment processing event
-                self.events.emit(TTSEvent(
+                self.events.create_and_emit(
                     TTSEventType.FRAGMENT_PROCESSING,
-                    {
+                    additional_data={
                         "fragment": fragment_text,
                         "index": fragment_info.get("index", 0),
                         "turn_id": fragment_info.get("turn_id", turn_id)
                     }
-                ))
+                )
                 
                 # Generate audio for this fragment
                 try:
                     # For first fragment, emit first response event
                     if total_fragments == 1:
                         first_fragment_start = time.time()
-                        
+                    
+                    fragment_voice_id = self._map_voice_id_for_provider(voice_id, lease.provider_name)
                     chunk_count = 0
-                    for audio_chunk in self.provider.generate_speech_stream(fragment_text, mapped_voice_id, speed):
+                    for audio_chunk in self._scheduled_stream(
+                        lease.provider_name, lease.provider, fragment_text, fragment_voice_id, speed, target
+                    ):
                         # For first fragment, first chunk, emit first response latency event
                         if total_fragments == 1 and chunk_count == 0:
                             first_response_latency = time.time() - first_fragment_start
-                            self.events.emit(TTSEvent(
+                            self.events.create_and_emit(
                                 TTSEventType.FIRST_RESPONSE_LATENCY,
-                                {"latency_sec": first_response_latency, "turn_id": turn_id}
-                            ))
+                                additional_data={"latency_sec": first_response_latency, "turn_id": turn_id}
+                            )
                         
                         chunk_count += 1
                         audio_generated = True
                         
                         # Emit audio chunk event
-                        self.events.emit(TTSEvent(
+                        self.events.create_and_emit(
                             TTSEventType.AUDIO_CHUNK_GENERATED,
-                            {"size": len(audio_chunk), "fragment_index": fragment_info.get("index", 0)}
-                        ))
+                            additional_data={"size": len(audio_chunk), "fragment_index": fragment_info.get("index", 0)}
+                        )
                         
                         yield audio_chunk
                     
@@ -1067,10 +1473,10 @@ class TTSService:
                     pause_ms = fragment_info.get("pause_after_ms", 0)
                     if pause_ms > 0:
                         # Emit pause event
-                        self.events.emit(TTSEvent(
+                        self.events.create_and_emit(
                             TTSEventType.DIALOG_PAUSE,
-                            {"duration_ms": pause_ms, "turn_id": turn_id}
-                        ))
+                            additional_data={"duration_ms": pause_ms, "turn_id": turn_id}
+                        )
                         
                         # Actually pause for the specified time
                         time.sleep(pause_ms / 1000.0)
@@ -1078,30 +1484,33 @@ class TTSService:
                 except Exception as fragment_error:
                     logger.error(f"Error generating speech for fragment: {fragment_error}")
                     
-                    # Try fallback for this fragment if available
-                    if self.fallback_manager:
-                        logger.info(f"Attempting fallback for dialog fragment: {fragment_text[:30]}...")
-                        success, fallback_provider = self.fallback_manager.try_fallback(str(fragment_error))
+                    # Swap this request's lease for another streaming provider;
+                    # a busy provider is not a failed one
+                    lease.release(error=not isinstance(fragment_error, ProviderBusyError))
+                    lease = self._lease_provider(voice_id, require_streaming=True, exclude=tried)
+                    if lease is None:
+                        logger.error("No alternative streaming provider for dialog fragment")
+                        break
+                    tried.add(lease.provider_name)
+                    
+                    logger.info(f"Attempting fallback for dialog fragment: {fragment_text[:30]}...")
+                    try:
+                        # Try with fallback provider
+                        fragment_voice_id = self._map_voice_id_for_provider(voice_id, lease.provider_name)
+                        for audio_chunk in self._scheduled_stream(
+                            lease.provider_name, lease.provider, fragment_text, fragment_voice_id, speed, target
+                        ):
+                            audio_generated = True
+                            yield audio_chunk
+                        
+                        # Apply pause if specified
+                        pause_ms = fragment_info.get("pause_after_ms", 0)
+                        if pause_ms > 0:
+                            time.sleep(pause_ms / 1000.0)
                         
-                        if success and isinstance(fallback_provider, StreamingTTSProvider):
-                            self.provider = fallback_provider
-                            
-                            try:
-                                # Try with fallback provider
-                                for audio_chunk in self.provider.generate_speech_stream(
-                                    fragment_text, mapped_voice_id, speed
-                                ):
-                                    audio_generated = True
-                                    yield audio_chunk
-                                
-                                # Apply pause if specified
-                                pause_ms = fragment_info.get("pause_after_ms", 0)
-                                if pause_ms > 0:
-                                    time.sleep(pause_ms / 1000.0)
-                                
-                            except Exception as fallback_fragment_error:
-                                logger.error(f"Fallback also failed for fragment: {fallback_fragment_error}")
-                                # Continue to next fragment rather than failing completely
+                    except Exception as fallback_fragment_error:
+                        logger.error(f"Fallback also failed for fragment: {fallback_fragment_error}")
+                        # Continue to next fragment rather than failing completely
             
             # If no audio was generated, yield empty bytes to avoid breaking the generator
             if not audio_generated:
@@ -1112,10 +1521,494 @@ class TTSService:
             logger.error(f"Error in dialog speech generation: {e}")
             
             # Emit error event
-            self.events.emit(TTSEvent(
+            self.events.create_and_emit(
                 TTSEventType.ERROR,
-                {"error": str(e), "turn_id": turn_id}
-            ))
+                additional_data={"error": str(e), "turn_id": turn_id}
+            )
             
             # Yield empty bytes to avoid breaking the generator
-            yield b"" 
\ No newline at end of file
+            yield b""
+        finally:
+            if lease is not None:
+                lease.release()
+    
+    def cancel_dialog_turn(self, turn_id: str) -> bool:
+        """
+        Cancel a pipelined dialog turn, stopping any look-ahead synthesis.
+        
+        Args:
+            turn_id (str): Dialog turn ID
+            
+        Returns:
+            bool: True if an active turn was cancelled
+        """
+        with self._pipeline_lock:
+            cancel_event = self._active_dialog_turns.get(turn_id)
+        
+        if cancel_event is None:
+            return False
+        
+        cancel_event.set()
+        logger.info(f"Cancelled dialog turn {turn_id}")
+        return True
+    
+    def _get_pipeline_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the shared executor used for look-ahead fragment synthesis.
+        
+        Returns:
+            ThreadPoolExecutor: Executor instance
+        """
+        with self._pipeline_lock:
+            if self._pipeline_executor is None:
+                workers = self.config.get("dialog", {}).get("pipeline_workers", 8)
+                self._pipeline_executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="tts-dialog"
+                )
+            return self._pipeline_executor
+    
+    def _silence(self, provider: BaseTTSProvider, duration_ms: int,
+                 output_format: Optional[OutputFormat] = None) -> bytes:
+        """
+        Generate silence matching a stream's format.
+        
+        Args:
+            provider (BaseTTSProvider): Provider whose stream the silence is spliced into
+            duration_ms (int): Silence duration in milliseconds
+            output_format (Optional[OutputFormat]): Stream format, or None for the provider's own
+            
+        Returns:
+            bytes: Silence samples (16-bit PCM unless the format is μ-law)
+        """
+        if output_format is not None:
+            frames = int(output_format.sample_rate * duration_ms / 1000) * output_format.channels
+            # 0xFF is μ-law zero
+            return (b"\xff" if output_format.encoding == MULAW else b"\x00\x00") * frames
+        
+        try:
+            _, channels, sample_rate = provider.get_stream_info()
+        except Exception:
+            channels, sample_rate = 1, 24000
+        
+        frames = int(sample_rate * duration_ms / 1000)
+        return b"\x00\x00" * frames * channels
+    
+    def _run_fragment_job(self, job: _FragmentJob, provider: StreamingTTSProvider,
+                          voice_id: Optional[str], speed: float,
+                          output_format: Optional[OutputFormat] = None) -> None:
+        """
+        Synthesize one fragment into its job queue (runs on the pipeline executor).
+        
+        Args:
+            job (_FragmentJob): Fragment job
+            provider (StreamingTTSProvider): Provider to synthesize with
+            voice_id (Optional[str]): Provider-specific voice ID
+            speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Stream format, or None for the provider's own
+        """
+        try:
+            if job.cancelled.is_set():
+                return
+            for chunk in self._scheduled_stream(job.provider_name, provider, job.text, voice_id,
+                                                speed, output_format):
+                if job.cancelled.is_set():
+                    break
+                job.chunks.put(chunk)
+        except Exception as e:
+            job.error = e
+        finally:
+            job.chunks.put(_FragmentJob.END)
+    
+    def _submit_fragment_job(self, executor: ThreadPoolExecutor, job: _FragmentJob,
+                             lease: ProviderLease, voice_id: Optional[str], speed: float,
+                             output_format: Optional[OutputFormat] = None) -> None:
+        """
+        Submit a fragment job for synthesis with a leased provider.
+        
+        Args:
+            executor (ThreadPoolExecutor): Pipeline executor
+            job (_FragmentJob): Fragment job
+            lease (ProviderLease): Lease whose provider synthesizes the fragment
+            voice_id (Optional[str]): Requested voice ID (unmapped)
+            speed (float): Speech speed factor
+            output_format (Optional[OutputFormat]): Stream format, or None for the provider's own
+        """
+        job.provider_name = lease.provider_name
+        fragment_voice_id = self._map_voice_id_for_provider(voice_id, lease.provider_name)
+        job.future = executor.submit(self._run_fragment_job, job, lease.provider, fragment_voice_id,
+                                     speed, output_format)
+    
+    def _drain_fragment_job(self, job: _FragmentJob,
+                            cancel_event: threading.Event) -> Generator[bytes, None, None]:
+        """
+        Yield a fragment job's audio chunks as they are synthesized.
+        
+        Args:
+            job (_FragmentJob): Fragment job
+            cancel_event (threading.Event): Stops draining when set
+            
+        Returns:
+            Generator[bytes, None, None]: Generator yielding audio chunks
+        """
+        while True:
+            try:
+                item = job.chunks.get(timeout=0.1)
+            except queue.Empty:
+                if cancel_event.is_set():
+                    return
+                continue
+            if item is _FragmentJob.END:
+                return
+            yield item
+    
+    def _generate_dialog_pipelined(self, text: str, voice_id: Optional[str], speed: float,
+                                   urgency: float, context: Optional[Dict[str, Any]],
+                                   turn_id: Optional[str], lease_ref: List[Optional[ProviderLease]],
+                                   tried: Set[str], start_time: float,
+                                   output_format: Optional[OutputFormat] = None) -> Generator[bytes, None, None]:
+        """
+        Pipelined body of generate_dialog_speech_stream.
+        
+        Up to ``pipeline_depth`` fragments after the current one are synthesized
+        concurrently; audio is still yielded strictly in fragment order.
+        
+        Args:
+            text (str): Dialog text
+            voice_id (Optional[str]): Requested voice ID (unmapped)
+            speed (float): Speech speed factor
+            urgency (float): Urgency factor
+            context (Optional[Dict[str, Any]]): Dialog turn context
+            turn_id (Optional[str]): Dialog turn ID
+            lease_ref (List[Optional[ProviderLease]]): One-element holder for the turn's lease
+            tried (Set[str]): Providers already tried by this turn
+            start_time (float): Turn start timestamp
+            output_format (Optional[OutputFormat]): Stream format, or None for the provider's own
+            
+        Returns:
+            Generator[bytes, None, None]: Generator yielding audio chunks and silence
+        """
+        depth = max(0, self.config.get("dialog", {}).get("pipeline_depth", 2))
+        executor = self._get_pipeline_executor()
+        fragments = self.dialog_manager.process_dialog_turn(
+            text, turn_id=turn_id, context=context, urgency=urgency, apply_pauses=False
+        )
+        
+        cancel_event = threading.Event()
+        if turn_id:
+            with self._pipeline_lock:
+                self._active_dialog_turns[turn_id] = cancel_event
+        
+        pending: "deque[_FragmentJob]" = deque()
+        fragments_done = False
+        turn_end_info: Dict[str, Any] = {}
+        total_fragments = 0
+        audio_generated = False
+        
+        def submit(job: _FragmentJob) -> None:
+            self._submit_fragment_job(executor, job, lease_ref[0], voice_id, speed, output_format)
+        
+        def fill() -> None:
+            nonlocal fragments_done, total_fragments
+            while not fragments_done and len(pending) <= depth:
+                fragment_info = next(fragments, None)
+                if fragment_info is None:
+                    fragments_done = True
+                    break
+                if fragment_info.get("turn_complete", False):
+                    turn_end_info.update(fragment_info)
+                    continue
+                if not fragment_info.get("fragment", ""):
+                    continue
+                
+                job = _FragmentJob(total_fragments, fragment_info)
+                total_fragments += 1
+                submit(job)
+                pending.append(job)
+        
+        try:
+            fill()
+            while pending:
+                if cancel_event.is_set():
+                    logger.info(f"Dialog turn {turn_id} cancelled with {len(pending)} fragments pending")
+                    break
+                
+                job = pending.popleft()
+                # Keep the look-ahead window full while this fragment streams
+                fill()
+                
+                self.events.create_and_emit(
+                    TTSEventType.FRAGMENT_PROCESSING,
+                    additional_data={
+                        "fragment": job.text,
+                        "index": job.info.get("index", job.index),
+                        "turn_id": job.info.get("turn_id", turn_id)
+                    }
+                )
+                
+                chunk_count = 0
+                for item in self._drain_fragment_job(job, cancel_event):
+                    if job.index == 0 and chunk_count == 0:
+                        self.events.create_and_emit(
+                            TTSEventType.FIRST_RESPONSE_LATENCY,
+                            additional_data={"latency_sec": time.time() - start_time, "turn_id": turn_id}
+                        )
+                    
+                    chunk_count += 1
+                    audio_generated = True
+                    self.events.create_and_emit(
+                        TTSEventType.AUDIO_CHUNK_GENERATED,
+                        additional_data={"size": len(item), "fragment_index": job.info.get("index", job.index)}
+                    )
+                    yield item
+                
+                if cancel_event.is_set():
+                    job.cancel()
+                    continue
+                
+                if job.error is not None:
+                    logger.error(f"Error generating speech for fragment: {job.error}")
+                    
+                    # Swap this turn's lease; fragments already submitted to the
+                    # failed provider are resubmitted to the replacement
+                    lease_ref[0].release(error=not isinstance(job.error, ProviderBusyError))
+                    lease_ref[0] = self._lease_provider(voice_id, require_streaming=True, exclude=tried)
+                    if lease_ref[0] is None:
+                        logger.error("No alternative streaming provider for dialog fragment")
+                        break
+                    tried.add(lease_ref[0].provider_name)
+                    
+                    retry_jobs = [_FragmentJob(job.index, job.info)] if chunk_count == 0 else []
+                    for other in list(pending):
+                        other.cancel()
+                    retry_jobs.extend(_FragmentJob(other.index, other.info) for other in pending)
+                    pending.clear()
+                    for retry in retry_jobs:
+                        submit(retry)
+                    pending.extend(retry_jobs)
+                    continue
+                
+                # Render the pause as silence in the stream instead of sleeping
+                pause_ms = job.info.get("pause_after_ms", 0)
+                if pause_ms > 0:
+                    self.events.create_and_emit(
+                        TTSEventType.DIALOG_PAUSE,
+                        additional_data={"duration_ms": pause_ms, "turn_id": turn_id}
+                    )
+                    yield self._silence(lease_ref[0].provider, pause_ms, output_format)
+            
+            if not cancel_event.is_set():
+                self.events.create_and_emit(
+                    TTSEventType.DIALOG_TURN_END,
+                    additional_data={
+                        "turn_id": turn_id,
+                        "fragment_count": turn_end_info.get("fragment_count", total_fragments),
+                        "duration": time.time() - start_time
+                    }
+                )
+            
+            # If no audio was generated, yield empty bytes to avoid breaking the generator
+            if not audio_generated:
+                logger.warning("No audio generated for any fragments in dialog turn")
+                yield b""
+        
+        except Exception as e:
+            logger.error(f"Error in pipelined dialog speech generation: {e}")
+            self.events.create_and_emit(
+                TTSEventType.ERROR,
+                additional_data={"error": str(e), "turn_id": turn_id}
+            )
+            yield b""
+        finally:
+            # Covers consumer close, cancellation and errors alike
+            for job in pending:
+                job.cancel()
+            fragments.close()
+            if turn_id:
+                with self._pipeline_lock:
+                    self._active_dialog_turns.pop(turn_id, None)
+    
+    def _get_text_fragmenter(self):
+        """
+        Get the shared TextFragmenter used to segment streamed text.
+        
+        Returns:
+            TextFragmenter: Fragmenter configured from dialog settings
+        """
+        with self._pipeline_lock:
+            if self._text_fragmenter is None:
+                from .text_processing import TextFragmenter
+                dialog_config = self.config.get("dialog", {})
+                self._text_fragmenter = TextFragmenter(
+                    min_fragment_size=dialog_config.get("min_fragment_size", 5),
+                    max_fragment_size=dialog_config.get("max_fragment_size", 200)
+                )
+            return self._text_fragmenter
+    
+    @traced_stream("tts.llm_stream")
+    def generate_llm_speech_stream(self, token_stream: Iterable[str], voice_id: Optional[str] = None,
+                                   speed: float = 1.0, turn_id: Optional[str] = None,
+                                   metrics: Optional[Dict[str, Any]] = None,
+                                   output_format: Union[str, OutputFormat, None] = None) -> Generator[bytes, None, None]:
+        """
+        Speak an LLM response while it is still being generated.
+        
+        Tokens are segmented into sentences on a background thread as they
+        arrive, and each sentence is submitted for synthesis immediately (at
+        most ``pipeline_depth`` sentences ahead of playback). Audio is yielded
+        in sentence order, so the first sentence plays while the LLM is still
+        producing the rest. A LLM_TURN_LATENCY event reports time-to-first-token
+        and time-to-first-audio when the turn ends.
+        
+        Args:
+            token_stream (Iterable[str]): Text deltas, e.g. from LLMHandler.stream_response()
+            voice_id (Optional[str]): Voice identifier
+            speed (float): Speech speed factor
+            turn_id (Optional[str]): Turn ID, allows cancel_dialog_turn()
+            metrics (Optional[Dict[str, Any]]): Dict populated with time_to_first_token,
+                time_to_first_audio, total_time and sentences for this turn
+            output_format (Union[str, OutputFormat, None]): Output profile or format of
+                the headerless chunks (defaults to the configured output_format)
+            
+        Returns:
+            Generator[bytes, None, None]: Generator yielding audio chunks
+            
+        Raises:
+            ValueError: If no streaming-capable provider is available
+        """
+        if metrics is None:
+            metrics = {}
+        target = self._target_format(output_format, "raw")
+        
+        tried: Set[str] = set()
+        lease = self._lease_provider(voice_id, require_streaming=True)
+        if lease is None:
+            raise ValueError("No streaming-capable provider available for LLM response")
+        tried.add(lease.provider_name)
+        lease_ref = [lease]
+        
+        start_time = time.time()
+        metrics.update({"time_to_first_token": None, "time_to_first_audio": None,
+                        "total_time": None, "sentences": 0})
+        
+        depth = max(0, self.config.get("dialog", {}).get("pipeline_depth", 2))
+        executor = self._get_pipeline_executor()
+        fragmenter = self._get_text_fragmenter()
+        
+        jobs: "queue.Queue[Any]" = queue.Queue()
+        slots = threading.Semaphore(depth + 1)
+        cancel_event = threading.Event()
+        if turn_id:
+            with self._pipeline_lock:
+                self._active_dialog_turns[turn_id] = cancel_event
+        
+        def tokens() -> Generator[str, None, None]:
+            for token in token_stream:
+                if token and metrics["time_to_first_token"] is None:
+                    metrics["time_to_first_token"] = time.time() - start_time
+                yield token
+        
+        def segment() -> None:
+            index = 0
+            try:
+                for sentence in fragmenter.process_stream(tokens()):
+                    sentence = sentence.strip()
+                    if not sentence:
+                        continue
+                    # Bound synthesis running ahead of playback
+                    while not slots.acquire(timeout=0.1):
+                        if cancel_event.is_set():
+                            return
+                    if cancel_event.is_set():
+                        return
+                    
+                    job = _FragmentJob(index, {"fragment": sentence, "index": index, "turn_id": turn_id})
+                    index += 1
+                    self._submit_fragment_job(executor, job, lease_ref[0], voice_id, speed, target)
+                    jobs.put(job)
+            except Exception as e:
+                logger.error(f"Error segmenting LLM token stream: {e}")
+            finally:
+                jobs.put(_FragmentJob.END)
+        
+        segmenter = threading.Thread(target=segment, name="tts-llm-segmenter", daemon=True)
+        segmenter.start()
+        
+        try:
+            while not cancel_event.is_set():
+                try:
+                    job = jobs.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if job is _FragmentJob.END:
+                    break
+                
+                metrics["sentences"] += 1
+                self.events.create_and_emit(
+                    TTSEventType.FRAGMENT_PROCESSING,
+                    additional_data={"fragment": job.text, "index": job.index, "turn_id": turn_id}
+                )
+                
+                attempt = job
+                while attempt is not None:
+                    chunk_count = 0
+                    for chunk in self._drain_fragment_job(attempt, cancel_event):
+                        if metrics["time_to_first_audio"] is None:
+                            metrics["time_to_first_audio"] = time.time() - start_time
+                            self.events.create_and_emit(
+                                TTSEventType.FIRST_RESPONSE_LATENCY,
+                                additional_data={"latency_sec": metrics["time_to_first_audio"], "turn_id": turn_id}
+                            )
+                        chunk_count += 1
+                        yield chunk
+                    
+                    if attempt.error is None or chunk_count > 0 or cancel_event.is_set():
+                        break
+                    
+                    logger.error(f"Error generating speech for LLM sentence: {attempt.error}")
+                    # Only swap the lease once per failed provider; later sentences
+                    # already submitted to it are retried on the replacement
+                    if attempt.provider_name == lease_ref[0].provider_name:
+                        lease_ref[0].release(error=not isinstance(attempt.error, ProviderBusyError))
+                        replacement = self._lease_provider(voice_id, require_streaming=True, exclude=tried)
+                        if replacement is None:
+                            logger.error("No alternative streaming provider for LLM sentence")
+                            lease_ref[0] = None
+                            cancel_event.set()
+                            break
+                        lease_ref[0] = replacement
+                        tried.add(replacement.provider_name)
+                    
+                    attempt = _FragmentJob(job.index, job.info)
+                    self._submit_fragment_job(executor, attempt, lease_ref[0], voice_id, speed, target)
+                
+                slots.release()
+        
+        except Exception as e:
+            logger.error(f"Error in LLM speech generation: {e}")
+            self.events.create_and_emit(
+                TTSEventType.ERROR,
+                additional_data={"error": str(e), "turn_id": turn_id}
+            )
+        finally:
+            cancel_event.set()
+            while True:
+                try:
+                    job = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not _FragmentJob.END:
+                    job.cancel()
+            
+            if lease_ref[0] is not None:
+                lease_ref[0].release()
+            if turn_id:
+                with self._pipeline_lock:
+                    self._active_dialog_turns.pop(turn_id, None)
+            
+            metrics["total_time"] = time.time() - start_time
+            self.events.create_and_emit(
+                TTSEventType.LLM_TURN_LATENCY,
+                additional_data={"turn_id": turn_id, **metrics}
+            )
+            logger.info(f"LLM turn {turn_id}: first token {metrics['time_to_first_token']}, "
+                        f"first audio {metrics['time_to_first_audio']}, {metrics['sentences']} sentences")
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# Durable webhook event queue for Morning Coffee application
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Dict, Any, Callable, List, Set
+
+import redis
+
+from .stats import summarize
+
+# Configure logging
+logger = logging.getLogger('webhook-queue')
+
+# Renew a shard lease held by this consumer, or take it if it is free
+_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+class WebhookEventQueue:
+    """
+    Durable queue of Telnyx call events backed by Redis Streams.
+    
+    The webhook endpoint only enqueues events; worker threads process them.
+    Events are sharded over ``shard_count`` streams by call_control_id and
+    every shard is consumed by a single thread, so the events of one call
+    are handled in order while different calls are handled in parallel.
+    Each shard is leased to one process at a time, so several app processes
+    can share the shards without breaking per-call order.
+    
+    Leases are renewed by a heartbeat thread while events are handled, and
+    a worker checks its lease before each entry, so a shard is never
+    consumed by two processes at once.
+    
+    Entries are acknowledged once handled. Entries left unacknowledged by a
+    process that died are claimed when their shard is next leased, once they
+    have been idle for ``claim_idle_ms``; until then the new owner handles
+    nothing from the shard, so events stay in order. Telnyx event ids are
+    remembered for ``dedup_ttl`` seconds, so retried deliveries are queued
+    only once.
+    """
+    
+    STREAM_PREFIX = 'webhooks:telnyx:stream:'
+    SEEN_PREFIX = 'webhooks:telnyx:seen:'
+    LEASE_PREFIX = 'webhooks:telnyx:lease:'
+    GROUP = 'webhook-workers'
+    
+    def __init__(self, redis_client: redis.Redis, handler: Callable[[Dict[str, Any]], Any],
+                 shard_count: int = 8, dedup_ttl: int = 86400, lease_ttl: int = 15,
+                 max_stream_length: int = 10000, block_ms: int = 2000, claim_idle_ms: int = 120000):
+        """
+        Initialize the queue.
+        
+        Args:
+            redis_client (redis.Redis): Redis client (with decoded responses)
+            handler (Callable[[Dict[str, Any]], Any]): Called with each webhook body
+            shard_count (int): Number of streams events are spread over
+            dedup_ttl (int): Seconds an event id is remembered
+            lease_ttl (int): Seconds a shard lease lasts without renewal
+            max_stream_length (int): Approximate number of entries kept per stream
+            block_ms (int): Milliseconds a worker blocks waiting for new entries;
+                must stay below the client's socket timeout
+            claim_idle_ms (int): Milliseconds an entry of another consumer must be idle
+                before it is claimed; keep it above the longest time handling an event takes
+        """
+        self.redis = redis_client
+        self.handler = handler
+        self.shard_count = shard_count
+        self.dedup_ttl = dedup_ttl
+        self.lease_ttl = lease_ttl
+        self.max_stream_length = max_stream_length
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self._lease = self.redis.register_script(_LEASE_SCRIPT)
+        
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._leased_shards: Set[int] = set()
+        self._leased_lock = threading.Lock()
+        
+        # Per event type: processed and failed counts, queue lag and processing time
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+            "processed": 0,
+            "failed": 0,
+            "lag": deque(maxlen=500),
+            "processing_time": deque(maxlen=500),
+        })
+        self._duplicates = 0
+    
+    def _stream(self, shard: int) -> str:
+        return f"{self.STREAM_PREFIX}{shard}"
+    
+    def shard_for(self, call_control_id: str) -> int:
+        """
+        Get the shard that carries a call's events.
+        
+        Args:
+            call_control_id (str): Telnyx call control ID
+        
+        Returns:
+            int: Shard index
+        """
+        return zlib.crc32(call_control_id.encode()) % self.shard_count
+    
+    def enqueue(self, data: Dict[str, Any]) -> bool:
+        """
+        Queue a call webhook unless its event was already queued.
+        
+        Args:
+            data (Dict[str, Any]): Webhook body
+        
+        Returns:
+            bool: True if queued, False if it is a duplicate delivery
+        
+        Raises:
+            redis.RedisError: If the event could not be stored
+        """
+        event = data.get('data', {})
+        event_id = event.get('id')
+        call_control_id = event.get('payload', {}).get('call_control_id', '')
+        
+        seen_key = f"{self.SEEN_PREFIX}{event_id}" if event_id else None
+        if seen_key and not self.redis.set(seen_key, 1, nx=True, ex=self.dedup_ttl):
+            with self._stats_lock:
+                self._duplicates += 1
+            logger.info(f"Ignoring duplicate webhook event {event_id}")
+            return False
+        
+        try:
+            self.redis.xadd(
+                self._stream(self.shard_for(call_control_id)),
+                {
+                    'event_id': event_id or '',
+                    'event_type': event.get('event_type') or 'unknown',
+                    'call_control_id': call_control_id,
+                    'received_at': repr(time.time()),
+                    'body': json.dumps(data),
+                },
+                maxlen=self.max_stream_length,
+                approximate=True
+            )
+        except redis.RedisError:
+            # Let a retried delivery through
+            if seen_key:
+                self.redis.delete(seen_key)
+            raise
+        return True
+    
+    def start(self) -> None:
+        """Start one worker thread per shard and the lease heartbeat."""
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for shard in range(self.shard_count):
+            thread = threading.Thread(target=self._run_shard, args=(shard,),
+                                      daemon=True, name=f"webhook-worker-{shard}")
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._run_heartbeat, daemon=True, name="webhook-lease-heartbeat")
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Webhook queue started with {self.shard_count} shards as {self.consumer}")
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the worker threads and release their shard leases.
+        
+        Args:
+            timeout (float): Seconds to wait for each thread
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def _ensure_group(self, stream: str) -> None:
+        try:
+            self.redis.xgroup_create(stream, self.GROUP, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+    
+    def _hold_lease(self, shard: int) -> bool:
+        held = bool(self._lease(keys=[f"{self.LEASE_PREFIX}{shard}"],
+                                args=[self.consumer, self.lease_ttl]))
+        with self._leased_lock:
+            if held:
+                self._leased_shards.add(shard)
+            else:
+                self._leased_shards.discard(shard)
+        return held
+    
+    def _run_heartbeat(self) -> None:
+        """Renew the leases of shards whose events are being handled."""
+        while not self._stop_event.wait(self.lease_ttl / 3):
+            with self._leased_lock:
+                shards = list(self._leased_shards)
+            for shard in shards:
+                try:
+                    if not self._hold_lease(shard):
+                        logger.warning(f"Webhook shard {shard} lease lost")
+                except redis.RedisError as e:
+                    logger.error(f"Webhook shard {shard} lease renewal failed: {e}")
+    
+    def _others_pending(self, stream: str) -> int:
+        """Count entries delivered to other consumers and not yet acknowledged."""
+        summary = self.redis.xpending(stream, self.GROUP)
+        return sum(consumer['pending'] for consumer in summary.get('consumers') or []
+                   if consumer['name'] != self.consumer)
+    
+    def _release_lease(self, shard: int) -> None:
+        with self._leased_lock:
+            self._leased_shards.discard(shard)
+        key = f"{self.LEASE_PREFIX}{shard}"
+        try:
+            if self.redis.get(key) == self.consumer:
+                self.redis.delete(key)
+        except redis.RedisError:
+            pass
+    
+    def _run_shard(self, shard: int) -> None:
+        """Consume one shard while this process holds its lease."""
+        stream = self._stream(shard)
+        leased = False
+        draining = False
+        while not self._stop_event.is_set():
+            try:
+                if not self._hold_lease(shard):
+                    leased = False
+                    self._stop_event.wait(self.lease_ttl / 3)
+                    continue
+                
+                if not leased:
+                    # Newly leased: first finish entries a previous owner left
+                    # unacknowledged. Entries it may still be handling are only
+                    # claimed once idle for longer than handling can take.
+                    self._ensure_group(stream)
+                    self.redis.xautoclaim(stream, self.GROUP, self.consumer, min_idle_time=self.claim_idle_ms,
+                                          start_id='0-0', count=1000)
+                    if self._others_pending(stream):
+                        self._stop_event.wait(self.lease_ttl / 3)
+                        continue
+                    leased = True
+                    draining = True
+                
+                # Entries already delivered to this consumer ('0') come before new ones ('>')
+                response = self.redis.xreadgroup(self.GROUP, self.consumer,
+                                                 {stream: '0' if draining else '>'},
+                                                 count=10, block=None if draining else self.block_ms)
+                entries = [entry for _, stream_entries in response or [] for entry in stream_entries]
+                if draining and not entries:
+                    draining = False
+                for entry_id, fields in entries:
+                    # Stop if the lease was lost; the new owner claims the rest in order
+                    if not self._hold_lease(shard):
+                        logger.warning(f"Webhook shard {shard} lease lost, leaving the rest of the batch")
+                        leased = False
+                        break
+                    # Entries trimmed from the stream while pending come back without fields
+                    if fields:
+                        self._process(fields)
+                    self.redis.xack(stream, self.GROUP, entry_id)
+            
+            except redis.RedisError as e:
+                logger.error(f"Webhook worker {shard} Redis error: {e}")
+                leased = False
+                self._stop_event.wait(1.0)
+            except Exception as e:
+                logger.error(f"Webhook worker {shard} error: {e}")
+                self._stop_event.wait(1.0)
+        
+        self._release_lease(shard)
+    
+    def _process(self, fields: Dict[str, str]) -> None:
+        """Handle one queued event and record its lag and processing time."""
+        event_type = fields.get('event_type', 'unknown')
+        start_time = time.time()
+        lag = start_time - float(fields.get('received_at') or start_time)
+        
+        failed = False
+        try:
+            self.handler(json.loads(fields['body']))
+        except Exception as e:
+            failed = True
+            logger.error(f"Error processing {event_type} event {fields.get('event_id')} "
+                         f"for call {fields.get('call_control_id')}: {e}")
+        
+        with self._stats_lock:
+            stats = self._stats[event_type]
+            stats["processed"] += 1
+            stats["failed"] += int(failed)
+            stats["lag"].append(lag)
+            stats["processing_time"].append(time.time() - start_time)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+        
+        Returns:
+            Dict[str, Any]: Entries not yet delivered (waiting) and delivered but not
+                acknowledged (pending) across shards, duplicate deliveries, and per
+                event type counts, queue lag and processing time
+        """
+        with self._stats_lock:
+            event_types = {
+                event_type: {
+                    "processed": stats["processed"],
+                    "failed": stats["failed"],
+                    "lag": summarize(stats["lag"], ("avg", "p95", "max")),
+                    "processing_time": summarize(stats["processing_time"], ("avg", "p95", "max")),
+                }
+                for event_type, stats in self._stats.items()
+            }
+            duplicates = self._duplicates
+        
+        waiting = 0
+        pending = 0
+        try:
+            pipe = self.redis.pipeline()
+            for shard in range(self.shard_count):
+                pipe.xinfo_groups(self._stream(shard))
+            for groups in pipe.execute(raise_on_error=False):
+                if isinstance(groups, Exception):
+                    continue
+                for group in groups:
+                    if group.get('name') == self.GROUP:
+                        waiting += group.get('lag') or 0
+                        pending += group.get('pending') or 0
+        except redis.RedisError as e:
+            logger.error(f"Error reading webhook queue depth: {e}")
+        
+        return {
+            "shards": self.shard_count,
+            "workers": len(self._threads),
+            "waiting": waiting,
+            "pending": pending,
+            "duplicates": duplicates,
+            "event_types": event_types,
+        }
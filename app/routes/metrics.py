@@ -263,6 +263,83 @@ def get_voice_pool_stats():
         logger.error(f"Error retrieving voice pool statistics: {e}")
         return jsonify({"error": str(e)}), 500
 
+@metrics_blueprint.route('/scheduler', methods=['GET'])
+def get_scheduler_stats():
+    """Get TTS scheduler queue depth and wait times per priority class."""
+    try:
+        tts_service = current_app.tts_service
+        return jsonify(tts_service.get_scheduler_stats())
+    except Exception as e:
+        logger.error(f"Error getting scheduler stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@metrics_blueprint.route('/webhooks', methods=['GET'])
+def get_webhook_queue_stats():
+    """Get webhook queue depth, lag and processing time per event type."""
+    try:
+        webhook_queue = current_app.config.get('WEBHOOK_QUEUE')
+        if not webhook_queue:
+            return jsonify({"error": "Webhook queue not available"}), 404
+        
+        return jsonify(webhook_queue.get_stats())
+    except Exception as e:
+        logger.error(f"Error getting webhook queue stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@metrics_blueprint.route('/transcription', methods=['GET'])
+def get_transcription_stats():
+    """Get transcription latency per completion path, with provider racing stats under "provider_race"."""
+    try:
+        tracker = current_app.config.get('TRANSCRIPTION_LATENCY')
+        if not tracker:
+            return jsonify({"error": "Transcription metrics not available"}), 404
+        
+        stats = tracker.get_stats()
+        transcription_handler = current_app.config.get('TRANSCRIPTION_HANDLER')
+        if hasattr(transcription_handler, 'get_stats'):
+            stats["provider_race"] = transcription_handler.get_stats()
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"Error getting transcription stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@metrics_blueprint.route('/streaming-stt', methods=['GET'])
+def get_streaming_stt_stats():
+    """Get streaming recognition statistics per active call."""
+    try:
+        streaming_stt = current_app.config.get('STREAMING_STT')
+        if not streaming_stt:
+            return jsonify({"error": "Streaming recognition not available"}), 404
+        
+        return jsonify(streaming_stt.get_stats())
+    except Exception as e:
+        logger.error(f"Error getting streaming recognition stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@metrics_blueprint.route('/traces', methods=['GET'])
+def get_traces():
+    """Get per-stage latency percentiles and waterfalls of recent turns."""
+    try:
+        tracer = current_app.config.get('TRACER')
+        if not tracer:
+            return jsonify({"error": "Tracing not available"}), 404
+        
+        trace_id = request.args.get('trace_id')
+        if trace_id:
+            trace = tracer.get_trace(trace_id)
+            if not trace:
+                return jsonify({"error": f"Trace {trace_id} not found"}), 404
+            return jsonify(trace)
+        
+        limit = request.args.get('limit', 20, type=int)
+        return jsonify({
+            "stages": tracer.get_stage_stats(),
+            "traces": tracer.recent_traces(limit)
+        })
+    except Exception as e:
+        logger.error(f"Error getting traces: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @metrics_blueprint.route('/streaming', methods=['GET'])
 def get_streaming_stats():
     """Get statistics about streaming sessions."""
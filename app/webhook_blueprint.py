@@ -2,8 +2,9 @@
 # Webhook Blueprint for Morning Coffee application
 
 import logging
+import threading
 import time
-import requests
+import redis
 from typing import Dict, Any, Optional
 
 from flask import Blueprint, request, jsonify, current_app
@@ -11,6 +12,11 @@ from flask import Blueprint, request, jsonify, current_app
 # Additional imports for streaming
 from .modules.tts.telnyx_streaming import TelnyxStreamingManager, AudioFormat
 from .modules.tts.call_metrics import CallQualityMonitor
+from .modules.tracing import get_tracer, current_trace_id, decode_client_state, encode_client_state
+from .modules.call_flow import (
+    REPEAT_PROMPT, CHAT_PROMPT, GOODBYE_MESSAGE, CALL_VOICE, MORNING_CALL_FLOW, MORNING_CALL_FLOW_ID,
+    NEXT_STEP_AFTER_PLAYBACK
+)
 
 # Configure logging
 logger = logging.getLogger('webhooks')
@@ -18,11 +24,348 @@ logger = logging.getLogger('webhooks')
 # Create blueprint
 webhooks = Blueprint('webhooks', __name__, url_prefix='/webhooks')
 
+def _stream_llm_response(llm_handler, tts_service, tts_streaming_manager, call_quality_monitor,
+                         call_session, call_control_id: str, user_input: str,
+                         history: list) -> Optional[str]:
+    """
+    Stream an LLM response into the call while it is being generated.
+    
+    LLM tokens are fed straight into incremental TTS and playback starts with
+    the first synthesized chunk. Time-to-first-token and time-to-first-audio
+    are recorded for the turn.
+    
+    Returns:
+        The full response text, or None if nothing could be streamed
+    """
+    llm_metrics: Dict[str, Any] = {}
+    tts_metrics: Dict[str, Any] = {}
+    parts = []
+    
+    def tokens():
+        for token in llm_handler.stream_response(user_input, history, metrics=llm_metrics):
+            parts.append(token)
+            yield token
+    
+    streaming_started = False
+    try:
+        session_id = tts_streaming_manager.create_streaming_session(
+            call_control_id=call_control_id,
+            client_state="ai_response"
+        )
+        if not session_id:
+            raise Exception("Failed to create streaming session")
+        
+        if call_quality_monitor:
+            call_quality_monitor.start_streaming_session(call_session.id, session_id)
+        
+        audio_generator = tts_service.generate_llm_speech_stream(
+            tokens(),
+            voice_id=CALL_VOICE,
+            turn_id=f"{call_session.id}:{call_session.history_offset + len(call_session.conversation_history)}",
+            metrics=tts_metrics
+        )
+        
+        for audio_chunk in audio_generator:
+            if not audio_chunk:
+                continue
+            tts_streaming_manager.add_wav_audio(
+                call_control_id=call_control_id,
+                wav_data=audio_chunk,
+                metadata={"type": "ai_response"}
+            )
+            
+            # Start playback as soon as the first sentence has audio
+            if not streaming_started:
+                streaming_started = tts_streaming_manager.start_streaming(call_control_id)
+    
+    except Exception as e:
+        logger.error(f"Error streaming LLM response for call {call_control_id}: {str(e)}")
+        if call_quality_monitor:
+            call_quality_monitor.record_error(call_session.id, "llm_streaming_error", str(e))
+    
+    if not streaming_started:
+        return None
+    
+    logger.info(f"LLM turn for call {call_control_id}: "
+                f"first token {llm_metrics.get('time_to_first_token')}, "
+                f"first audio {tts_metrics.get('time_to_first_audio')}")
+    if call_quality_monitor:
+        call_quality_monitor.record_llm_turn(
+            call_session.id,
+            time_to_first_token=llm_metrics.get("time_to_first_token"),
+            time_to_first_audio=tts_metrics.get("time_to_first_audio"),
+            total_time=tts_metrics.get("total_time") or 0
+        )
+    
+    return "".join(parts).strip()
+
+def _respond_to_user_turn(text: str, client_state: Optional[str], call_session, call_control_id: str,
+                          redis_store, tts_service, telnyx_handler, llm_handler,
+                          tts_streaming_manager, call_quality_monitor):
+    """
+    Answer what the user said in a recording.
+    
+    After the affirmation was repeated the reply acknowledges it; during the
+    chat the LLM replies, or the call says goodbye if the user wants to end
+    it. The caller saves the call session afterwards.
+    
+    Returns:
+        Flask response describing the outcome
+    """
+    call_session.add_conversation_entry(role="user", content=text)
+    
+    if client_state == 'recording_chat' and text.lower() in ["no", "no thanks", "goodbye", "bye", "end", "stop"]:
+        # User wants to end the conversation
+        reply = GOODBYE_MESSAGE
+        next_state = 'goodbye'
+        _track_call_step(call_session, next_state)
+    else:
+        # Check if LLM handler is available
+        if not llm_handler:
+            logger.error(f"LLM handler not available")
+            return jsonify({"error": "Conversation AI not available"}), 503
+        
+        _track_call_step(call_session, 'ai_response')
+        
+        if client_state == 'recording_affirmation':
+            # User repeated the affirmation, acknowledge it and move to chat
+            history = [
+                {"role": "system", "content": "You are a supportive AI assistant. The user has just repeated their daily affirmation. Acknowledge this positively and ask how they're feeling today. Keep your response warm but concise (2-3 sentences)."}
+            ]
+        else:
+            # Format conversation history for the LLM, without the current turn
+            history = [
+                {"role": entry["role"], "content": entry["content"]}
+                for entry in call_session.conversation_history
+            ]
+            if not history or history[0]["role"] != "system":
+                history.insert(0, {
+                    "role": "system", 
+                    "content": "You are a supportive AI assistant having a short voice conversation. Keep your responses concise (1-3 sentences) and supportive."
+                })
+            history = history[:-1]
+        
+        # Speak the response while the LLM is still generating it
+        if tts_streaming_manager:
+            ai_response = _stream_llm_response(
+                llm_handler, tts_service, tts_streaming_manager, call_quality_monitor,
+                call_session, call_control_id, text, history
+            )
+            if ai_response is not None:
+                call_session.add_conversation_entry(role="assistant", content=ai_response)
+                return jsonify({"status": "ai response streaming started"})
+        
+        reply = llm_handler.get_response(text, history)
+        call_session.add_conversation_entry(role="assistant", content=reply)
+        next_state = 'ai_response'
+    
+    # Fall back to traditional approach if streaming fails or is not available
+    audio_bytes = tts_service.generate_speech(text=reply, voice_id=CALL_VOICE)
+    if not audio_bytes:
+        logger.error(f"Failed to generate speech for reply")
+        return jsonify({"error": "TTS failed"}), 500
+    
+    # Upload audio to Telnyx storage
+    audio_upload = telnyx_handler.upload_to_storage(file_data=audio_bytes)
+    if not audio_upload:
+        logger.error(f"Failed to upload audio to Telnyx storage")
+        return jsonify({"error": "Audio upload failed"}), 500
+    
+    telnyx_handler.play_audio(
+        call_control_id=call_control_id,
+        audio_url=audio_upload['url'],
+        client_state=next_state
+    )
+    return jsonify({"status": "response played"})
+
+def _track_call_step(call_session, step_id: Optional[str]) -> None:
+    """
+    Tell predictive synthesis which step of the call flow a call has reached.
+    
+    The flow's entry step starts tracking the call; None stops it.
+    
+    Args:
+        call_session: The call session
+        step_id (Optional[str]): Step of MORNING_CALL_FLOW the call reached, or None once it ended
+    """
+    predictive_generator = current_app.config.get('PREDICTIVE_GENERATOR')
+    if not predictive_generator:
+        return
+    try:
+        if step_id is None:
+            predictive_generator.end_call(call_session.id)
+        elif step_id == MORNING_CALL_FLOW['entry_point']:
+            predictive_generator.start_call(call_session.id, MORNING_CALL_FLOW_ID,
+                                            metadata={"voice_id": CALL_VOICE})
+        else:
+            predictive_generator.update_call_step(call_session.id, step_id)
+    except Exception as e:
+        logger.error(f"Error tracking call {call_session.id} for predictive synthesis: {e}")
+
+def _is_inbound_stream(payload: Dict[str, Any]) -> bool:
+    """
+    Check whether a media stream carries the caller's audio.
+    
+    Only streams started with an inbound track ("inbound_track" or
+    "both_tracks") are; the streams TTS playback starts declare no track.
+    
+    Args:
+        payload (Dict[str, Any]): streaming.started or streaming.stopped payload
+    
+    Returns:
+        bool: True if the stream carries inbound audio
+    """
+    track = payload.get('stream_track') or payload.get('stream_params', {}).get('stream_track')
+    return track in ('inbound_track', 'both_tracks')
+
+def _streaming_recognition_active(call_control_id: str) -> bool:
+    """Check whether a call's turns come from streaming recognition."""
+    streaming_stt = current_app.config.get('STREAMING_STT')
+    return bool(streaming_stt) and streaming_stt.is_active(call_control_id)
+
+def _listen_for_caller(telnyx_handler, call_control_id: str, client_state: str) -> bool:
+    """
+    Listen for the caller's next turn.
+    
+    While a call is recognized from its inbound stream, the turn ends when
+    the caller stops speaking, so no recording is started; the client state
+    is passed on with the streamed transcript instead.
+    
+    Args:
+        telnyx_handler: Telnyx handler
+        call_control_id (str): Telnyx call control ID
+        client_state (str): State of the call once the caller has spoken
+    
+    Returns:
+        bool: True if listening started
+    """
+    if _streaming_recognition_active(call_control_id):
+        current_app.config['STREAMING_STT'].set_client_state(call_control_id, client_state)
+        return True
+    return telnyx_handler.start_recording(call_control_id=call_control_id, client_state=client_state)
+
+def _record_transcription_latency(path: str, seconds: float) -> None:
+    """Record submit-to-text latency if a tracker is configured."""
+    tracker = current_app.config.get('TRANSCRIPTION_LATENCY')
+    if tracker:
+        tracker.record(path, seconds)
+
+def _finish_transcription(transcription_id: str, path: str,
+                          result: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Resume the call waiting for a submitted transcription.
+    
+    The pending transcription is claimed first, so a callback and the
+    polling fallback never both resume the call. The transcript is then
+    handled like a call event, in order with the call's other events.
+    
+    Args:
+        transcription_id (str): Transcription job ID
+        path (str): How completion was detected, for latency metrics
+        result (Optional[Dict[str, Any]]): Status information, fetched if not given
+    
+    Returns:
+        bool: True if the call was resumed
+    """
+    redis_store = current_app.config['REDIS_STORE']
+    transcription_handler = current_app.config.get('TRANSCRIPTION_HANDLER')
+    
+    pending = redis_store.claim_pending_transcription(transcription_id)
+    if not pending:
+        logger.info(f"Transcription {transcription_id} already handled or unknown")
+        return False
+    
+    if result is None:
+        result = transcription_handler.check_transcription_status(transcription_id)
+    if result.get("status") in ("in_progress", "unavailable"):
+        # Not readable yet; leave it to the polling fallback
+        redis_store.save_pending_transcription(transcription_id, pending)
+        return False
+    
+    if result.get("status") == "completed":
+        _record_transcription_latency(path, time.time() - pending["submitted_at"])
+    get_tracer().record(f"stt.{path}", pending["submitted_at"], time.time(), trace_id=pending.get("trace_id"),
+                        error=result.get("error"), transcription_id=transcription_id)
+    
+    dispatch_transcript(pending["call_control_id"], pending.get("client_state"), transcription_id, result,
+                        trace_id=pending.get("trace_id"))
+    return True
+
+def dispatch_transcript(call_control_id: str, client_state: Optional[str], transcription_id: str,
+                        result: Dict[str, Any], trace_id: Optional[str] = None) -> None:
+    """
+    Continue a call with the transcript of what the caller said.
+    
+    The transcript is handled like a call event, through the webhook queue
+    if there is one, so it is processed in order with the call's other
+    events. Must run in an application context.
+    
+    Args:
+        call_control_id (str): Telnyx call control ID
+        client_state (Optional[str]): State the call was in while the caller spoke
+        transcription_id (str): Transcript identifier
+        result (Dict[str, Any]): Status information with "status" and "text" or "error"
+        trace_id (Optional[str]): Trace of the caller's turn (defaults to the current trace)
+    """
+    completed = result.get("status") == "completed"
+    event = {
+        "data": {
+            "id": f"transcription-{transcription_id}",
+            "event_type": "transcription.completed" if completed else "transcription.failed",
+            "payload": {
+                "call_control_id": call_control_id,
+                "client_state": encode_client_state(client_state, trace_id),
+                "transcription_id": transcription_id,
+                "text": result.get("text", ""),
+                "error": result.get("error")
+            }
+        }
+    }
+    
+    webhook_queue = current_app.config.get('WEBHOOK_QUEUE')
+    if webhook_queue:
+        webhook_queue.enqueue(event)
+    else:
+        process_call_event(event)
+
+def _start_transcription_fallback(transcription_id: str, transcription_handler, delay: float) -> None:
+    """
+    Poll for a transcript in case its completion callback never arrives.
+    
+    Polling starts after ``delay`` seconds and stops as soon as the
+    transcription has been claimed by a callback.
+    """
+    app = current_app._get_current_object()
+    redis_store = app.config['REDIS_STORE']
+    
+    def claimed() -> bool:
+        return not redis_store.has_pending_transcription(transcription_id)
+    
+    def poll():
+        try:
+            time.sleep(delay)
+            result = transcription_handler.wait_for_transcription(transcription_id, should_stop=claimed)
+            if result.get("status") == "cancelled":
+                return
+            
+            with app.app_context():
+                _finish_transcription(transcription_id, 'assemblyai_poll', result)
+        except Exception as e:
+            logger.error(f"Error polling transcription {transcription_id}: {e}")
+    
+    threading.Thread(target=poll, daemon=True, name=f"transcription-poll-{transcription_id}").start()
+
 @webhooks.route('/telnyx/call', methods=['POST'])
 def telnyx_call_webhook():
-    """Handle Telnyx call webhooks."""
+    """
+    Handle Telnyx call webhooks.
+    
+    Events are queued and acknowledged at once; workers process them in
+    order per call. Without a queue the event is processed inline.
+    """
     # Extract event data
     data = request.json
+    event_id = data.get('data', {}).get('id')
     event_type = data.get('data', {}).get('event_type')
     call_control_id = data.get('data', {}).get('payload', {}).get('call_control_id')
     
@@ -31,11 +374,60 @@ def telnyx_call_webhook():
     if not call_control_id:
         return jsonify({"error": "Missing call_control_id"}), 400
     
+    webhook_queue = current_app.config.get('WEBHOOK_QUEUE')
+    if not webhook_queue:
+        return process_call_event(data)
+    
+    _, trace_id = decode_client_state(data.get('data', {}).get('payload', {}).get('client_state'))
+    with get_tracer().span("webhook.receive", trace_id=trace_id, event_type=event_type):
+        try:
+            queued = webhook_queue.enqueue(data)
+        except redis.RedisError as e:
+            # Telnyx retries deliveries that are not acknowledged
+            logger.error(f"Error queuing webhook event {event_id}: {e}")
+            return jsonify({"error": "Webhook queue not available"}), 503
+    
+    return jsonify({"status": "queued" if queued else "duplicate"})
+
+def process_call_event(data: Dict[str, Any]):
+    """
+    Process a Telnyx call webhook.
+    
+    The event is handled in the trace named by its client state, which is
+    stripped of the trace id before the handlers see it. A saved recording
+    is the start of the caller's turn and starts a new trace. Must run in
+    an application context.
+    
+    Args:
+        data (Dict[str, Any]): Webhook body
+    
+    Returns:
+        Flask response describing the outcome
+    """
+    event_type = data.get('data', {}).get('event_type')
+    payload = data.get('data', {}).get('payload', {})
+    
+    client_state, trace_id = decode_client_state(payload.get('client_state'))
+    if trace_id:
+        payload['client_state'] = client_state
+    if event_type == 'call.recording.saved':
+        trace_id = None
+    
+    tracer = get_tracer()
+    with tracer.trace(trace_id), tracer.span(f"webhook.{event_type}",
+                                             call_control_id=payload.get('call_control_id')):
+        return _handle_call_event(data)
+
+def _handle_call_event(data: Dict[str, Any]):
+    """Handle a Telnyx call webhook within its trace."""
+    event_type = data.get('data', {}).get('event_type')
+    call_control_id = data.get('data', {}).get('payload', {}).get('call_control_id')
+    
     # Get service instances from application config
     redis_store = current_app.config['REDIS_STORE']
     tts_service = current_app.config['TTS_SERVICE']  # Replace TTS_CLIENT with TTS_SERVICE
     telnyx_handler = current_app.config['TELNYX_HANDLER']
-    assemblyai_handler = current_app.config['ASSEMBLYAI_HANDLER']
+    transcription_handler = current_app.config.get('TRANSCRIPTION_HANDLER')
     llm_handler = current_app.config['LLM_HANDLER']
     
     # Initialize TTS streaming manager and monitoring if not already in config
@@ -71,7 +463,9 @@ def telnyx_call_webhook():
         return jsonify({"error": "TTS service not available"}), 503
     
     # Get the call session
-    call_session = redis_store.get_call_by_control_id(call_control_id)
+    # Only the recent conversation is needed to build the prompt
+    history_limit = getattr(current_app.config.get('APP_CONFIG'), 'CONVERSATION_HISTORY_LIMIT', None)
+    call_session = redis_store.get_call_by_control_id(call_control_id, history_limit=history_limit)
     if not call_session:
         logger.warning(f"Call session not found for control ID {call_control_id}")
         return jsonify({"error": "Call session not found"}), 404
@@ -101,6 +495,7 @@ def telnyx_call_webhook():
         # Start call quality monitoring
         if call_quality_monitor:
             call_quality_monitor.start_call_monitoring(call_session.id)
+        _track_call_step(call_session, MORNING_CALL_FLOW['entry_point'])
         
         try:
             # Use streaming for better latency
@@ -123,13 +518,15 @@ def telnyx_call_webhook():
                     # Get streaming generator from TTS service with dialog optimization
                     audio_generator = tts_service.generate_dialog_speech_stream(
                         text=greeting, 
-                        voice_id="default_female"
+                        voice_id=CALL_VOICE,
+                        output_format="pstn_l16"
                     )
                 else:
                     # Fall back to regular streaming
                     audio_generator = tts_service.generate_speech_stream(
                         text=greeting, 
-                        voice_id="default_female"
+                        voice_id=CALL_VOICE,
+                        output_format="pstn_l16"
                     )
                 
                 # Start call quality monitoring for the stream
@@ -164,7 +561,7 @@ def telnyx_call_webhook():
                 logger.warning("Streaming manager not available, falling back to batch audio generation")
                 
                 # Traditional audio generation (existing code)
-                audio_bytes = tts_service.generate_speech(text=greeting, voice_id="default_female")
+                audio_bytes = tts_service.generate_speech(text=greeting, voice_id=CALL_VOICE)
                 if not audio_bytes:
                     logger.error(f"Failed to generate speech for greeting")
                     return jsonify({"error": "TTS failed"}), 500
@@ -199,7 +596,7 @@ def telnyx_call_webhook():
             # Fall back to non-streaming approach
             try:
                 # Traditional audio generation (existing code)
-                audio_bytes = tts_service.generate_speech(text=greeting, voice_id="default_female")
+                audio_bytes = tts_service.generate_speech(text=greeting, voice_id=CALL_VOICE)
                 if not audio_bytes:
                     return jsonify({"error": "TTS failed"}), 500
                     
@@ -227,13 +624,15 @@ def telnyx_call_webhook():
         # Audio playback ended
         client_state = data.get('data', {}).get('payload', {}).get('client_state')
         logger.info(f"Playback ended for call {call_control_id} with state {client_state}")
+        if client_state in NEXT_STEP_AFTER_PLAYBACK:
+            _track_call_step(call_session, NEXT_STEP_AFTER_PLAYBACK[client_state])
         
         if client_state == 'greeting':
             # After greeting, ask user to repeat the affirmation
-            prompt = "Now, please repeat the affirmation."
+            prompt = REPEAT_PROMPT
             
             # Convert to speech using TTS
-            audio_bytes = tts_service.generate_speech(text=prompt, voice_id="default_female")
+            audio_bytes = tts_service.generate_speech(text=prompt, voice_id=CALL_VOICE)
             if not audio_bytes:
                 logger.error(f"Failed to generate speech for prompt")
                 return jsonify({"error": "TTS failed"}), 500
@@ -252,31 +651,25 @@ def telnyx_call_webhook():
             )
             
         elif client_state == 'repeat_prompt':
-            # After prompting for repetition, start recording
-            success = telnyx_handler.start_recording(
-                call_control_id=call_control_id,
-                client_state='recording_affirmation'
-            )
+            # After prompting for repetition, listen for the caller
+            success = _listen_for_caller(telnyx_handler, call_control_id, 'recording_affirmation')
             if success:
                 call_session.update_state('recording')
                 redis_store.update_call_session(call_session)
                 
         elif client_state == 'chat_prompt':
-            # After chat prompt, start recording for chat
-            success = telnyx_handler.start_recording(
-                call_control_id=call_control_id,
-                client_state='recording_chat'
-            )
+            # After chat prompt, listen for the caller's chat turn
+            success = _listen_for_caller(telnyx_handler, call_control_id, 'recording_chat')
             if success:
                 call_session.update_state('recording')
                 redis_store.update_call_session(call_session)
                 
         elif client_state == 'ai_response':
             # After AI response, ask if user wants to continue chatting
-            prompt = "Would you like to continue our conversation? Just say yes or no."
+            prompt = CHAT_PROMPT
             
             # Convert to speech using TTS
-            audio_bytes = tts_service.generate_speech(text=prompt, voice_id="default_female")
+            audio_bytes = tts_service.generate_speech(text=prompt, voice_id=CALL_VOICE)
             if not audio_bytes:
                 logger.error(f"Failed to generate speech for chat prompt")
                 return jsonify({"error": "TTS failed"}), 500
@@ -313,238 +706,119 @@ def telnyx_call_webhook():
             logger.error(f"Missing recording details in webhook")
             return jsonify({"error": "Missing recording details"}), 400
         
-        # Check if AssemblyAI handler is available
-        if not assemblyai_handler:
-            logger.error(f"AssemblyAI handler not available")
+        # Turns of calls recognized from streamed audio come from the stream
+        if _streaming_recognition_active(call_control_id):
+            logger.info(f"Ignoring recording {recording_id}; call {call_control_id} is recognized from its stream")
+            return jsonify({"status": "recording ignored, streaming recognition active"})
+        
+        # Check if a transcription handler is available
+        if not transcription_handler:
+            logger.error(f"Transcription handler not available")
             return jsonify({"error": "Speech recognition not available"}), 503
             
         # Add recording to call session
         call_session.add_recording(recording_url=recording_url, recording_id=recording_id)
         call_session.update_state('processing')
+        call_session.trace_id = current_trace_id()
         redis_store.update_call_session(call_session)
         
-        # Download the recording for transcription
         try:
-            recording_response = requests.get(recording_url)
-            recording_response.raise_for_status()
-            recording_data = recording_response.content
+            if hasattr(transcription_handler, 'transcribe_audio_url'):
+                # Stream the recording straight into the transcription request
+                submitted_at = time.time()
+                if hasattr(transcription_handler, 'transcribe_with_provider'):
+                    # Raced providers; record the latency under the one that won
+                    text, provider = transcription_handler.transcribe_with_provider(recording_url)
+                else:
+                    text, provider = transcription_handler.transcribe_audio_url(recording_url), 'openai'
+                if not text:
+                    logger.error(f"Transcription failed for recording {recording_id}")
+                    return jsonify({"error": "Transcription failed"}), 500
+                
+                _record_transcription_latency(provider, time.time() - submitted_at)
+                call_session.add_transcription(text=text, transcription_id=recording_id)
+                response = _respond_to_user_turn(
+                    text, client_state, call_session, call_control_id, redis_store, tts_service,
+                    telnyx_handler, llm_handler, tts_streaming_manager, call_quality_monitor
+                )
+                redis_store.update_call_session(call_session)
+                return response
             
-            # Submit for transcription
-            transcription_id = assemblyai_handler.submit_transcription(recording_data)
-            if not transcription_id:
+            # Submit for transcription; the call resumes when the transcript is done
+            job = transcription_handler.submit_transcription(recording_url)
+            if not job:
                 logger.error(f"Failed to submit transcription for recording {recording_id}")
                 return jsonify({"error": "Transcription submission failed"}), 500
-                
-            # Poll for transcription result (in a real app, this would be async)
-            max_retries = 10
-            for i in range(max_retries):
-                status, text = assemblyai_handler.check_transcription_status(transcription_id)
-                
-                if status == "completed" and text:
-                    # Transcription completed
-                    call_session.add_transcription(text=text, transcription_id=transcription_id)
-                    
-                    if client_state == 'recording_affirmation':
-                        # User repeated the affirmation, now move to chat
-                        call_session.add_conversation_entry(role="user", content=text)
-                        
-                        # Check if LLM handler is available
-                        if not llm_handler:
-                            logger.error(f"LLM handler not available")
-                            return jsonify({"error": "Conversation AI not available"}), 503
-                        
-                        # Generate a response based on their affirmation repetition
-                        prompt = [
-                            {"role": "system", "content": "You are a supportive AI assistant. The user has just repeated their daily affirmation. Acknowledge this positively and ask how they're feeling today. Keep your response warm but concise (2-3 sentences)."},
-                            {"role": "user", "content": text}
-                        ]
-                        
-                        ai_response = llm_handler.get_response(prompt, temperature=0.7)
-                        call_session.add_conversation_entry(role="assistant", content=ai_response)
-                        
-                        # Convert AI response to speech using streaming
-                        if tts_streaming_manager:
-                            try:
-                                # Create a streaming session for the AI response
-                                session_id = tts_streaming_manager.create_streaming_session(
-                                    call_control_id=call_control_id,
-                                    client_state="ai_response"
-                                )
-                                
-                                # Generate audio stream
-                                audio_generator = tts_service.generate_speech_stream(
-                                    text=ai_response, 
-                                    voice_id="default_female"
-                                )
-                                
-                                # Track streaming session
-                                if call_quality_monitor:
-                                    call_quality_monitor.start_streaming_session(call_session.id, session_id)
-                                
-                                # Process audio chunks
-                                for audio_chunk in audio_generator:
-                                    # Add to streaming session
-                                    tts_streaming_manager.add_wav_audio(
-                                        call_control_id=call_control_id,
-                                        wav_data=audio_chunk
-                                    )
-                                
-                                # Start streaming
-                                tts_streaming_manager.start_streaming(call_control_id)
-                                
-                                redis_store.update_call_session(call_session)
-                                return jsonify({"status": "ai response streaming started"})
-                            except Exception as e:
-                                logger.error(f"Error in streaming AI response: {str(e)}")
-                                # Fall back to non-streaming approach
-                        
-                        # Fall back to traditional approach if streaming fails or is not available
-                        audio_bytes = tts_service.generate_speech(text=ai_response, voice_id="default_female")
-                        if not audio_bytes:
-                            logger.error(f"Failed to generate speech for AI response")
-                            return jsonify({"error": "TTS failed"}), 500
-                            
-                            # Play the AI response
-                            success = telnyx_handler.play_audio(
-                                call_control_id=call_control_id,
-                                audio_url=audio_upload['url'],
-                                client_state='ai_response'
-                            )
-                    
-                    elif client_state == 'recording_chat':
-                        # User is chatting, generate a response
-                        call_session.add_conversation_entry(role="user", content=text)
-                        
-                        # Check if the user wants to end the conversation
-                        if text.lower() in ["no", "no thanks", "goodbye", "bye", "end", "stop"]:
-                            # User wants to end the conversation
-                            goodbye = "Thank you for your time today. Remember your affirmation and have a wonderful day!"
-                            
-                            # Convert to speech using TTS
-                            audio_bytes = tts_service.generate_speech(text=goodbye, voice_id="default_female")
-                            if not audio_bytes:
-                                logger.error(f"Failed to generate speech for goodbye")
-                                return jsonify({"error": "TTS failed"}), 500
-                                
-                            # Upload audio to Telnyx storage
-                            audio_upload = telnyx_handler.upload_to_storage(file_data=audio_bytes)
-                            if not audio_upload:
-                                logger.error(f"Failed to upload audio to Telnyx storage")
-                                return jsonify({"error": "Audio upload failed"}), 500
-                                
-                            # Play the goodbye message
-                            success = telnyx_handler.play_audio(
-                                call_control_id=call_control_id,
-                                audio_url=audio_upload['url'],
-                                client_state='goodbye'
-                            )
-                            
-                        else:
-                            # Check if LLM handler is available
-                            if not llm_handler:
-                                logger.error(f"LLM handler not available")
-                                return jsonify({"error": "Conversation AI not available"}), 503
-                                
-                            # Generate a response with the LLM
-                            history = call_session.conversation_history
-                            
-                            # Format conversation history for the LLM
-                            formatted_history = [
-                                {"role": entry["role"], "content": entry["content"]}
-                                for entry in history
-                            ]
-                            
-                            # Add a system prompt at the beginning
-                            if not formatted_history or formatted_history[0]["role"] != "system":
-                                formatted_history.insert(0, {
-                                    "role": "system", 
-                                    "content": "You are a supportive AI assistant having a short voice conversation. Keep your responses concise (1-3 sentences) and supportive."
-                                })
-                            
-                            # Get response from LLM
-                            ai_response = llm_handler.get_response(formatted_history, temperature=0.7)
-                            call_session.add_conversation_entry(role="assistant", content=ai_response)
-                            
-                            # Convert AI response to speech using streaming
-                            if tts_streaming_manager:
-                                try:
-                                    # Create a streaming session for the AI response
-                                    session_id = tts_streaming_manager.create_streaming_session(
-                                        call_control_id=call_control_id,
-                                        client_state="ai_response"
-                                    )
-                                    
-                                    # Generate audio stream
-                                    audio_generator = tts_service.generate_speech_stream(
-                                        text=ai_response, 
-                                        voice_id="default_female"
-                                    )
-                                    
-                                    # Track streaming session
-                                    if call_quality_monitor:
-                                        call_quality_monitor.start_streaming_session(call_session.id, session_id)
-                                    
-                                    # Process audio chunks
-                                    for audio_chunk in audio_generator:
-                                        # Add to streaming session
-                                        tts_streaming_manager.add_wav_audio(
-                                            call_control_id=call_control_id,
-                                            wav_data=audio_chunk
-                                        )
-                                    
-                                    # Start streaming
-                                    tts_streaming_manager.start_streaming(call_control_id)
-                                    
-                                    redis_store.update_call_session(call_session)
-                                    return jsonify({"status": "ai response streaming started"})
-                                except Exception as e:
-                                    logger.error(f"Error in streaming AI response: {str(e)}")
-                                    # Fall back to non-streaming approach
-                        
-                        # Fall back to traditional approach if streaming fails or is not available
-                        audio_bytes = tts_service.generate_speech(text=ai_response, voice_id="default_female")
-                        if not audio_bytes:
-                            logger.error(f"Failed to generate speech for AI response")
-                            return jsonify({"error": "TTS failed"}), 500
-                            
-                        # Upload audio to Telnyx storage
-                        audio_upload = telnyx_handler.upload_to_storage(file_data=audio_bytes)
-                        if not audio_upload:
-                            logger.error(f"Failed to upload audio to Telnyx storage")
-                            return jsonify({"error": "Audio upload failed"}), 500
-                            
-                            # Play the AI response
-                            success = telnyx_handler.play_audio(
-                                call_control_id=call_control_id,
-                                audio_url=audio_upload['url'],
-                                client_state='ai_response'
-                            )
-                    
-                    # Save updated call session
-                    redis_store.update_call_session(call_session)
-                    break
-                    
-                elif status == "error":
-                    # Transcription failed
-                    logger.error(f"Transcription failed for recording {recording_id}")
-                    return jsonify({"error": "Transcription failed"}), 500
-                    
-                # Wait before checking again
-                time.sleep(2)
+            
+            redis_store.save_pending_transcription(job["job_id"], {
+                "call_control_id": call_control_id,
+                "client_state": client_state,
+                "recording_id": recording_id,
+                "submitted_at": job["submitted_at"],
+                "trace_id": current_trace_id()
+            })
+            _start_transcription_fallback(job["job_id"], transcription_handler,
+                                          delay=transcription_handler.webhook_grace if job["webhook"] else 0)
+            return jsonify({"status": "transcription submitted", "transcription_id": job["job_id"]})
             
         except Exception as e:
             logger.error(f"Error processing recording: {str(e)}")
             return jsonify({"error": str(e)}), 500
+    
+    elif event_type == 'transcription.completed':
+        # A submitted transcription is done; continue the conversation
+        payload = data.get('data', {}).get('payload', {})
+        text = payload.get('text') or ''
+        call_session.add_transcription(text=text, transcription_id=payload.get('transcription_id'))
+        call_session.trace_id = current_trace_id()
+        response = _respond_to_user_turn(
+            text, payload.get('client_state'), call_session, call_control_id, redis_store, tts_service,
+            telnyx_handler, llm_handler, tts_streaming_manager, call_quality_monitor
+        )
+        redis_store.update_call_session(call_session)
+        return response
+    
+    elif event_type == 'transcription.failed':
+        payload = data.get('data', {}).get('payload', {})
+        logger.error(f"Transcription {payload.get('transcription_id')} failed for call "
+                     f"{call_control_id}: {payload.get('error')}")
+        return jsonify({"error": "Transcription failed"}), 500
+    
+    elif event_type == 'streaming.started':
+        # Inbound audio is streaming; recognize it instead of waiting for recordings.
+        # Streams that play TTS audio to the caller carry no caller speech.
+        payload = data.get('data', {}).get('payload', {})
+        if not _is_inbound_stream(payload):
+            return jsonify({"status": "ignored, not an inbound stream"})
+        streaming_stt = current_app.config.get('STREAMING_STT')
+        if streaming_stt:
+            streaming_stt.start_call(call_control_id, payload.get('client_state'))
+        return jsonify({"status": "streaming recognition started"})
+    
+    elif event_type == 'streaming.stopped':
+        if not _is_inbound_stream(data.get('data', {}).get('payload', {})):
+            return jsonify({"status": "ignored, not an inbound stream"})
+        streaming_stt = current_app.config.get('STREAMING_STT')
+        if streaming_stt:
+            streaming_stt.end_call(call_control_id)
+        return jsonify({"status": "streaming recognition stopped"})
             
     elif event_type == 'call.hangup':
         # Call ended, clean up resources
         logger.info(f"Call ended: {call_control_id}")
-        call_session.update_state('ended')
+        # A hangup finishes the call unless it already completed or failed
+        if call_session.state not in ['completed', 'failed']:
+            call_session.update_state('completed')
         redis_store.update_call_session(call_session)
         
+        _track_call_step(call_session, None)
+        
         # Clean up any active streaming sessions
         if tts_streaming_manager:
             tts_streaming_manager.terminate_streaming(call_control_id)
+        streaming_stt = current_app.config.get('STREAMING_STT')
+        if streaming_stt:
+            streaming_stt.end_call(call_control_id)
         
         # End call monitoring
         if call_quality_monitor:
@@ -574,10 +848,12 @@ def telnyx_call_webhook():
         logger.info(f"Streaming event: {streaming_status} for call {call_control_id} with state {client_state}")
         
         if streaming_status == 'completed':
+            if client_state in NEXT_STEP_AFTER_PLAYBACK:
+                _track_call_step(call_session, NEXT_STEP_AFTER_PLAYBACK[client_state])
             # Stream completed successfully
             if client_state == 'greeting':
                 # After greeting stream completes, ask user to repeat the affirmation
-                prompt = "Now, please repeat the affirmation."
+                prompt = REPEAT_PROMPT
                 
                 # Stream the prompt using the streaming manager
                 if tts_streaming_manager:
@@ -591,7 +867,8 @@ def telnyx_call_webhook():
                         # Generate audio stream
                         audio_generator = tts_service.generate_speech_stream(
                             text=prompt, 
-                            voice_id="default_female"
+                            voice_id=CALL_VOICE,
+                            output_format="pstn_l16"
                         )
                         
                         # Track streaming session
@@ -615,7 +892,7 @@ def telnyx_call_webhook():
                         # Fall back to non-streaming approach for the prompt
                 
                 # Fall back to traditional approach if streaming fails
-                audio_bytes = tts_service.generate_speech(text=prompt, voice_id="default_female")
+                audio_bytes = tts_service.generate_speech(text=prompt, voice_id=CALL_VOICE)
                 if not audio_bytes:
                     logger.error(f"Failed to generate speech for prompt")
                     return jsonify({"error": "TTS failed"}), 500
@@ -634,11 +911,8 @@ def telnyx_call_webhook():
                 )
             
             elif client_state == 'repeat_prompt':
-                # After prompting for repetition, start recording
-                success = telnyx_handler.start_recording(
-                    call_control_id=call_control_id,
-                    client_state='recording_affirmation'
-                )
+                # After prompting for repetition, listen for the caller
+                success = _listen_for_caller(telnyx_handler, call_control_id, 'recording_affirmation')
                 if success:
                     call_session.update_state('recording')
                     redis_store.update_call_session(call_session)
@@ -674,4 +948,36 @@ def telnyx_message_webhook():
     # This would process message delivery confirmations, etc.
     # For now, just acknowledge the webhook
     
-    return jsonify({"status": "webhook processed"}) 
\ No newline at end of file
+    return jsonify({"status": "webhook processed"})
+
+@webhooks.route('/assemblyai', methods=['POST'])
+def assemblyai_webhook():
+    """Handle AssemblyAI transcript completion callbacks."""
+    transcription_handler = current_app.config.get('TRANSCRIPTION_HANDLER')
+    if not transcription_handler or not hasattr(transcription_handler, 'verify_webhook'):
+        return jsonify({"error": "AssemblyAI transcription not configured"}), 503
+    
+    if not transcription_handler.verify_webhook(request.headers):
+        logger.warning("Rejected AssemblyAI webhook with invalid secret")
+        return jsonify({"error": "Unauthorized"}), 401
+    
+    data = request.json or {}
+    transcript_id = data.get('transcript_id')
+    status = data.get('status')
+    
+    logger.info(f"Received AssemblyAI webhook: {status} for transcript {transcript_id}")
+    
+    if not transcript_id:
+        return jsonify({"error": "Missing transcript_id"}), 400
+    
+    result = None
+    if status == 'error':
+        result = {"status": "error", "error": "Transcription failed with status: error"}
+    
+    try:
+        resumed = _finish_transcription(transcript_id, 'assemblyai_webhook', result)
+    except Exception as e:
+        logger.error(f"Error resuming call for transcript {transcript_id}: {e}")
+        return jsonify({"error": str(e)}), 500
+    
+    return jsonify({"status": "resumed" if resumed else "ignored"})
@@ -0,0 +1,48 @@
+"""
+Unit tests for the application component factories.
+"""
+
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from app.config import TestConfig
+from app.modules.app_components import register_components
+from app.modules.call_flow import MORNING_CALL_FLOW_ID
+from app.modules.components import ComponentRegistry
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """
+    Create a registry of the application's components on an in-memory Redis.
+    """
+    monkeypatch.chdir(tmp_path)
+    server = fakeredis.FakeServer()
+    with patch('redis.Redis', side_effect=lambda **kwargs: fakeredis.FakeRedis(server=server)):
+        registry = ComponentRegistry()
+        register_components(registry, TestConfig())
+        yield registry
+
+
+def test_every_component_builds(registry):
+    """
+    GIVEN the application's registered components and a test configuration
+    WHEN warm-up builds them and the on-demand ones are requested
+    THEN every component builds, and the app becomes warm
+    """
+    registry.mark_serving()
+    registry.warm_up()
+    assert registry.wait_warm(timeout=10)
+
+    names = list(registry.get_status()["components"])
+    for name in names:
+        registry.get(name)
+
+    components = registry.get_status()["components"]
+    assert {name: component["error"] for name, component in components.items()} == dict.fromkeys(names)
+    assert registry.get("tts_benchmark").tts_service is registry.get("tts_service")
+    assert registry.get("dialog_manager") is registry.get("tts_service").dialog_manager
+    assert registry.get("transcription_handler") is not None
+    assert MORNING_CALL_FLOW_ID in registry.get("predictive_generator").call_flows
@@ -0,0 +1,97 @@
+"""
+Unit tests for the AssemblyAI handler.
+"""
+
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from app.modules.assemblyai_handler import AssemblyAIHandler
+
+
+def test_submission_requests_a_webhook_callback():
+    """
+    GIVEN a handler configured with a webhook URL and secret
+    WHEN a recording is submitted
+    THEN AssemblyAI is asked to call the webhook with the secret header
+    """
+    handler = AssemblyAIHandler("key", webhook_url="https://app/webhooks/assemblyai", webhook_secret="s3cret")
+    response = MagicMock()
+    response.json.return_value = {"id": "tr-1"}
+
+    with patch("app.modules.assemblyai_handler.requests.post", return_value=response) as post:
+        job = handler.submit_transcription("https://recordings/1.wav")
+
+    body = post.call_args.kwargs["json"]
+    assert body["webhook_url"] == "https://app/webhooks/assemblyai"
+    assert body["webhook_auth_header_value"] == "s3cret"
+    assert job["job_id"] == "tr-1" and job["webhook"] is True
+    assert handler.verify_webhook({AssemblyAIHandler.WEBHOOK_AUTH_HEADER: "s3cret"})
+    assert not handler.verify_webhook({})
+
+
+def test_fallback_polling_backs_off_until_completed():
+    """
+    GIVEN a transcript that is still processing for three checks
+    WHEN the handler waits for it
+    THEN the poll interval grows up to its maximum and the text is returned
+    """
+    handler = AssemblyAIHandler("key")
+    statuses = [{"status": "in_progress"}] * 3 + [{"status": "completed", "text": "hello"}]
+    sleeps = []
+
+    with patch.object(handler, "check_transcription_status", side_effect=statuses), \
+            patch("app.modules.assemblyai_handler.time.sleep", side_effect=sleeps.append):
+        result = handler.wait_for_transcription("tr-2", initial_interval=0.25, max_interval=0.5, backoff=2)
+
+    assert result == {"status": "completed", "text": "hello"}
+    assert sleeps == [0.25, 0.5, 0.5]
+
+
+def test_fallback_polling_stops_once_claimed():
+    """
+    GIVEN a transcript already handled by its webhook callback
+    WHEN the fallback starts polling
+    THEN it stops without checking the status
+    """
+    handler = AssemblyAIHandler("key")
+    with patch.object(handler, "check_transcription_status") as check:
+        result = handler.wait_for_transcription("tr-3", should_stop=lambda: True)
+
+    assert result == {"status": "cancelled"}
+    check.assert_not_called()
+
+
+def test_polling_retries_transport_errors_and_stops_on_job_errors():
+    """
+    GIVEN status checks that fail to reach AssemblyAI twice before the job fails
+    WHEN the handler waits for the transcript
+    THEN failed checks are retried on the backoff schedule and the job's error is returned
+    """
+    handler = AssemblyAIHandler("key")
+    failed_job = MagicMock()
+    failed_job.json.return_value = {"status": "error", "error": "Audio too short"}
+    responses = [requests.ConnectionError("reset"), requests.Timeout("slow"), failed_job]
+    sleeps = []
+
+    with patch("app.modules.assemblyai_handler.requests.get", side_effect=responses), \
+            patch("app.modules.assemblyai_handler.time.sleep", side_effect=sleeps.append):
+        result = handler.wait_for_transcription("tr-4", initial_interval=0.25, max_interval=0.5, backoff=2)
+
+    assert result["status"] == "error"
+    assert sleeps == [0.25, 0.5]
+
+
+def test_polling_times_out_when_assemblyai_stays_unreachable():
+    """
+    GIVEN status checks that never reach AssemblyAI
+    WHEN the handler waits until its timeout
+    THEN it reports a timeout with the last transport error
+    """
+    handler = AssemblyAIHandler("key")
+    with patch("app.modules.assemblyai_handler.requests.get", side_effect=requests.ConnectionError("refused")), \
+            patch("app.modules.assemblyai_handler.time.sleep"):
+        result = handler.wait_for_transcription("tr-5", timeout=0.0)
+
+    assert result["status"] == "timeout"
+    assert "refused" in result["error"]
@@ -0,0 +1,153 @@
+"""
+Unit tests for per-request voice resolution in TTS providers.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.tts.base_provider import BaseTTSProvider, SentenceStreamingProvider, VoiceSpec
+
+
+class DummyProvider(BaseTTSProvider):
+    """
+    Minimal provider that counts voice metadata loads.
+    """
+
+    def __init__(self):
+        self.current_voice = "default"
+        self._voices = None
+        self.loads = 0
+
+    def generate_speech(self, text, voice_id=None, speed=1.0):
+        return self.resolve_voice(voice_id, speed).voice_id.encode()
+
+    def get_voices(self):
+        self.loads += 1
+        self._voices = {"alpha": {}, "beta": {}}
+        return {"voices": self._voices}
+
+    def set_voice(self, voice_id):
+        self.current_voice = voice_id
+        return True
+
+    def voice_exists(self, voice_id):
+        return voice_id in self.cached_voices()
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class EchoStreamingProvider(SentenceStreamingProvider, DummyProvider):
+    """
+    Streaming provider whose audio is the text of each sentence.
+    """
+
+    def __init__(self):
+        DummyProvider.__init__(self)
+        self._init_stream_sessions()
+
+    def generate_speech_stream(self, text, voice_id=None, speed=1.0):
+        yield text.encode()
+
+
+def test_voice_spec_is_immutable():
+    """
+    GIVEN a resolved voice spec with provider settings
+    WHEN a caller tries to change it
+    THEN neither its fields nor its settings can be modified
+    """
+    settings = {"stability": 0.5}
+    spec = VoiceSpec(voice_id="alpha", speed=1.2, settings=settings)
+    settings["stability"] = 0.9
+
+    with pytest.raises(AttributeError):
+        spec.voice_id = "beta"
+    with pytest.raises(TypeError):
+        spec.settings["stability"] = 0.1
+    assert spec.settings["stability"] == 0.5
+
+
+def test_concurrent_requests_do_not_share_voice_state():
+    """
+    GIVEN one provider instance serving requests for different voices in parallel
+    WHEN each request resolves its own voice
+    THEN every request gets its own voice and the default voice is unchanged
+    """
+    provider = DummyProvider()
+    results = {}
+
+    def request(voice_id):
+        for _ in range(200):
+            assert provider.generate_speech("hi", voice_id) == voice_id.encode()
+        results[voice_id] = True
+
+    threads = [threading.Thread(target=request, args=(voice,)) for voice in ("alpha", "beta")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"alpha": True, "beta": True}
+    assert provider.resolve_voice().voice_id == "default"
+
+
+def test_voice_metadata_is_loaded_once():
+    """
+    GIVEN a provider without cached voice metadata
+    WHEN several threads need the metadata at the same time
+    THEN it is fetched only once
+    """
+    provider = DummyProvider()
+
+    threads = [threading.Thread(target=provider.cached_voices) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.loads == 1
+    assert provider.voice_exists("beta")
+
+
+def test_ended_session_keeps_unterminated_tail_until_read():
+    """
+    GIVEN a streaming session whose text ends without terminal punctuation
+    WHEN the session is ended
+    THEN the tail is synthesized and can still be read, after which the session is gone
+    """
+    provider = EchoStreamingProvider()
+    provider.begin_streaming_session("s1")
+    provider.add_text_to_stream("s1", "Good morning. How are you feeling")
+
+    head = provider.read_session_audio("s1")
+    assert provider.end_streaming_session("s1")
+    tail = provider.read_session_audio("s1")
+
+    assert b"Good morning." in head
+    assert b"How are you feeling" in tail
+    assert provider.read_session_audio("s1") == b""
+    assert not provider.end_streaming_session("s1")
+
+
+def test_sessions_never_read_are_evicted_when_idle():
+    """
+    GIVEN an ended session nobody reads and a session still in use
+    WHEN a new session begins after the idle timeout
+    THEN only the abandoned session is evicted
+    """
+    provider = EchoStreamingProvider()
+    provider.stream_session_idle_timeout = 60
+    with patch("app.modules.tts.base_provider.time.time", return_value=1000.0):
+        provider.begin_streaming_session("abandoned")
+        provider.add_text_to_stream("abandoned", "Goodbye.")
+        provider.end_streaming_session("abandoned")
+        provider.begin_streaming_session("active")
+    with patch("app.modules.tts.base_provider.time.time", return_value=1050.0):
+        provider.read_session_audio("active")
+    with patch("app.modules.tts.base_provider.time.time", return_value=1100.0):
+        provider.begin_streaming_session("new")
+
+    assert set(provider._stream_sessions) == {"active", "new"}
+    assert provider.read_session_audio("abandoned") == b""
@@ -0,0 +1,172 @@
+"""
+Unit tests for incremental call session storage.
+"""
+
+import json
+from unittest.mock import patch, MagicMock
+
+import fakeredis
+import pytest
+
+from app.modules.redis_store import RedisStore
+
+
+@pytest.fixture
+def store():
+    """
+    Create a store on a mock Redis connection.
+    """
+    with patch('redis.Redis') as mock_redis:
+        mock_redis.return_value = MagicMock()
+        yield RedisStore()
+
+
+@pytest.fixture
+def lua_store():
+    """
+    Create a store on an in-memory Redis that runs its Lua scripts.
+    """
+    server = fakeredis.FakeServer()
+    with patch('redis.Redis', side_effect=lambda **kwargs: fakeredis.FakeRedis(server=server,
+                                                                               decode_responses=True)):
+        yield RedisStore(finished_call_ttl=3600)
+
+
+def test_update_writes_only_changed_fields_and_new_entries(store):
+    """
+    GIVEN a call session loaded with a long conversation
+    WHEN its state changes and one exchange is added
+    THEN only the state is written and only the two new entries are appended
+    """
+    store.redis.pipeline.return_value.execute.return_value = [
+        {"id": "call-1", "user_id": "user-1", "call_control_id": "cc-1", "state": "chatting",
+         "affirmation": "", "started_at": "2026-01-01T08:00:00", "completed_at": "", "trace_id": ""},
+        [],
+        [],
+        [json.dumps({"role": "user", "content": "hello"})],
+        41,
+    ]
+    call_session = store.get_call_session("call-1", history_limit=1)
+    store._update_call.return_value = 1
+
+    call_session.update_state("completed")
+    call_session.add_conversation_entry("user", "bye")
+    call_session.add_conversation_entry("assistant", "have a good day")
+
+    assert call_session.history_offset == 40
+    assert store.update_call_session(call_session)
+    keys = store._update_call.call_args.kwargs["keys"]
+    args = store._update_call.call_args.kwargs["args"]
+    assert keys[:4] == ["call:call-1", "active_calls:user:user-1", "active_calls", "call_control:cc-1"]
+    assert keys[6] == "call:call-1:conversation_history"
+    assert args[:5] == [store.finished_call_ttl, 2, "state", "completed", "completed_at"]
+    assert args[6:8] == [0, 0]
+    assert args[8] == 2 and json.loads(args[9])["content"] == "bye"
+
+    store._update_call.reset_mock()
+    assert store.update_call_session(call_session)
+    store._update_call.assert_not_called()
+
+
+def test_update_of_missing_session_fails(store):
+    """
+    GIVEN a call session that is not in Redis
+    WHEN it is updated
+    THEN the update fails and the changes stay unsaved
+    """
+    store._update_call.return_value = 0
+    call_session = store.create_call_session("user-1", "cc-1")
+    call_session.add_conversation_entry("user", "hello")
+
+    assert not store.update_call_session(call_session)
+    assert call_session.changes()[1]["conversation_history"][0]["content"] == "hello"
+
+
+def test_control_id_lookup_reads_session_in_one_call(store):
+    """
+    GIVEN a call control ID indexed to a call
+    WHEN the call is looked up by it
+    THEN the session comes from one script call, bounded to the requested history
+    """
+    store._load_by_control_id.return_value = [
+        "call-1",
+        ["id", "call-1", "user_id", "user-1", "state", "greeting", "affirmation", "I am calm"],
+        [json.dumps({"url": "https://example.com/a.wav", "id": "rec-1"})],
+        [],
+        [],
+        0,
+    ]
+
+    call_session = store.get_call_by_control_id("cc-1", history_limit=20)
+
+    store._load_by_control_id.assert_called_once_with(keys=["call_control:cc-1"], args=["call:", 20])
+    assert call_session.affirmation == "I am calm"
+    assert call_session.recordings[0]["id"] == "rec-1"
+    assert call_session.changes() == ({}, {})
+
+
+def test_active_calls_are_read_from_the_user_index_in_one_round_trip(store):
+    """
+    GIVEN a user index holding an active call and a call that has expired
+    WHEN the user's active calls are requested
+    THEN both are read in one pipeline without scanning, and the stale entry is dropped
+    """
+    store.redis.smembers.return_value = {"call-1", "call-2"}
+    store.redis.pipeline.return_value.execute.return_value = [
+        {"id": "call-1", "user_id": "user-1", "call_control_id": "cc-1", "state": "chatting"},
+        [], [], [], 0,
+        {}, [], [], [], 0,
+    ]
+
+    active_calls = store.get_active_calls_for_user("user-1")
+
+    assert [call_session.id for call_session in active_calls] == ["call-1"]
+    store.redis.scan.assert_not_called()
+    store.redis.pipeline.return_value.execute.assert_called_once()
+    store.redis.srem.assert_called_once_with("active_calls:user:user-1", "call-2")
+
+
+def test_finished_call_leaves_the_active_indexes_and_expires(lua_store):
+    """
+    GIVEN two active calls of a user, stored and updated through the Lua scripts
+    WHEN one of them completes
+    THEN it leaves both active call indexes, all its keys expire, and the other call stays active
+    """
+    finished = lua_store.create_call_session("user-1", "cc-1")
+    ongoing = lua_store.create_call_session("user-1", "cc-2")
+    finished.add_conversation_entry("user", "hello")
+    ongoing.update_state("in_progress")
+    assert lua_store.update_call_session(finished)
+    assert lua_store.update_call_session(ongoing)
+
+    finished.update_state("completed")
+    assert lua_store.update_call_session(finished)
+
+    assert [call.id for call in lua_store.get_active_calls()] == [ongoing.id]
+    assert [call.id for call in lua_store.get_active_calls_for_user("user-1")] == [ongoing.id]
+    assert lua_store.redis.smembers("active_calls:user:user-1") == {ongoing.id}
+    for key in ["call:" + finished.id, "call:" + finished.id + ":conversation_history", "call_control:cc-1"]:
+        assert 0 < lua_store.redis.ttl(key) <= 3600
+    assert lua_store.redis.ttl("call:" + ongoing.id) == -1
+
+
+def test_control_id_lookup_script_reads_bounded_history(lua_store):
+    """
+    GIVEN a stored call with three conversation entries
+    WHEN it is looked up by call control ID through the Lua script, bounded to two entries
+    THEN the latest two entries load with their offset, and updates append after them
+    """
+    call_session = lua_store.create_call_session("user-1", "cc-1", affirmation="I am calm")
+    for content in ["one", "two", "three"]:
+        call_session.add_conversation_entry("user", content)
+    assert lua_store.update_call_session(call_session)
+
+    loaded = lua_store.get_call_by_control_id("cc-1", history_limit=2)
+    loaded.add_conversation_entry("assistant", "four")
+    assert lua_store.update_call_session(loaded)
+
+    assert loaded.affirmation == "I am calm"
+    assert loaded.history_offset == 1
+    assert [entry["content"] for entry in lua_store.get_conversation_history(call_session.id)] == \
+        ["one", "two", "three", "four"]
+    assert lua_store.get_call_by_control_id("cc-unknown") is None
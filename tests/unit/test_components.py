@@ -0,0 +1,98 @@
+"""
+Unit tests for lazy application components.
+"""
+
+import threading
+import time
+
+from app.modules.components import ComponentRegistry
+
+
+def test_component_is_built_once_on_first_use():
+    """
+    GIVEN a component that depends on another and is used from several threads
+    WHEN it is first used
+    THEN each component is built exactly once and nothing is built before use
+    """
+    builds = []
+    registry = ComponentRegistry()
+
+    def build_store(components):
+        builds.append("store")
+        time.sleep(0.05)
+        return {"connected": True}
+
+    def build_service(components):
+        builds.append("service")
+        return {"store": components.get("store")}
+
+    registry.register("store", build_store)
+    registry.register("service", build_service)
+    service = registry.lazy("service")
+    assert builds == []
+
+    threads = [threading.Thread(target=lambda: service.get("store")) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(builds) == ["service", "store"]
+    assert service.get("store") == {"connected": True}
+    assert registry.get_status()["components"]["store"]["trigger"] == "on_demand"
+
+
+def test_failed_component_is_falsy_and_retried():
+    """
+    GIVEN a component whose first build fails
+    WHEN it is checked and used again
+    THEN it reads as unavailable with the error recorded, and the next use builds it
+    """
+    attempts = []
+    registry = ComponentRegistry()
+
+    def build_flaky(components):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("redis not reachable")
+        return "client"
+
+    registry.register("flaky", build_flaky)
+    flaky = registry.lazy("flaky")
+
+    assert not flaky
+    assert registry.get_status()["components"]["flaky"]["error"] == "redis not reachable"
+    assert flaky.upper() == "CLIENT"
+    assert registry.get_status()["components"]["flaky"]["state"] == "ready"
+
+
+def test_warm_up_builds_components_in_parallel_and_reports_readiness():
+    """
+    GIVEN two independent components whose builds each wait for the other, and one built on demand
+    WHEN the app starts serving and warms up
+    THEN it is serving at once, and the two builds overlap before it is warm
+    """
+    registry = ComponentRegistry()
+    both_building = threading.Barrier(3, timeout=2)
+
+    def build(components):
+        # Only returns once the other build has started and the test has checked in
+        both_building.wait()
+        return "client"
+
+    for name in ("redis", "llm"):
+        registry.register(name, build)
+    registry.register("benchmark", lambda components: "benchmark", warm=False)
+
+    registry.mark_serving()
+    registry.warm_up()
+    assert registry.get_status()["status"] == "serving"
+    both_building.wait()
+
+    assert registry.wait_warm(timeout=2)
+    status = registry.get_status()
+    assert status["status"] == "warm"
+    assert status["components"]["redis"]["state"] == "ready"
+    assert status["components"]["llm"]["state"] == "ready"
+    assert status["components"]["redis"]["trigger"] == "warm_up"
+    assert status["components"]["benchmark"]["state"] == "pending"
@@ -0,0 +1,123 @@
+"""
+Unit tests for the TTS fallback manager health checks.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.modules.tts.fallback_manager import TTSFallbackManager
+
+
+class FakeProvider:
+    """Provider stub whose health probe takes a configurable time."""
+
+    def __init__(self, delay=0.0, healthy=True):
+        self.delay = delay
+        self.healthy = healthy
+        self.probes = 0
+
+    def health_check(self):
+        self.probes += 1
+        time.sleep(self.delay)
+        return {"status": "ok" if self.healthy else "error"}
+
+
+@pytest.fixture
+def providers():
+    """
+    Create one fast and one slow fake provider.
+    """
+    return {"fast": FakeProvider(), "slow": FakeProvider(delay=2.0)}
+
+
+@pytest.fixture
+def manager(providers):
+    """
+    Create a fallback manager backed by the fake providers.
+    """
+    return TTSFallbackManager(
+        primary_provider="fast",
+        fallback_providers=["slow"],
+        provider_factory=lambda name, redis_client, config: providers[name],
+        health_check_interval=60,
+        auto_recovery=False,
+        probe_timeout=0.2
+    )
+
+
+def test_slow_probe_times_out_without_blocking_requests(manager, providers):
+    """
+    GIVEN a fallback manager with a provider whose health probe hangs
+    WHEN a health check round runs in the background
+    THEN get_provider returns immediately and the slow provider is marked unhealthy
+    """
+    for status in manager.providers.values():
+        status.last_check_time = 0
+
+    worker = threading.Thread(target=manager.run_health_checks)
+    worker.start()
+    time.sleep(0.05)
+
+    start = time.time()
+    assert manager.get_provider() is providers["fast"]
+    assert time.time() - start < 0.05
+
+    worker.join()
+    stats = manager.get_stats()
+    assert stats["providers"]["fast"]["is_healthy"] is True
+    assert stats["providers"]["slow"]["is_healthy"] is False
+    assert stats["stats"]["probe_timeouts"] == 1
+
+
+def test_recent_traffic_replaces_synthetic_probe(manager, providers):
+    """
+    GIVEN a provider that has served several recent requests successfully
+    WHEN its health is checked
+    THEN the passive signal is used and no synthetic probe is sent
+    """
+    manager.providers["fast"].last_check_time = 0
+    for _ in range(3):
+        manager.record_success("fast")
+
+    assert manager.check_provider_health("fast") is True
+    assert providers["fast"].probes == 0
+    assert manager.stats["passive_checks"] == 1
+
+
+def test_candidates_list_healthy_providers_first(manager, providers):
+    """
+    GIVEN a primary that became unhealthy while the current provider is the fallback
+    WHEN the candidates for a request are listed
+    THEN healthy providers come first in current, fallback, primary order, without duplicates
+    """
+    manager.current_provider_name = "slow"
+    assert manager.get_candidate_providers() == ["slow", "fast"]
+
+    manager.providers["slow"].is_healthy = False
+    assert manager.get_candidate_providers() == ["fast", "slow"]
+    assert manager.current_provider_name == "slow"
+
+
+def test_forcing_unknown_and_unhealthy_providers(manager, providers):
+    """
+    GIVEN providers the manager does not manage yet, one of which cannot be created
+    WHEN they are forced, and then an unhealthy managed provider is forced
+    THEN a creatable one is added and made current, the other is refused,
+        and the unhealthy one becomes current but is still tried last
+    """
+    providers["extra"] = FakeProvider()
+
+    assert manager.force_provider("extra") is True
+    assert manager.get_provider_by_name("extra") is providers["extra"]
+    assert manager.current_provider_name == "extra"
+
+    assert manager.force_provider("missing") is False
+    assert "missing" not in manager.providers
+    assert manager.current_provider_name == "extra"
+
+    manager.providers["slow"].is_healthy = False
+    assert manager.force_provider("slow") is True
+    assert manager.current_provider_name == "slow"
+    assert manager.get_candidate_providers()[-1] == "slow"
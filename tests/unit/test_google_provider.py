@@ -0,0 +1,64 @@
+"""
+Unit tests for concurrent Google Cloud TTS streaming.
+"""
+
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from app.modules.tts.providers.google_provider import EnhancedGoogleProvider
+
+
+@pytest.fixture
+def provider():
+    """
+    Create a provider whose client returns each segment's text as its audio.
+    """
+    provider = EnhancedGoogleProvider({"stream_concurrency": 3, "max_request_configs": 4})
+    provider.texttospeech = MagicMock()
+    provider.texttospeech.SynthesisInput.side_effect = lambda text: text
+    provider.tts_available = True
+    provider.client = MagicMock()
+    return provider
+
+
+def test_segments_finishing_out_of_order_are_yielded_in_order(provider):
+    """
+    GIVEN three segments synthesized concurrently, the first one slowest
+    WHEN the text is streamed
+    THEN later segments finish first but the audio follows the text
+    """
+    delays = {"one ": 0.2, "two ": 0.1, "three": 0.0}
+    finished = []
+    lock = threading.Lock()
+
+    def synthesize_speech(input, voice, audio_config):
+        time.sleep(delays[input])
+        with lock:
+            finished.append(input)
+        return MagicMock(audio_content=input.encode())
+
+    provider.client.synthesize_speech.side_effect = synthesize_speech
+    with patch.object(provider, "_split_stream_segments", return_value=list(delays)):
+        audio = b"".join(provider.generate_speech_stream("one two three"))
+
+    assert finished == ["three", "two ", "one "]
+    assert audio == b"one two three"
+
+
+def test_request_configs_are_bounded_and_shared_by_close_speeds(provider):
+    """
+    GIVEN requests at many free-form speeds
+    WHEN their request configs are built
+    THEN speeds equal to two decimals share one, and only the most recent few are kept
+    """
+    first = provider._get_request_config(provider.resolve_voice(speed=1.1))
+    assert provider._get_request_config(provider.resolve_voice(speed=1.1000001)) is first
+
+    for step in range(10):
+        provider._get_request_config(provider.resolve_voice(speed=0.5 + step / 10))
+
+    assert len(provider._request_configs) == 4
+    assert [key[2] for key in provider._request_configs] == [1.1, 1.2, 1.3, 1.4]
@@ -0,0 +1,91 @@
+"""
+Unit tests for PCM streaming over HTTP.
+"""
+
+import io
+import wave
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.modules.tts.http_streaming import HTTPStreamingProvider
+
+
+class FakeHTTPProvider(HTTPStreamingProvider):
+    """
+    HTTP provider whose responses are given body chunks.
+    """
+
+    def __init__(self, body_chunks):
+        self._init_http()
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = body_chunks
+        self._http_session = MagicMock()
+        self._http_session.request.return_value = response
+
+    def generate_speech_stream(self, text, voice_id=None, speed=1.0, output_format=None):
+        return self._stream_pcm("POST", "https://tts.example/stream", json={"text": text})
+
+    def generate_speech(self, text, voice_id=None, speed=1.0):
+        return b"".join(self.generate_speech_stream(text))
+
+    def get_voices(self):
+        return {"voices": {}}
+
+    def set_voice(self, voice_id):
+        return True
+
+    def voice_exists(self, voice_id):
+        return True
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+def _wav(pcm):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _split(data, *sizes):
+    chunks = []
+    for size in sizes:
+        chunks.append(data[:size])
+        data = data[size:]
+    return chunks + [data]
+
+
+@pytest.mark.parametrize("sizes", [(2, 3, 30), (45, 1), (1,) * 60])
+def test_wav_header_is_skipped_however_it_arrives(sizes):
+    """
+    GIVEN a WAV response whose header arrives split across chunks
+    WHEN it is streamed
+    THEN only the PCM samples are yielded
+    """
+    pcm = bytes(range(40))
+    provider = FakeHTTPProvider(_split(_wav(pcm), *sizes))
+
+    chunks = list(provider.generate_speech_stream("hello"))
+
+    assert b"".join(chunks) == pcm
+
+
+def test_chunks_stay_sample_aligned_across_odd_reads():
+    """
+    GIVEN headerless PCM arriving in odd-sized reads, ending in half a sample
+    WHEN it is streamed
+    THEN every chunk holds whole samples and the partial last sample is dropped
+    """
+    pcm = bytes(range(21))
+    provider = FakeHTTPProvider(_split(pcm, 3, 5, 1, 7))
+
+    chunks = list(provider.generate_speech_stream("hello"))
+
+    assert all(len(chunk) % 2 == 0 for chunk in chunks)
+    assert b"".join(chunks) == pcm[:20]
@@ -0,0 +1,121 @@
+"""
+Unit tests for Kokoro synthesis from the engine queue.
+"""
+
+import queue
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+pyaudio = pytest.importorskip("pyaudio")
+
+from app.modules.tts.providers import kokoro_provider
+
+
+class StubEngine:
+    """
+    Engine that queues float32 chunks the way RealtimeTTS engines do.
+
+    Each text is synthesized as the chunks listed for it, and synthesis waits
+    for ``release`` or a stop after the first chunk.
+    """
+
+    chunks = {}
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.stop_synthesis_event = threading.Event()
+        self.release = threading.Event()
+        self.active = 0
+        self.max_active = 0
+        self.stopped = False
+        self.lock = threading.Lock()
+
+    def get_stream_info(self):
+        return pyaudio.paFloat32, 1, 24000
+
+    def synthesize(self, text):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            for index, samples in enumerate(self.chunks[text]):
+                self.queue.put(np.array(samples, dtype=np.float32).tobytes())
+                while index == 0 and not self.release.wait(0.01):
+                    if self.stop_synthesis_event.is_set():
+                        self.stopped = True
+                        return False
+            return True
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def provider():
+    with patch.object(kokoro_provider, "KokoroEngine", StubEngine, create=True):
+        yield kokoro_provider.KokoroProvider()
+
+
+def _samples(pcm):
+    return np.frombuffer(pcm, dtype=np.int16).tolist()
+
+
+def test_chunks_stream_while_synthesis_runs(provider):
+    """
+    GIVEN an engine producing float32 audio, including samples out of range
+    WHEN a text is streamed
+    THEN the first chunk arrives before synthesis ends, and chunks are clipped 16-bit PCM
+    """
+    StubEngine.chunks = {"Hello": [[-2.0, -1.0, 0.0], [0.5, 1.0, 3.0]]}
+    stream = provider.generate_speech_stream("Hello")
+
+    first = next(stream)
+    assert provider.engine.active == 1
+    provider.engine.release.set()
+    rest = list(stream)
+
+    assert _samples(first) == [-32767, -32767, 0]
+    assert [_samples(chunk) for chunk in rest] == [[16383, 32767, 32767]]
+
+
+def test_requests_on_one_engine_are_serialized(provider):
+    """
+    GIVEN two texts streamed from one provider on separate threads
+    WHEN both are synthesized
+    THEN the engine runs one synthesis at a time and each stream gets only its own audio
+    """
+    StubEngine.chunks = {"one": [[0.25], [0.25]], "two": [[-0.25], [-0.25]]}
+    provider.engine.release.set()
+    results = {}
+
+    def stream(text):
+        results[text] = [_samples(chunk) for chunk in provider.generate_speech_stream(text)]
+
+    threads = [threading.Thread(target=stream, args=(text,)) for text in ("one", "two")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert provider.engine.max_active == 1
+    assert results == {"one": [[8191], [8191]], "two": [[-8191], [-8191]]}
+
+
+def test_abandoned_stream_stops_the_engine_and_leaves_no_audio(provider):
+    """
+    GIVEN a stream abandoned after its first chunk
+    WHEN the next text is streamed
+    THEN the engine was interrupted, and the next stream gets none of the old audio
+    """
+    StubEngine.chunks = {"long": [[0.5]] * 10, "next": [[-0.5]]}
+    stream = provider.generate_speech_stream("long")
+    next(stream)
+    stream.close()
+
+    assert provider.engine.stopped
+    assert not provider._engine_lock.locked()
+    provider.engine.release.set()
+    assert [_samples(chunk) for chunk in provider.generate_speech_stream("next")] == [[-16383]]
@@ -0,0 +1,47 @@
+"""
+Unit tests for LLM response streaming.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.llm_handler import LLMHandler
+
+
+@pytest.fixture
+def handler():
+    return LLMHandler("openai", api_key="test-key", model="gpt-4o-mini")
+
+
+def test_stream_yields_deltas_as_they_arrive(handler):
+    """
+    GIVEN a backend streaming a response in deltas, some of them empty
+    WHEN the response is streamed
+    THEN the non-empty deltas are yielded in order and the blocking path is not used
+    """
+    metrics = {}
+    with patch.object(handler, "_stream_openai_response", return_value=iter(["Good ", "", "morning", "."])), \
+            patch.object(handler, "get_response") as get_response:
+        deltas = list(handler.stream_response("hello", metrics=metrics))
+
+    assert deltas == ["Good ", "morning", "."]
+    assert metrics["deltas"] == 3 and metrics["streamed"]
+    get_response.assert_not_called()
+
+
+def test_stream_error_falls_back_to_blocking_response(handler):
+    """
+    GIVEN a backend whose stream fails before producing any text
+    WHEN the response is streamed
+    THEN the blocking response is yielded as a single delta
+    """
+    history = [{"role": "user", "content": "hi"}]
+    metrics = {}
+    with patch.object(handler, "_stream_openai_response", side_effect=ConnectionError("stream reset")), \
+            patch.object(handler, "get_response", return_value="Good morning.") as get_response:
+        deltas = list(handler.stream_response("hello", history, metrics=metrics))
+
+    assert deltas == ["Good morning."]
+    assert metrics["deltas"] == 1 and not metrics["streamed"]
+    get_response.assert_called_once_with("hello", history)
@@ -0,0 +1,39 @@
+"""
+Unit tests for the OpenAI transcription handler.
+"""
+
+import io
+from unittest.mock import MagicMock
+
+from app.modules.openai_transcription_handler import OpenAITranscriptionHandler, _DownloadStream
+
+
+def test_download_stream_reads_across_chunk_boundaries():
+    """
+    GIVEN a download arriving in uneven chunks
+    WHEN it is read in fixed-size blocks
+    THEN the blocks cover the download exactly and the end reads empty
+    """
+    stream = _DownloadStream(iter([b"ab", b"cde", b"f"]))
+
+    assert stream.read(4) == b"abcd"
+    assert stream.read(4) == b"ef"
+    assert stream.read(4) == b""
+    assert not hasattr(stream, "fileno")
+
+
+def test_audio_bytes_are_uploaded_from_a_named_buffer():
+    """
+    GIVEN recorded audio bytes
+    WHEN they are transcribed
+    THEN the upload is an in-memory buffer named like a WAV file
+    """
+    handler = OpenAITranscriptionHandler(api_key="key")
+    handler.client = MagicMock()
+    handler.client.audio.transcriptions.create.return_value.text = "hello"
+
+    assert handler.transcribe_audio_data(b"RIFF....") == "hello"
+
+    name, audio, content_type = handler.client.audio.transcriptions.create.call_args.kwargs["file"]
+    assert name == "recording.wav" and content_type == "audio/wav"
+    assert isinstance(audio, io.BytesIO) and audio.getvalue() == b"RIFF...."
@@ -0,0 +1,76 @@
+"""
+Unit tests for TTS output format negotiation and transcoding.
+"""
+
+import numpy as np
+
+from app.modules.tts.output_format import (
+    MULAW, PCM_S16LE, OutputFormat, StreamTranscoder, describe_audio, mulaw_decode,
+    mulaw_encode, negotiate_output_format, resolve_output_format, transcode, wrap_wav
+)
+
+
+def _tone(sample_rate, seconds=0.1):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (np.sin(2 * np.pi * 440 * t) * 12000).astype("<i2")
+
+
+def test_negotiation_prefers_native_target_then_cheapest_same_rate():
+    """
+    GIVEN providers with different native formats
+    WHEN a PSTN μ-law format is negotiated
+    THEN an exact match wins, then 8 kHz PCM, then the lowest higher rate
+    """
+    pstn = resolve_output_format("pstn")
+    exact = [OutputFormat(PCM_S16LE, 24000), OutputFormat(MULAW, 8000)]
+    same_rate = [OutputFormat(PCM_S16LE, 24000), OutputFormat(PCM_S16LE, 8000)]
+    higher = [OutputFormat(PCM_S16LE, 48000), OutputFormat(PCM_S16LE, 16000)]
+
+    assert negotiate_output_format(exact, pstn) == OutputFormat(MULAW, 8000)
+    assert negotiate_output_format(same_rate, pstn) == OutputFormat(PCM_S16LE, 8000)
+    assert negotiate_output_format(higher, pstn) == OutputFormat(PCM_S16LE, 16000)
+
+
+def test_mulaw_round_trip_stays_close():
+    """
+    GIVEN 16-bit PCM samples
+    WHEN they are μ-law encoded and decoded
+    THEN the error stays within the companding step size
+    """
+    samples = _tone(8000)
+    decoded = mulaw_decode(mulaw_encode(samples))
+
+    assert len(decoded) == len(samples)
+    error = np.abs(decoded.astype(np.int32) - samples.astype(np.int32))
+    assert np.all(error <= np.abs(samples.astype(np.int32)) // 16 + 16)
+
+
+def test_chunked_transcoding_matches_whole_buffer():
+    """
+    GIVEN a 24 kHz PCM stream split at arbitrary byte boundaries
+    WHEN it is transcoded to PSTN μ-law chunk by chunk
+    THEN the output equals transcoding the whole buffer at once
+    """
+    source = OutputFormat(PCM_S16LE, 24000)
+    target = resolve_output_format("pstn")
+    audio = wrap_wav(_tone(24000).tobytes(), source)
+
+    transcoder = StreamTranscoder(source, target)
+    chunked = b"".join(transcoder.feed(audio[i:i + 333]) for i in range(0, len(audio), 333))
+    chunked += transcoder.flush()
+
+    assert chunked == transcode(audio, source, target)
+    assert len(chunked) == 800
+
+
+def test_describe_audio_reads_wav_header():
+    """
+    GIVEN one second of 8 kHz μ-law audio in a WAV container
+    WHEN it is described
+    THEN its size, format and duration come from the header
+    """
+    pstn = resolve_output_format("pstn", "wav")
+    audio = wrap_wav(b"\xff" * 8000, pstn)
+
+    assert describe_audio(audio) == {"size": 8044, "format": pstn.key, "duration": 1.0}
+    assert describe_audio(b"ID3\x04")["format"] == "mp3"
@@ -0,0 +1,162 @@
+"""
+Unit tests for predictive TTS generation.
+"""
+
+import fakeredis
+
+from app.modules.tts.predictive import CallFlowStep, PredictiveGenerator, TransitionModel
+from app.modules.tts.scheduler import TTSScheduler
+
+
+class DictCache:
+    """
+    Minimal stand-in for TTSCacheManager.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+FLOW = {
+    "name": "Survey",
+    "entry_point": "start",
+    "steps": {
+        "start": {"phrases": ["Hello"], "transitions": {"yes": "likely", "no": "rare"}},
+        "likely": {"phrases": ["Great, let us continue"], "transitions": {"default": "end"}},
+        "rare": {"phrases": ["Sorry to hear that"], "transitions": {"default": "end"}},
+        "end": {"phrases": ["Goodbye"], "transitions": {}},
+    },
+}
+
+
+def test_transition_probabilities_converge_on_observed_paths():
+    """
+    GIVEN a step with two declared transitions
+    WHEN completed calls took one of them nine times out of ten
+    THEN its estimated probability follows the counts, smoothed by the prior
+    """
+    model = TransitionModel(prior_weight=1.0)
+    step = CallFlowStep(id="start", transitions={"yes": "likely", "no": "rare"})
+    assert model.probabilities("survey", step) == {"likely": 0.5, "rare": 0.5}
+
+    for path in [["start", "likely"]] * 9 + [["start", "rare"]]:
+        model.record_path("survey", path)
+
+    probabilities = model.probabilities("survey", step)
+    assert probabilities["likely"] == 10 / 12
+    assert probabilities["rare"] == 2 / 12
+
+
+def test_predictions_are_ranked_within_budget_and_scored():
+    """
+    GIVEN a flow whose calls almost always take the same branch
+    WHEN a new call starts with a budget for one phrase ahead
+    THEN only the likely branch is predicted, and reaching it counts as used
+    """
+    generator = PredictiveGenerator(DictCache(), lambda *args, **kwargs: b"audio",
+                                    scheduler=TTSScheduler(), enabled=False,
+                                    synthesis_budget=0.6, seconds_per_char=0.02)
+    try:
+        flow_id = generator.register_call_flow(FLOW)
+        for index in range(8):
+            generator.start_call(f"past-{index}", flow_id)
+            generator.update_call_step(f"past-{index}", "likely")
+            generator.end_call(f"past-{index}")
+
+        generator.enable()
+        generator.start_call("live", flow_id)
+        assert set(generator.call_states["live"].predictions) == {("likely", "Great, let us continue")}
+
+        generator.update_call_step("live", "likely")
+        stats = generator.get_stats()
+        assert stats["predictions_used"] == stats["phrases_predicted"]
+        assert 0 < stats["precision"] <= 1 and 0 < stats["recall"] <= 1
+    finally:
+        generator.shutdown()
+
+
+def test_stale_and_duplicate_predictions_are_not_synthesized():
+    """
+    GIVEN two calls on the same flow whose predictions are still queued
+    WHEN one call moves to another step and the other ends
+    THEN shared phrases are queued once and only the moved call's new branch is synthesized
+    """
+    generated = []
+    generator = PredictiveGenerator(DictCache(), lambda phrase, *args, **kwargs: generated.append(phrase),
+                                    scheduler=TTSScheduler(), synthesis_budget=10.0)
+    try:
+        generator._stop_event.set()
+        generator._worker_thread.join()
+
+        flow_id = generator.register_call_flow(FLOW)
+        generator.start_call("first", flow_id)
+        queued = generator.task_queue.qsize()
+        generator.start_call("second", flow_id)
+        assert generator.task_queue.qsize() == queued
+        assert generator.get_stats()["deduplicated"] == queued
+
+        generator.update_call_step("first", "rare")
+        generator.end_call("second")
+        while not generator.task_queue.empty():
+            _, _, task = generator.task_queue.get()
+            generator._dispatch_task(task)
+        generator.executor.shutdown(wait=True)
+
+        stats = generator.get_stats()
+        assert sorted(generated) == ["Goodbye", "Sorry to hear that"]
+        assert stats["stale_dropped"] == 2
+        assert stats["wasted_seconds_avoided"] > 0
+    finally:
+        generator.shutdown()
+
+
+def test_step_changes_are_learned_across_processes_before_calls_end():
+    """
+    GIVEN two generators sharing Redis
+    WHEN a call on one of them changes step and has not ended yet
+    THEN the other one already counts the transition
+    """
+    redis_client = fakeredis.FakeRedis()
+    generators = [PredictiveGenerator(DictCache(), lambda *args, **kwargs: b"audio", scheduler=TTSScheduler(),
+                                      enabled=False, redis_client=redis_client) for _ in range(2)]
+    try:
+        flow_id = generators[0].register_call_flow(FLOW)
+        generators[0].start_call("live", flow_id)
+        generators[0].update_call_step("live", "rare")
+
+        assert generators[1].transitions.counts(flow_id, "start") == {"rare": 1}
+        generators[0].end_call("live")
+        assert generators[1].transitions.counts(flow_id, "start") == {"rare": 1}
+    finally:
+        for generator in generators:
+            generator.shutdown()
+
+
+def test_synthesis_budget_holds_for_the_whole_call():
+    """
+    GIVEN a budget that covers the first step's phrase and one phrase ahead
+    WHEN the call moves on to a step whose next phrase was not predicted yet
+    THEN nothing more is queued ahead, since the call spent its budget
+    """
+    generator = PredictiveGenerator(DictCache(), lambda *args, **kwargs: b"audio", scheduler=TTSScheduler(),
+                                    synthesis_budget=0.6, seconds_per_char=0.02)
+    try:
+        generator._stop_event.set()
+        generator._worker_thread.join()
+        flow_id = generator.register_call_flow(FLOW)
+        generator.start_call("live", flow_id)
+        state = generator.call_states["live"]
+        assert len(state.predictions) == 1
+
+        generator.update_call_step("live", "likely")
+
+        assert ("end", "Goodbye") not in state.predictions
+        assert state.synthesis_spent <= 0.6
+    finally:
+        generator.shutdown()
@@ -0,0 +1,143 @@
+"""
+Unit tests for priority scheduling of TTS provider requests.
+"""
+
+import threading
+import time
+
+from app.modules.tts.scheduler import SchedulingClass, TokenBucket, TTSScheduler
+
+
+def _wait_for_queue(scheduler, depth):
+    deadline = time.monotonic() + 2.0
+    while sum(c["queue_depth"] for c in scheduler.get_stats()["classes"].values()) < depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_waiting_requests_are_granted_by_class():
+    """
+    GIVEN a single-slot provider that is busy
+    WHEN prewarm, prediction and live requests queue up in that order
+    THEN the slot goes to the live turn first and the prewarm request last
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 1, "requests_per_minute": 60000}})
+    busy = scheduler.acquire("fake", SchedulingClass.LIVE_TURN)
+    order = []
+
+    def request(priority):
+        with scheduler.acquire("fake", priority):
+            order.append(priority)
+
+    threads = []
+    for depth, priority in enumerate((SchedulingClass.PREWARM, SchedulingClass.PREDICTION,
+                                      SchedulingClass.LIVE_TURN), start=1):
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        _wait_for_queue(scheduler, depth)
+
+    busy.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == [SchedulingClass.LIVE_TURN, SchedulingClass.PREDICTION, SchedulingClass.PREWARM]
+    assert scheduler.get_stats()["classes"]["prewarm"]["granted"] == 1
+
+
+def test_background_work_is_deferred_while_live_latency_is_high():
+    """
+    GIVEN a live turn that took longer than the latency target
+    WHEN prewarm and live requests arrive
+    THEN prewarm is deferred while live turns are still granted
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 4, "requests_per_minute": 60000}},
+                             live_latency_target=0.01, degraded_hold=5.0)
+    with scheduler.acquire("fake", SchedulingClass.LIVE_TURN) as permit:
+        time.sleep(0.02)
+        permit.mark_first_audio()
+
+    assert scheduler.is_degraded()
+    assert scheduler.acquire("fake", SchedulingClass.PREWARM, timeout=0.05) is None
+    assert scheduler.acquire("fake", SchedulingClass.LIVE_TURN, timeout=0.05) is not None
+    assert scheduler.get_stats()["classes"]["prewarm"]["deferred"] == 1
+
+
+def test_nested_requests_reuse_the_slot_and_inherit_its_class():
+    """
+    GIVEN a thread holding the only slot of a provider for a prediction
+    WHEN it makes a nested request without a class
+    THEN the nested request is granted at once with the prediction class
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 1, "requests_per_minute": 60000}})
+    with scheduler.acquire("fake", SchedulingClass.PREDICTION):
+        nested = scheduler.acquire("fake", timeout=0.01)
+        assert nested is not None and nested.priority == SchedulingClass.PREDICTION
+        nested.release()
+
+    assert scheduler.get_stats()["providers"]["fake"]["in_flight"] == 0
+
+
+def test_token_bucket_limits_request_rate():
+    """
+    GIVEN a bucket of two requests refilled at 60 per minute
+    WHEN both tokens are taken
+    THEN the next request has to wait about a second
+    """
+    bucket = TokenBucket(60, burst=2)
+    now = time.monotonic()
+    bucket.take(now)
+    bucket.take(now)
+
+    assert 0.9 < bucket.wait_time(now) <= 1.0
+    assert bucket.wait_time(now + 1.0) == 0.0
+
+
+def test_live_fragments_do_not_wait_for_the_request_rate():
+    """
+    GIVEN a provider limited to 60 requests per minute with a burst of one
+    WHEN the fragments of a live turn are requested back-to-back
+    THEN each is granted at once, and a prewarm request has to wait for tokens
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 4, "requests_per_minute": 60, "burst": 1}})
+    for _ in range(6):
+        with scheduler.acquire("fake", SchedulingClass.LIVE_TURN, timeout=0.05) as permit:
+            assert permit is not None
+            permit.mark_first_audio()
+
+    assert scheduler.get_stats()["classes"]["live_turn"]["granted"] == 6
+    assert scheduler.acquire("fake", SchedulingClass.PREWARM, timeout=0.05) is None
+
+
+def test_live_turns_without_first_audio_do_not_count_toward_latency():
+    """
+    GIVEN a live turn whose audio arrived all at once after a long synthesis
+    WHEN it is released without marking first audio
+    THEN live latency is not recorded and background work is not deferred
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 4, "requests_per_minute": 60000}},
+                             live_latency_target=0.01)
+    with scheduler.acquire("fake", SchedulingClass.LIVE_TURN):
+        time.sleep(0.02)
+
+    assert scheduler.get_stats()["live_latency"] is None
+    assert not scheduler.is_degraded()
+
+
+def test_reconfiguring_keeps_spent_tokens():
+    """
+    GIVEN a provider that used up its request burst
+    WHEN the scheduler is configured again, unchanged and then with a new rate
+    THEN the bucket is kept while unchanged, and the new rate does not refill it
+    """
+    scheduler = TTSScheduler({"fake": {"max_concurrency": 4, "requests_per_minute": 60, "burst": 2}})
+    for _ in range(2):
+        scheduler.acquire("fake", SchedulingClass.LIVE_TURN).release()
+    bucket = scheduler._providers["fake"].bucket
+    assert bucket.wait_time() > 0.5
+
+    scheduler.configure({"fake": {"max_concurrency": 4, "requests_per_minute": 60, "burst": 2}})
+    assert scheduler._providers["fake"].bucket is bucket
+
+    scheduler.configure({"fake": {"max_concurrency": 4, "requests_per_minute": 120, "burst": 2}})
+    assert scheduler._providers["fake"].bucket is not bucket
+    assert 0.2 < scheduler._providers["fake"].bucket.wait_time() <= 0.5
@@ -0,0 +1,147 @@
+"""
+Unit tests for streaming speech recognition with VAD endpointing.
+"""
+
+import base64
+import wave
+
+import numpy as np
+import pytest
+
+from app.modules.streaming_stt import (
+    EnergyZCRVAD, StreamingASRBackend, StreamingRecognizer, StreamingSTTManager, iter_wav_chunks
+)
+from app.modules.tts.output_format import mulaw_encode
+
+SAMPLE_RATE = 8000
+
+
+class StubASR(StreamingASRBackend):
+    """
+    ASR backend that reports how much audio it was given.
+    """
+
+    def __init__(self, supports_partials=True):
+        self.supports_partials = supports_partials
+        self.calls = []
+
+    def transcribe(self, samples, sample_rate, final):
+        self.calls.append((len(samples), final))
+        return f"{'final' if final else 'partial'} {len(samples) * 1000 // sample_rate}ms"
+
+
+def _noise(seconds, level=0.001, seed=0):
+    return np.random.default_rng(seed).normal(0, level, int(seconds * SAMPLE_RATE))
+
+
+def _voiced(seconds, f0=150.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return sum(0.2 / k * np.sin(2 * np.pi * f0 * k * t) for k in range(1, 6))
+
+
+def _pcm(*segments):
+    return (np.clip(np.concatenate(segments), -1, 1) * 32767).astype(np.int16)
+
+
+@pytest.fixture
+def two_utterances_wav(tmp_path):
+    """
+    WAV recording with background noise and two spoken turns.
+    """
+    path = tmp_path / "two_utterances.wav"
+    samples = _pcm(_noise(0.5), _voiced(1.0) + _noise(1.0, seed=1), _noise(0.8, seed=2),
+                   _voiced(0.6) + _noise(0.6, seed=3), _noise(1.0, seed=4))
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(samples.tobytes())
+    return str(path)
+
+
+def test_vad_separates_speech_from_noise():
+    """
+    GIVEN frames of background noise, voiced speech and quieter unvoiced hiss
+    WHEN they are classified after the noise floor was learned
+    THEN voiced and unvoiced frames are speech and noise frames are not
+    """
+    vad = EnergyZCRVAD(sample_rate=SAMPLE_RATE)
+    frame = vad.frame_length
+    vad.classify(_pcm(_noise(0.5)).reshape(-1, frame))
+
+    hiss = np.random.default_rng(5).normal(0, 0.003, frame * 5)
+    frames = _pcm(_noise(0.1, seed=6), _voiced(0.1), hiss).reshape(-1, frame)
+    speech = vad.classify(frames)
+
+    assert not speech[:5].any()
+    assert speech[5:].all()
+
+
+def test_wav_fixture_yields_one_final_per_turn_at_end_of_speech(two_utterances_wav):
+    """
+    GIVEN a recorded call with two turns separated by 0.8 s of silence
+    WHEN it is streamed in 20 ms chunks
+    THEN each turn is finalized 600 ms after it ends, with partials while it is spoken
+    """
+    asr = StubASR()
+    finals = []
+    recognizer = StreamingRecognizer(asr, sample_rate=SAMPLE_RATE, on_final=finals.append,
+                                     end_silence_ms=600, partial_interval_ms=400)
+
+    finalized_at = []
+    for index, chunk in enumerate(iter_wav_chunks(two_utterances_wav, chunk_ms=20)):
+        for event in recognizer.feed(chunk):
+            if event.is_final:
+                finalized_at.append((index + 1) * 20)
+
+    assert recognizer.flush() == []
+    assert len(finals) == 2
+    assert finals[0].start_ms == pytest.approx(300, abs=60)
+    assert finals[0].end_ms == pytest.approx(1600, abs=60)
+    assert finals[1].start_ms == pytest.approx(2100, abs=60)
+    assert finalized_at == [pytest.approx(2100, abs=60), pytest.approx(3500, abs=60)]
+    assert recognizer.stats["partials"] >= 2
+    assert recognizer.stats["utterances"] == 2
+
+
+def test_short_clicks_are_dropped():
+    """
+    GIVEN a 60 ms burst of sound in silence
+    WHEN it is streamed
+    THEN no transcript is produced and the ASR is never called
+    """
+    asr = StubASR(supports_partials=False)
+    recognizer = StreamingRecognizer(asr, sample_rate=SAMPLE_RATE)
+
+    events = recognizer.feed(_pcm(_noise(0.5), _voiced(0.06), _noise(1.0, seed=1)).tobytes())
+
+    assert events == []
+    assert asr.calls == []
+    assert recognizer.stats["dropped"] == 1
+
+
+def test_manager_finalizes_telnyx_media_frames_with_client_state():
+    """
+    GIVEN a call streaming μ-law media frames while in the chat state
+    WHEN the caller speaks and falls silent
+    THEN the call is active from its first frame, and the final transcript is
+        reported for the call with its client state
+    """
+    finals = []
+    manager = StreamingSTTManager(StubASR(supports_partials=False),
+                                  on_final=lambda call_id, state, event: finals.append((call_id, state, event.text)))
+    manager.start_call("call-1", client_state="recording_chat")
+    assert not manager.is_active("call-1")
+
+    audio = mulaw_encode(_pcm(_noise(0.5), _voiced(0.8), _noise(1.0, seed=1)))
+    for offset in range(0, len(audio), 160):
+        manager.handle_media_message("call-1", {
+            "event": "media",
+            "media": {"track": "inbound", "payload": base64.b64encode(audio[offset:offset + 160]).decode()}
+        })
+
+    assert manager.is_active("call-1")
+    assert [(call_id, state) for call_id, state, _ in finals] == [("call-1", "recording_chat")]
+    assert finals[0][2].startswith("final")
+    assert manager.handle_media_message("call-1", {"event": "stop"}) == []
+    assert manager.get_stats()["active_calls"] == 0
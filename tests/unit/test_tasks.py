@@ -0,0 +1,144 @@
+"""
+Unit tests for the TTS background tasks and the task audio cache.
+"""
+
+from unittest.mock import patch, MagicMock
+
+import fakeredis
+import pytest
+
+from app.modules.tts import tasks
+from app.modules.tts.cache_manager import TTSCacheManager
+
+
+@pytest.fixture
+def cache():
+    """
+    Create a task audio cache whose Redis tier runs on fakeredis.
+    """
+    server = fakeredis.FakeServer()
+    with patch('redis.Redis', side_effect=lambda **kwargs: fakeredis.FakeRedis(server=server)):
+        cache = TTSCacheManager({"redis": {"enabled": True, "prefix": "tts:audio:"},
+                                 "filesystem": {"enabled": False}})
+    with patch.object(tasks, 'get_cache_manager', return_value=cache):
+        yield cache
+
+
+def test_contains_many_probes_every_tier(cache):
+    """
+    GIVEN one key only in memory, one only in Redis and one nowhere
+    WHEN the cache is probed for all of them, with a duplicate
+    THEN exactly the cached keys are found
+    """
+    cache.memory_cache.set("memory-key", b"a")
+    cache.redis_cache.set("redis-key", b"b")
+
+    assert cache.contains_many(["memory-key", "redis-key", "missing-key", "redis-key"]) == {"memory-key",
+                                                                                            "redis-key"}
+
+
+def test_redis_items_are_read_in_ranges(cache):
+    """
+    GIVEN audio cached in Redis only
+    WHEN it is streamed in chunks smaller than the audio
+    THEN it is read with GETRANGE in order, and a missing key streams nothing
+    """
+    cache.redis_cache.set("audio", b"0123456789")
+
+    with patch.object(cache.redis_cache.client, 'get', side_effect=AssertionError("read whole")):
+        chunks = list(cache.stream("audio", chunk_size=4))
+
+    assert chunks == [b"0123", b"4567", b"89"]
+    assert cache.stream("missing", chunk_size=4) is None
+
+
+def test_batch_fans_out_round_robin_within_rate_limits():
+    """
+    GIVEN five items for a provider allowing two parallel sub-tasks
+    WHEN the batch fans out
+    THEN the planning task is replaced by a chord of two chunks dealt round-robin
+    """
+    task = MagicMock()
+    items = [{'key': f"k{i}"} for i in range(5)]
+    callback = tasks.aggregate_batch_task.s(manifest={})
+
+    with patch.object(tasks, 'batch_limits', return_value=(2, 1.5)):
+        tasks._fan_out(task, "batch-1", {"google": items}, {}, callback)
+
+    replacement = task.replace.call_args.args[0]
+    header = replacement.tasks
+    assert [chunk.kwargs['items'] for chunk in header] == [items[0::2], items[1::2]]
+    assert {chunk.kwargs['interval'] for chunk in header} == {1.5}
+    assert replacement.body.task == tasks.aggregate_batch_task.name
+
+
+def test_aggregate_counts_only_audio_still_cached(cache):
+    """
+    GIVEN a batch with one generated, one failed, one cached and one evicted text
+    WHEN its chunk results are aggregated
+    THEN the evicted text is an error rather than counted as cached
+    """
+    cache.set("cached-key", b"cached audio")
+    manifest = {'batch_id': "batch-1", 'provider_type': "google", 'requested': 4, 'duplicates': 0,
+                'keys': {"new": "new-key", "bad": "bad-key", "old": "cached-key", "gone": "evicted-key"}}
+    chunk_results = [[{'key': "new-key", 'reference': {'cache_key': "new-key"}},
+                      {'key': "bad-key", 'error': "provider down"}]]
+
+    result = tasks.aggregate_batch_task.run(chunk_results, manifest)
+
+    assert result['items']['old']['cache_key'] == "cached-key"
+    assert result['items']['gone'] is None
+    assert result['errors'] == {"bad": "provider down", "gone": "not in cache"}
+    assert (result['cached'], result['generated'], result['failed']) == (1, 1, 2)
+
+
+@pytest.fixture
+def provider_factory():
+    """
+    Create providers as mocks, in a worker process without cached providers.
+    """
+    def create_provider(provider_type, redis_client, provider_config):
+        provider = MagicMock(config=provider_config)
+        provider.warm_up.return_value = {'voices': 0.0}
+        provider.generate_speech.return_value = b"audio"
+        return provider
+
+    with patch.dict(tasks.TTSTask._providers, clear=True), \
+            patch.object(tasks, 'get_redis_client', return_value=None), \
+            patch.object(tasks, 'get_scheduler'), \
+            patch.object(tasks.TTSProviderFactory, 'create_provider', side_effect=create_provider) as factory:
+        yield factory
+
+
+def test_each_provider_config_gets_its_own_instance(provider_factory):
+    """
+    GIVEN two configurations of one provider
+    WHEN providers are loaded for both, and again for the first with its keys reordered
+    THEN each configuration has its own cached instance
+    """
+    fast, fast_init = tasks.TTSTask.load_provider("google", {"speed": 1.2, "voice": "a"})
+    slow, _ = tasks.TTSTask.load_provider("google", {"speed": 0.8, "voice": "a"})
+    again, again_init = tasks.TTSTask.load_provider("google", {"voice": "a", "speed": 1.2})
+
+    assert tasks.provider_cache_key("google", {"speed": 1.2}) != tasks.provider_cache_key("google", {"speed": 0.8})
+    assert fast is not slow
+    assert again is fast
+    assert fast_init is not None and again_init is None
+    assert provider_factory.call_count == 2
+
+
+def test_warmed_worker_serves_its_first_task_warm(provider_factory, cache):
+    """
+    GIVEN a worker process that warmed its provider on start
+    WHEN its first task uses that provider and configuration
+    THEN the task reports no cold start
+    """
+    report = tasks.warm_providers({"google": {"config": {"api_key": "key"}, "voices": ["en-US"]}})
+
+    result = tasks.generate_speech_task.run("Good morning", "google", provider_config={"api_key": "key"})
+
+    assert report["google"]["key"] == tasks.provider_cache_key("google", {"api_key": "key"})
+    assert provider_factory.call_count == 1
+    tasks.TTSTask._providers[report["google"]["key"]].warm_up.assert_called_once_with(["en-US"], None)
+    assert result['cold_start'] is False
+    assert result['provider_init_time'] == 0.0
@@ -0,0 +1,70 @@
+"""
+Unit tests for incremental sentence segmentation.
+"""
+
+import pytest
+
+from app.modules.tts.text_processing import SentenceSegmenter, TextFragmenter
+
+
+@pytest.fixture
+def segmenter():
+    """
+    Create a sentence segmenter with the default abbreviations.
+    """
+    return SentenceSegmenter()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Hello there. How are you?", ["Hello there.", "How are you?"]),
+    ("Dr. Smith paid $3.50 for coffee. It was good!",
+     ["Dr. Smith paid $3.50 for coffee.", "It was good!"]),
+    ("Bring fruit, e.g. apples. Thanks.", ["Bring fruit, e.g. apples.", "Thanks."]),
+    ("Well... maybe later. Or now... Who knows?",
+     ["Well... maybe later.", "Or now...", "Who knows?"]),
+    ("He said \"Stop.\" Then he left.", ["He said \"Stop.\"", "Then he left."]),
+    ("J. R. Tolkien wrote books. So do I. Really.",
+     ["J. R. Tolkien wrote books.", "So do I.", "Really."]),
+])
+def test_split_handles_abbreviations_decimals_and_ellipses(segmenter, text, expected):
+    """
+    GIVEN text with abbreviations, decimals, ellipses and quotes
+    WHEN it is split into sentences
+    THEN only real sentence boundaries are used
+    """
+    assert segmenter.split(text) == expected
+
+
+def test_streamed_chunks_match_one_shot_split(segmenter):
+    """
+    GIVEN text fed one character at a time
+    WHEN sentences are collected from the segmenter
+    THEN they match splitting the whole text, and each is emitted once the next begins
+    """
+    text = "Good morning. It is 7.45 a.m. and sunny... Enjoy the day! Bye."
+    expected = SentenceSegmenter().split(text)
+
+    emitted = []
+    for index, char in enumerate(text):
+        for sentence in segmenter.feed(char):
+            emitted.append((index, sentence))
+    sentences = [sentence for _, sentence in emitted] + segmenter.flush()
+
+    assert sentences == expected
+    assert emitted[0] == (text.index("It"), "Good morning.")
+
+
+def test_process_stream_breaks_overlong_sentences():
+    """
+    GIVEN a streamed sentence longer than the maximum fragment size
+    WHEN the fragmenter processes the stream
+    THEN it is broken at word boundaries without losing text
+    """
+    fragmenter = TextFragmenter(min_fragment_size=5, max_fragment_size=20)
+    text = "this sentence keeps going on and on without any punctuation at all"
+    chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+
+    fragments = list(fragmenter.process_stream(chunks))
+
+    assert all(len(fragment) <= 20 for fragment in fragments)
+    assert " ".join(fragments).split() == text.split()
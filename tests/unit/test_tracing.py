@@ -0,0 +1,73 @@
+"""
+Unit tests for per-turn latency tracing.
+"""
+
+import threading
+
+import pytest
+
+from app.modules.tracing import Tracer, current_trace_id, decode_client_state, encode_client_state
+
+
+def test_client_state_round_trips_trace_id():
+    """
+    GIVEN a call state and a trace id
+    WHEN the state is encoded for Telnyx and decoded from the webhook
+    THEN the call state and trace id come back unchanged
+    """
+    encoded = encode_client_state("recording_chat", "abc123")
+
+    assert decode_client_state(encoded) == ("recording_chat", "abc123")
+    assert decode_client_state("greeting") == ("greeting", None)
+    assert encode_client_state("greeting") == "greeting"
+    assert decode_client_state(encode_client_state(encoded, "def456")) == ("recording_chat", "def456")
+
+
+def test_nested_spans_and_worker_spans_form_one_waterfall():
+    """
+    GIVEN a turn with nested spans and an upload timed in another thread
+    WHEN the trace is read back
+    THEN all spans are in its waterfall, nested spans point at their parent
+    """
+    tracer = Tracer()
+
+    with tracer.trace() as trace_id:
+        with tracer.span("webhook.call.recording.saved") as outer:
+            with tracer.span("stt.openai"):
+                pass
+            worker = threading.Thread(
+                target=lambda: tracer.record("telnyx.upload", outer.start, outer.start + 0.05, trace_id=trace_id)
+            )
+            worker.start()
+            worker.join()
+    assert current_trace_id() is None
+
+    trace = tracer.get_trace(trace_id)
+    spans = {span["name"]: span for span in trace["spans"]}
+
+    assert set(spans) == {"webhook.call.recording.saved", "stt.openai", "telnyx.upload"}
+    assert spans["stt.openai"]["parent_id"] == outer.span_id
+    assert spans["telnyx.upload"]["duration_ms"] == pytest.approx(50)
+    assert trace["total_ms"] >= spans["telnyx.upload"]["duration_ms"]
+    assert tracer.recent_traces()[0]["trace_id"] == trace_id
+
+
+def test_stream_span_records_first_item_and_stage_stats():
+    """
+    GIVEN a traced stream that fails after one item
+    WHEN it is consumed
+    THEN the span records the first item and the error, and counts in the stage stats
+    """
+    tracer = Tracer()
+
+    def chunks():
+        yield b"audio"
+        raise ValueError("provider failed")
+
+    with pytest.raises(ValueError):
+        list(tracer.trace_stream("tts.stream", chunks()))
+
+    stats = tracer.get_stage_stats()["tts.stream"]
+    assert stats["count"] == 1 and stats["errors"] == 1
+    assert stats["p99"] >= stats["p50"] >= 0
+    assert tracer.recent_traces() == []
@@ -0,0 +1,115 @@
+"""
+Unit tests for racing transcription providers.
+"""
+
+import threading
+import time
+
+from app.modules.transcription_coordinator import TranscriptionCoordinator, word_disagreement
+
+
+class FakeProvider:
+    """
+    Provider that answers after a fixed delay.
+    """
+
+    def __init__(self, text, delay):
+        self.text = text
+        self.delay = delay
+        self.calls = 0
+
+    def transcribe_audio_url(self, audio_url):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.text
+
+
+class PollingProvider(FakeProvider):
+    """
+    Provider that polls until its transcript is ready or it is told to stop.
+    """
+
+    def __init__(self, text, delay):
+        super().__init__(text, delay)
+        self.stopped = threading.Event()
+
+    def transcribe_and_wait(self, audio_url, timeout, should_stop):
+        self.calls += 1
+        deadline = time.time() + self.delay
+        while time.time() < deadline:
+            if should_stop():
+                self.stopped.set()
+                return None
+            time.sleep(0.005)
+        return self.text
+
+
+def _wait_for(condition):
+    deadline = time.time() + 2.0
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+
+def test_first_non_empty_transcript_wins_and_pollers_stop():
+    """
+    GIVEN a provider that answers empty at once, a slower correct one and a slow poller
+    WHEN a turn is raced
+    THEN the first non-empty transcript is returned and the poller is told to stop
+    """
+    poller = PollingProvider("hello there", delay=1.0)
+    coordinator = TranscriptionCoordinator({
+        "empty": FakeProvider("", delay=0.0),
+        "fast": FakeProvider("Hello, there!", delay=0.05),
+        "poller": poller,
+    })
+
+    assert coordinator.transcribe_with_provider("https://recordings/1.wav") == ("Hello, there!", "fast")
+    assert poller.stopped.wait(1.0)
+
+    stats = coordinator.get_stats()["providers"]
+    assert stats["fast"]["wins"] == 1
+    assert stats["empty"]["failures"] == 1
+    _wait_for(lambda: coordinator.get_stats()["providers"]["poller"]["cancelled"] == 1)
+
+
+def test_late_results_are_compared_with_the_winner():
+    """
+    GIVEN two providers that word a transcript differently
+    WHEN the slower one finishes after the race is decided
+    THEN both record a disagreement with the share of differing words
+    """
+    coordinator = TranscriptionCoordinator({
+        "fast": FakeProvider("I feel great today", delay=0.0),
+        "slow": FakeProvider("I feel grey today", delay=0.05),
+    })
+
+    assert coordinator.transcribe_audio_url("https://recordings/2.wav") == "I feel great today"
+    _wait_for(lambda: coordinator.get_stats()["providers"]["slow"]["successes"] == 1)
+
+    stats = coordinator.get_stats()["providers"]
+    assert stats["slow"]["disagreement_rate"] == 1.0
+    assert stats["fast"]["avg_word_disagreement"] == word_disagreement("I feel great today", "I feel grey today") == 0.25
+
+
+def test_racing_stops_when_one_provider_consistently_wins():
+    """
+    GIVEN one provider that wins every race
+    WHEN enough turns have been raced
+    THEN later turns go to it alone, except for periodic probe races
+    """
+    fast = FakeProvider("yes", delay=0.0)
+    slow = FakeProvider("yes", delay=0.03)
+    coordinator = TranscriptionCoordinator({"fast": fast, "slow": slow}, min_races=5, probe_every=4)
+
+    for _ in range(5):
+        coordinator.transcribe_audio_url("https://recordings/3.wav")
+    assert coordinator.get_stats()["mode"] == "solo:fast"
+
+    slow_calls = slow.calls
+    for _ in range(4):
+        coordinator.transcribe_audio_url("https://recordings/3.wav")
+
+    stats = coordinator.get_stats()
+    assert stats["solo_turns"] == 3
+    assert slow.calls == slow_calls + 1
@@ -0,0 +1,268 @@
+"""
+Unit tests for the TTS service.
+"""
+
+import io
+import time
+import wave
+from unittest.mock import patch, MagicMock
+
+import fakeredis
+import pytest
+
+from app.modules.tts import tasks
+from app.modules.tts.base_provider import StreamingTTSProvider
+from app.modules.tts.cache_manager import TTSCacheManager
+from app.modules.tts.provider_factory import TTSProviderFactory
+from app.modules.tts.tts_service import TTSService
+
+
+class FakeStreamingProvider(StreamingTTSProvider):
+    """
+    Streaming provider whose audio is the text it was given.
+    """
+
+    def __init__(self, fail=False, delays=None):
+        self.fail = fail
+        self.delays = delays or {}
+        self.requests = []
+
+    def generate_speech(self, text, voice_id=None, speed=1.0, output_format=None):
+        self.requests.append(text)
+        if self.fail:
+            raise ConnectionError("provider down")
+        return text.encode()
+
+    def generate_speech_stream(self, text, voice_id=None, speed=1.0, output_format=None):
+        self.requests.append(text)
+        time.sleep(self.delays.get(text, 0))
+        if self.fail:
+            raise ConnectionError("provider down")
+        yield text.encode()
+
+    def get_stream_info(self):
+        return 8, 1, 8000
+
+    def begin_streaming_session(self, session_id, voice_id=None, speed=1.0):
+        return True
+
+    def add_text_to_stream(self, session_id, text):
+        return True
+
+    def end_streaming_session(self, session_id):
+        return True
+
+    def get_voices(self):
+        return {"voices": {}}
+
+    def set_voice(self, voice_id):
+        return True
+
+    def voice_exists(self, voice_id):
+        return True
+
+    def health_check(self):
+        return {"status": "healthy"}
+
+
+class ReportingProvider(FakeStreamingProvider):
+    """
+    Streaming provider that reports its own events, like the Google provider.
+    """
+
+    def __init__(self, event_emitter=None, **kwargs):
+        super().__init__()
+        self.event_emitter = event_emitter
+
+
+class FakeDialogManager:
+    """
+    Dialog manager that splits a turn into fixed fragments with a pause after each.
+    """
+
+    def __init__(self, fragments, pause_after_ms=0):
+        self.fragments = fragments
+        self.pause_after_ms = pause_after_ms
+
+    def process_dialog_turn(self, text, turn_id=None, context=None, urgency=0.0, apply_pauses=True):
+        for index, fragment in enumerate(self.fragments):
+            yield {"fragment": fragment, "index": index, "turn_id": turn_id,
+                   "pause_after_ms": self.pause_after_ms}
+        yield {"turn_complete": True, "fragment_count": len(self.fragments)}
+
+
+@pytest.fixture
+def providers():
+    return {"primary": FakeStreamingProvider(), "backup": FakeStreamingProvider()}
+
+
+@pytest.fixture
+def service(providers):
+    """
+    Create a service whose fallback manager routes to fake providers.
+    """
+    with patch("app.modules.tts.tts_service.TTSProviderFactory.create_provider",
+               return_value=providers["primary"]):
+        service = TTSService(redis_client=MagicMock(), config={
+            "default_provider": "primary",
+            "provider_config": {name: {"max_concurrency": 8, "requests_per_minute": 60000}
+                                for name in providers},
+        })
+    service.fallback_manager = MagicMock()
+    service.fallback_manager.get_candidate_providers.return_value = list(providers)
+    service.fallback_manager.get_provider_by_name.side_effect = providers.get
+    service.redis_client.get.return_value = None
+    return service
+
+
+def test_busy_provider_is_skipped_without_marking_it_failed(service, providers):
+    """
+    GIVEN a primary provider the scheduler grants no slot for
+    WHEN speech is generated and streamed
+    THEN both paths fall back to the backup and the primary is not marked failed
+    """
+    acquire = service.scheduler.acquire
+
+    def acquire_backup_only(provider_name, priority=None, timeout=None):
+        return acquire(provider_name, priority, timeout) if provider_name == "backup" else None
+
+    with patch.object(service.scheduler, "acquire", side_effect=acquire_backup_only):
+        assert service.generate_speech("Good morning.", use_cache=False) == b"Good morning."
+        assert b"".join(service.generate_speech_stream("Hello there.")) == b"Hello there."
+
+    service.fallback_manager.mark_provider_failure.assert_not_called()
+    assert providers["primary"].requests == []
+
+
+def test_fallback_audio_is_cached_under_the_provider_that_produced_it(service, providers):
+    """
+    GIVEN a failing primary provider and a working backup
+    WHEN speech is generated with caching
+    THEN the backup's audio is cached under the backup, not the primary
+    """
+    providers["primary"].fail = True
+
+    assert service.generate_speech("Good morning.") == b"Good morning."
+
+    cache_key = service.redis_client.setex.call_args.args[0]
+    assert cache_key == service._get_cache_key("Good morning.", None, 1.0, "backup")
+    assert cache_key != service._get_cache_key("Good morning.", None, 1.0, "primary")
+
+
+def test_pipelined_dialog_keeps_fragment_order(service, providers):
+    """
+    GIVEN a dialog turn whose first fragment takes longest to synthesize
+    WHEN the turn is streamed with look-ahead synthesis
+    THEN later fragments are synthesized meanwhile and audio still plays in order
+    """
+    providers["primary"].delays = {"Good morning.": 0.2}
+    service.dialog_manager = FakeDialogManager(["Good morning.", "How are you?", "Let us begin."])
+
+    stream = service.generate_dialog_speech_stream("...", pipelined=True)
+
+    assert next(stream) == b"Good morning."
+    assert sorted(providers["primary"].requests) == ["Good morning.", "How are you?", "Let us begin."]
+    assert b"".join(stream) == b"How are you?Let us begin."
+
+
+def test_pipelined_dialog_renders_pauses_as_silence(service):
+    """
+    GIVEN a dialog turn with a 50 ms pause after each fragment
+    WHEN the turn is streamed with look-ahead synthesis
+    THEN each pause is 50 ms of silent samples in the stream
+    """
+    service.dialog_manager = FakeDialogManager(["Breathe in.", "Breathe out."], pause_after_ms=50)
+    silence = b"\x00\x00" * 400
+
+    chunks = list(service.generate_dialog_speech_stream("...", pipelined=True))
+
+    assert chunks == [b"Breathe in.", silence, b"Breathe out.", silence]
+
+
+def test_cancelled_dialog_turn_stops_look_ahead(service, providers):
+    """
+    GIVEN a pipelined dialog turn of five fragments
+    WHEN it is cancelled while the first fragment plays
+    THEN no further audio is yielded and fragments beyond the look-ahead are never synthesized
+    """
+    providers["primary"].delays = {"Two.": 0.2}
+    service.dialog_manager = FakeDialogManager(["One.", "Two.", "Three.", "Four.", "Five."])
+    stream = service.generate_dialog_speech_stream("...", turn_id="turn-1", pipelined=True)
+
+    assert next(stream) == b"One."
+    assert service.cancel_dialog_turn("turn-1")
+
+    assert list(stream) == []
+    assert "Five." not in providers["primary"].requests
+    assert not service.cancel_dialog_turn("turn-1")
+
+
+def test_llm_tokens_are_spoken_sentence_by_sentence_in_order(service, providers):
+    """
+    GIVEN an LLM token stream whose sentences span several tokens
+    WHEN it is spoken while streaming
+    THEN each sentence is synthesized once whole, and audio plays in sentence order
+    """
+    providers["primary"].delays = {"Good morning.": 0.2}
+    tokens = ["Good ", "morn", "ing. How ", "are you", " today? Let us", " begin."]
+    metrics = {}
+
+    audio = b"".join(service.generate_llm_speech_stream(iter(tokens), metrics=metrics))
+
+    assert audio == b"Good morning.How are you today?Let us begin."
+    assert sorted(providers["primary"].requests) == ["Good morning.", "How are you today?", "Let us begin."]
+    assert metrics["sentences"] == 3
+    assert metrics["time_to_first_token"] <= metrics["time_to_first_audio"]
+
+
+def test_providers_report_events_through_the_service(providers):
+    """
+    GIVEN a provider that emits its own events, used as primary and as fallback
+    WHEN the service creates it
+    THEN every instance emits through the service's event emitter
+    """
+    with patch.dict(TTSProviderFactory._providers, {"reporting": ReportingProvider}):
+        single = TTSService(redis_client=MagicMock(), config={"default_provider": "reporting"})
+        with_fallback = TTSService(redis_client=MagicMock(), config={
+            "default_provider": "reporting", "fallback_providers": ["reporting"], "auto_recovery": False,
+        })
+
+    assert single.provider.event_emitter is single.events
+    assert with_fallback.provider.event_emitter is with_fallback.events
+
+
+def test_task_audio_round_trips_through_the_cache(service):
+    """
+    GIVEN a worker that stored a task's WAV audio and returned its reference
+    WHEN the web process reads the task's result and audio
+    THEN the result describes the audio, which is read back whole and in chunks
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(b"\x01\x02" * 8000)
+    audio = buffer.getvalue()
+    server = fakeredis.FakeServer()
+    with patch("redis.Redis", side_effect=lambda **kwargs: fakeredis.FakeRedis(server=server)):
+        worker_cache, web_cache = (TTSCacheManager({"redis": {"enabled": True, "prefix": "tts:audio:"},
+                                                    "filesystem": {"enabled": False}}) for _ in range(2))
+    reference = tasks._store_audio(worker_cache, "task-key", audio)
+    task = MagicMock(status="SUCCESS", result=dict(reference, latency=0.5, cold_start=False))
+    task.ready.return_value = True
+    task.failed.return_value = False
+    task.successful.return_value = True
+
+    with patch("celery.result.AsyncResult", return_value=task), \
+            patch("app.modules.tts.tts_service.get_cache_manager", return_value=web_cache):
+        result = service.get_task_result("task-1")
+        whole = service.get_task_audio("task-1")
+        chunks = list(service.stream_task_audio("task-1", chunk_size=4096))
+
+    assert tasks._cached_reference(web_cache, "task-key") == dict(reference, cached=True)
+    assert (result["cache_key"], result["data_size"], result["format"]) == ("task-key", len(audio),
+                                                                           reference["format"])
+    assert result["duration"] == pytest.approx(1.0)
+    assert whole == audio
+    assert b"".join(chunks) == audio and max(map(len, chunks)) == 4096
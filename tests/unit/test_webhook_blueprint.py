@@ -0,0 +1,94 @@
+"""
+Unit tests for call webhook handling with streaming recognition.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from app.modules.models import CallSession
+from app.webhook_blueprint import _handle_call_event
+
+
+def _event(event_type, **payload):
+    return {"data": {"event_type": event_type, "payload": {"call_control_id": "cc-1", **payload}}}
+
+
+@pytest.fixture
+def app():
+    """
+    Create an app whose services are mocks and whose call is recognized from its stream.
+    """
+    app = Flask(__name__)
+    redis_store = MagicMock()
+    redis_store.get_call_by_control_id.return_value = CallSession(id="call-1", user_id="user-1",
+                                                                  call_control_id="cc-1")
+    streaming_stt = MagicMock()
+    streaming_stt.is_active.return_value = True
+    app.config.update(REDIS_STORE=redis_store, TTS_SERVICE=MagicMock(), TELNYX_HANDLER=MagicMock(),
+                      LLM_HANDLER=MagicMock(), TRANSCRIPTION_HANDLER=MagicMock(),
+                      TTS_STREAMING_MANAGER=MagicMock(), CALL_QUALITY_MONITOR=MagicMock(),
+                      STREAMING_STT=streaming_stt)
+    return app
+
+
+def test_streamed_calls_listen_without_recording(app):
+    """
+    GIVEN a call whose inbound audio is recognized as it streams
+    WHEN the chat prompt finishes and a recording is saved anyway
+    THEN no recording is started or transcribed, and the stream carries the new state
+    """
+    with app.app_context():
+        _handle_call_event(_event("call.playback.ended", client_state="chat_prompt"))
+        _handle_call_event(_event("call.recording.saved", client_state="recording_chat", recording_id="rec-1",
+                                  recording_urls={"wav": "https://recordings/1.wav"}))
+
+    app.config["TELNYX_HANDLER"].start_recording.assert_not_called()
+    app.config["TRANSCRIPTION_HANDLER"].transcribe_audio_url.assert_not_called()
+    app.config["STREAMING_STT"].set_client_state.assert_called_once_with("cc-1", "recording_chat")
+
+
+def test_only_inbound_streams_are_recognized(app):
+    """
+    GIVEN a TTS playback stream and an inbound stream starting on a call
+    WHEN their streaming.started events arrive
+    THEN recognition starts only for the inbound stream
+    """
+    with app.app_context():
+        _handle_call_event(_event("streaming.started", client_state="ai_response"))
+        _handle_call_event(_event("streaming.started", client_state="chat_prompt", stream_track="inbound_track"))
+
+    app.config["STREAMING_STT"].start_call.assert_called_once_with("cc-1", "chat_prompt")
+
+
+def test_hangup_finishes_the_call(app):
+    """
+    GIVEN an active call
+    WHEN the caller hangs up
+    THEN the call is saved as completed, so it leaves the active call indexes
+    """
+    app.config["CALL_QUALITY_MONITOR"].get_call_metrics.return_value = None
+    with app.app_context():
+        _handle_call_event(_event("call.hangup"))
+
+    call_session = app.config["REDIS_STORE"].update_call_session.call_args.args[0]
+    assert call_session.state == "completed"
+    assert call_session.completed_at is not None
+
+
+def test_call_events_drive_predictive_synthesis(app):
+    """
+    GIVEN predictive synthesis following the call flow
+    WHEN the greeting finishes playing and the caller later hangs up
+    THEN the call moves on to the repeat prompt, and its prediction state is ended
+    """
+    predictive_generator = MagicMock()
+    app.config["PREDICTIVE_GENERATOR"] = predictive_generator
+    app.config["CALL_QUALITY_MONITOR"].get_call_metrics.return_value = None
+    with app.app_context():
+        _handle_call_event(_event("call.playback.ended", client_state="greeting"))
+        _handle_call_event(_event("call.hangup"))
+
+    predictive_generator.update_call_step.assert_called_once_with("call-1", "repeat_prompt")
+    predictive_generator.end_call.assert_called_once_with("call-1")
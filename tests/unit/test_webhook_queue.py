@@ -0,0 +1,136 @@
+"""
+Unit tests for the webhook event queue.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+
+from app.modules.webhook_queue import WebhookEventQueue
+
+
+def _event(event_id, event_type, call_control_id):
+    return {"data": {"id": event_id, "event_type": event_type,
+                     "payload": {"call_control_id": call_control_id}}}
+
+
+def test_events_are_queued_once_on_their_call_shard():
+    """
+    GIVEN a queue whose event ids have been seen once
+    WHEN Telnyx delivers the same event twice
+    THEN it is added to the call's shard once and the retry counts as a duplicate
+    """
+    client = MagicMock()
+    client.set.side_effect = [True, None]
+    queue = WebhookEventQueue(client, handler=lambda data: None, shard_count=4)
+
+    assert queue.enqueue(_event("evt-1", "call.answered", "call-a")) is True
+    assert queue.enqueue(_event("evt-1", "call.answered", "call-a")) is False
+
+    client.xadd.assert_called_once()
+    stream, fields = client.xadd.call_args.args
+    assert stream == f"webhooks:telnyx:stream:{queue.shard_for('call-a')}"
+    assert json.loads(fields["body"])["data"]["id"] == "evt-1"
+    assert queue.get_stats()["duplicates"] == 1
+
+
+def test_failed_enqueue_lets_the_retry_through():
+    """
+    GIVEN Redis rejecting the stream write
+    WHEN an event is enqueued
+    THEN the error is raised and the event id is forgotten so a retry is queued
+    """
+    client = MagicMock()
+    client.set.return_value = True
+    client.xadd.side_effect = redis.ConnectionError("down")
+    queue = WebhookEventQueue(client, handler=lambda data: None)
+
+    with pytest.raises(redis.ConnectionError):
+        queue.enqueue(_event("evt-2", "call.hangup", "call-b"))
+
+    client.delete.assert_called_once_with("webhooks:telnyx:seen:evt-2")
+
+
+def test_processing_records_lag_and_failures_per_event_type():
+    """
+    GIVEN a handler that fails on hangup events
+    WHEN queued answered and hangup events are processed
+    THEN each event type reports its count, failures and queue lag
+    """
+    def handler(data):
+        if data["data"]["event_type"] == "call.hangup":
+            raise ValueError("boom")
+
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = []
+    queue = WebhookEventQueue(client, handler=handler)
+    for event_id, event_type in (("1", "call.answered"), ("2", "call.hangup")):
+        queue._process({
+            "event_id": event_id,
+            "event_type": event_type,
+            "call_control_id": "call-c",
+            "received_at": "0",
+            "body": json.dumps(_event(event_id, event_type, "call-c")),
+        })
+
+    event_types = queue.get_stats()["event_types"]
+    assert event_types["call.answered"]["processed"] == 1
+    assert event_types["call.answered"]["failed"] == 0
+    assert event_types["call.hangup"]["failed"] == 1
+    assert event_types["call.hangup"]["lag"]["max"] > 0
+
+
+def _leases(queue, *results):
+    """Return lease results in order, then stop the workers."""
+    remaining = list(results)
+
+    def lease(keys, args):
+        if remaining:
+            return remaining.pop(0)
+        queue._stop_event.set()
+        return 0
+
+    return lease
+
+
+def test_worker_stops_the_batch_when_its_lease_is_lost():
+    """
+    GIVEN a newly leased shard with two queued events
+    WHEN the lease is lost after the first event
+    THEN the second event is left unhandled and unacknowledged for the new owner
+    """
+    handled = []
+    client = MagicMock()
+    client.xpending.return_value = {"pending": 0, "consumers": []}
+    fields = [
+        {"event_type": "call.answered", "received_at": "0",
+         "body": json.dumps(_event(event_id, "call.answered", "call-d"))}
+        for event_id in ("1", "2")
+    ]
+    client.xreadgroup.return_value = [("stream", [("1-0", fields[0]), ("2-0", fields[1])])]
+    queue = WebhookEventQueue(client, handler=handled.append, claim_idle_ms=60000)
+    queue._lease = _leases(queue, 1, 1, 0)
+
+    queue._run_shard(0)
+
+    assert [data["data"]["id"] for data in handled] == ["1"]
+    client.xack.assert_called_once_with("webhooks:telnyx:stream:0", "webhook-workers", "1-0")
+    assert client.xautoclaim.call_args.kwargs["min_idle_time"] == 60000
+
+
+def test_new_owner_waits_for_entries_another_consumer_is_handling():
+    """
+    GIVEN a shard whose previous owner still has recently delivered entries pending
+    WHEN another process leases the shard
+    THEN it handles nothing from the shard until those entries are done
+    """
+    client = MagicMock()
+    client.xpending.return_value = {"pending": 1, "consumers": [{"name": "other:1", "pending": 1}]}
+    queue = WebhookEventQueue(client, handler=lambda data: None, lease_ttl=0.03)
+    queue._lease = _leases(queue, 1, 1)
+
+    queue._run_shard(0)
+
+    client.xreadgroup.assert_not_called()